@@ -0,0 +1,216 @@
+"""Per-process Redis pub/sub multiplexer for websocket fan-out.
+
+All websockets of a process share one Redis connection:
+
+- One Redis subscription per channel, reference-counted across the local
+  subscribers of that channel.
+- Each published message is decoded once and the same ``Event`` is handed
+  to every local subscriber; consumers can memoize derived values (such as
+  the encoded outgoing frame) in ``Event.cache``.
+- Every subscriber has a bounded queue. A subscriber that falls
+  ``queue_size`` messages behind is evicted, so a slow socket can neither
+  grow memory without limit nor hold up delivery to the others.
+"""
+
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Optional, Set
+
+import redis.asyncio as redis
+
+SUBSCRIBER_QUEUE_SIZE = int(os.environ.get("BROADCAST_QUEUE_SIZE", 256))
+
+_UNDECODED = object()
+
+
+class Event:
+    def __init__(self, channel: str, message: Any) -> None:
+        self.channel = channel
+        self.message = message
+        self.cache: Dict[str, Any] = {}
+        self._data = _UNDECODED
+
+    @property
+    def data(self) -> Any:
+        """The message decoded from JSON (once), or the raw message."""
+        if self._data is _UNDECODED:
+            try:
+                self._data = json.loads(self.message)
+            except (TypeError, ValueError):
+                self._data = self.message
+        return self._data
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, Event)
+            and self.channel == other.channel
+            and self.message == other.message
+        )
+
+    def __repr__(self) -> str:
+        return f"Event(channel={self.channel!r}, message={self.message!r})"
+
+
+class Unsubscribed(Exception):
+    pass
+
+
+class RedisBackend:
+    def __init__(self, url: str):
+        self._url = url
+        self._pub_conn = None
+        self._sub_conn = None
+        self._pubsub = None
+
+    async def connect(self) -> None:
+        # Create separate connections for publishing and subscribing
+        self._pub_conn = await redis.from_url(
+            self._url, encoding="utf-8", decode_responses=True
+        )
+        self._sub_conn = await redis.from_url(
+            self._url, encoding="utf-8", decode_responses=True
+        )
+        self._pubsub = self._sub_conn.pubsub()
+
+    async def disconnect(self) -> None:
+        if self._pubsub:
+            await self._pubsub.close()
+        if self._pub_conn:
+            await self._pub_conn.close()
+        if self._sub_conn:
+            await self._sub_conn.close()
+
+    async def subscribe(self, channel: str) -> None:
+        await self._pubsub.subscribe(channel)
+
+    async def unsubscribe(self, channel: str) -> None:
+        await self._pubsub.unsubscribe(channel)
+
+    async def publish(self, channel: str, message: Any) -> None:
+        await self._pub_conn.publish(channel, message)
+
+    async def next_published(self) -> Optional[Event]:
+        if not self._pubsub.channels:
+            # get_message raises before the first subscription.
+            await asyncio.sleep(0.1)
+            return None
+
+        message = await self._pubsub.get_message(
+            ignore_subscribe_messages=True, timeout=1.0
+        )
+        if message and message["type"] == "message":
+            return Event(channel=message["channel"], message=message["data"])
+        return None
+
+
+class Subscriber:
+    def __init__(self, queue: asyncio.Queue) -> None:
+        self._queue = queue
+        self.evicted = False
+
+    async def __aiter__(self) -> Optional[AsyncGenerator]:
+        try:
+            while True:
+                yield await self.get()
+        except Unsubscribed:
+            pass
+
+    async def get(self) -> Event:
+        item = await self._queue.get()
+        if item is None:
+            raise Unsubscribed()
+        return item
+
+
+class Broadcast:
+    def __init__(
+        self,
+        url: str,
+        queue_size: int = SUBSCRIBER_QUEUE_SIZE,
+        backend: Optional[RedisBackend] = None,
+    ):
+        self._subscribers: Dict[str, Set[Subscriber]] = {}
+        self._backend = backend or RedisBackend(url)
+        self._queue_size = queue_size
+        self._listener_task: Optional[asyncio.Task] = None
+        self._stats = {"messages": 0, "deliveries": 0, "evictions": 0}
+
+    async def __aenter__(self) -> "Broadcast":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
+        await self.disconnect()
+
+    async def connect(self) -> None:
+        await self._backend.connect()
+        self._listener_task = asyncio.create_task(self._listener())
+
+    async def disconnect(self) -> None:
+        if self._listener_task.done():
+            self._listener_task.result()
+        else:
+            self._listener_task.cancel()
+        await self._backend.disconnect()
+
+    async def _listener(self) -> None:
+        while True:
+            event = await self._backend.next_published()
+            if event is not None:
+                self._dispatch(event)
+
+    def _dispatch(self, event: Event) -> None:
+        subscribers = self._subscribers.get(event.channel)
+        if not subscribers:
+            return
+        self._stats["messages"] += 1
+        for subscriber in list(subscribers):
+            try:
+                subscriber._queue.put_nowait(event)
+                self._stats["deliveries"] += 1
+            except asyncio.QueueFull:
+                self._evict(event.channel, subscriber)
+
+    def _evict(self, channel: str, subscriber: Subscriber) -> None:
+        """Drop a subscriber whose queue is full and end its iteration."""
+        subscriber.evicted = True
+        self._subscribers.get(channel, set()).discard(subscriber)
+        self._stats["evictions"] += 1
+        queue = subscriber._queue
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def publish(self, channel: str, message: Any) -> None:
+        await self._backend.publish(channel, message)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[Subscriber]:
+        subscriber = Subscriber(asyncio.Queue(maxsize=self._queue_size))
+        subscribers = self._subscribers.get(channel)
+        first = subscribers is None
+        if first:
+            # Registered before awaiting, so concurrent first subscribers
+            # share the set (and the Redis subscription).
+            subscribers = self._subscribers[channel] = set()
+        subscribers.add(subscriber)
+
+        try:
+            if first:
+                await self._backend.subscribe(channel)
+            yield subscriber
+        finally:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[channel]
+                    await self._backend.unsubscribe(channel)
+
+    def stats(self) -> Dict[str, int]:
+        stats = dict(self._stats)
+        stats["channels"] = len(self._subscribers)
+        stats["subscribers"] = sum(len(s) for s in self._subscribers.values())
+        return stats
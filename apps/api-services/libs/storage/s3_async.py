@@ -0,0 +1,77 @@
+"""Async S3 access for bulk reads.
+
+Objects are streamed in chunks into spooled temporary files (in memory up
+to ``S3_SPOOL_MAX_MEMORY`` bytes, on disk beyond that), so loading many
+large files holds neither the event loop nor the full objects in memory.
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from tempfile import SpooledTemporaryFile
+from typing import AsyncIterator, Iterable, List, Tuple, Union
+
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
+
+from libs.api.config import get_settings
+
+S3_FETCH_CONCURRENCY = int(os.environ.get("S3_FETCH_CONCURRENCY", 16))
+S3_SPOOL_MAX_MEMORY = int(os.environ.get("S3_SPOOL_MAX_MEMORY", 1024 * 1024))
+S3_READ_CHUNK_SIZE = 256 * 1024
+
+
+@asynccontextmanager
+async def async_s3_client(max_pool_connections: int = S3_FETCH_CONCURRENCY) -> AsyncIterator:
+    settings = get_settings()
+    session = get_session()
+    async with session.create_client(
+        "s3",
+        region_name=settings.AWS_S3_REGION_NAME,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        endpoint_url=getattr(settings, "AWS_S3_ENDPOINT_URL", None) or None,
+        config=AioConfig(
+            signature_version="s3v4", max_pool_connections=max_pool_connections
+        ),
+    ) as client:
+        yield client
+
+
+async def spool_object(
+    client, bucket_name: str, key: str, max_memory: int = S3_SPOOL_MAX_MEMORY
+) -> Tuple[SpooledTemporaryFile, int]:
+    """Stream an object into a spooled temp file, rewound; returns (file, size)."""
+    response = await client.get_object(Bucket=bucket_name, Key=key)
+    spool = SpooledTemporaryFile(max_size=max_memory)
+    try:
+        async with response["Body"] as stream:
+            while True:
+                chunk = await stream.read(S3_READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool, response["ContentLength"]
+
+
+async def spool_objects(
+    client,
+    bucket_name: str,
+    keys: Iterable[str],
+    concurrency: int = S3_FETCH_CONCURRENCY,
+) -> List[Union[Tuple[SpooledTemporaryFile, int], Exception]]:
+    """
+    Spool many objects with at most ``concurrency`` downloads in flight.
+    Results are in key order; a failed key yields its exception.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(key):
+        async with semaphore:
+            return await spool_object(client, bucket_name, key)
+
+    return await asyncio.gather(*(fetch(key) for key in keys), return_exceptions=True)
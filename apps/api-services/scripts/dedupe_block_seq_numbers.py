@@ -0,0 +1,56 @@
+"""
+Dedupe block seq_numbers and build the unique (thread_id, seq_number) index.
+
+Usage:
+    python scripts/dedupe_block_seq_numbers.py [--dry-run]
+
+Blocks that share a seq_number within a thread (saved before numbers were
+allocated atomically) are renumbered: the oldest block keeps its number and
+the others get fresh numbers from the thread's Redis counter. The unique
+index that BlockModel declares is then built. api-services and super_services
+write the same `blocks` collection, so one run covers both.
+
+Idempotent: a re-run finds no duplicates and the index already exists.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from libs.storage.redis_storage import REDIS
+from services.messaging_service.core.sequence import (
+    SequenceAllocator,
+    duplicate_seq_groups,
+)
+from services.messaging_service.models.conversation import BlockModel
+
+SEQ_INDEX = [("thread_id", 1), ("seq_number", 1)]
+
+
+def dedupe_block_seq_numbers(dry_run=False):
+    collection = BlockModel._get_collection()
+
+    groups = duplicate_seq_groups(collection)
+    extra = sum(len(group["ids"]) - 1 for group in groups)
+    print(f"Found {len(groups)} duplicated seq_numbers ({extra} blocks to renumber).")
+    if dry_run:
+        return
+
+    if groups:
+        allocator = SequenceAllocator(REDIS, BlockModel._get_collection)
+        moved = allocator.renumber_duplicates()
+        print(f"Renumbered {moved} blocks.")
+
+    for name, info in collection.index_information().items():
+        if info["key"] == SEQ_INDEX and info.get("unique"):
+            print(f"Unique index {name} already exists.")
+            return
+
+    print("Building unique (thread_id, seq_number) index...")
+    name = collection.create_index(SEQ_INDEX, unique=True)
+    print(f"Done: index {name}")
+
+
+if __name__ == "__main__":
+    dedupe_block_seq_numbers(dry_run="--dry-run" in sys.argv[1:])
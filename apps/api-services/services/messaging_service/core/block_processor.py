@@ -1,4 +1,5 @@
 import json
+from pymongo.errors import DuplicateKeyError
 from libs.core.exceptions import APICommonException
 from fastapi.encoders import jsonable_encoder
 from services.messaging_service.core.kafka_store import KAFKA_BASE
@@ -13,6 +14,7 @@ from services.messaging_service.models.conversation import (
     BlockModel,
     CheggQuestionSolverLogsModel,
 )
+from services.messaging_service.core.sequence import SequenceAllocator
 from services.messaging_service.core.storage import imagekitBackend
 from libs.api.config import get_settings
 from libs.api.logger import get_logger
@@ -73,15 +75,24 @@ def getUser(user):
     return user
 
 
-def get_seq_number(thread_id):
-    redis_key = f"{thread_id}_seq_number"
-    seq_data = REDIS.get(redis_key)
-    if seq_data:
-        seq_data = int(seq_data)
-        return redis_key, seq_data
-    else:
-        seq_data = BlockModel.count(thread_id=thread_id)
-        return redis_key, seq_data
+SEQUENCE = SequenceAllocator(REDIS, BlockModel._get_collection)
+
+
+def save_block(create_data, thread_id):
+    """Save a block under a freshly allocated seq_number.
+
+    The unique (thread_id, seq_number) index rejects a number that is already
+    taken (e.g. after Redis lost the counter); the counter is then resynced
+    from the collection and the save retried once.
+    """
+    for attempt in range(2):
+        create_data["seq_number"] = SEQUENCE.allocate(thread_id)
+        try:
+            return BlockModel.save_single_to_db(create_data)
+        except DuplicateKeyError:
+            if attempt:
+                raise
+            SEQUENCE.resync(thread_id)
 
 
 def get_thread_content(thread_id):
@@ -99,12 +110,22 @@ def get_thread_content(thread_id):
     return ""
 
 
-def fetch_thread_history(thread_id, last_count=10):
+def fetch_thread_history(thread_id, last_count=10, before_seq=None):
+    """Blocks preceding ``before_seq`` (default: the latest block), newest first."""
     query = {
         "thread_id": thread_id,
         "is_active": True,
         "block_type": {"$ne": "sys_msg"},
     }
+    collection = BlockModel._get_collection()
+    if before_seq is None:
+        latest = collection.find_one(
+            query, {"seq_number": 1}, sort=[("seq_number", -1)]
+        )
+        if not latest:
+            return []
+        before_seq = latest.get("seq_number", 0)
+    query["seq_number"] = {"$lt": before_seq}
     projection = [
         "user_id",
         "user",
@@ -114,8 +135,8 @@ def fetch_thread_history(thread_id, last_count=10):
         "pilot_handle",
         "seq_number",
     ]
-    old_messages = BlockModel._get_collection().find(
-        query, projection, sort=[("_id", -1)], skip=1, limit=last_count
+    old_messages = collection.find(
+        query, projection, sort=[("seq_number", -1)], limit=last_count
     )
     return list(old_messages)
 
@@ -181,11 +202,10 @@ def processTextMsg(
         if len(parent_data):
             create_data["parent_id"] = data["parent_id"]
             create_data["parent"] = parent_data
-    redis_key, seq_data = get_seq_number(thread_id)
-    create_data["seq_number"] = seq_data + 1
-    if create:
-        create_data = BlockModel.save_single_to_db(create_data)
-        REDIS.set(redis_key, create_data.seq_number)
+    if not create:
+        create_data["seq_number"] = SEQUENCE.peek(thread_id)
+    else:
+        create_data = save_block(create_data, thread_id)
         executeQuery(
             "UPDATE thread_threadpost SET reply_count = (thread_threadpost.reply_count + 1) WHERE (NOT thread_threadpost.is_deleted AND thread_threadpost.post_id = %s)",
             (thread_id,),
@@ -214,11 +234,10 @@ def processVideoMsg(data, thread_id, user, create=True, broadcaster=None):
         if len(parent_data):
             create_data["parent_id"] = data["parent_id"]
             create_data["parent"] = parent_data
-    redis_key, seq_data = get_seq_number(thread_id)
-    create_data["seq_number"] = seq_data + 1
-    if create:
-        create_data = BlockModel.save_single_to_db(create_data)
-        REDIS.set(redis_key, create_data.seq_number)
+    if not create:
+        create_data["seq_number"] = SEQUENCE.peek(thread_id)
+    else:
+        create_data = save_block(create_data, thread_id)
         executeQuery(
             "UPDATE thread_threadpost SET reply_count = (thread_threadpost.reply_count + 1) WHERE (NOT thread_threadpost.is_deleted AND thread_threadpost.post_id = %s)",
             (thread_id,),
@@ -320,10 +339,7 @@ def processSaveBlock(block, user, thread_id):
         "block_id": generateRandomKey("", unique=True, length=0),
     }
     create_data.update(block)
-    redis_key, seq_data = get_seq_number(thread_id)
-    create_data["seq_number"] = seq_data + 1
-    create_data = BlockModel.save_single_to_db(create_data)
-    REDIS.set(redis_key, create_data.seq_number)
+    create_data = save_block(create_data, thread_id)
     create_data = convertFromBaseModel(create_data)
     return create_data
 
@@ -1,7 +1,8 @@
+from contextlib import asynccontextmanager
 from typing import Dict, List, Union
 from fastapi import UploadFile
 from libs.storage.postgres import executeQuery
-from libs.storage.s3 import read_file_header
+from libs.storage.s3_async import async_s3_client, spool_objects
 from libs.api.config import get_settings
 
 settings = get_settings()
@@ -28,6 +29,11 @@ async def getKnowBase(brain_id) -> Union[Dict, None]:
 
 
 async def getAllFiles(brain_id, force_query=None) -> Union[List, None]:
+    """Unindexed files of the knowledge base, each with an open UploadFile.
+
+    The spooled temp files stay open for the indexer; release them with
+    closeAllFiles, or use openAllFiles, once indexing finishes.
+    """
     knowledgeBase = []
     space = await getKnowBase(brain_id)
     if not space:
@@ -41,18 +47,38 @@ async def getAllFiles(brain_id, force_query=None) -> Union[List, None]:
             (space_id,),
             many=True,
         )
-    for file in files:
-        try:
-            s3_response_object = read_file_header(
-                settings.AWS_STORAGE_BUCKET_NAME, f"media/{file.get('file')}"
-            )
-            fileObj = s3_response_object["Body"].read()
-            file["file"] = UploadFile(
-                fileObj,
-                filename=file.get("name"),
-                size=s3_response_object["ContentLength"],
-            )
-            knowledgeBase.append(file)
-        except Exception as ex:
-            pass
+    if not files:
+        return knowledgeBase
+    # Files stream concurrently into spooled temp files, and the indexer gets
+    # the open handles; a file that cannot be fetched is skipped.
+    async with async_s3_client() as client:
+        spooled = await spool_objects(
+            client,
+            settings.AWS_STORAGE_BUCKET_NAME,
+            [f"media/{file.get('file')}" for file in files],
+        )
+    for file, result in zip(files, spooled):
+        if isinstance(result, Exception):
+            continue
+        fileObj, size = result
+        file["file"] = UploadFile(fileObj, filename=file.get("name"), size=size)
+        knowledgeBase.append(file)
     return knowledgeBase
+
+
+async def closeAllFiles(files: List) -> None:
+    """Close the spooled temp files getAllFiles handed out."""
+    for file in files or []:
+        upload = file.get("file")
+        if isinstance(upload, UploadFile):
+            await upload.close()
+
+
+@asynccontextmanager
+async def openAllFiles(brain_id, force_query=None):
+    """getAllFiles whose temp files are closed when the block exits."""
+    files = await getAllFiles(brain_id, force_query)
+    try:
+        yield files
+    finally:
+        await closeAllFiles(files)
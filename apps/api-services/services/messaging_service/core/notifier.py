@@ -17,6 +17,30 @@ from pydantic import ValidationError
 
 app_logging = get_logger("messaging_service")
 
+_ROUTING_KEYS = ("include_self", "from_user", "self_only")
+
+
+def _should_deliver(message: dict, unique_id) -> bool:
+    include_self = message.get("include_self", False)
+    from_user = message.get("from_user")
+    self_only = message.get("self_only", False)
+    return (
+        (self_only == unique_id)
+        or (include_self and from_user == unique_id)
+        or (from_user != unique_id and not self_only)
+    )
+
+
+def _outgoing_text(event) -> str:
+    """The message without routing keys, encoded once per event like send_json."""
+    text = event.cache.get("text")
+    if text is None:
+        message = {k: v for k, v in event.data.items() if k not in _ROUTING_KEYS}
+        text = event.cache["text"] = json.dumps(
+            message, separators=(",", ":"), ensure_ascii=False
+        )
+    return text
+
 
 class ChannelNotifier:
     """
@@ -131,21 +155,20 @@ class ChannelNotifier:
     ):
         async with self.broadcaster.subscribe(channel=thread_id) as subscriber:
             async for event in subscriber:
-                message = json.loads(event.message)
-                include_self = message.pop("include_self", False)
-                from_user = message.pop("from_user")
-                self_only = message.pop("self_only", False)
-                if (
-                    (self_only == unique_id)
-                    or (include_self and from_user == unique_id)
-                    or (from_user != unique_id and not self_only)
-                ):
-                    try:
-                        await websocket.send_json(message)
-                    except Exception as ex:
-                        app_logging.debug(
-                            "The connection is closed in send Json", str(ex)
-                        )
+                if not _should_deliver(event.data, unique_id):
+                    continue
+                try:
+                    await websocket.send_text(_outgoing_text(event))
+                except Exception as ex:
+                    app_logging.debug(
+                        "The connection is closed in send Json", str(ex)
+                    )
+        if subscriber.evicted:
+            app_logging.debug(f"Closing slow websocket on thread {thread_id}")
+            try:
+                await websocket.close(code=1013)
+            except Exception as ex:
+                app_logging.debug("The connection is already closed", str(ex))
 
     async def _notify(self, message: dict, thread_id: str):
         app_logging.debug(thread_id, message)
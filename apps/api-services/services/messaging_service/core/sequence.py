@@ -0,0 +1,115 @@
+"""Per-thread block sequence numbers allocated with atomic Redis increments.
+
+The counter for a thread lives at ``{thread_id}_seq_number`` and holds the
+last allocated number. Allocation is a single ``INCRBY``, so concurrent
+senders always get distinct numbers; a batch reserves a contiguous range in
+the same call. A missing counter (cold thread, flushed Redis) is seeded once
+from the highest stored ``seq_number`` via the (thread_id, seq_number) index;
+seeding only ever raises the counter, so racing seeders are harmless.
+
+Keep in sync with apps/super/super_services/libs/core/sequence.py: both services
+allocate from the same counters and write the same ``blocks`` collection.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+# INCRBY only when the counter exists; nil tells the caller to seed it first.
+_INCR_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return false
+"""
+
+# Raise the counter to ARGV[1] unless it is already higher.
+_RAISE_TO = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local floor = tonumber(ARGV[1])
+if floor > current then
+    redis.call('SET', KEYS[1], floor)
+    return floor
+end
+return current
+"""
+
+
+def seq_key(thread_id: str) -> str:
+    return f"{thread_id}_seq_number"
+
+
+def duplicate_seq_groups(collection) -> List[Dict[str, Any]]:
+    """(thread_id, seq_number) pairs held by more than one block, with their _ids."""
+    return list(
+        collection.aggregate(
+            [
+                {
+                    "$group": {
+                        "_id": {"thread_id": "$thread_id", "seq_number": "$seq_number"},
+                        "ids": {"$push": "$_id"},
+                    }
+                },
+                {"$match": {"ids.1": {"$exists": True}}},
+            ],
+            allowDiskUse=True,
+        )
+    )
+
+
+class SequenceAllocator:
+    def __init__(self, redis_client, get_collection: Callable):
+        self._redis = redis_client
+        self._get_collection = get_collection
+        self._incr_if_exists = redis_client.register_script(_INCR_IF_EXISTS)
+        self._raise_to = redis_client.register_script(_RAISE_TO)
+
+    def max_stored(self, thread_id: str) -> int:
+        """Highest stored seq_number of the thread (an index lookup, not a count)."""
+        doc = self._get_collection().find_one(
+            {"thread_id": thread_id},
+            {"seq_number": 1, "_id": 0},
+            sort=[("seq_number", -1)],
+        )
+        return int(doc.get("seq_number") or 0) if doc else 0
+
+    def resync(self, thread_id: str) -> int:
+        """Raise the counter to the highest stored seq_number and return it."""
+        return int(self._raise_to(keys=[seq_key(thread_id)], args=[self.max_stored(thread_id)]))
+
+    def allocate(self, thread_id: str, count: int = 1) -> int:
+        """Reserve ``count`` consecutive numbers and return the first one."""
+        key = seq_key(thread_id)
+        last = self._incr_if_exists(keys=[key], args=[count])
+        if last is None:
+            self.resync(thread_id)
+            last = self._redis.incrby(key, count)
+        return int(last) - count + 1
+
+    def renumber_duplicates(self) -> int:
+        """
+        Move every block that shares its thread's seq_number with an older
+        block to a fresh number from the counter; the oldest keeps its number.
+        A re-run finds nothing to move. Returns the number of blocks moved.
+        """
+        collection = self._get_collection()
+        moved = 0
+        for group in duplicate_seq_groups(collection):
+            thread_id = group["_id"].get("thread_id")
+            if thread_id is None:
+                continue
+            # ObjectIds sort by creation time.
+            later = sorted(group["ids"])[1:]
+            self.resync(thread_id)
+            first = self.allocate(thread_id, len(later))
+            for offset, block_id in enumerate(later):
+                collection.update_one(
+                    {"_id": block_id}, {"$set": {"seq_number": first + offset}}
+                )
+            moved += len(later)
+        return moved
+
+    def peek(self, thread_id: str) -> int:
+        """The next number, without reserving it (for blocks that are not saved)."""
+        current: Optional[str] = self._redis.get(seq_key(thread_id))
+        if current is None:
+            return self.max_stored(thread_id) + 1
+        return int(current) + 1
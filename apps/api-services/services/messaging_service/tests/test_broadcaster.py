@@ -0,0 +1,203 @@
+import asyncio
+import json
+import os
+from time import perf_counter
+
+import pytest
+
+from libs.core.broadcaster import Broadcast, Event, RedisBackend
+
+
+class _MemoryBackend(RedisBackend):
+    """Redis pub/sub stand-in that records (un)subscriptions."""
+
+    def __init__(self):
+        super().__init__("memory://")
+        self.calls = []
+        self._published = asyncio.Queue()
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def subscribe(self, channel):
+        self.calls.append(("subscribe", channel))
+        await asyncio.sleep(0)
+
+    async def unsubscribe(self, channel):
+        self.calls.append(("unsubscribe", channel))
+
+    async def publish(self, channel, message):
+        await self._published.put(Event(channel, message))
+
+    async def next_published(self):
+        return await self._published.get()
+
+
+async def _drain(broadcast):
+    while not broadcast._backend._published.empty():
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_one_subscription_and_one_decode_per_channel():
+    backend = _MemoryBackend()
+    async with Broadcast("memory://", backend=backend) as broadcast:
+        async with broadcast.subscribe("t1") as first, broadcast.subscribe("t1") as second:
+            await broadcast.publish("t1", json.dumps({"event": "block", "n": 1}))
+            await _drain(broadcast)
+            a, b = await first.get(), await second.get()
+
+            assert a is b
+            assert a.data == {"event": "block", "n": 1}
+            assert a.data is b.data
+            assert broadcast.stats()["subscribers"] == 2
+
+        assert backend.calls == [("subscribe", "t1"), ("unsubscribe", "t1")]
+        assert broadcast.stats()["channels"] == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_subscribers_share_the_channel():
+    backend = _MemoryBackend()
+    async with Broadcast("memory://", backend=backend) as broadcast:
+        entered = asyncio.Event()
+        release = asyncio.Event()
+
+        async def client():
+            async with broadcast.subscribe("t1"):
+                entered.set()
+                await release.wait()
+
+        tasks = [asyncio.create_task(client()) for _ in range(3)]
+        await entered.wait()
+        await asyncio.sleep(0)
+        assert broadcast.stats()["subscribers"] == 3
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert backend.calls == [("subscribe", "t1"), ("unsubscribe", "t1")]
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_evicted_without_holding_up_others():
+    backend = _MemoryBackend()
+    async with Broadcast("memory://", queue_size=2, backend=backend) as broadcast:
+        received = []
+
+        async def fast_client(subscriber):
+            async for event in subscriber:
+                received.append(event.data)
+
+        async with broadcast.subscribe("t1") as slow, broadcast.subscribe("t1") as fast:
+            consumer = asyncio.create_task(fast_client(fast))
+            for n in range(5):
+                await broadcast.publish("t1", json.dumps({"n": n}))
+                await _drain(broadcast)
+
+            assert slow.evicted and not fast.evicted
+            assert [event async for event in slow] == []
+            assert received == [{"n": n} for n in range(5)]
+            assert broadcast.stats()["evictions"] == 1
+            consumer.cancel()
+
+        assert backend.calls[-1] == ("unsubscribe", "t1")
+
+
+@pytest.mark.asyncio
+async def test_subscription_is_released_when_the_consumer_fails():
+    backend = _MemoryBackend()
+    async with Broadcast("memory://", backend=backend) as broadcast:
+        with pytest.raises(RuntimeError):
+            async with broadcast.subscribe("t1"):
+                raise RuntimeError("socket closed")
+
+        assert broadcast.stats()["channels"] == 0
+        assert backend.calls == [("subscribe", "t1"), ("unsubscribe", "t1")]
+
+
+async def _redis_available(url):
+    import redis.asyncio as redis
+
+    client = redis.from_url(url)
+    try:
+        return await asyncio.wait_for(client.ping(), 1.0)
+    except Exception:
+        return False
+    finally:
+        await client.aclose()
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_websocket_fanout_benchmark():
+    url = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+    if not await _redis_available(url):
+        pytest.skip(f"No local Redis at {url}")
+    clients = int(os.environ.get("BROADCAST_BENCH_CLIENTS", 2000))
+    messages = 50
+    payload = {
+        "event": "block",
+        "data": {"content": "x" * 512, "block_type": "text"},
+        "from_user": "u0",
+        "include_self": True,
+    }
+
+    def per_socket(event):
+        # The previous fan-out: every socket decodes and re-encodes.
+        message = json.loads(event.message)
+        message.pop("include_self", False)
+        message.pop("from_user")
+        return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+    def shared(event):
+        text = event.cache.get("text")
+        if text is None:
+            message = {k: v for k, v in event.data.items() if k not in ("include_self", "from_user")}
+            text = event.cache["text"] = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+        return text
+
+    results = {}
+    for label, encode in (("per_socket", per_socket), ("shared", shared)):
+        async with Broadcast(url, queue_size=messages * 2) as broadcast:
+            done = asyncio.Event()
+            delivered = 0
+
+            async def client(subscriber):
+                nonlocal delivered
+                async for event in subscriber:
+                    encode(event)
+                    delivered += 1
+                    if delivered == clients * messages:
+                        done.set()
+
+            async with broadcast.subscribe("bench") as first:
+                subscribers = [first]
+                contexts = [broadcast.subscribe("bench") for _ in range(clients - 1)]
+                subscribers += [await ctx.__aenter__() for ctx in contexts]
+                tasks = [asyncio.create_task(client(s)) for s in subscribers]
+
+                start = perf_counter()
+                for n in range(messages):
+                    await broadcast.publish("bench", json.dumps({**payload, "n": n}))
+                await asyncio.wait_for(done.wait(), 120)
+                results[label] = perf_counter() - start
+
+                stats = broadcast.stats()
+                for task in tasks:
+                    task.cancel()
+                for ctx in contexts:
+                    await ctx.__aexit__(None, None, None)
+
+    print(
+        f"[LATENCY] websocket_fanout clients={clients} messages={messages} "
+        f"redis_subscriptions={stats['channels']} "
+        f"per_socket_ms={results['per_socket'] * 1000:.0f} "
+        f"shared_ms={results['shared'] * 1000:.0f}"
+    )
+    assert stats["channels"] == 1
+    assert results["shared"] < results["per_socket"]
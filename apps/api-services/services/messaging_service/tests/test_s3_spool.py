@@ -0,0 +1,132 @@
+import asyncio
+import os
+from time import perf_counter
+
+import pytest
+
+from libs.storage.s3_async import spool_object, spool_objects
+
+LATENCY_SECONDS = 0.02
+
+
+class _Body:
+    def __init__(self, data):
+        self._data = data
+        self._pos = 0
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+    async def read(self, size):
+        await asyncio.sleep(0)
+        chunk = self._data[self._pos:self._pos + size]
+        self._pos += len(chunk)
+        return chunk
+
+
+class _FakeS3:
+    """get_object with a fixed first-byte latency, tracking concurrency."""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.in_flight = 0
+        self.peak = 0
+
+    async def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise KeyError(Key)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(LATENCY_SECONDS)
+        finally:
+            self.in_flight -= 1
+        data = self.objects[Key]
+        return {"Body": _Body(data), "ContentLength": len(data)}
+
+
+@pytest.mark.asyncio
+async def test_large_objects_spill_to_disk():
+    data = os.urandom(600 * 1024)
+    spool, size = await spool_object(_FakeS3({"k": data}), "bucket", "k", max_memory=64 * 1024)
+
+    assert size == len(data)
+    assert spool._rolled
+    assert spool.read() == data
+    spool.close()
+
+
+@pytest.mark.asyncio
+async def test_fetches_are_bounded_and_failures_are_isolated():
+    objects = {f"media/{n}.txt": f"file {n}".encode() for n in range(20)}
+    s3 = _FakeS3(objects)
+    keys = [f"media/{n}.txt" for n in range(20)] + ["media/missing.txt"]
+
+    results = await spool_objects(s3, "bucket", keys, concurrency=4)
+
+    assert s3.peak == 4
+    assert isinstance(results[-1], KeyError)
+    for n, (spool, size) in enumerate(results[:-1]):
+        assert (spool.read(), size) == (objects[keys[n]], len(objects[keys[n]]))
+        spool.close()
+
+
+@pytest.mark.asyncio
+async def test_load_from_moto_s3():
+    moto_server = pytest.importorskip("moto.server")
+    import boto3
+    from aiobotocore.session import get_session
+
+    server = moto_server.ThreadedMotoServer(port=0)
+    server.start()
+    try:
+        host, port = server.get_host_and_port()
+        endpoint = f"http://{host}:{port}"
+        credentials = dict(
+            region_name="us-east-1", aws_access_key_id="test", aws_secret_access_key="test"
+        )
+        s3 = boto3.client("s3", endpoint_url=endpoint, **credentials)
+        s3.create_bucket(Bucket="kb")
+        files = {f"media/doc-{n}.txt": os.urandom(50_000 + n) for n in range(40)}
+        for key, data in files.items():
+            s3.put_object(Bucket="kb", Key=key, Body=data)
+
+        async with get_session().create_client("s3", endpoint_url=endpoint, **credentials) as client:
+            start = perf_counter()
+            results = await spool_objects(client, "kb", list(files), concurrency=8)
+            elapsed = perf_counter() - start
+
+        assert [spool.read() for spool, _ in results] == list(files.values())
+        assert [size for _, size in results] == [len(d) for d in files.values()]
+        print(f"[LATENCY] kb_file_load files={len(files)} concurrency=8 total_ms={elapsed * 1000:.0f}")
+    finally:
+        server.stop()
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_kb_file_load_benchmark():
+    files = 200
+    objects = {f"media/{n}.bin": os.urandom(32 * 1024) for n in range(files)}
+
+    start = perf_counter()
+    for key in objects:
+        spool, _ = await spool_object(_FakeS3(objects), "bucket", key)
+        spool.close()
+    serial = perf_counter() - start
+
+    start = perf_counter()
+    results = await spool_objects(_FakeS3(objects), "bucket", list(objects), concurrency=16)
+    concurrent = perf_counter() - start
+    for spool, _ in results:
+        spool.close()
+
+    print(
+        f"[LATENCY] kb_file_load files={files} first_byte_ms={LATENCY_SECONDS * 1000:.0f} "
+        f"serial_ms={serial * 1000:.0f} concurrent_ms={concurrent * 1000:.0f}"
+    )
+    assert concurrent < serial / 4
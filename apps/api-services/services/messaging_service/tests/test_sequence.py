@@ -0,0 +1,173 @@
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import pytest
+import redis
+
+from services.messaging_service.core.sequence import (
+    _INCR_IF_EXISTS,
+    _RAISE_TO,
+    SequenceAllocator,
+    duplicate_seq_groups,
+    seq_key,
+)
+
+
+class _MemoryRedis:
+    """Thread-safe stand-in for the counter commands and the two scripts."""
+
+    def __init__(self):
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def register_script(self, script):
+        run = {_INCR_IF_EXISTS: self._incr_if_exists, _RAISE_TO: self._raise_to}[script]
+
+        def call(keys, args):
+            with self._lock:
+                return run(keys[0], int(args[0]))
+
+        return call
+
+    def _incr_if_exists(self, key, amount):
+        if key not in self.values:
+            return None
+        self.values[key] += amount
+        return self.values[key]
+
+    def _raise_to(self, key, floor):
+        self.values[key] = max(self.values.get(key, 0), floor)
+        return self.values[key]
+
+    def incrby(self, key, amount):
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+            return self.values[key]
+
+    def get(self, key):
+        value = self.values.get(key)
+        return None if value is None else str(value)
+
+
+class _Blocks:
+    """Collection stand-in answering the max-seq_number lookup."""
+
+    def __init__(self, stored=0):
+        self.stored = stored
+        self.lookups = 0
+
+    def find_one(self, query, projection, sort):
+        self.lookups += 1
+        return {"seq_number": self.stored} if self.stored else None
+
+
+def test_cold_thread_is_seeded_once_from_the_stored_max():
+    blocks = _Blocks(stored=41)
+    allocator = SequenceAllocator(_MemoryRedis(), lambda: blocks)
+
+    assert allocator.peek("t1") == 42
+    assert allocator.allocate("t1") == 42
+    assert allocator.allocate("t1") == 43
+    assert blocks.lookups == 2  # peek and the seed; warm allocations skip Mongo
+
+
+def test_concurrent_senders_get_distinct_numbers():
+    allocator = SequenceAllocator(_MemoryRedis(), lambda: _Blocks(stored=5))
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        numbers = list(pool.map(lambda _: allocator.allocate("t1"), range(500)))
+
+    assert sorted(numbers) == list(range(6, 506))
+
+
+def test_range_reservation_and_resync_never_go_backwards():
+    client = _MemoryRedis()
+    blocks = _Blocks(stored=3)
+    allocator = SequenceAllocator(client, lambda: blocks)
+
+    assert allocator.allocate("t1", count=10) == 4
+    assert allocator.allocate("t1") == 14
+
+    blocks.stored = 20  # written by a writer that bypassed the counter
+    assert allocator.resync("t1") == 20
+    assert allocator.allocate("t1") == 21
+    blocks.stored = 1
+    assert allocator.resync("t1") == 21
+
+
+def test_renumber_duplicates_keeps_the_oldest_block_and_reruns_clean():
+    mongomock = pytest.importorskip("mongomock")
+    blocks = mongomock.MongoClient().db.blocks
+    blocks.insert_many(
+        [
+            {"thread_id": "t1", "seq_number": n, "block_id": f"b{i}"}
+            for i, n in enumerate([1, 2, 2, 3, 3, 3])
+        ]
+        + [{"thread_id": "t2", "seq_number": 1, "block_id": "c0"}]
+    )
+    client = _MemoryRedis()
+    client.values[seq_key("t1")] = 2  # lagging counter
+    allocator = SequenceAllocator(client, lambda: blocks)
+
+    assert allocator.renumber_duplicates() == 3
+    assert duplicate_seq_groups(blocks) == []
+    numbers = {b["block_id"]: b["seq_number"] for b in blocks.find({"thread_id": "t1"})}
+    assert [numbers[f"b{i}"] for i in (0, 1, 3)] == [1, 2, 3]
+    assert sorted(numbers.values()) == [1, 2, 3, 4, 5, 6]
+    assert allocator.allocate("t1") == 7
+
+    assert allocator.renumber_duplicates() == 0
+
+
+def _local_redis(url):
+    client = redis.StrictRedis.from_url(url, decode_responses=True, socket_connect_timeout=1)
+    try:
+        client.ping()
+        return client
+    except redis.RedisError:
+        return None
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark
+def test_sequence_allocation_benchmark():
+    client = _local_redis(os.environ.get("REDIS_URL", "redis://localhost:6379/0"))
+    if client is None:
+        pytest.skip("No local Redis")
+    thread_id = f"bench-{uuid.uuid4().hex}"
+    allocator = SequenceAllocator(client, lambda: _Blocks())
+    senders, per_sender = 32, 200
+
+    def read_then_write(_):
+        # The previous scheme: read the counter, save, then write it back.
+        numbers = []
+        for _ in range(per_sender):
+            seq = int(client.get(seq_key(thread_id)) or 0) + 1
+            client.set(seq_key(thread_id), seq)
+            numbers.append(seq)
+        return numbers
+
+    def atomic(_):
+        return [allocator.allocate(thread_id) for _ in range(per_sender)]
+
+    results = {}
+    try:
+        for label, sender in (("read_then_write", read_then_write), ("atomic", atomic)):
+            client.delete(seq_key(thread_id))
+            start = perf_counter()
+            with ThreadPoolExecutor(max_workers=senders) as pool:
+                numbers = [n for batch in pool.map(sender, range(senders)) for n in batch]
+            results[label] = (perf_counter() - start, len(numbers) - len(set(numbers)))
+    finally:
+        client.delete(seq_key(thread_id))
+
+    print(
+        f"[LATENCY] seq_allocation senders={senders} per_sender={per_sender} "
+        f"read_then_write_ms={results['read_then_write'][0] * 1000:.0f} "
+        f"read_then_write_duplicates={results['read_then_write'][1]} "
+        f"atomic_ms={results['atomic'][0] * 1000:.0f} atomic_duplicates={results['atomic'][1]}"
+    )
+    assert results["atomic"][1] == 0
@@ -20,10 +20,12 @@ def getMimeType(file_name):
     return mime_type
 
 
-def compute_sha1_from_file(file_path):
+def compute_sha1_from_file(file_path, block_size=1 << 20):
+    sha1 = hashlib.sha1()
     with open(file_path, "rb") as f:
-        content = f.read()
-        return compute_sha1_from_content(content)
+        for block in iter(lambda: f.read(block_size), b""):
+            sha1.update(block)
+    return sha1.hexdigest()
 
 
 def compute_sha1_from_content(content):
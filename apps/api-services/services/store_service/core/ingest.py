@@ -0,0 +1,192 @@
+"""
+Streaming ingestion of delimited tabular uploads (CSV and TSV).
+
+Rows are read in bounded batches, so peak memory depends on the batch
+size rather than on the file size:
+
+- Column types are inferred once from a sample of the first batch with
+  vectorized checks instead of trying every parser on every cell.
+- Content hashes are a 64-bit non-cryptographic digest computed per batch.
+- Each batch is written with one unordered bulk insert.
+"""
+
+import json
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from libs.core.jsondecoder import json_dumps
+
+# Excel uploads stay on the docling document path (file_processors["common"]).
+TABULAR_EXTENSIONS = {".csv", ".tsv"}
+
+INGEST_BATCH_SIZE = int(os.environ.get("STORE_INGEST_BATCH_SIZE", 5000))
+TYPE_SAMPLE_SIZE = 1000
+PREVIEW_SIZE = 100
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y")
+DATETIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%d/%m/%Y %H:%M:%S", "%m/%d/%Y %H:%M:%S")
+
+_INT_PATTERN = r"^[+-]?\d+$"
+
+
+def to_column_name(name, extension: str = ".csv") -> str:
+    name = str(name).lower()
+    name = re.sub(r"[^a-z0-9]+", "_", name)
+    name = re.sub(r"^[0-9_]+", "", name)
+    name = name[:63]
+    name = name.rstrip("_")
+    if extension == ".tsv":
+        name = name.replace("link", "url")
+    if not name:
+        name = "column"
+    return name
+
+
+@contextmanager
+def local_file(url: str) -> Iterator[Optional[str]]:
+    """Path of the file on disk, downloading S3 objects to a temporary file."""
+    if url.startswith("file://"):
+        url = url.replace("file://", "", 1)
+    if "s3" not in url:
+        yield url if os.path.exists(url) else None
+        return
+
+    from libs.storage.s3 import download_file
+    from libs.storage.s3_url import s3_path_split
+
+    bucket_name, key = s3_path_split(url)
+    fd, path = tempfile.mkstemp(suffix=f"temp__{os.path.basename(key)}")
+    os.close(fd)
+    try:
+        download_file(bucket_name, key, path)
+        yield path
+    finally:
+        os.remove(path)
+
+
+def _normalize_batch(df: pd.DataFrame, extension: str) -> pd.DataFrame:
+    names = [to_column_name(col, extension) for col in df.columns]
+    df.columns = names
+    duplicated = pd.Index(names).duplicated(keep="last")
+    if duplicated.any():
+        # Later columns win on name clashes, as they did for per-row dicts.
+        df = df.loc[:, ~duplicated]
+    return df.apply(lambda col: col.str.strip())
+
+
+def iter_tabular_batches(
+    path: str,
+    extension: str,
+    batch_size: int = INGEST_BATCH_SIZE,
+    encoding: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """Yield the rows of a tabular file as string DataFrames of ``batch_size``."""
+    batches = pd.read_csv(
+        path,
+        sep="\t" if extension == ".tsv" else ",",
+        dtype=str,
+        keep_default_na=False,
+        chunksize=batch_size,
+        encoding=encoding,
+    )
+    for batch in batches:
+        yield _normalize_batch(batch, extension)
+
+
+def _matches_formats(values: pd.Series, formats: Iterable[str]) -> bool:
+    return any(
+        pd.to_datetime(values, format=fmt, errors="coerce").notna().all()
+        for fmt in formats
+    )
+
+
+def _is_json_object(value: str) -> bool:
+    try:
+        return isinstance(json.loads(value), (dict, list))
+    except ValueError:
+        return False
+
+
+def infer_column_type(values: pd.Series) -> str:
+    """
+    Type shared by every non-empty value of a column sample, checked in the
+    same order as ``csv_loader.infer_data_type``.
+    """
+    values = values[values != ""]
+    if values.empty:
+        return "str"
+    if values.str.lower().isin(["true", "false"]).all():
+        return "boolean"
+    if values.str.match(_INT_PATTERN).all():
+        return "int"
+    if pd.to_numeric(values, errors="coerce").notna().all():
+        return "float"
+    if _matches_formats(values, DATE_FORMATS):
+        return "date"
+    if _matches_formats(values, DATETIME_FORMATS):
+        return "datetime"
+    if values.str.match(r"^\s*[\[{]").all() and values.map(_is_json_object).all():
+        return "dict"
+    return "str"
+
+
+def infer_column_types(
+    sample: pd.DataFrame, sample_size: int = TYPE_SAMPLE_SIZE
+) -> Dict[str, str]:
+    sample = sample.head(sample_size)
+    return OrderedDict((col, infer_column_type(sample[col])) for col in sample.columns)
+
+
+def hash_frame(df: pd.DataFrame) -> List[str]:
+    """64-bit content hash of each row, as hex."""
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return [f"{value:016x}" for value in hashes.tolist()]
+
+
+def hash_documents(docs: List[dict]) -> List[str]:
+    """64-bit content hash of each document's JSON, as hex."""
+    if not docs:
+        return []
+    payloads = np.array([json_dumps(doc) for doc in docs], dtype=object)
+    return [f"{value:016x}" for value in pd.util.hash_array(payloads).tolist()]
+
+
+def ingest_tabular_file(
+    path: str,
+    extension: str,
+    save_batch: Callable[[List[dict]], object],
+    extra_fields: Optional[Dict] = None,
+    batch_size: int = INGEST_BATCH_SIZE,
+    preview_size: int = PREVIEW_SIZE,
+) -> Dict:
+    """
+    Stream a tabular file into ``save_batch`` one batch of documents at a time.
+
+    Returns the inferred ``columns``, the number of documents written and the
+    first ``preview_size`` documents.
+    """
+    extra_fields = extra_fields or {}
+    columns: Dict[str, str] = OrderedDict()
+    preview: List[dict] = []
+    count = 0
+    for batch in iter_tabular_batches(path, extension, batch_size):
+        if not count:
+            columns = infer_column_types(batch)
+        hashes = hash_frame(batch)
+        records = batch.to_dict("records")
+        for record, content_hash in zip(records, hashes):
+            record["content_hash"] = content_hash
+            record.update(extra_fields)
+        if records:
+            save_batch(records)
+        count += len(records)
+        if len(preview) < preview_size:
+            preview.extend(records[: preview_size - len(preview)])
+    return {"columns": columns, "count": count, "preview": preview}
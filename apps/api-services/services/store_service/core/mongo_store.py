@@ -24,12 +24,12 @@ class MongoStore:
                 self.collection.create_index(field["Name"])
         return "MongoDB collection created successfully"
 
-    def save_data(self, data=None):
+    def save_data(self, data=None, ordered=True):
         if isinstance(data, pd.DataFrame):
             records = data.to_dict("records")
         else:
             records = data
-        res = self.collection.insert_many(records)
+        res = self.collection.insert_many(records, ordered=ordered)
         return f"Data saved to MongoDB successfully, Inserted Count - {len(res.inserted_ids)}"
 
     def fetch_data(self, *args, **kwargs):
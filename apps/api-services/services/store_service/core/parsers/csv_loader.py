@@ -1,10 +1,9 @@
 from collections import OrderedDict
-import csv
 from datetime import datetime
 import json
 from typing import Any, Dict, List, Optional
+from services.store_service.core.ingest import infer_column_types, iter_tabular_batches
 from services.store_service.core.parsers.base import BaseLoader
-import inflection
 import re
 
 
@@ -71,23 +70,12 @@ class CSVLoader(BaseLoader):
     def load(self) -> List[Any]:
         """Load data into document objects."""
         docs = []
-        headers = []
         columns = OrderedDict()
 
-        with open(self.file_path, newline="", encoding=self.encoding) as csvfile:
-            csv_reader = csv.DictReader(csvfile, **self.csv_args)
-            headers = next(csv_reader)
-            for col in headers:
-                col = inflection.underscore(self.to_column_name(col))
-                columns[col] = "unknown"
-            for i, row in enumerate(csv_reader):
-                doc = {self.to_column_name(k): v.strip() for k, v in row.items()}
-                docs.append(doc)
-                for col, value in zip(headers, doc.values()):
-                    col = inflection.underscore(self.to_column_name(col))
-                    if columns[col] == "unknown" or columns[col] == "string":
-                        col_type = infer_data_type(value)
-                        columns[col] = col_type
+        for batch in iter_tabular_batches(self.file_path, ".csv", encoding=self.encoding):
+            if not docs:
+                columns = infer_column_types(batch)
+            docs.extend(batch.to_dict("records"))
 
         return {
             "docs": docs,
@@ -5,19 +5,37 @@ import pandas as pd
 import re
 from datetime import datetime, timezone
 
-from libs.core.jsondecoder import convertFromMongo, json_dumps
+from libs.core.jsondecoder import convertFromMongo
 from libs.api.logger import get_logger
+from services.store_service.core.ingest import (
+    TABULAR_EXTENSIONS,
+    hash_documents,
+    ingest_tabular_file,
+    local_file,
+)
 
 app_logging = get_logger("store_service")
 
 
+_punkt_ready = False
+
+
+def ensure_punkt():
+    """Download the nltk sentence tokenizer once per process."""
+    global _punkt_ready
+    if not _punkt_ready:
+        import nltk
+
+        nltk.download("punkt", quiet=True)
+        _punkt_ready = True
+
+
 class Chunker:
     @staticmethod
     def chunk_text(text, chunk_size=1000):
-        import nltk
         from nltk.tokenize import sent_tokenize
 
-        nltk.download("punkt", quiet=True)
+        ensure_punkt()
         sentences = sent_tokenize(text)
         chunks = []
         current_chunk = ""
@@ -80,11 +98,13 @@ class StoreProcessor:
         self.db_manager = db_manager
 
     async def process(self, file_path, collection_id, schema_path=None, **kwargs):
-        from services.store_service.core.file import compute_sha1_from_content
-
-        index = kwargs.get("index", False)
         config = kwargs.get("config", {})
         file_name = inflection.underscore(os.path.basename(file_path)).replace(" ", "_")
+        if os.path.splitext(file_name)[1].lower() in TABULAR_EXTENSIONS:
+            return await self.process_tabular(
+                file_path, collection_id, file_name, schema_path, **kwargs
+            )
+
         processed_data = await self.parser.read_data_file(
             file_path, collection_id, **kwargs
         )
@@ -96,8 +116,8 @@ class StoreProcessor:
         schema = processed_data.get("data", {}).get("columns", {})
 
         current_time = datetime.now(timezone.utc)
-        for d in data:
-            d["content_hash"] = compute_sha1_from_content(json_dumps(d).encode())
+        for d, content_hash in zip(data, hash_documents(data)):
+            d["content_hash"] = content_hash
             d["file_name"] = file_name
             d["file_sha1"] = file_sha1
             d["created"] = current_time
@@ -118,17 +138,90 @@ class StoreProcessor:
             raise ValueError("Unsupported data type for chunking")
 
         for chunk in chunks:
-            self.db_manager.save_data(chunk)
+            self.db_manager.save_data(chunk, ordered=False)
 
+        await self.finish_upload(file_path, file_sha1, schema, **kwargs)
+        return {
+            "message": "Data stored successfully",
+            "success": True,
+            "data": {
+                "data": convertFromMongo(data),
+                "schemas": schema,
+            },
+        }
+
+    async def process_tabular(
+        self, file_path, collection_id, file_name, schema_path=None, **kwargs
+    ):
+        """
+        Stream a CSV/TSV upload into the collection in bounded batches.
+
+        Only a preview of the stored rows is returned, with the total count.
+        """
+        from services.store_service.core.file import compute_sha1_from_file
+
+        config = kwargs.get("config", {})
+        extra_fields = {"file_name": file_name}
+        with local_file(file_path) as path:
+            if not path:
+                return {
+                    "data": {"error": f"File not found at {file_path}"},
+                    "success": False,
+                }
+            file_size = os.path.getsize(path)
+            if file_size < 1:
+                return {
+                    "data": {"error": f"❌ {os.path.basename(file_path)} is empty."},
+                    "success": False,
+                }
+            file_sha1 = compute_sha1_from_file(path)
+            extra_fields["file_sha1"] = file_sha1
+            extra_fields["created"] = datetime.now(timezone.utc)
+            if collection_id == "collection_data_document":
+                extra_fields["token"] = config.get("token", None)
+                extra_fields["org_id"] = config.get("org_id", None)
+            loaded = ingest_tabular_file(
+                path,
+                os.path.splitext(file_name)[1].lower(),
+                lambda records: self.db_manager.save_data(records, ordered=False),
+                extra_fields=extra_fields,
+            )
+
+        if kwargs.get("save_log"):
+            from services.store_service.schemas.collection import CollectionFile
+
+            collection_file = CollectionFile(
+                url=file_path, size=file_size, file_sha1=file_sha1
+            )
+            collection_file.save_file_log(collection_id)
+
+        if schema_path:
+            schema = self.parser.read_schema(schema_path)
+        else:
+            schema = self.schema_creator.create_schema(loaded["columns"])
+
+        await self.finish_upload(file_path, file_sha1, schema, **kwargs)
+        return {
+            "message": "Data stored successfully",
+            "success": True,
+            "data": {
+                "data": convertFromMongo(loaded["preview"]),
+                "count": loaded["count"],
+                "schemas": schema,
+            },
+        }
+
+    async def finish_upload(self, file_path, file_sha1, schema, **kwargs):
         app_logging.debug("Schema Generated", schema)
 
+        config = kwargs.get("config", {})
         token = kwargs.get("token", None)
         if schema and token:
             from services.store_service.views.collection import updateCollectionSchema
 
             updateCollectionSchema(token, schema)
 
-        if index:
+        if kwargs.get("index", False):
             await self.add_index_job(
                 file_path,
                 file_sha1,
@@ -138,15 +231,6 @@ class StoreProcessor:
                 upload=True,
             )
 
-        return {
-            "message": "Data stored successfully",
-            "success": True,
-            "data": {
-                "data": convertFromMongo(data),
-                "schemas": schema,
-            },
-        }
-
     async def fetch_data(self, **kwargs):
         from services.store_service.models.collection import CollectionSchemaModel
 
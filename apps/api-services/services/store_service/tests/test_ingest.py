@@ -0,0 +1,200 @@
+import csv
+import gc
+import os
+import random
+import tracemalloc
+from time import perf_counter
+
+import pytest
+
+from services.store_service.core.ingest import (
+    hash_documents,
+    infer_column_types,
+    ingest_tabular_file,
+    iter_tabular_batches,
+)
+from services.store_service.core.file import compute_sha1_from_content
+from services.store_service.core.parsers.csv_loader import CSVLoader, infer_data_type
+from libs.core.jsondecoder import json_dumps
+
+import pandas as pd
+
+
+def _write_csv(path, rows, seed=1):
+    rng = random.Random(seed)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Name", "Phone Number", "Age", "Score", "Joined", "Active", "Meta"])
+        for i in range(rows):
+            writer.writerow(
+                [
+                    f" Contact {i} ",
+                    f"+91{9000000000 + rng.randrange(10**9)}",
+                    rng.randrange(18, 90),
+                    f"{rng.random() * 100:.2f}",
+                    f"2025-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+                    rng.choice(["true", "False"]),
+                    '{"plan": "basic"}' if i % 2 else "",
+                ]
+            )
+
+
+def test_infer_column_types() -> None:
+    sample = pd.DataFrame(
+        {
+            "flag": ["true", "FALSE", ""],
+            "count": ["1", "-20", "+3"],
+            "ratio": ["1.5", "2", "1e3"],
+            "day": ["2025-01-02", "2024-12-31", ""],
+            "at": ["01/02/2025 10:00:00", "13/02/2025 09:30:00", "02/03/2025 00:00:00"],
+            "meta": ['{"a": 1}', "[1, 2]", ""],
+            "mixed": ["1", "two", "3"],
+            "empty": ["", "", ""],
+        }
+    )
+
+    assert infer_column_types(sample) == {
+        "flag": "boolean",
+        "count": "int",
+        "ratio": "float",
+        "day": "date",
+        "at": "datetime",
+        "meta": "dict",
+        "mixed": "str",
+        "empty": "str",
+    }
+
+
+def test_ingest_streams_batches(tmp_path) -> None:
+    path = tmp_path / "contacts.csv"
+    _write_csv(path, 1050)
+    batches = []
+
+    loaded = ingest_tabular_file(
+        str(path), ".csv", batches.append, extra_fields={"file_name": "contacts.csv"}, batch_size=200
+    )
+
+    assert [len(b) for b in batches] == [200] * 5 + [50]
+    assert loaded["count"] == 1050
+    assert len(loaded["preview"]) == 100
+    assert loaded["columns"] == {
+        "name": "str",
+        "phone_number": "int",
+        "age": "int",
+        "score": "float",
+        "joined": "date",
+        "active": "boolean",
+        "meta": "dict",
+    }
+    first = batches[0][0]
+    assert first["name"] == "Contact 0"
+    assert first["phone_number"].startswith("+91")  # Values are stored as read
+    assert first["file_name"] == "contacts.csv"
+    hashes = [doc["content_hash"] for batch in batches for doc in batch]
+    assert len(set(hashes)) == len(hashes) and all(len(h) == 16 for h in hashes)
+
+
+def test_hashes_are_stable_and_content_based(tmp_path) -> None:
+    path = tmp_path / "rows.tsv"
+    path.write_text("Link\tNote\nhttp://a\tx\nhttp://a\tx\nhttp://b\tx\n")
+
+    batch = next(iter_tabular_batches(str(path), ".tsv"))
+    docs = batch.to_dict("records")
+    hashes = hash_documents(docs)
+
+    assert list(batch.columns) == ["url", "note"]
+    assert hashes[0] == hashes[1] != hashes[2]
+    assert hash_documents(docs) == hashes
+
+
+@pytest.mark.asyncio
+async def test_excel_uploads_stay_on_the_document_path() -> None:
+    from services.store_service.core.processor import StoreProcessor
+
+    routed = []
+
+    class _Parser:
+        async def read_data_file(self, file_path, collection_id, **kwargs):
+            routed.append(("document", file_path))
+            return {"success": False}
+
+    async def _tabular(file_path, *args, **kwargs):
+        routed.append(("tabular", file_path))
+        return {"success": True}
+
+    processor = StoreProcessor.__new__(StoreProcessor)
+    processor.parser = _Parser()
+    processor.process_tabular = _tabular
+
+    await processor.process("/tmp/contacts.xlsx", "collection")
+    await processor.process("/tmp/contacts.CSV", "collection")
+
+    assert routed == [("document", "/tmp/contacts.xlsx"), ("tabular", "/tmp/contacts.CSV")]
+
+
+def test_csv_loader_keeps_every_row(tmp_path) -> None:
+    path = tmp_path / "contacts.csv"
+    _write_csv(path, 10)
+
+    loaded = CSVLoader(str(path)).load()
+
+    assert len(loaded["docs"]) == 10
+    assert loaded["docs"][0]["name"] == "Contact 0"
+    assert loaded["columns"]["age"] == "int"
+
+
+def _legacy_load(path):
+    """The previous pipeline: parse every cell and SHA1 every row in memory."""
+    docs, columns = [], {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            doc = {k: v.strip() for k, v in row.items()}
+            for col, value in doc.items():
+                columns[col] = infer_data_type(value)
+            doc["content_hash"] = compute_sha1_from_content(json_dumps(doc).encode())
+            docs.append(doc)
+    return docs
+
+
+def _peak_mib(fn):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark
+def test_store_ingest_benchmark(tmp_path) -> None:
+    rows = int(os.environ.get("STORE_INGEST_BENCH_ROWS", 40_000))
+    peaks = {}
+    for count in (rows // 2, rows):
+        path = tmp_path / f"{count}.csv"
+        _write_csv(path, count)
+
+        start = perf_counter()
+        assert ingest_tabular_file(str(path), ".csv", lambda records: None)["count"] == count
+        streaming_s = perf_counter() - start
+        peaks[count] = _peak_mib(
+            lambda: ingest_tabular_file(str(path), ".csv", lambda records: None)
+        )
+
+        start = perf_counter()
+        assert len(_legacy_load(path)) == count
+        legacy_s = perf_counter() - start
+        legacy_peak = _peak_mib(lambda: _legacy_load(path))
+
+        print(
+            f"[LATENCY] store_ingest rows={count} "
+            f"legacy_rows_per_s={count / legacy_s:.0f} legacy_peak_mib={legacy_peak:.1f} "
+            f"streaming_rows_per_s={count / streaming_s:.0f} "
+            f"streaming_peak_mib={peaks[count]:.1f}"
+        )
+        assert streaming_s < legacy_s
+
+    # Peak memory is set by the batch size, not by the number of rows.
+    assert peaks[rows] < peaks[rows // 2] * 1.5
+    assert peaks[rows] < legacy_peak / 3
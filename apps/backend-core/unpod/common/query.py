@@ -15,6 +15,7 @@ def create_search_query(model: Model, search_keyword, key_list=[], queryset=None
 
 
 def get_model_unique_code(model, field, N=16):
+    """Polls for a free code; fields with a unique constraint should use unpod.common.tokens."""
     token = generate_code(N)
     query = Q()
     query.add(Q(**{field: token}), Q.AND)
@@ -26,7 +27,8 @@ def get_model_unique_code(model, field, N=16):
 def generateSpaceSlug(space):
     from django.utils.text import slugify
 
-    space_slug = f"{space.name}-{space.token[:4]}{space.token[-4:]}"
+    # The tail of the token: time-ordered tokens share their leading characters.
+    space_slug = f"{space.name}-{space.token[-8:]}"
     space_slug = slugify(space_slug)
     return space_slug
 
@@ -17,7 +17,7 @@ SONYFLAKE_EPOCH = APP_SONYFLAKE_EPOCH
 
 def get_machine_id() -> Union[int, None]:
     machine_id = os.environ.get("APP_MACHINE_ID", 257)
-    return machine_id
+    return int(machine_id)
 
 
 def lower_16bit_private_ip() -> int:
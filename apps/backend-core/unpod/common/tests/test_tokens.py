@@ -0,0 +1,147 @@
+"""
+Tests for tokens module
+Tests time-ordered and random token generation and insert-retry on unique conflicts
+
+Run tests:
+    pytest unpod/common/tests/test_tokens.py -v
+"""
+from time import perf_counter
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.db import IntegrityError
+
+from ..tokens import (
+    SONYFLAKE_WIDTH,
+    TOKEN_ALPHABET,
+    encode_base36,
+    random_token,
+    save_with_unique_token,
+    time_ordered_token,
+)
+
+
+class _Instance:
+    """Stand-in for a model instance with a token field."""
+
+    _meta = SimpleNamespace(get_field=lambda name: SimpleNamespace(column=name))
+
+    def __init__(self, conflicts=0, message="Key (token)=(X) already exists."):
+        self.token = None
+        self.conflicts = conflicts
+        self.message = message
+        self.saved = []
+
+    def save(self):
+        if self.conflicts:
+            self.conflicts -= 1
+            raise IntegrityError(self.message)
+        self.saved.append(self.token)
+
+
+def _connection(in_atomic_block):
+    return patch(
+        "unpod.common.tokens.transaction.get_connection",
+        return_value=SimpleNamespace(in_atomic_block=in_atomic_block),
+    )
+
+
+class TestTokenGeneration:
+    """Test encoding and the two token kinds"""
+
+    def test_encoding_is_fixed_width_and_order_preserving(self):
+        values = [0, 1, 35, 36, 10**12, 2**63 - 1]
+        encoded = [encode_base36(v) for v in values]
+
+        assert all(len(e) == SONYFLAKE_WIDTH for e in encoded)
+        assert encoded == sorted(encoded)
+        assert [int(e, 36) for e in encoded] == values
+
+    def test_time_ordered_tokens_sort_by_creation(self):
+        tokens = [time_ordered_token(N=20) for _ in range(2000)]
+
+        assert len(set(tokens)) == len(tokens)
+        assert [t[:SONYFLAKE_WIDTH] for t in tokens] == sorted(t[:SONYFLAKE_WIDTH] for t in tokens)
+        assert all(len(t) == 20 and set(t) <= set(TOKEN_ALPHABET) for t in tokens)
+
+    def test_short_time_ordered_token_is_rejected(self):
+        with pytest.raises(ValueError):
+            time_ordered_token(N=SONYFLAKE_WIDTH - 1)
+
+    def test_random_tokens_use_the_code_alphabet(self):
+        tokens = {random_token(N=16) for _ in range(2000)}
+
+        assert len(tokens) == 2000
+        assert all(len(t) == 16 and set(t) <= set(TOKEN_ALPHABET) for t in tokens)
+
+
+class TestSaveWithUniqueToken:
+    """Test insert-retry on the token's unique constraint"""
+
+    def test_conflict_regenerates_and_retries(self):
+        instance = _Instance(conflicts=2)
+        made = iter(["A", "B", "C"])
+        with _connection(in_atomic_block=False):
+            save_with_unique_token(instance, "token", lambda: next(made), instance.save)
+
+        assert instance.saved == ["C"]
+
+    def test_existing_token_is_kept(self):
+        instance = _Instance()
+        instance.token = "KEEP"
+        save_with_unique_token(instance, "token", lambda: "NEW", instance.save)
+
+        assert instance.saved == ["KEEP"]
+
+    def test_other_conflicts_and_atomic_blocks_raise(self):
+        other = _Instance(conflicts=1, message="Key (request_token)=(X) already exists.")
+        with _connection(in_atomic_block=False), pytest.raises(IntegrityError):
+            save_with_unique_token(other, "token", lambda: "A", other.save)
+
+        atomic = _Instance(conflicts=1)
+        with _connection(in_atomic_block=True), pytest.raises(IntegrityError):
+            save_with_unique_token(atomic, "token", lambda: "A", atomic.save)
+
+    def test_attempts_are_bounded(self):
+        instance = _Instance(conflicts=10)
+        with _connection(in_atomic_block=False), pytest.raises(IntegrityError):
+            save_with_unique_token(instance, "token", lambda: "A", instance.save)
+
+        assert instance.conflicts == 7
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_bulk_create_token_benchmark():
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from unpod.common.query import get_model_unique_code
+    from unpod.space.models import SpaceOrganization
+
+    rows = 500
+
+    with CaptureQueriesContext(connection) as polled_queries:
+        start = perf_counter()
+        polled = [
+            SpaceOrganization(name=f"polled {n}", token=get_model_unique_code(SpaceOrganization, "token", N=20))
+            for n in range(rows)
+        ]
+        SpaceOrganization.objects.bulk_create(polled)
+        polled_s = perf_counter() - start
+
+    with CaptureQueriesContext(connection) as ordered_queries:
+        start = perf_counter()
+        ordered = [SpaceOrganization(name=f"ordered {n}", token=time_ordered_token(N=20)) for n in range(rows)]
+        SpaceOrganization.objects.bulk_create(ordered)
+        ordered_s = perf_counter() - start
+
+    tokens = list(SpaceOrganization.objects.filter(name__startswith="ordered").values_list("token", flat=True))
+    assert len(set(tokens)) == rows
+    print(
+        f"[LATENCY] token_bulk_create rows={rows} "
+        f"polled_ms={polled_s * 1000:.0f} polled_queries={len(polled_queries)} "
+        f"time_ordered_ms={ordered_s * 1000:.0f} time_ordered_queries={len(ordered_queries)}"
+    )
+    assert len(ordered_queries) < len(polled_queries)
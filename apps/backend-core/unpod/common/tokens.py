@@ -0,0 +1,74 @@
+"""
+Model tokens that need no existence check.
+
+Identifier tokens (spaces, organizations) are time-ordered: the next
+``app_sonyflake`` id as a fixed-width base-36 prefix in the ``generate_code``
+alphabet, then random characters up to the requested length. They sort by
+creation time, and the random tail keeps processes that share a machine id
+apart within the same clock tick.
+
+Secret tokens (invites, access requests) are fully random, since they are
+handed out as bearer links and must not be guessable from a creation time.
+
+Uniqueness is enforced by the fields' unique constraints rather than by
+querying first: ``save_with_unique_token`` fills the token and, outside an
+atomic block, retries the insert with a new token on a conflict. Inside an
+atomic block (every request, with ATOMIC_REQUESTS) a retry would need a
+savepoint, which costs more round trips than the query it replaces, so the
+practically impossible conflict is raised like any other integrity error.
+"""
+
+import re
+import secrets
+import string
+
+from django.db import IntegrityError, transaction
+
+from unpod.common.sonyflake import app_sonyflake
+
+TOKEN_ALPHABET = string.digits + string.ascii_uppercase
+# Base-36 digits needed for a 63-bit sonyflake id.
+SONYFLAKE_WIDTH = 13
+TOKEN_INSERT_ATTEMPTS = 3
+
+
+def encode_base36(value: int, width: int = SONYFLAKE_WIDTH) -> str:
+    """Fixed-width base-36, so string order matches numeric order."""
+    digits = []
+    while value:
+        value, remainder = divmod(value, 36)
+        digits.append(TOKEN_ALPHABET[remainder])
+    return "".join(reversed(digits)).rjust(width, TOKEN_ALPHABET[0])
+
+
+def random_token(N: int = 16) -> str:
+    return "".join(secrets.choice(TOKEN_ALPHABET) for _ in range(N))
+
+
+def time_ordered_token(N: int = 20) -> str:
+    if N < SONYFLAKE_WIDTH:
+        raise ValueError(f"Token length must be at least {SONYFLAKE_WIDTH}")
+    return encode_base36(app_sonyflake.next_id()) + random_token(N - SONYFLAKE_WIDTH)
+
+
+def _is_conflict_on(error: IntegrityError, column: str) -> bool:
+    # Postgres: 'Key (token)=(...) already exists'; SQLite: 'failed: table.token'.
+    return re.search(rf"\b{re.escape(column)}\b", str(error)) is not None
+
+
+def save_with_unique_token(instance, field: str, make_token, save, *args, **kwargs):
+    """
+    Call ``save`` with ``field`` set to ``make_token()`` when it is empty,
+    regenerating the token if the insert conflicts on that field.
+    """
+    if getattr(instance, field):
+        return save(*args, **kwargs)
+    column = instance._meta.get_field(field).column
+    retry = not transaction.get_connection(kwargs.get("using")).in_atomic_block
+    for attempt in range(TOKEN_INSERT_ATTEMPTS):
+        setattr(instance, field, make_token())
+        try:
+            return save(*args, **kwargs)
+        except IntegrityError as e:
+            if not retry or attempt + 1 == TOKEN_INSERT_ATTEMPTS or not _is_conflict_on(e, column):
+                raise
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CoreComponentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'unpod.core_components'
+
+    def ready(self):
+        import unpod.core_components.signals  # noqa F401
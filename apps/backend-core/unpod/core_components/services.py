@@ -535,6 +535,30 @@ class PilotService:
               pilot.eval_kn_bases.add(*valid_ids)
 
 
+    @staticmethod
+    def trigger_flow_precompile(pilot):
+        """
+        Precompile the pilot's conversation flow after its prompt is saved.
+
+        Compiling a prompt into a flow takes several LLM calls; doing it here
+        means calls load the compiled flow from cache instead of compiling
+        during call setup. The trigger is queued on the Django-Q cluster once
+        the surrounding transaction commits, so the request never waits on it.
+        """
+        if not pilot.system_prompt:
+            return
+
+        from django_q.tasks import async_task
+
+        agent_id, system_prompt = pilot.handle, pilot.system_prompt
+        transaction.on_commit(
+            lambda: async_task(
+                "unpod.core_components.tasks.precompile_agent_flow",
+                agent_id,
+                system_prompt,
+            )
+        )
+
     @staticmethod
     @transaction.atomic
     def create_pilot_with_associations(validated_data, request):
@@ -624,6 +648,7 @@ class PilotService:
         PilotService.process_pilot_permissions(pilot, user_list, request)
         PilotService.process_pilot_components(pilot, components, request)
         PilotService.process_pilot_eval_kbs(pilot, eval_kn_bases)
+        PilotService.trigger_flow_precompile(pilot)
 
         # Set default component values if none provided
         if not components:
@@ -702,6 +727,8 @@ class PilotService:
         # Process model updates
         PilotService.process_pilot_models(pilot, validated_data)
 
+        previous_system_prompt = pilot.system_prompt
+
         # Update all other fields
         for attr, value in validated_data.items():
             setattr(pilot, attr, value)
@@ -726,4 +753,7 @@ class PilotService:
         PilotService.process_pilot_components(pilot, components, request)
         PilotService.process_pilot_eval_kbs(pilot, eval_kn_bases, is_update=True)
 
+        if pilot.system_prompt != previous_system_prompt:
+            PilotService.trigger_flow_precompile(pilot)
+
         return pilot
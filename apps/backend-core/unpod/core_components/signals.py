@@ -0,0 +1,45 @@
+"""
+Invalidate cached agent configs whenever a row the voice config is built
+from changes (super_services.voice.models.config), whichever code path
+wrote it: PilotService, admin, serializers or scripts.
+
+Queryset ``update()`` and ``bulk_create()`` do not send these signals; the
+pilot update path still saves the pilot itself, which covers its links.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from unpod.core_components.models import Model, Pilot, PilotLink, Provider, Voice
+from unpod.core_components.utils import invalidate_agent_config_on_commit
+from unpod.dynamic_forms.models import DynamicFormValues
+
+
+@receiver([post_save, post_delete], sender=Pilot)
+def pilot_changed(sender, instance, **kwargs):
+    invalidate_agent_config_on_commit(instance.handle)
+
+
+@receiver([post_save, post_delete], sender=PilotLink)
+def pilot_link_changed(sender, instance, **kwargs):
+    if instance.pilot_id:
+        handle = (
+            Pilot.objects.filter(id=instance.pilot_id)
+            .values_list("handle", flat=True)
+            .first()
+        )
+        invalidate_agent_config_on_commit(handle)
+
+
+@receiver([post_save, post_delete], sender=DynamicFormValues)
+def agent_form_values_changed(sender, instance, **kwargs):
+    if instance.parent_type == "agent":
+        invalidate_agent_config_on_commit(instance.parent_id)
+
+
+@receiver([post_save, post_delete], sender=Model)
+@receiver([post_save, post_delete], sender=Provider)
+@receiver([post_save, post_delete], sender=Voice)
+def shared_component_changed(sender, instance, **kwargs):
+    # Linked models, providers and voices are resolved for every pilot using them.
+    invalidate_agent_config_on_commit("*")
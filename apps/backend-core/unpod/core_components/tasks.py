@@ -4,6 +4,9 @@ Migrated from django_cron
 """
 import logging
 
+from asgiref.sync import async_to_sync
+
+from unpod.common.prefect import trigger_deployment
 from unpod.core_components.services import process_event_cron
 
 logger = logging.getLogger(__name__)
@@ -22,3 +25,19 @@ def event_trigger_cron():
     except Exception as e:
         logger.exception(f"Error in event_trigger_cron: {e}")
         raise
+
+
+def precompile_agent_flow(agent_id, system_prompt):
+    """
+    Trigger the flow precompile deployment for a saved pilot prompt
+    Queued from PilotService.trigger_flow_precompile
+    """
+    try:
+        async_to_sync(trigger_deployment)(
+            "Precompile-Agent-Flow",
+            {"agent_id": agent_id, "system_prompt": system_prompt},
+        )
+        logger.info(f"Flow precompile triggered for {agent_id}")
+    except Exception as e:
+        logger.exception(f"Flow precompile trigger error for {agent_id}: {e}")
+        raise
@@ -24,6 +24,46 @@ def remove_from_redis(key):
         pass
 
 
+# Channel the voice services listen on to drop their in-process copy of
+# an agent config (super_services.voice.models.config_cache).
+AGENT_CONFIG_INVALIDATION_CHANNEL = "agent_config:invalidate"
+
+
+def invalidate_agent_config(handle):
+    """
+    Delete the cached agent config and tell running voice workers to reload it.
+    ``"*"`` drops every agent's config, for rows shared by many pilots.
+    """
+    from redis import StrictRedis
+
+    if not handle:
+        return
+    try:
+        REDIS: StrictRedis = StrictRedis.from_url(
+            settings.CACHES["default"]["LOCATION"]
+        )
+        if handle == "*":
+            keys = list(REDIS.scan_iter("model_config:*"))
+            if keys:
+                REDIS.delete(*keys)
+        else:
+            REDIS.delete(f"model_config:{handle}")
+        REDIS.publish(
+            AGENT_CONFIG_INVALIDATION_CHANNEL, json.dumps({"handle": handle})
+        )
+        REDIS.close()
+    except Exception as e:
+        print(f"Agent config invalidation error: {e}")
+
+
+def invalidate_agent_config_on_commit(handle):
+    """Run invalidate_agent_config once the current transaction commits."""
+    from django.db import transaction
+
+    if handle:
+        transaction.on_commit(lambda: invalidate_agent_config(handle))
+
+
 def get_user_data(user_obj, fields=("id", "email", "full_name", "user_token")):
     user_data = {field: getattr(user_obj, field, "") or "" for field in fields}
     if "profile_color" in fields:
@@ -11,15 +11,16 @@ from unpod.common.enum import (
 )
 
 from unpod.common.mixin import CreatedUpdatedMixin
-from unpod.common.query import get_model_unique_code, generateSpaceSlug
+from unpod.common.query import generateSpaceSlug
 from unpod.common.storage_backends import PrivateMediaStorage
+from unpod.common.tokens import random_token, save_with_unique_token, time_ordered_token
 from unpod.roles.models import AccountTags, Roles
 
 
 # fmt: off
 class SpaceOrganization(CreatedUpdatedMixin):
     name = models.CharField(max_length=99, db_index=True)
-    token = models.CharField(max_length=30, blank=True, null=True, db_index=True)
+    token = models.CharField(max_length=30, blank=True, null=True, unique=True)
     domain = models.CharField(max_length=99, blank=True, null=True)
     domain_handle = models.CharField(max_length=99, blank=True, null=True)
     is_private_domain = models.BooleanField(default=False)
@@ -57,9 +58,7 @@ class SpaceOrganization(CreatedUpdatedMixin):
         ]
 
     def save(self, *args, **kwargs) -> None:
-        if not self.token:
-            self.token = get_model_unique_code(self.__class__, 'token', N=20)
-        return super().save(*args, **kwargs)
+        return save_with_unique_token(self, 'token', lambda: time_ordered_token(N=20), super().save, *args, **kwargs)
 
     def __str__(self) -> str:
         return f"{self.name} - {self.token}"
@@ -82,7 +81,7 @@ class Space(CreatedUpdatedMixin):
     space_organization = models.ForeignKey(SpaceOrganization, on_delete=models.SET_NULL,
                                            related_name='%(class)s_space_organization', null=True, blank=True)
     name = models.CharField(max_length=99, db_index=True)
-    token = models.CharField(max_length=30, blank=True, null=True, db_index=True)
+    token = models.CharField(max_length=30, blank=True, null=True, unique=True)
     description = models.TextField(blank=True, null=True)
     privacy_type = models.CharField(choices=PrivacyType.choices(), default=PrivacyType.public.name, max_length=20)
     slug = models.CharField(db_index=True, max_length=199, blank=True, null=True)
@@ -103,11 +102,17 @@ class Space(CreatedUpdatedMixin):
         ]
 
     def save(self, *args, **kwargs) -> None:
-        if not self.token:
-            self.token = get_model_unique_code(self.__class__, 'token', N=24)
-        if not self.slug:
+        derive_slug = not self.slug
+
+        def new_token():
+            self.token = time_ordered_token(N=24)
+            if derive_slug:
+                self.slug = generateSpaceSlug(self)
+            return self.token
+
+        if derive_slug and self.token:
             self.slug = generateSpaceSlug(self)
-        return super().save(*args, **kwargs)
+        return save_with_unique_token(self, 'token', new_token, super().save, *args, **kwargs)
 
     def __str__(self) -> str:
         return f"{self.name} - {self.token}"
@@ -131,7 +136,7 @@ class SpaceInvite(CreatedUpdatedMixin):
                              related_name='%(class)s_role', null=True, blank=True)
     invite_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
                                   related_name='%(class)s_invite_by', null=True, blank=True)
-    invite_token = models.CharField(max_length=40, blank=True, null=True)
+    invite_token = models.CharField(max_length=40, blank=True, null=True, unique=True)
     valid_upto = models.DateTimeField(null=True, blank=True)
     valid_from = models.DateTimeField(null=True, blank=True, auto_now_add=True)
     user_email = models.EmailField(blank=True, null=True)
@@ -143,9 +148,7 @@ class SpaceInvite(CreatedUpdatedMixin):
     expired_dt = models.DateTimeField(blank=True, null=True)
 
     def save(self, *args, **kwargs) -> None:
-        if not self.invite_token:
-            self.invite_token = get_model_unique_code(self.__class__, 'invite_token', N=20)
-        return super().save(*args, **kwargs)
+        return save_with_unique_token(self, 'invite_token', lambda: random_token(N=20), super().save, *args, **kwargs)
 
 
 class SpaceAccessRequest(CreatedUpdatedMixin):
@@ -153,7 +156,7 @@ class SpaceAccessRequest(CreatedUpdatedMixin):
                              null=True, blank=True)
     space = models.ForeignKey(Space, on_delete=models.CASCADE, related_name='%(class)s_space', null=True, blank=True)
     role = models.ForeignKey(Roles, on_delete=models.SET_NULL, related_name='%(class)s_role', null=True, blank=True)
-    request_token = models.CharField(max_length=40, blank=True, null=True, db_index=True)
+    request_token = models.CharField(max_length=40, blank=True, null=True, unique=True)
     request_type = models.CharField(
         max_length=20,
         choices=[('access_request', 'Access Request'), ('change_role', 'Change Role')],
@@ -167,9 +170,7 @@ class SpaceAccessRequest(CreatedUpdatedMixin):
     is_expired = models.BooleanField(default=False)
 
     def save(self, *args, **kwargs) -> None:
-        if not self.request_token:
-            self.request_token = get_model_unique_code(self.__class__, 'request_token', N=16)
-        return super().save(*args, **kwargs)
+        return save_with_unique_token(self, 'request_token', lambda: random_token(N=16), super().save, *args, **kwargs)
 
 
 class OrganizationInvite(CreatedUpdatedMixin):
@@ -179,7 +180,7 @@ class OrganizationInvite(CreatedUpdatedMixin):
                              related_name='%(class)s_role', null=True, blank=True)
     invite_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
                                   related_name='%(class)s_invite_by', null=True, blank=True)
-    invite_token = models.CharField(max_length=40, blank=True, null=True)
+    invite_token = models.CharField(max_length=40, blank=True, null=True, unique=True)
     valid_upto = models.DateTimeField(null=True, blank=True)
     valid_from = models.DateTimeField(null=True, blank=True, auto_now_add=True)
     user_email = models.EmailField(blank=True, null=True)
@@ -191,9 +192,7 @@ class OrganizationInvite(CreatedUpdatedMixin):
     expired_dt = models.DateTimeField(blank=True, null=True)
 
     def save(self, *args, **kwargs) -> None:
-        if not self.invite_token:
-            self.invite_token = get_model_unique_code(self.__class__, 'invite_token', N=20)
-        return super().save(*args, **kwargs)
+        return save_with_unique_token(self, 'invite_token', lambda: random_token(N=20), super().save, *args, **kwargs)
 
 
 class OrganizationAccessRequest(CreatedUpdatedMixin):
@@ -202,7 +201,7 @@ class OrganizationAccessRequest(CreatedUpdatedMixin):
     organization = models.ForeignKey(SpaceOrganization, on_delete=models.CASCADE, related_name='%(class)s_organization',
                                      null=True, blank=True)
     role = models.ForeignKey(Roles, on_delete=models.SET_NULL, related_name='%(class)s_role', null=True, blank=True)
-    request_token = models.CharField(max_length=40, blank=True, null=True, db_index=True)
+    request_token = models.CharField(max_length=40, blank=True, null=True, unique=True)
     request_type = models.CharField(
         max_length=20,
         choices=[('access_request', 'Access Request'), ('change_role', 'Change Role')],
@@ -216,9 +215,7 @@ class OrganizationAccessRequest(CreatedUpdatedMixin):
     is_expired = models.BooleanField(default=False)
 
     def save(self, *args, **kwargs) -> None:
-        if not self.request_token:
-            self.request_token = get_model_unique_code(self.__class__, 'request_token', N=16)
-        return super().save(*args, **kwargs)
+        return save_with_unique_token(self, 'request_token', lambda: random_token(N=16), super().save, *args, **kwargs)
 
 
 class SpaceOrganizationBillingInfo(models.Model):
@@ -22,7 +22,7 @@ from unpod.common.helpers.global_helper import get_product_id
 from unpod.common.helpers.service_helper import send_email
 from unpod.common.mongodb import MongoDBQueryManager
 from unpod.common.pagination import getPagination
-from unpod.common.query import get_model_unique_code
+from unpod.common.tokens import random_token
 from unpod.common.string import generate_color_hex
 from unpod.common.utils import get_app_info
 
@@ -144,7 +144,7 @@ def processInvitation(main_obj, user_emails, user, invite_type='space'):
                 "user_email": email.get('email'),
                 "valid_from": today,
                 "valid_upto": today + timezone.timedelta(days=3),
-                "invite_token": get_model_unique_code(invite_model, 'invite_token', N=20)
+                "invite_token": random_token(N=20)
             }
             success_invite.append(invite_model(**create_data))
             duplicate_email.append(email.get('email'))
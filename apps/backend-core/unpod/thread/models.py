@@ -16,7 +16,7 @@ from unpod.common.enum import (
     PostRepeatType,
 )
 from unpod.common.mixin import CreatedUpdatedMixin, SoftDeleteModelMixin
-from unpod.common.query import get_model_unique_code
+from unpod.common.tokens import random_token, save_with_unique_token
 from unpod.space.models import Space
 from unpod.roles.models import Roles
 
@@ -251,7 +251,7 @@ class ThreadPostAccessRequest(CreatedUpdatedMixin):
         blank=True,
     )
     request_token = models.CharField(
-        max_length=40, blank=True, null=True, db_index=True
+        max_length=40, blank=True, null=True, unique=True
     )
     valid_from = models.DateTimeField(null=True, blank=True, auto_now_add=True)
     request_verified = models.BooleanField(default=False)
@@ -261,11 +261,9 @@ class ThreadPostAccessRequest(CreatedUpdatedMixin):
     is_expired = models.BooleanField(default=False)
 
     def save(self, *args, **kwargs) -> None:
-        if not self.request_token:
-            self.request_token = get_model_unique_code(
-                self.__class__, "request_token", N=16
-            )
-        return super().save(*args, **kwargs)
+        return save_with_unique_token(
+            self, "request_token", lambda: random_token(N=16), super().save, *args, **kwargs
+        )
 
 
 class PostInvite(CreatedUpdatedMixin):
@@ -290,7 +288,7 @@ class PostInvite(CreatedUpdatedMixin):
         null=True,
         blank=True,
     )
-    invite_token = models.CharField(max_length=40, blank=True, null=True)
+    invite_token = models.CharField(max_length=40, blank=True, null=True, unique=True)
     valid_upto = models.DateTimeField(null=True, blank=True)
     valid_from = models.DateTimeField(null=True, blank=True, auto_now_add=True)
     user_email = models.EmailField(blank=True, null=True)
@@ -300,11 +298,9 @@ class PostInvite(CreatedUpdatedMixin):
     joined_dt = models.DateTimeField(blank=True, null=True)
 
     def save(self, *args, **kwargs) -> None:
-        if not self.invite_token:
-            self.invite_token = get_model_unique_code(
-                self.__class__, "invite_token", N=20
-            )
-        return super().save(*args, **kwargs)
+        return save_with_unique_token(
+            self, "invite_token", lambda: random_token(N=20), super().save, *args, **kwargs
+        )
 
 
 class PostReport(CreatedUpdatedMixin):
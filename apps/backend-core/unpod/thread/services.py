@@ -10,7 +10,7 @@ from unpod.common.enum import PostRelation, PostStatus, PrivacyType, FileStorage
 from unpod.common.exception import APIException206
 from unpod.common.file import getFileType
 from unpod.common.mixin import UsableRequest
-from unpod.common.query import get_model_unique_code
+from unpod.common.tokens import random_token
 from unpod.common.storage_backends import imagekitBackend, muxBackend
 from unpod.common.sonyflake import app_sonyflake
 from unpod.common.uuid import generate_uuid
@@ -410,9 +410,7 @@ def createThreadPermission(post, user_list, request, create_owner=True):
                             user_email=user.get("email"),
                             valid_from=today,
                             valid_upto=today + timezone.timedelta(days=3),
-                            invite_token=get_model_unique_code(
-                                PostInvite, "invite_token", N=20
-                            ),
+                            invite_token=random_token(N=20),
                         )
                     )
     if len(role_list):
@@ -6,6 +6,7 @@ from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
 from super.core.logging.logging import print_log
+from super_services.db.services.models.contact_profile import ContactProfileModel
 from super_services.db.services.models.task import TaskModel
 # from super_services.db.services.schemas.task import TaskStatusEnum
 from super_services.libs.core.jsondecoder import convertFromMongo
@@ -37,6 +38,89 @@ def get_token_from_space_id(space_id: str) -> Optional[str]:
         return None
 
 
+# Fields each path reads, so tasks are never fetched whole.
+PROFILE_TASK_PROJECTION = {
+    "_id": 0,
+    "task_id": 1,
+    "status": 1,
+    "execution_type": 1,
+    "profile_contribution": 1,
+    "output.transcript": 1,
+    "output.duration": 1,
+    "output.start_time": 1,
+    "output.end_time": 1,
+    "output.data.startedAt": 1,
+    "output.data.endedAt": 1,
+    "output.post_call_data.profile_summary": 1,
+    "updated_at": 1,
+    "created_at": 1,
+    "modified": 1,
+    "created": 1,
+}
+
+PROFILE_HISTORY_PROJECTION = {
+    "_id": 0,
+    "execution_type": 1,
+    "status": 1,
+    "output.duration": 1,
+    "output.start_time": 1,
+    "output.end_time": 1,
+    "output.call_summary": 1,
+    "output.data.startedAt": 1,
+    "output.data.endedAt": 1,
+    "output.data.summary": 1,
+    "output.post_call_data.classification.summary": 1,
+    "output.post_call_data.summary": 1,
+    "updated_at": 1,
+    "created_at": 1,
+    "modified": 1,
+    "created": 1,
+}
+
+# Latest call tasks read to build the recent-conversations history.
+PROFILE_HISTORY_WINDOW = 20
+
+
+def _parse_datetime(value) -> datetime:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return value
+
+
+def _utc_isoformat(dt: datetime) -> str:
+    """Naive timestamps are taken as UTC, so all values compare as strings."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+def _contribution_inc(contribution: Optional[Dict], sign: int = 1) -> Dict:
+    """Rollup counters one task contribution adds (or removes, sign=-1)."""
+    if not contribution:
+        return {}
+    inc = {
+        "total_calls": sign * contribution.get("calls", 0),
+        "connected_calls": sign * contribution.get("connected", 0),
+        "total_duration": sign * contribution.get("duration", 0),
+    }
+    if contribution.get("hour") is not None:
+        inc[f"call_hours.{contribution['hour']}"] = sign
+    return inc
+
+
+def _contribution_delta(previous: Optional[Dict], current: Dict) -> Dict:
+    delta = _contribution_inc(current)
+    for field, value in _contribution_inc(previous, sign=-1).items():
+        delta[field] = delta.get(field, 0) + value
+    return {field: value for field, value in delta.items() if value}
+
+
+def _profile_summary_at(task: Dict) -> str:
+    return str(
+        task.get('updated_at', task.get('modified', task.get('created_at', task.get('created', ''))))
+    )
+
+
 class ProfileUpdateService:
     def __init__(self, document_id: str, token: str, collection_ref: str = None):
         self.document_id = document_id
@@ -44,11 +128,11 @@ class ProfileUpdateService:
         self.collection_ref = collection_ref
         self.api_url = f"{STORE_SERVICE_URL}/api/v1/store/collection-doc-data/{token}/{document_id}"
 
-    def fetch_tasks_by_document(self) -> List:
+    def fetch_tasks_by_document(self, projection: Dict = None) -> List:
         try:
             query = {"ref_id": self.document_id}
             # Use _get_collection().find() for direct pymongo query (avoids OID validation issues)
-            tasks_cursor = TaskModel._get_collection().find(query, sort=[("_id", -1)])
+            tasks_cursor = TaskModel._get_collection().find(query, projection, sort=[("_id", -1)])
             tasks = [convertFromMongo(task) for task in tasks_cursor]
             print_log(f"Found {len(tasks)} tasks for document {self.document_id}", "profile_update_tasks_found")
             return tasks
@@ -56,118 +140,258 @@ class ProfileUpdateService:
             print_log(f"Error fetching tasks for document {self.document_id}: {str(e)}", "profile_update_fetch_error")
             return []
 
-    def calculate_profile_analytics(self, tasks: List) -> Dict:
-        total_calls = len(tasks)
-        connected_calls = 0
-        total_duration = 0
-        call_hours = []
-        last_connected = None
+    def fetch_recent_call_tasks(self, limit: int = PROFILE_HISTORY_WINDOW) -> List:
+        """Latest call tasks of the document, with only the history fields."""
+        try:
+            tasks_cursor = TaskModel._get_collection().find(
+                {"ref_id": self.document_id, "execution_type": "call"},
+                PROFILE_HISTORY_PROJECTION,
+                sort=[("_id", -1)],
+                limit=limit,
+            )
+            return [convertFromMongo(task) for task in tasks_cursor]
+        except Exception as e:
+            print_log(f"Error fetching recent tasks for document {self.document_id}: {str(e)}", "profile_update_fetch_error")
+            return []
 
-        for task in tasks:
-            # Tasks are now dicts (from convertFromMongo)
-            output = task.get("output", {}) if isinstance(task, dict) else {}
-            status = task.get("status") if isinstance(task, dict) else None
+    # ── Contact rollup ──────────────────────────────────────────────────
 
-            # Check if call was connected (completed with transcript)
-            transcript = output.get("transcript", [])
-            is_connected = (
-                status == "completed" and
-                transcript and
-                len(transcript) > 0
-            )
+    def get_rollup(self) -> Optional[Dict]:
+        return ContactProfileModel._get_collection().find_one(
+            {"ref_id": self.document_id}, {"_id": 0}
+        )
 
-            if is_connected:
-                connected_calls += 1
+    def count_tasks(self) -> int:
+        """All tasks of the document, whatever their status (ref_id index)."""
+        return TaskModel._get_collection().count_documents({"ref_id": self.document_id})
 
-                output_data = output.get("data", {})
+    def rebuild_rollup(self) -> Dict:
+        """
+        Recompute the contact rollup from all of its tasks (repair path).
 
-                # Get duration - check multiple sources
-                duration_seconds = 0
+        Also records each task's contribution, so later apply_task calls
+        only add what changed.
+        """
+        raw_tasks = list(
+            TaskModel._get_collection().find(
+                {"ref_id": self.document_id}, PROFILE_TASK_PROJECTION, sort=[("_id", -1)]
+            )
+        )
+        tasks = [convertFromMongo(dict(task)) for task in raw_tasks]
+        rollup = self.rollup_from_tasks(tasks)
 
-                # Option 1: Direct duration field
-                if output.get("duration"):
-                    try:
-                        duration_seconds = float(output.get("duration"))
-                    except (ValueError, TypeError):
-                        pass
+        profile_summary = None
+        profile_summary_at = None
+        call_tasks = [t for t in tasks if t.get("execution_type") == "call"]
+        for task in sorted(call_tasks, key=_profile_summary_at, reverse=True):
+            summary = task.get("output", {}).get("post_call_data", {}).get("profile_summary")
+            if summary:
+                profile_summary, profile_summary_at = summary, _profile_summary_at(task)
+                break
+
+        now = datetime.utcnow()
+        rollup.update(
+            {
+                "ref_id": self.document_id,
+                "profile_summary": profile_summary,
+                "profile_summary_at": profile_summary_at,
+                "rebuilt_at": now.isoformat(),
+                "created": now,
+                "modified": now,
+            }
+        )
+        ContactProfileModel._get_collection().replace_one(
+            {"ref_id": self.document_id}, rollup, upsert=True
+        )
 
-                # Option 2: Calculate from timestamps if duration not found
-                if duration_seconds == 0:
-                    started_at = (
-                        output_data.get("startedAt") or
-                        output.get("start_time")
-                    )
-                    ended_at = (
-                        output_data.get("endedAt") or
-                        output.get("end_time")
-                    )
-
-                    if started_at and ended_at:
-                        try:
-                            if isinstance(started_at, str):
-                                start_dt = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
-                            else:
-                                start_dt = started_at
-
-                            if isinstance(ended_at, str):
-                                end_dt = datetime.fromisoformat(ended_at.replace('Z', '+00:00'))
-                            else:
-                                end_dt = ended_at
-
-                            duration_seconds = (end_dt - start_dt).total_seconds()
-                        except (ValueError, TypeError) as e:
-                            print_log(f"Error calculating duration: {e}", "profile_update_duration_error")
-
-                if duration_seconds > 0:
-                    total_duration += duration_seconds
-
-                # Track call time for preferred_time calculation
-                start_time = (
-                    output_data.get("startedAt") or
-                    output.get("start_time") or
-                    task.get("updated_at") or
-                    task.get("created_at") or
-                    task.get("modified") or
-                    task.get("created")
+        collection = TaskModel._get_collection()
+        for task in tasks:
+            contribution = self.task_profile_contribution(task)
+            if task.get("task_id") and task.get("profile_contribution") != contribution:
+                collection.update_one(
+                    {"task_id": task["task_id"]},
+                    {"$set": {"profile_contribution": contribution}},
                 )
-                if start_time:
-                    try:
-                        if isinstance(start_time, str):
-                            dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                        else:
-                            dt = start_time
-                        call_hours.append(dt.hour)
-                    except (ValueError, TypeError):
-                        pass
 
-                # Track last connected time
-                end_time = (
-                    output_data.get("endedAt") or
-                    output.get("end_time") or
-                    task.get("modified") or
-                    task.get("created")
+        print_log(f"Rebuilt profile rollup for document {self.document_id} from {len(tasks)} tasks", "profile_update_rollup_rebuilt")
+        rollup.pop("_id", None)
+        return rollup
+
+    def apply_task(self, task_id: str) -> bool:
+        """
+        Fold one finished task into the contact rollup with atomic deltas.
+
+        The task stores what it last contributed; a compare-and-set on that
+        field makes repeated or concurrent updates for the same task add
+        only the difference, so this costs the same however many calls the
+        contact has had.
+        """
+        tasks = TaskModel._get_collection()
+        for _ in range(3):
+            raw_task = tasks.find_one({"task_id": task_id}, PROFILE_TASK_PROJECTION)
+            if not raw_task:
+                return False
+            previous = raw_task.get("profile_contribution")
+            task = convertFromMongo(dict(raw_task))
+            contribution = self.task_profile_contribution(task)
+
+            if previous != contribution:
+                claimed = tasks.update_one(
+                    {"task_id": task_id, "profile_contribution": previous},
+                    {"$set": {"profile_contribution": contribution}},
                 )
-                if end_time:
-                    try:
-                        if isinstance(end_time, str):
-                            end_dt = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
-                        else:
-                            end_dt = end_time
+                if not claimed.matched_count:
+                    continue  # Updated concurrently; re-read and diff again
+
+            update: Dict = {"$set": {"modified": datetime.utcnow()}}
+            delta = _contribution_delta(previous, contribution)
+            if delta:
+                update["$inc"] = delta
+            if contribution.get("ended_at"):
+                update["$max"] = {"last_connected": contribution["ended_at"]}
+            rollups = ContactProfileModel._get_collection()
+            rollups.update_one({"ref_id": self.document_id}, update, upsert=True)
+
+            profile_summary = (
+                task.get("output", {}).get("post_call_data", {}).get("profile_summary")
+            )
+            if profile_summary and task.get("execution_type") == "call":
+                summary_at = _profile_summary_at(task)
+                rollups.update_one(
+                    {
+                        "ref_id": self.document_id,
+                        "$or": [
+                            {"profile_summary_at": None},
+                            {"profile_summary_at": {"$lte": summary_at}},
+                        ],
+                    },
+                    {"$set": {"profile_summary": profile_summary, "profile_summary_at": summary_at}},
+                )
+            return True
 
-                        if last_connected is None or end_dt > last_connected:
-                            last_connected = end_dt
-                    except (ValueError, TypeError):
-                        pass
+        print_log(f"Gave up applying task {task_id} to profile rollup of {self.document_id}", "profile_update_rollup_conflict")
+        return False
+
+    def task_profile_contribution(self, task: Dict) -> Dict:
+        """
+        What one task adds to its contact's rollup: a call, and when it
+        connected (completed with a transcript) its duration, hour of day
+        and end time.
+        """
+        # Tasks are dicts (from convertFromMongo)
+        output = task.get("output", {}) if isinstance(task, dict) else {}
+        status = task.get("status") if isinstance(task, dict) else None
+        contribution = {"calls": 1, "connected": 0, "duration": 0, "hour": None, "ended_at": None}
+
+        # Check if call was connected (completed with transcript)
+        transcript = output.get("transcript", [])
+        is_connected = (
+            status == "completed" and
+            transcript and
+            len(transcript) > 0
+        )
+        if not is_connected:
+            return contribution
+
+        contribution["connected"] = 1
+        output_data = output.get("data", {})
+
+        # Get duration - check multiple sources
+        duration_seconds = 0
+
+        # Option 1: Direct duration field
+        if output.get("duration"):
+            try:
+                duration_seconds = float(output.get("duration"))
+            except (ValueError, TypeError):
+                pass
+
+        # Option 2: Calculate from timestamps if duration not found
+        if duration_seconds == 0:
+            started_at = (
+                output_data.get("startedAt") or
+                output.get("start_time")
+            )
+            ended_at = (
+                output_data.get("endedAt") or
+                output.get("end_time")
+            )
+
+            if started_at and ended_at:
+                try:
+                    start_dt = _parse_datetime(started_at)
+                    end_dt = _parse_datetime(ended_at)
+                    duration_seconds = (end_dt - start_dt).total_seconds()
+                except (ValueError, TypeError) as e:
+                    print_log(f"Error calculating duration: {e}", "profile_update_duration_error")
+
+        if duration_seconds > 0:
+            contribution["duration"] = duration_seconds
+
+        # Track call time for preferred_time calculation
+        start_time = (
+            output_data.get("startedAt") or
+            output.get("start_time") or
+            task.get("updated_at") or
+            task.get("created_at") or
+            task.get("modified") or
+            task.get("created")
+        )
+        if start_time:
+            try:
+                contribution["hour"] = _parse_datetime(start_time).hour
+            except (ValueError, TypeError):
+                pass
+
+        # Track last connected time
+        end_time = (
+            output_data.get("endedAt") or
+            output.get("end_time") or
+            task.get("modified") or
+            task.get("created")
+        )
+        if end_time:
+            try:
+                contribution["ended_at"] = _utc_isoformat(_parse_datetime(end_time))
+            except (ValueError, TypeError):
+                pass
+
+        return contribution
+
+    def rollup_from_tasks(self, tasks: List) -> Dict:
+        """Fold every task's contribution into a fresh rollup."""
+        rollup = {
+            "total_calls": 0,
+            "connected_calls": 0,
+            "total_duration": 0,
+            "call_hours": {},
+            "last_connected": None,
+        }
+        for task in tasks:
+            contribution = self.task_profile_contribution(task)
+            for field, value in _contribution_inc(contribution).items():
+                if field.startswith("call_hours."):
+                    hour = field.split(".", 1)[1]
+                    rollup["call_hours"][hour] = rollup["call_hours"].get(hour, 0) + value
+                else:
+                    rollup[field] += value
+            ended_at = contribution.get("ended_at")
+            if ended_at and (rollup["last_connected"] is None or ended_at > rollup["last_connected"]):
+                rollup["last_connected"] = ended_at
+        return rollup
+
+    def analytics_from_rollup(self, rollup: Dict) -> Dict:
+        total_calls = rollup.get("total_calls", 0)
+        connected_calls = rollup.get("connected_calls", 0)
+        total_duration = rollup.get("total_duration", 0)
 
         # Calculate averages
         avg_call_duration = round(total_duration / connected_calls, 2) if connected_calls > 0 else 0
         response_rate = round((connected_calls / total_calls) * 100, 2) if total_calls > 0 else 0
 
         # Calculate preferred time (most common hour range)
-        preferred_time = self._calculate_preferred_time(call_hours)
-
-        # Format last_connected
-        last_connected_str = last_connected.isoformat() if last_connected else None
+        hour_counts = {int(hour): count for hour, count in (rollup.get("call_hours") or {}).items()}
+        preferred_time = self._preferred_time_from_counts(hour_counts)
 
         return {
             "avg_call_duration": f"{avg_call_duration}s",
@@ -175,12 +399,21 @@ class ProfileUpdateService:
             "preferred_time": preferred_time,
             "total_calls": total_calls,
             "connected_calls": connected_calls,
-            "last_connected": last_connected_str,
+            "last_connected": rollup.get("last_connected"),
             "sentiment": None  # Will be populated later in build_overview
         }
 
+    def calculate_profile_analytics(self, tasks: List) -> Dict:
+        return self.analytics_from_rollup(self.rollup_from_tasks(tasks))
+
     def _calculate_preferred_time(self, call_hours: List[int]) -> str:
-        if not call_hours:
+        hour_counts: Dict[int, int] = {}
+        for hour in call_hours:
+            hour_counts[hour] = hour_counts.get(hour, 0) + 1
+        return self._preferred_time_from_counts(hour_counts)
+
+    def _preferred_time_from_counts(self, hour_counts: Dict[int, int]) -> str:
+        if not hour_counts:
             return "None"
 
         # Define time slots
@@ -195,10 +428,10 @@ class ProfileUpdateService:
 
         # Count calls in each slot
         slot_counts = {slot: 0 for slot in time_slots}
-        for hour in call_hours:
+        for hour, count in hour_counts.items():
             for slot_name, hour_range in time_slots.items():
                 if hour in hour_range:
-                    slot_counts[slot_name] += 1
+                    slot_counts[slot_name] += count
                     break
 
         # Find most common slot
@@ -516,21 +749,48 @@ class ProfileUpdateService:
 
         return None
 
-    def build_overview(self, tasks: List = None) -> Dict:
-        if tasks is None:
-            tasks = self.fetch_tasks_by_document()
+    def build_overview(self, tasks: List = None, task_id: str = None) -> Dict:
+        """
+        Build the profile overview.
+
+        With ``tasks`` everything is computed from them. Otherwise the
+        analytics come from the stored contact rollup (after folding in
+        ``task_id``, rebuilt when missing) and only the latest call tasks
+        are read for the history.
+
+        Only completed calls reach apply_task, so ``total_calls`` is counted
+        from the tasks instead of taken from the rollup; failed and pending
+        tasks still lower the response rate, as in rebuild_rollup.
+
+        determine_profile_status reads only the analytics, and the sentiment
+        shown comes from the latest profile summary. analyze_sentiment and
+        the history see the PROFILE_HISTORY_WINDOW latest call tasks.
+        """
+        if tasks is not None:
+            profile_analytics = self.calculate_profile_analytics(tasks)
+            recent_tasks = tasks
+            profile_summary = self.get_latest_profile_summary(tasks)
+        else:
+            rollup = self.get_rollup()
+            if rollup is None:
+                rollup = self.rebuild_rollup()
+            elif task_id:
+                self.apply_task(task_id)
+                rollup = self.get_rollup() or rollup
+            rollup = {**rollup, "total_calls": self.count_tasks()}
+            profile_analytics = self.analytics_from_rollup(rollup)
+            recent_tasks = self.fetch_recent_call_tasks()
+            profile_summary = rollup.get("profile_summary")
 
         # Calculate all components
-        profile_analytics = self.calculate_profile_analytics(tasks)
-        profile_status = self.determine_profile_status(tasks, profile_analytics)
-        sentiment = self.analyze_sentiment(tasks)
-        previous_task = self.generate_previous_task(tasks, limit=5)
-        profile_summary = self.get_latest_profile_summary(tasks)
+        profile_status = self.determine_profile_status(recent_tasks, profile_analytics)
+        sentiment = self.analyze_sentiment(recent_tasks)
+        previous_task = self.generate_previous_task(recent_tasks, limit=5)
 
         # Add sentiment to analytics after last_connected (same as profile_summary.sentiment)
         profile_analytics["sentiment"] = profile_summary.get("sentiment") if profile_summary else None
 
-        summary = self.generate_summary(tasks, profile_analytics, profile_status, sentiment, profile_summary, previous_task)
+        summary = self.generate_summary(recent_tasks, profile_analytics, profile_status, sentiment, profile_summary, previous_task)
 
         overview = {
             "summary": summary,
@@ -580,10 +840,10 @@ class ProfileUpdateService:
             print_log(f"Error updating document {self.document_id} in collection {self.collection_ref}: {str(e)}", "profile_update_mongo_error")
             return False
 
-    async def update_document(self, overview: Dict = None) -> Dict:
+    async def update_document(self, overview: Dict = None, task_id: str = None) -> Dict:
         try:
             if overview is None:
-                overview = self.build_overview()
+                overview = self.build_overview(task_id=task_id)
 
             # # Fetch current document
             # response = requests.get(self.api_url)
@@ -623,7 +883,9 @@ class ProfileUpdateService:
 async def update_profile_after_call(document_id: str = None, token: str = None, collection_ref: str = None, task_id: str = None) -> Dict:
     if task_id:
         try:
-            task_cursor = TaskModel._get_collection().find_one({"task_id": task_id})
+            task_cursor = TaskModel._get_collection().find_one(
+                {"task_id": task_id}, {"ref_id": 1, "collection_ref": 1, "space_id": 1}
+            )
             if task_cursor:
                 task = convertFromMongo(task_cursor)
                 # Get document_id from ref_id
@@ -652,7 +914,7 @@ async def update_profile_after_call(document_id: str = None, token: str = None,
         return {"status": "failed", "error": "Missing document_id or token"}
 
     service = ProfileUpdateService(document_id, token, collection_ref)
-    return await service.update_document()
+    return await service.update_document(task_id=task_id)
 
 
 
@@ -1,5 +1,6 @@
 """Three-layer orchestration system."""
 
+from super.core.orchestrator.three_layer.action_store import ActionStore
 from super.core.orchestrator.three_layer.classifier import (
     ClassificationResult,
     IntentType,
@@ -42,6 +43,7 @@ __all__ = [
     "IntentType",
     "classify_intent",
     # Persistence
+    "ActionStore",
     "PersistenceAdapter",
     "SharedContext",
 ]
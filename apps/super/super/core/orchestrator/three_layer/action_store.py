@@ -0,0 +1,153 @@
+"""Indexed in-memory action store for three-layer orchestration."""
+
+import time
+from itertools import count
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from super.core.orchestrator.three_layer.models import ActionState, ActionStatus
+
+TERMINAL_STATUSES = frozenset({ActionStatus.DONE, ActionStatus.CANCELLED})
+
+
+class ActionStore:
+    """
+    Action states indexed by thread and by (thread, status).
+
+    Per-thread lookups cost O(actions in that thread with that status)
+    instead of O(all actions). Results are returned in creation order,
+    the same order a scan of a single dict would produce.
+    Actions that reach a terminal status are timestamped and can be
+    evicted once ``terminal_ttl`` seconds have passed.
+    """
+
+    def __init__(self, terminal_ttl: Optional[float] = None) -> None:
+        self.terminal_ttl = terminal_ttl
+        self._reset()
+
+    def _reset(self) -> None:
+        self._actions: Dict[str, ActionState] = {}
+        self._seq: Dict[str, int] = {}
+        self._by_thread: Dict[str, Dict[str, None]] = {}
+        self._by_status: Dict[Tuple[str, ActionStatus], Dict[str, None]] = {}
+        self._indexed_status: Dict[str, ActionStatus] = {}
+        self._finished_at: Dict[str, float] = {}
+        self._counter = count()
+
+    def __len__(self) -> int:
+        return len(self._actions)
+
+    def __contains__(self, action_id: str) -> bool:
+        return action_id in self._actions
+
+    @property
+    def actions(self) -> Dict[str, ActionState]:
+        """All in-memory actions by ID (read-only view by convention)."""
+        return self._actions
+
+    def get(self, action_id: str) -> Optional[ActionState]:
+        return self._actions.get(action_id)
+
+    def add(self, action: ActionState) -> None:
+        action_id = action["action_id"]
+        if action_id in self._actions:
+            self.remove(action_id)
+        self._actions[action_id] = action
+        self._seq[action_id] = next(self._counter)
+        self._by_thread.setdefault(action["thread_id"], {})[action_id] = None
+        self._index_status(action_id, action["status"])
+
+    def remove(self, action_id: str) -> Optional[ActionState]:
+        action = self._actions.pop(action_id, None)
+        if action is None:
+            return None
+        self._seq.pop(action_id, None)
+        self._finished_at.pop(action_id, None)
+        thread_actions = self._by_thread.get(action["thread_id"])
+        if thread_actions is not None:
+            thread_actions.pop(action_id, None)
+            if not thread_actions:
+                del self._by_thread[action["thread_id"]]
+        self._unindex_status(action_id, action["thread_id"])
+        return action
+
+    def replace_all(self, actions: Iterable[ActionState]) -> None:
+        """Drop every action and rebuild the indexes from ``actions``."""
+        self._reset()
+        for action in actions:
+            self.add(action)
+
+    def replace_thread(self, thread_id: str, actions: Iterable[ActionState]) -> None:
+        """Replace the actions of one thread, leaving other threads untouched."""
+        for action_id in list(self._by_thread.get(thread_id, ())):
+            self.remove(action_id)
+        for action in actions:
+            self.add(action)
+
+    def set_status(self, action: ActionState, status: ActionStatus) -> None:
+        """Set ``action['status']`` and move it to the matching status index."""
+        action["status"] = status
+        action_id = action["action_id"]
+        if action_id in self._actions:
+            self._unindex_status(action_id, action["thread_id"])
+            self._index_status(action_id, status)
+
+    def thread_actions(self, thread_id: str) -> List[ActionState]:
+        return [self._actions[a] for a in self._by_thread.get(thread_id, ())]
+
+    def by_status(self, thread_id: str, *statuses: ActionStatus) -> List[ActionState]:
+        """Actions of a thread in any of ``statuses``, in creation order."""
+        ids = sorted(
+            (
+                action_id
+                for status in statuses
+                for action_id in self._by_status.get((thread_id, status), ())
+            ),
+            key=self._seq.__getitem__,
+        )
+        return [self._actions[action_id] for action_id in ids]
+
+    def first_with_status(
+        self, thread_id: str, *statuses: ActionStatus
+    ) -> Optional[ActionState]:
+        """Earliest-created action of a thread in any of ``statuses``."""
+        ids = [
+            action_id
+            for status in statuses
+            for action_id in self._by_status.get((thread_id, status), ())
+        ]
+        if not ids:
+            return None
+        return self._actions[min(ids, key=self._seq.__getitem__)]
+
+    def expired_terminal(self, now: Optional[float] = None) -> List[str]:
+        """IDs of terminal actions older than ``terminal_ttl``, oldest first."""
+        if self.terminal_ttl is None:
+            return []
+        cutoff = (time.monotonic() if now is None else now) - self.terminal_ttl
+        expired = []
+        # Insertion order of _finished_at is finish order.
+        for action_id, finished_at in self._finished_at.items():
+            if finished_at > cutoff:
+                break
+            expired.append(action_id)
+        return expired
+
+    def _index_status(self, action_id: str, status: ActionStatus) -> None:
+        thread_id = self._actions[action_id]["thread_id"]
+        self._by_status.setdefault((thread_id, status), {})[action_id] = None
+        self._indexed_status[action_id] = status
+        # Re-insert so _finished_at stays ordered by finish time.
+        self._finished_at.pop(action_id, None)
+        if status in TERMINAL_STATUSES:
+            self._finished_at[action_id] = time.monotonic()
+
+    def _unindex_status(self, action_id: str, thread_id: str) -> None:
+        status = self._indexed_status.pop(action_id, None)
+        if status is None:
+            return
+        key = (thread_id, status)
+        ids = self._by_status.get(key)
+        if ids is not None:
+            ids.pop(action_id, None)
+            if not ids:
+                del self._by_status[key]
@@ -1,9 +1,12 @@
 """Event system for three-layer orchestration."""
 
 import asyncio
+import logging
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Awaitable, Callable, Dict, List, TypedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, TypedDict
+
+logger = logging.getLogger(__name__)
 
 
 class EventType(Enum):
@@ -49,10 +52,18 @@ EventHandler = Callable[[Event], Awaitable[None]]
 
 
 class EventEmitter:
-    """Async event emitter for the three-layer system."""
+    """Async event emitter for the three-layer system.
+
+    Handlers run concurrently and are isolated from each other: a handler
+    that raises is logged and does not affect the others or the emitter.
+    With ``handler_timeout`` set, ``emit`` returns once that many seconds
+    have passed and slower handlers keep running in the background.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, handler_timeout: Optional[float] = None) -> None:
         self._handlers: Dict[EventType, List[EventHandler]] = {}
+        self._handler_timeout = handler_timeout
+        self._background: Set[asyncio.Task] = set()
 
     def subscribe(self, event_type: EventType, handler: EventHandler) -> None:
         """Subscribe a handler to an event type."""
@@ -70,4 +81,28 @@ class EventEmitter:
     async def emit(self, event: Event) -> None:
         """Emit an event to all subscribers."""
         handlers = self._handlers.get(event["type"], [])
-        await asyncio.gather(*[h(event) for h in handlers])
+        if not handlers:
+            return
+
+        tasks = [asyncio.ensure_future(self._run_handler(h, event)) for h in handlers]
+        if self._handler_timeout is None:
+            await asyncio.gather(*tasks)
+            return
+
+        _, pending = await asyncio.wait(tasks, timeout=self._handler_timeout)
+        for task in pending:
+            logger.warning(
+                f"Event handler for {event['type'].value} exceeded "
+                f"{self._handler_timeout}s, continuing in background"
+            )
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def _run_handler(self, handler: EventHandler, event: Event) -> None:
+        try:
+            await handler(event)
+        except Exception:
+            logger.exception(
+                f"Event handler {getattr(handler, '__qualname__', handler)} "
+                f"failed for {event['type'].value} ({event['action_id']})"
+            )
@@ -1,9 +1,14 @@
 """Shared context (observation layer) for three-layer orchestration."""
 
+import asyncio
 import uuid
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
 
+from super.core.orchestrator.three_layer.action_store import (
+    TERMINAL_STATUSES,
+    ActionStore,
+)
 from super.core.orchestrator.three_layer.events import (
     Event,
     EventEmitter,
@@ -24,6 +29,8 @@ class PersistenceAdapter(Protocol):
     """Protocol for persistence adapters.
 
     Implementations handle storage of ActionState to external systems (e.g., databases).
+    Adapters may also define ``async save_actions(actions)`` to upsert a batch
+    in one round trip; SharedContext uses it for batched writes when present.
     """
 
     async def save_action(self, action: ActionState) -> None:
@@ -39,37 +46,104 @@ class PersistenceAdapter(Protocol):
         ...
 
 
+# Finished (done/cancelled) actions stay in memory this long before eviction.
+DEFAULT_TERMINAL_TTL_SECONDS = 300.0
+
+
 class SharedContext:
     """
     Shared context layer for three-layer orchestration.
 
     Holds action state, emits events on changes, no logic.
     CA and PA both read/write through this interface.
+
+    Actions are indexed per thread and status. Finished actions are archived
+    to the persistence adapter and evicted from memory after
+    ``terminal_ttl`` seconds (``None`` keeps them forever). With
+    ``persist_batch_size`` > 1, writes are coalesced per action and
+    flushed in batches; terminal states always flush immediately.
     """
 
     def __init__(
         self,
         persistence: Optional[PersistenceAdapter] = None,
+        terminal_ttl: Optional[float] = DEFAULT_TERMINAL_TTL_SECONDS,
+        persist_batch_size: int = 1,
+        event_handler_timeout: Optional[float] = None,
     ) -> None:
-        self._actions: Dict[str, ActionState] = {}
-        self._emitter = EventEmitter()
+        self._store = ActionStore(terminal_ttl=terminal_ttl)
+        self._emitter = EventEmitter(handler_timeout=event_handler_timeout)
         self._persistence = persistence
+        self._persist_batch_size = max(1, persist_batch_size)
+        self._pending_writes: Dict[str, ActionState] = {}
+
+    @property
+    def _actions(self) -> Dict[str, ActionState]:
+        return self._store.actions
+
+    @_actions.setter
+    def _actions(self, actions: Dict[str, ActionState]) -> None:
+        self._store.replace_all(actions.values())
 
     async def _persist(self, action: ActionState) -> None:
-        """Save action to persistence if configured."""
-        if self._persistence is not None:
-            await self._persistence.save_action(action)
+        """Save action to persistence if configured (batched when enabled)."""
+        if self._persistence is None:
+            return
+
+        self._pending_writes[action["action_id"]] = action
+        if (
+            len(self._pending_writes) >= self._persist_batch_size
+            or action["status"] in TERMINAL_STATUSES
+        ):
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write all pending action updates to persistence."""
+        if self._persistence is None or not self._pending_writes:
+            return
+
+        batch = list(self._pending_writes.values())
+        self._pending_writes = {}
+        try:
+            save_actions = getattr(self._persistence, "save_actions", None)
+            if save_actions is not None:
+                await save_actions(batch)
+            else:
+                await asyncio.gather(*[self._persistence.save_action(a) for a in batch])
+        except Exception:
+            # Keep unsaved updates queued unless a newer one replaced them.
+            for action in batch:
+                self._pending_writes.setdefault(action["action_id"], action)
+            raise
+
+    async def evict_finished(self) -> int:
+        """Archive and drop finished actions older than the terminal TTL.
+
+        Returns:
+            Number of actions evicted from memory
+        """
+        expired = self._store.expired_terminal()
+        if not expired:
+            return 0
+
+        if any(action_id in self._pending_writes for action_id in expired):
+            await self.flush()
+        for action_id in expired:
+            self._store.remove(action_id)
+        return len(expired)
 
     async def load_thread_state(self, thread_id: str) -> None:
-        """Load actions from persistence and replace in-memory cache.
+        """Load a thread's actions from persistence and replace them in memory.
 
         Used for session restart scenarios where we need to restore state.
+        Other threads' in-memory actions are left untouched.
         """
         if self._persistence is None:
             return
 
+        await self.flush()
         actions = await self._persistence.load_thread_actions(thread_id)
-        self._actions = {action["action_id"]: action for action in actions}
+        self._store.replace_thread(thread_id, actions)
 
     def subscribe(self, event_type: EventType, handler: EventHandler) -> None:
         """Subscribe to events."""
@@ -97,30 +171,24 @@ class SharedContext:
             input_text=input_text,
             supersedes=supersedes,
         )
-        self._actions[action_id] = action
+        self._store.add(action)
         await self._persist(action)
+        await self.evict_finished()
         return action
 
     def get_action(self, action_id: str) -> Optional[ActionState]:
         """Get an action by ID."""
-        return self._actions.get(action_id)
+        return self._store.get(action_id)
 
     def get_pending_actions(self, thread_id: str) -> List[ActionState]:
         """Get all pending actions for a thread."""
-        return [
-            a for a in self._actions.values()
-            if a["thread_id"] == thread_id and a["status"] == ActionStatus.PENDING
-        ]
+        return self._store.by_status(thread_id, ActionStatus.PENDING)
 
     def get_active_action(self, thread_id: str) -> Optional[ActionState]:
         """Get the currently processing action for a thread."""
-        for action in self._actions.values():
-            if (
-                action["thread_id"] == thread_id
-                and action["status"] in (ActionStatus.PROCESSING, ActionStatus.WAITING)
-            ):
-                return action
-        return None
+        return self._store.first_with_status(
+            thread_id, ActionStatus.PROCESSING, ActionStatus.WAITING
+        )
 
     async def update_status(
         self,
@@ -128,12 +196,12 @@ class SharedContext:
         new_status: ActionStatus,
     ) -> None:
         """Update action status and emit event."""
-        action = self._actions.get(action_id)
+        action = self._store.get(action_id)
         if not action:
             return
 
         old_status = action["status"]
-        action["status"] = new_status
+        self._store.set_status(action, new_status)
         action["updated_at"] = datetime.now(timezone.utc).isoformat()
 
         await self._persist(action)
@@ -151,7 +219,7 @@ class SharedContext:
         mode: ExecutionMode,
     ) -> None:
         """Set execution mode for an action."""
-        action = self._actions.get(action_id)
+        action = self._store.get(action_id)
         if action:
             action["mode"] = mode
             action["updated_at"] = datetime.now(timezone.utc).isoformat()
@@ -162,7 +230,7 @@ class SharedContext:
         engagement: str,
     ) -> None:
         """Set engagement message for ASYNC actions."""
-        action = self._actions.get(action_id)
+        action = self._store.get(action_id)
         if action:
             action["engagement"] = engagement
             action["updated_at"] = datetime.now(timezone.utc).isoformat()
@@ -174,7 +242,7 @@ class SharedContext:
         prompt: Optional[str] = None,
     ) -> None:
         """Set action to waiting state."""
-        action = self._actions.get(action_id)
+        action = self._store.get(action_id)
         if not action:
             return
 
@@ -194,7 +262,7 @@ class SharedContext:
         input_data: Dict[str, Any],
     ) -> None:
         """Resolve waiting state with user input."""
-        action = self._actions.get(action_id)
+        action = self._store.get(action_id)
         if not action:
             return
 
@@ -214,7 +282,7 @@ class SharedContext:
         result: Dict[str, Any],
     ) -> None:
         """Complete an action with result."""
-        action = self._actions.get(action_id)
+        action = self._store.get(action_id)
         if not action:
             return
 
@@ -234,7 +302,7 @@ class SharedContext:
         reason: str,
     ) -> None:
         """Cancel an action."""
-        action = self._actions.get(action_id)
+        action = self._store.get(action_id)
         if not action:
             return
 
@@ -1,11 +1,37 @@
+"""Conversation state in Redis, persisted as deltas.
+
+Each session keeps one list entry per message (``{prefix}:{session_id}:messages``,
+the JSON of ``Message.to_memory()``) and a small header hash
+(``{prefix}:{session_id}:header``) with the message count. A save re-hashes
+every message it holds, appends the new ones and rewrites only those whose
+digest changed, so an in-place edit anywhere in the conversation is saved
+while the data sent to Redis does not grow with the conversation.
+Every ``STATE_COMPACT_EVERY`` saves, or when the stored list has drifted from
+what this instance wrote, the list is rewritten from the context in full.
+Sessions stored in the old single-blob format are still readable and are
+migrated on their next save.
+"""
+
+import hashlib
 import json
 import logging
-import pickle
+import os
+from typing import Optional
+
 from super.core.context.schema import Context
 from super.core.memory.kv.kv import KVMemory
 from super.core.memory.settings import MemoryConfig, MemoryProviders
 from super.core.state.base import BaseState
 
+STATE_COMPACT_EVERY = int(os.getenv("STATE_COMPACT_EVERY", "100"))
+# Messages loaded by default; 0 loads the whole conversation.
+STATE_LOAD_WINDOW = int(os.getenv("STATE_LOAD_WINDOW", "0"))
+
+
+def _encode(message) -> tuple[str, str]:
+    payload = json.dumps(message.to_memory())
+    return payload, hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
 
 class KVState(BaseState):
     def __init__(
@@ -25,21 +51,140 @@ class KVState(BaseState):
             # TODO load store config from environment variables
         )
         self._memory = KVMemory(m_conf, logger=logger)
+        self._reset()
 
         self.logger = logger
 
+    def _reset(self) -> None:
+        # What this instance knows is stored: list length, the list index of
+        # context.messages[0] (non-zero after a windowed load) and digests by index.
+        self._synced = False
+        self._stored_count = 0
+        self._offset = 0
+        self._digests: dict[int, str] = {}
+        self._saves = 0
+
     def set_session_id(self, session_id: str) -> None:
         self._session_id = session_id
+        self._reset()
+
+    @property
+    def _redis(self):
+        return self._memory.client
+
+    @property
+    def _blob_key(self) -> str:
+        return f"{self._memory.key_prefix}:{self._session_id}"
+
+    @property
+    def _messages_key(self) -> str:
+        return f"{self._blob_key}:messages"
+
+    @property
+    def _header_key(self) -> str:
+        return f"{self._blob_key}:header"
 
     async def save(self, context: Context) -> None:
-        """Save context and state data directly to the memory vector store."""
-        # Save context in memory
-        await self._memory.add(self._session_id, json.dumps(context.to_memories()))
-        self.logger.debug(f"Context saved for session ID: {self._session_id}")
-
-    async def load(self) -> Context:
-        """Load the context directly from the memory vector store."""
-        # Retrieve context for this session ID
+        """Persist the messages added or changed since the last save."""
+        self._saves += 1
+        total = self._offset + len(context.messages)
+        if (
+            not self._synced
+            or total < self._stored_count
+            or self._saves % STATE_COMPACT_EVERY == 0
+        ):
+            await self._rewrite(context)
+            return
+
+        pipe = self._redis.pipeline(transaction=True)
+        appended = []
+        for index in range(self._offset, total):
+            payload, digest = _encode(context.messages[index - self._offset])
+            if index >= self._stored_count:
+                appended.append(payload)
+            elif self._digests.get(index) != digest:
+                pipe.lset(self._messages_key, index, payload)
+            self._digests[index] = digest
+        if appended:
+            pipe.rpush(self._messages_key, *appended)
+        pipe.hset(self._header_key, mapping={"count": total})
+        pipe.llen(self._messages_key)
+        results = await pipe.execute()
+        self._stored_count = total
+        if int(results[-1]) != total:
+            # Another writer touched the list; rewrite it on the next save.
+            self.logger.warning(
+                f"State list for session {self._session_id} has {results[-1]} entries, expected {total}"
+            )
+            self._synced = False
+        self.logger.debug(
+            f"Context saved for session ID: {self._session_id} (+{len(appended)} messages)"
+        )
+
+    async def _rewrite(self, context: Context) -> None:
+        """Replace the stored list with the context's messages (compaction)."""
+        stored_prefix = []
+        if self._offset:
+            # A windowed load holds only the tail; keep the older entries as stored.
+            stored_prefix = await self._redis.lrange(self._messages_key, 0, self._offset - 1)
+        encoded = [_encode(message) for message in context.messages]
+        entries = stored_prefix + [payload for payload, _ in encoded]
+        total = len(entries)
+
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.delete(self._messages_key, self._blob_key)
+        if entries:
+            pipe.rpush(self._messages_key, *entries)
+        pipe.hset(self._header_key, mapping={"count": total})
+        await pipe.execute()
+
+        self._synced = True
+        self._stored_count = total
+        self._digests = {
+            self._offset + i: digest for i, (_, digest) in enumerate(encoded)
+        }
+        self.logger.debug(f"Context compacted for session ID: {self._session_id}")
+
+    async def load(self, window: Optional[int] = None) -> Context:
+        """
+        Load the context; with a ``window`` (default ``STATE_LOAD_WINDOW``) only
+        the last ``window`` messages are read. ``load_earlier`` fetches the rest.
+        """
+        window = STATE_LOAD_WINDOW if window is None else window
+        start = -window if window > 0 else 0
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hget(self._header_key, "count")
+        pipe.lrange(self._messages_key, start, -1)
+        count, entries = await pipe.execute()
+
+        self._reset()
+        if count is None:
+            return await self._load_blob()
+        memories = [json.loads(entry) for entry in entries]
+        self._synced = True
+        self._stored_count = int(count)
+        self._offset = self._stored_count - len(memories)
+        state = Context.from_memories(self._session_id, memories)
+        for i, message in enumerate(state.messages):
+            self._digests[self._offset + i] = _encode(message)[1]
+        return state
+
+    async def load_earlier(self, context: Context, count: int) -> int:
+        """Prepend up to ``count`` older messages to a windowed context; returns how many."""
+        start = max(0, self._offset - count)
+        if start == self._offset:
+            return 0
+        entries = await self._redis.lrange(self._messages_key, start, self._offset - 1)
+        earlier = Context.from_memories(
+            self._session_id, [json.loads(entry) for entry in entries]
+        ).messages
+        context.messages[:0] = earlier
+        context.active_message += len(earlier)
+        self._offset = start
+        return len(earlier)
+
+    async def _load_blob(self) -> Context:
+        # Sessions written before delta persistence: one JSON blob of all memories.
         results = await self._memory.get(key=self._session_id)
         if results is None:
             return Context(self._session_id)
@@ -49,5 +194,7 @@ class KVState(BaseState):
 
     async def clear(self) -> None:
         """Clear the context and state data from the memory vector store."""
+        await self._redis.delete(self._messages_key, self._header_key, self._blob_key)
         await self._memory.delete_all(ref_id=self._session_id)
+        self._reset()
         self.logger.debug(f"Context cleared for session ID: {self._session_id}")
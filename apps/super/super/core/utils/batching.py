@@ -4,7 +4,13 @@ from collections.abc import Iterable
 from itertools import islice
 from typing import TypeVar
 
+from super.core.utils.threadpool_concurrency import DEFAULT_EXECUTOR
+from super.core.utils.threadpool_concurrency import BoundedExecutor
+from super.core.utils.threadpool_concurrency import arun_functions_tuples_in_parallel
+from super.core.utils.threadpool_concurrency import run_functions_tuples_in_parallel
+
 T = TypeVar("T")
+R = TypeVar("R")
 
 
 def batch_generator(
@@ -28,3 +34,44 @@ def batch_list(
     batch_size: int,
 ) -> list[list[T]]:
     return [lst[i : i + batch_size] for i in range(0, len(lst), batch_size)]
+
+
+def run_in_batches(
+    items: Iterable[T],
+    batch_size: int,
+    process_batch: Callable[[list[T]], R],
+    executor: "str | BoundedExecutor" = DEFAULT_EXECUTOR,
+    max_workers: int | None = None,
+    timeout: float | None = None,
+    allow_failures: bool = False,
+) -> list[R]:
+    """
+    Run ``process_batch`` over batches of ``items`` on a shared executor
+    (see threadpool_concurrency), returning the results in batch order.
+    """
+    return run_functions_tuples_in_parallel(
+        [(process_batch, (batch,)) for batch in batch_generator(items, batch_size)],
+        allow_failures=allow_failures,
+        max_workers=max_workers,
+        timeout=timeout,
+        executor=executor,
+    )
+
+
+async def arun_in_batches(
+    items: Iterable[T],
+    batch_size: int,
+    process_batch: Callable[[list[T]], R],
+    executor: "str | BoundedExecutor" = DEFAULT_EXECUTOR,
+    max_workers: int | None = None,
+    timeout: float | None = None,
+    allow_failures: bool = False,
+) -> list[R]:
+    """Async variant of run_in_batches that does not block the event loop."""
+    return await arun_functions_tuples_in_parallel(
+        [(process_batch, (batch,)) for batch in batch_generator(items, batch_size)],
+        allow_failures=allow_failures,
+        max_workers=max_workers,
+        timeout=timeout,
+        executor=executor,
+    )
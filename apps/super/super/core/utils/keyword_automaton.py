@@ -0,0 +1,111 @@
+from collections import deque
+from collections.abc import Iterable
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton for multi-keyword substring search.
+
+    Finds every keyword that occurs as a substring of a text in a single pass,
+    i.e. the same result as ``[k for k in keywords if k in text]`` but in
+    O(len(text) + matches) instead of O(len(keywords) * len(text)).
+    Keywords are matched verbatim; callers normalise case themselves.
+    """
+
+    def __init__(self, keywords: Iterable[str] = ()) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        self._ids: dict[str, int] = {}
+        self._keywords: list[str] = []
+        self._empty_id: int | None = None
+        self._built = False
+        for keyword in keywords:
+            self.add(keyword)
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    @property
+    def keywords(self) -> list[str]:
+        return self._keywords
+
+    def add(self, keyword: str) -> int:
+        """Register ``keyword`` and return its id; duplicates share one id."""
+        existing = self._ids.get(keyword)
+        if existing is not None:
+            return existing
+
+        keyword_id = len(self._keywords)
+        self._ids[keyword] = keyword_id
+        self._keywords.append(keyword)
+        self._built = False
+
+        if not keyword:
+            # The empty string is a substring of everything.
+            self._empty_id = keyword_id
+            return keyword_id
+
+        node = 0
+        for char in keyword:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(keyword_id)
+        return keyword_id
+
+    def build(self) -> None:
+        """Compute failure links. Called lazily on the first search."""
+        self._fail = [0] * len(self._goto)
+        # Reset merged outputs to the keywords that end exactly at each node.
+        terminal: list[list[int]] = [[] for _ in self._goto]
+        for keyword, keyword_id in self._ids.items():
+            if not keyword:
+                continue
+            node = 0
+            for char in keyword:
+                node = self._goto[node][char]
+            terminal[node].append(keyword_id)
+        self._out = terminal
+
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                if self._out[self._fail[child]]:
+                    self._out[child] = self._out[child] + self._out[self._fail[child]]
+        self._built = True
+
+    def find_ids(self, text: str) -> set[int]:
+        """Return the ids of all keywords that occur in ``text``."""
+        if not self._built:
+            self.build()
+        found: set[int] = set()
+        if self._empty_id is not None:
+            found.add(self._empty_id)
+
+        goto, fail, out = self._goto, self._fail, self._out
+        seen_nodes: set[int] = set()
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if node and node not in seen_nodes:
+                seen_nodes.add(node)
+                found.update(out[node])
+        return found
+
+    def find(self, text: str) -> set[str]:
+        """Return all keywords that occur in ``text``."""
+        return {self._keywords[keyword_id] for keyword_id in self.find_ids(text)}
@@ -0,0 +1,199 @@
+import math
+import struct
+from itertools import accumulate
+from bisect import bisect_right
+from collections.abc import Iterable
+from collections.abc import Iterator
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class LatencyHistogram:
+    """Fixed-memory, mergeable latency histogram (HDR-style log buckets).
+
+    Values are counted in logarithmic buckets whose width is a fixed fraction
+    of their value, so every quantile is accurate to ``relative_accuracy``
+    whatever the number of observations, and memory is bounded by the value
+    range rather than by the sample count. Histograms with the same layout
+    merge by adding bucket counts, which makes per-worker accumulation and a
+    fleet-wide merge exact.
+
+    Values at or below ``min_value`` share a single zero bucket; values above
+    ``max_value`` are clamped into the top bucket.
+    """
+
+    _VERSION = 1
+    _HEADER = struct.Struct("<BdddQddd")
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        min_value: float = 1e-3,
+        max_value: float = 1e7,
+    ) -> None:
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._offset = self._raw_index(min_value)
+        self._counts = [0] * (self._raw_index(max_value) - self._offset + 1)
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._cumulative: list[int] | None = None
+
+    def _raw_index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _bucket_value(self, index: int) -> float:
+        # Midpoint (in relative terms) of bucket (gamma^(i-1), gamma^i].
+        return 2 * self._gamma ** (index + self._offset) / (self._gamma + 1)
+
+    def layout(self) -> tuple[float, float, float]:
+        return (self.relative_accuracy, self.min_value, self.max_value)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self._cumulative = None
+        if value <= self.min_value:
+            self.zero_count += 1
+            return
+        index = self._raw_index(min(value, self.max_value)) - self._offset
+        self._counts[index] += 1
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add ``other``'s observations into this histogram."""
+        if other.layout() != self.layout():
+            raise ValueError("Cannot merge histograms with different layouts")
+        for index, bucket_count in enumerate(other._counts):
+            if bucket_count:
+                self._counts[index] += bucket_count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._cumulative = None
+        return self
+
+    def reset(self) -> None:
+        self._counts = [0] * len(self._counts)
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._cumulative = None
+
+    @property
+    def avg(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Value at rank ``int(count * q)``, like indexing sorted samples."""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Iterable[float]) -> list[float]:
+        """Several quantiles from one cumulative pass over the buckets."""
+        qs = list(qs)
+        if not self.count:
+            return [0.0] * len(qs)
+        if self._cumulative is None:
+            self._cumulative = list(accumulate(self._counts, initial=self.zero_count))
+        cumulative = self._cumulative
+        top = len(self._counts) - 1
+        results = []
+        for q in qs:
+            rank = min(int(self.count * q), self.count - 1)
+            if rank < self.zero_count:
+                results.append(self.min)
+                continue
+            index = bisect_right(cumulative, rank) - 1
+            if rank == self.count - 1 or index == top:
+                results.append(self.max)
+                continue
+            # Never report beyond what was actually observed.
+            results.append(min(max(self._bucket_value(index), self.min), self.max))
+        return results
+
+    def _nonzero(self) -> Iterator[tuple[int, int]]:
+        for index, bucket_count in enumerate(self._counts):
+            if bucket_count:
+                yield index, bucket_count
+
+    def to_bytes(self) -> bytes:
+        """Compact encoding: fixed header, then varint (index delta, count) pairs."""
+        out = bytearray(
+            self._HEADER.pack(
+                self._VERSION,
+                self.relative_accuracy,
+                self.min_value,
+                self.max_value,
+                self.zero_count,
+                self.sum,
+                self.min if self.count else 0.0,
+                self.max if self.count else 0.0,
+            )
+        )
+        previous = 0
+        for index, bucket_count in self._nonzero():
+            _write_varint(out, index - previous)
+            _write_varint(out, bucket_count)
+            previous = index
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "LatencyHistogram":
+        (
+            version,
+            relative_accuracy,
+            min_value,
+            max_value,
+            zero_count,
+            total,
+            minimum,
+            maximum,
+        ) = cls._HEADER.unpack_from(data)
+        if version != cls._VERSION:
+            raise ValueError(f"Unsupported histogram encoding version {version}")
+        pos = cls._HEADER.size
+
+        histogram = cls(relative_accuracy, min_value, max_value)
+        histogram.zero_count = zero_count
+        histogram.count = zero_count
+        histogram.sum = total
+        index = 0
+        while pos < len(data):
+            delta, pos = _read_varint(data, pos)
+            bucket_count, pos = _read_varint(data, pos)
+            index += delta
+            histogram._counts[index] = bucket_count
+            histogram.count += bucket_count
+        if histogram.count:
+            histogram.min = minimum
+            histogram.max = maximum
+        return histogram
@@ -1,7 +1,14 @@
+import asyncio
+import os
+import threading
+import time
 import uuid
 from collections.abc import Callable
-from concurrent.futures import as_completed
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
 from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures import wait
 from typing import Any
 from typing import Generic
 from typing import TypeVar
@@ -12,11 +19,137 @@ logger = setup_logger()
 
 R = TypeVar("R")
 
+DEFAULT_EXECUTOR = "default"
+DEFAULT_EXECUTOR_WORKERS = int(os.getenv("THREADPOOL_MAX_WORKERS", "32"))
+
+
+class BoundedExecutor:
+    """
+    Named, fixed-size thread pool shared by every caller in the process.
+
+    Tracks how many submitted calls are waiting for a thread (queue depth)
+    and how many threads are busy (saturation), so an undersized pool shows
+    up in metrics instead of as unexplained latency.
+    """
+
+    def __init__(self, name: str, max_workers: int = DEFAULT_EXECUTOR_WORKERS):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"pool-{name}"
+        )
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._queued = 0
+        self._running = 0
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "timeouts": 0,
+            "peak_queue_depth": 0,
+        }
+
+    def in_worker(self) -> bool:
+        """Whether the calling thread is one of this pool's workers."""
+        return getattr(self._local, "worker", False)
+
+    def submit(self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> "Future[R]":
+        with self._lock:
+            self._queued += 1
+            self._stats["submitted"] += 1
+            if self._queued > self._stats["peak_queue_depth"]:
+                self._stats["peak_queue_depth"] = self._queued
+
+        def run() -> R:
+            self._local.worker = True
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                with self._lock:
+                    self._stats["failed"] += 1
+                raise
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._stats["completed"] += 1
+
+        future = self._executor.submit(run)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future) -> None:
+        # A call cancelled before it started never ran ``run``.
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+                self._stats["cancelled"] += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self._stats["timeouts"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["queue_depth"] = self._queued
+            stats["running"] = self._running
+        stats["name"] = self.name
+        stats["max_workers"] = self.max_workers
+        stats["saturation"] = stats["running"] / self.max_workers
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_executors: dict[str, BoundedExecutor] = {}
+_executors_pid: int | None = None
+_executors_lock = threading.Lock()
+
+
+def get_executor(
+    name: str = DEFAULT_EXECUTOR, max_workers: int | None = None
+) -> BoundedExecutor:
+    """
+    The process-wide executor called ``name``, created on first use with
+    ``max_workers`` threads (default THREADPOOL_MAX_WORKERS).
+    """
+    global _executors_pid
+    with _executors_lock:
+        if _executors_pid != os.getpid():
+            # Worker threads do not survive a fork.
+            _executors.clear()
+            _executors_pid = os.getpid()
+        executor = _executors.get(name)
+        if executor is None:
+            executor = _executors[name] = BoundedExecutor(
+                name, max_workers or DEFAULT_EXECUTOR_WORKERS
+            )
+        return executor
+
+
+def executor_stats() -> dict[str, dict[str, Any]]:
+    """Metrics of every executor created in this process."""
+    with _executors_lock:
+        executors = list(_executors.values())
+    return {executor.name: executor.stats() for executor in executors}
+
+
+def _resolve(executor: "str | BoundedExecutor") -> BoundedExecutor:
+    return executor if isinstance(executor, BoundedExecutor) else get_executor(executor)
+
 
 def run_functions_tuples_in_parallel(
     functions_with_args: list[tuple[Callable, tuple]],
     allow_failures: bool = False,
     max_workers: int | None = None,
+    timeout: float | None = None,
+    executor: "str | BoundedExecutor" = DEFAULT_EXECUTOR,
 ) -> list[Any]:
     """
     Executes multiple functions in parallel and returns a list of the results for each function.
@@ -24,40 +157,143 @@ def run_functions_tuples_in_parallel(
     Args:
         functions_with_args: List of tuples each containing the function callable and a tuple of arguments.
         allow_failures: if set to True, then the function result will just be None
-        max_workers: Max number of worker threads
+        max_workers: Max number of functions of this call running at once
+        timeout: Seconds to wait for all results. Calls not yet started are
+            cancelled; with allow_failures their results are None, otherwise
+            TimeoutError is raised.
+        executor: Name of the shared executor (or the executor) to run on
 
     Returns:
-        dict: A dictionary mapping function names to their results or error messages.
+        list: The results, in the order of functions_with_args.
     """
-    workers = (
+    window = (
         min(max_workers, len(functions_with_args))
         if max_workers is not None
         else len(functions_with_args)
     )
 
-    if workers <= 0:
+    if window <= 0:
         return []
 
+    pool = _resolve(executor)
+    if pool.in_worker():
+        # Waiting on the pool from one of its own threads can deadlock it.
+        return _run_inline(functions_with_args, allow_failures)
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    calls = iter(enumerate(functions_with_args))
+    in_flight: dict[Future, int] = {}
+    results: list[Any] = [None] * len(functions_with_args)
+
+    def submit_next() -> None:
+        item = next(calls, None)
+        if item is not None:
+            index, (func, args) = item
+            in_flight[pool.submit(func, *args)] = index
+
+    for _ in range(window):
+        submit_next()
+
+    try:
+        while in_flight:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, _ = wait(in_flight, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                pool.record_timeout()
+                logger.warning(
+                    f"{len(in_flight)} calls on executor '{pool.name}' timed out after {timeout}s"
+                )
+                if allow_failures:
+                    break
+                raise FuturesTimeoutError(f"Timed out after {timeout}s")
+
+            for future in done:
+                index = in_flight.pop(future)
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    logger.exception(f"Function at index {index} failed due to {e}")
+
+                    if not allow_failures:
+                        raise
+                submit_next()
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+    return results
+
+
+def _run_inline(
+    functions_with_args: list[tuple[Callable, tuple]], allow_failures: bool
+) -> list[Any]:
     results = []
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        future_to_index = {
-            executor.submit(func, *args): i
-            for i, (func, args) in enumerate(functions_with_args)
-        }
+    for index, (func, args) in enumerate(functions_with_args):
+        try:
+            results.append(func(*args))
+        except Exception as e:
+            logger.exception(f"Function at index {index} failed due to {e}")
+            results.append(None)
 
-        for future in as_completed(future_to_index):
-            index = future_to_index[future]
+            if not allow_failures:
+                raise
+    return results
+
+
+async def arun_functions_tuples_in_parallel(
+    functions_with_args: list[tuple[Callable, tuple]],
+    allow_failures: bool = False,
+    max_workers: int | None = None,
+    timeout: float | None = None,
+    executor: "str | BoundedExecutor" = DEFAULT_EXECUTOR,
+) -> list[Any]:
+    """
+    Async variant of run_functions_tuples_in_parallel: the functions run on
+    the shared executor while the event loop keeps running. Cancelling the
+    awaiting task cancels the calls that have not started.
+    """
+    window = (
+        min(max_workers, len(functions_with_args))
+        if max_workers is not None
+        else len(functions_with_args)
+    )
+
+    if window <= 0:
+        return []
+
+    pool = _resolve(executor)
+    semaphore = asyncio.Semaphore(window)
+
+    async def run(index: int, func: Callable, args: tuple) -> Any:
+        async with semaphore:
             try:
-                results.append((index, future.result()))
+                return await asyncio.wrap_future(pool.submit(func, *args))
             except Exception as e:
                 logger.exception(f"Function at index {index} failed due to {e}")
-                results.append((index, None))
 
                 if not allow_failures:
                     raise
+                return None
+
+    tasks = [
+        asyncio.ensure_future(run(index, func, args))
+        for index, (func, args) in enumerate(functions_with_args)
+    ]
+    try:
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout)
+    except asyncio.TimeoutError:
+        pool.record_timeout()
+        logger.warning(f"Calls on executor '{pool.name}' timed out after {timeout}s")
+        if not allow_failures:
+            raise
+    finally:
+        for task in tasks:
+            task.cancel()
 
-    results.sort(key=lambda x: x[0])
-    return [result for index, result in results]
+    return [
+        task.result() if task.done() and not task.cancelled() else None
+        for task in tasks
+    ]
 
 
 class FunctionCall(Generic[R]):
@@ -81,27 +317,20 @@ class FunctionCall(Generic[R]):
 def run_functions_in_parallel(
     function_calls: list[FunctionCall],
     allow_failures: bool = False,
+    timeout: float | None = None,
+    executor: "str | BoundedExecutor" = DEFAULT_EXECUTOR,
 ) -> dict[str, Any]:
     """
     Executes a list of FunctionCalls in parallel and stores the results in a dictionary where the keys
     are the result_id of the FunctionCall and the values are the results of the call.
     """
-    results = {}
-    with ThreadPoolExecutor(max_workers=len(function_calls)) as executor:
-        future_to_id = {
-            executor.submit(func_call.execute): func_call.result_id
-            for func_call in function_calls
-        }
-
-        for future in as_completed(future_to_id):
-            result_id = future_to_id[future]
-            try:
-                results[result_id] = future.result()
-            except Exception as e:
-                logger.exception(f"Function with ID {result_id} failed due to {e}")
-                results[result_id] = None
-
-                if not allow_failures:
-                    raise
-
-    return results
+    results = run_functions_tuples_in_parallel(
+        [(func_call.execute, ()) for func_call in function_calls],
+        allow_failures=allow_failures,
+        timeout=timeout,
+        executor=executor,
+    )
+    return {
+        func_call.result_id: result
+        for func_call, result in zip(function_calls, results)
+    }
@@ -44,7 +44,8 @@ async def get_config_with_cache(
     Get agent configuration with caching.
 
     Uses ModelConfig from super_services to fetch configuration
-    by agent handle or space token.
+    by agent handle or space token. Agent handle lookups go through the
+    in-process config cache without blocking the event loop.
 
     Args:
         agent_handle: Agent identifier/slug
@@ -60,7 +61,7 @@ async def get_config_with_cache(
 
     if agent_handle:
         logger.debug(f"Fetching config for agent_handle: {agent_handle}")
-        config = config_loader.get_config(agent_handle)
+        config = await config_loader.aget_config(agent_handle)
 
     if not config and space_token:
         logger.debug(f"Fetching config for space_token")
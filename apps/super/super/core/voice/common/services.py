@@ -407,7 +407,9 @@ def schedule_redial_task(task_id, time, transcript):
             "scheduled_timestamp": int(time.timestamp()),
         }
 
-        TaskModel.update_one({"task_id": task.task_id}, updated_data)
+        from super_services.orchestration.task.task_service import TaskService
+
+        TaskService().update_task(task.task_id, updated_data)
 
         return True
 
@@ -1,69 +1,170 @@
-import time
+import asyncio
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
+from typing import List, Optional, Tuple
+
 from pipecat.frames.frames import (
+    InterimTranscriptionFrame,
     TranscriptionFrame
 )
-from pipecat.processors.frame_processor import (
-    FrameProcessor
-)
+from pipecat.processors.frame_processor import FrameProcessor
 
 from super.core.voice.schema import UserState
 
+KB_EMBEDDING_WORKERS = int(os.getenv("KB_EMBEDDING_WORKERS", "1"))
+KB_SPECULATIVE_RETRIEVAL = os.getenv("KB_SPECULATIVE_RETRIEVAL", "true").lower() == "true"
+KB_SPECULATIVE_SIMILARITY = float(os.getenv("KB_SPECULATIVE_SIMILARITY", "0.85"))
+
+_embedding_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_embedding_executor() -> ThreadPoolExecutor:
+    """Executor dedicated to query embeddings, so they never run on the event loop
+    or queue behind unrelated work in the default executor."""
+    global _embedding_executor
+    if _embedding_executor is None:
+        _embedding_executor = ThreadPoolExecutor(
+            max_workers=KB_EMBEDDING_WORKERS, thread_name_prefix="kb-embed"
+        )
+    return _embedding_executor
+
+
+def text_similarity(a: str, b: str) -> float:
+    return SequenceMatcher(None, a.lower().strip(), b.lower().strip()).ratio()
+
 
 class FAISSContextProcessor(FrameProcessor):
-    def __init__(self, voice_handler):
+    """
+    Adds knowledge-base context to final transcriptions.
+
+    Query embedding runs in a dedicated executor. With speculative retrieval,
+    each interim transcript starts a retrieval in the background; when the
+    final transcript lands, the speculative result is reused if its text is
+    at least ``similarity_threshold`` similar, and cancelled otherwise.
+    A retrieval still in flight is cancelled when the processor is cleaned up.
+    """
+
+    def __init__(
+        self,
+        voice_handler,
+        speculative: bool = KB_SPECULATIVE_RETRIEVAL,
+        similarity_threshold: float = KB_SPECULATIVE_SIMILARITY,
+    ):
         super().__init__()
         self.voice_handler = voice_handler
         self._logger = voice_handler._logger
+        self._speculative = speculative
+        self._similarity_threshold = similarity_threshold
+        self._pending: Optional[Tuple[str, asyncio.Task]] = None
+        self._stats = {"speculative_started": 0, "speculative_reused": 0, "speculative_cancelled": 0}
 
     async def process_frame(self, frame, direction):
-        # Process transcription frames and add FAISS context
-        if isinstance(frame, TranscriptionFrame):
-            try:
-                # Get transcription text
-                transcription_text = frame.text
-                if not transcription_text or len(transcription_text.strip()) < 3:
-                    return [frame]
-
-                self._logger.info(f"Processing transcription for FAISS context: {transcription_text[:50]}...")
-
-                # Search in FAISS for relevant context
-                faiss_start = time.time()
-                search_results = await self.voice_handler._context_retrieval.search_context(
-                    query_embedding=self.voice_handler._embedding_model.encode([transcription_text],
-                                                                               convert_to_tensor=False),
-                    k=2,  # Get top 2 results for context
-                    use_cache=True
-                )
-
-                faiss_time = (time.time() - faiss_start) * 1000
-
-                # Process results and add context
-                chunk_ids, search_metrics = search_results
-                context_docs = []
-                for chunk_id in chunk_ids:
-                    chunk = self.voice_handler._context_retrieval._hot_chunks.get(str(chunk_id))
-                    if chunk and chunk.get("content"):
-                        context_docs.append(chunk["content"])
-
-                # Add FAISS context to transcription if found
-                if context_docs:
-                    enhanced_text = f"""
-                        Context from knowledge base:
-                        {chr(10).join(context_docs)}
-
-                        User: {transcription_text}
-                        """
-                    # Update the transcription frame with enhanced content
-                    frame.text = enhanced_text
-                    self._logger.info(f"Added FAISS context ({len(context_docs)} docs) in {faiss_time:.2f}ms")
-                else:
-                    self._logger.info(f"No FAISS context found in {faiss_time:.2f}ms")
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, InterimTranscriptionFrame):
+            if self._speculative:
+                self._speculate(frame.text)
+        elif isinstance(frame, TranscriptionFrame):
+            await self._add_context(frame)
+
+        await self.push_frame(frame, direction)
+
+    def _speculate(self, text: str) -> None:
+        if not text or len(text.strip()) < 3:
+            return
+        if self._pending is not None:
+            pending_text, task = self._pending
+            # A near-identical interim keeps the retrieval already in flight.
+            if text_similarity(pending_text, text) >= self._similarity_threshold:
+                return
+            self._discard(task)
+            self._stats["speculative_cancelled"] += 1
+        self._pending = (text, asyncio.create_task(self._retrieve(text)))
+        self._stats["speculative_started"] += 1
+
+    def _take_retrieval(self, text: str) -> "asyncio.Future[List[str]]":
+        """The speculative retrieval if it matches ``text``, else a fresh one."""
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            pending_text, task = pending
+            if text_similarity(pending_text, text) >= self._similarity_threshold:
+                self._stats["speculative_reused"] += 1
+                return task
+            self._discard(task)
+            self._stats["speculative_cancelled"] += 1
+        return asyncio.ensure_future(self._retrieve(text))
+
+    @staticmethod
+    def _discard(task: asyncio.Task) -> None:
+        """Cancel a superseded retrieval and retrieve its outcome, so a
+        failure is not reported as never retrieved."""
+        task.cancel()
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def _retrieve(self, text: str) -> List[str]:
+        """Embed ``text`` off the event loop and return matching chunk contents."""
+        handler = self.voice_handler
+        loop = asyncio.get_running_loop()
+        query_embedding = await loop.run_in_executor(
+            get_embedding_executor(),
+            lambda: handler._embedding_model.encode([text], convert_to_tensor=False),
+        )
+        chunk_ids, _ = await handler._context_retrieval.search_context(
+            query_embedding=query_embedding,
+            k=2,  # Get top 2 results for context
+            use_cache=True
+        )
+        context_docs = []
+        for chunk_id in chunk_ids:
+            chunk = handler._context_retrieval._hot_chunks.get(str(chunk_id))
+            if chunk and chunk.get("content"):
+                context_docs.append(chunk["content"])
+        return context_docs
+
+    async def _add_context(self, frame: TranscriptionFrame) -> None:
+        transcription_text = frame.text
+        if not transcription_text or len(transcription_text.strip()) < 3:
+            if self._pending is not None:
+                self._discard(self._pending[1])
+                self._pending = None
+            return
 
-            except Exception as e:
-                self._logger.error(f"Error in FAISS context processing: {e}")
+        try:
+            self._logger.info(f"Processing transcription for FAISS context: {transcription_text[:50]}...")
+
+            faiss_start = time.time()
+            context_docs = await self._take_retrieval(transcription_text)
+            faiss_time = (time.time() - faiss_start) * 1000
+
+            # Add FAISS context to transcription if found
+            if context_docs:
+                enhanced_text = f"""
+                    Context from knowledge base:
+                    {chr(10).join(context_docs)}
+
+                    User: {transcription_text}
+                    """
+                # Update the transcription frame with enhanced content
+                frame.text = enhanced_text
+                self._logger.info(f"Added FAISS context ({len(context_docs)} docs) in {faiss_time:.2f}ms")
+            else:
+                self._logger.info(f"No FAISS context found in {faiss_time:.2f}ms")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._logger.error(f"Error in FAISS context processing: {e}")
+
+    async def cleanup(self):
+        await super().cleanup()
+        if self._pending is not None:
+            self._discard(self._pending[1])
+            self._pending = None
 
-        return [frame]
+    def get_stats(self) -> dict:
+        return dict(self._stats)
 
 
 # return FAISSContextProcessor(self)
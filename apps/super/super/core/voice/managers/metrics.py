@@ -13,6 +13,8 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 import logging
 
+from super.core.utils.latency_histogram import LatencyHistogram
+
 
 class Counter:
     """Simple counter metric"""
@@ -35,19 +37,20 @@ class Counter:
 
 
 class Histogram:
-    """Simple histogram metric"""
+    """Histogram metric with fleet-mergeable percentiles"""
     def __init__(self, name: str, description: str = "", buckets: List[float] = None):
         self.name = name
         self.description = description
         self.buckets = buckets or [0.1, 0.25, 0.5, 1, 2.5, 5, 10]
-        self.samples = deque(maxlen=1000)  # Keep last 1000 samples
+        # Fixed-size log-bucketed sketch (1% relative error), seconds
+        self.sketch = LatencyHistogram(relative_accuracy=0.01, min_value=1e-6, max_value=1e4)
         self.bucket_counts = {bucket: 0 for bucket in self.buckets}
         self.sum = 0
         self.count = 0
     
     def observe(self, value: float):
         """Record an observation"""
-        self.samples.append(value)
+        self.sketch.observe(value)
         self.sum += value
         self.count += 1
         
@@ -58,22 +61,33 @@ class Histogram:
     
     def get_percentile(self, percentile: float) -> float:
         """Get percentile value"""
-        if not self.samples:
-            return 0.0
-        
-        sorted_samples = sorted(self.samples)
-        index = int(len(sorted_samples) * percentile / 100)
-        return sorted_samples[min(index, len(sorted_samples) - 1)]
+        return self.sketch.quantile(percentile / 100)
+    
+    def merge(self, other: "Histogram"):
+        """Merge observations from another worker's histogram"""
+        self.sketch.merge(other.sketch)
+        self.sum += other.sum
+        self.count += other.count
+        for bucket, count in other.bucket_counts.items():
+            self.bucket_counts[bucket] = self.bucket_counts.get(bucket, 0) + count
+    
+    def reset(self):
+        """Reset histogram"""
+        self.sketch.reset()
+        self.sum = 0
+        self.count = 0
+        self.bucket_counts = {bucket: 0 for bucket in self.buckets}
     
     def get_stats(self) -> Dict[str, Any]:
         """Get histogram statistics"""
+        p50, p95, p99 = self.sketch.quantiles([0.5, 0.95, 0.99])
         return {
             'count': self.count,
             'sum': self.sum,
             'avg': self.sum / self.count if self.count > 0 else 0,
-            'p50': self.get_percentile(50),
-            'p95': self.get_percentile(95),
-            'p99': self.get_percentile(99),
+            'p50': p50,
+            'p95': p95,
+            'p99': p99,
             'buckets': self.bucket_counts
         }
 
@@ -380,6 +394,15 @@ class MetricsCollector:
                 lines.append(f"{name}_sum {stats['sum']}")
                 lines.append(f"{name}_count {stats['count']}")
                 lines.append("")
+                
+                # Percentiles from the sketch
+                lines.append(f"# HELP {name}_quantiles {histogram.description} percentiles")
+                lines.append(f"# TYPE {name}_quantiles summary")
+                for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+                    lines.append(f'{name}_quantiles{{quantile="{quantile}"}} {stats[key]}')
+                lines.append(f"{name}_quantiles_sum {stats['sum']}")
+                lines.append(f"{name}_quantiles_count {stats['count']}")
+                lines.append("")
             
             return "\n".join(lines)
             
@@ -467,12 +490,9 @@ class MetricsCollector:
             for gauge in self.gauges.values():
                 gauge.set(0)
             
-            # Clear histogram samples
+            # Clear histograms
             for histogram in self.histograms.values():
-                histogram.samples.clear()
-                histogram.sum = 0
-                histogram.count = 0
-                histogram.bucket_counts = {bucket: 0 for bucket in histogram.buckets}
+                histogram.reset()
             
             # Clear error rates
             self.error_rates.clear()
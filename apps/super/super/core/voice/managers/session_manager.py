@@ -3,6 +3,16 @@ SessionManager - Session lifecycle management for SuperVoiceAgent
 
 This module handles session creation, storage, updates, and cleanup
 with optional Redis backing for persistence and high availability.
+
+Redis layout:
+- ``session:{id}`` holds the serialized session with a server-side TTL,
+  refreshed on every write, so abandoned sessions expire without a sweep.
+- ``sessions:active`` is a sorted set of live (not ended) session ids
+  scored by last activity. Active-session queries are a range over scores
+  newer than the TTL window, never a scan of the keyspace; index entries
+  older than the window are trimmed in the same round trip.
+- Writes for a session (data and index) go out in one pipeline, and bulk
+  persistence batches many sessions per pipeline.
 """
 
 import asyncio
@@ -15,6 +25,11 @@ from typing import Dict, List, Optional, Any
 
 from super.core.voice.schema import CallMeta
 
+SESSION_KEY_PREFIX = "session:"
+ACTIVE_INDEX_KEY = "sessions:active"
+PERSIST_BATCH_SIZE = 500
+INACTIVE_STATES = ("ended", "error")
+
 
 class SessionData:
     """Session data container"""
@@ -320,34 +335,42 @@ class SessionManager:
     async def get_active_sessions(self) -> List[str]:
         """Get list of active session IDs"""
         try:
-            active_sessions = []
-            
             # Check in-memory sessions
-            for session_id, session in self._sessions.items():
-                if session.state not in ['ended', 'error']:
-                    active_sessions.append(session_id)
-            
-            # If using Redis, also check for sessions not in memory
+            active_sessions = [
+                session_id
+                for session_id, session in self._sessions.items()
+                if session.state not in INACTIVE_STATES
+            ]
+
+            # If using Redis, also include sessions of other workers
             if self.redis_client:
-                redis_sessions = await self._get_redis_session_ids()
-                for session_id in redis_sessions:
-                    if session_id not in active_sessions:
-                        # Load and check state
-                        session_data = await self._load_session_from_redis(session_id)
-                        if session_data and session_data.state not in ['ended', 'error']:
-                            active_sessions.append(session_id)
-            
+                seen = set(active_sessions)
+                for session_id in await self._get_redis_session_ids():
+                    if session_id not in seen:
+                        seen.add(session_id)
+                        active_sessions.append(session_id)
+
             return active_sessions
-            
+
         except Exception as e:
             self.logger.error(f"Failed to get active sessions: {e}")
             return []
-    
+
+    async def count_active_sessions(self) -> int:
+        """Number of active sessions across workers (O(log n) with Redis)"""
+        if not self.redis_client:
+            return sum(1 for s in self._sessions.values() if s.state not in INACTIVE_STATES)
+        try:
+            return await self.redis_client.zcount(ACTIVE_INDEX_KEY, self._window_start(), "+inf")
+        except Exception as e:
+            self.logger.error(f"Failed to count active sessions: {e}")
+            return 0
+
     async def get_session_stats(self) -> Dict[str, Any]:
         """Get session statistics"""
         try:
             total_sessions = len(self._sessions)
-            active_sessions = await self.get_active_sessions()
+            active_sessions = await self.count_active_sessions()
             
             # Transport breakdown
             transport_counts = {}
@@ -362,7 +385,7 @@ class SessionManager:
             
             return {
                 'total_sessions': total_sessions,
-                'active_sessions': len(active_sessions),
+                'active_sessions': active_sessions,
                 'transport_breakdown': transport_counts,
                 'state_breakdown': state_counts,
                 'timestamp': datetime.now().isoformat()
@@ -389,9 +412,10 @@ class SessionManager:
                     if current_time - session.last_activity > self.session_ttl:
                         expired_sessions.append(session_id)
                 
-                # Remove expired sessions
+                # Drop expired sessions from memory; their Redis keys expire
+                # on their own TTL and index entries age out of the window.
                 for session_id in expired_sessions:
-                    await self.remove_session(session_id)
+                    del self._sessions[session_id]
                     self.logger.info(f"Cleaned up expired session: {session_id}")
                 
                 if expired_sessions:
@@ -402,18 +426,32 @@ class SessionManager:
             except Exception as e:
                 self.logger.error(f"Error in session cleanup: {e}")
     
+    def _window_start(self) -> float:
+        """Oldest last-activity score still inside the session TTL"""
+        return time.time() - self.session_ttl.total_seconds()
+
+    def _queue_persist(self, pipe, session: SessionData) -> None:
+        """Queue the data write (with TTL) and index update for a session"""
+        ttl_seconds = int(self.session_ttl.total_seconds())
+        pipe.set(
+            f"{SESSION_KEY_PREFIX}{session.session_id}",
+            json.dumps(session.to_dict()),
+            ex=ttl_seconds,
+        )
+        if session.state in INACTIVE_STATES:
+            pipe.zrem(ACTIVE_INDEX_KEY, session.session_id)
+        else:
+            pipe.zadd(ACTIVE_INDEX_KEY, {session.session_id: session.last_activity.timestamp()})
+
     async def _persist_session(self, session: SessionData):
         """Persist session to Redis"""
         if not self.redis_client:
             return
         
         try:
-            key = f"session:{session.session_id}"
-            data = json.dumps(session.to_dict())
-            
-            # Set with TTL
-            ttl_seconds = int(self.session_ttl.total_seconds())
-            await self.redis_client.setex(key, ttl_seconds, data)
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_persist(pipe, session)
+            await pipe.execute()
             
         except Exception as e:
             self.logger.error(f"Failed to persist session to Redis: {e}")
@@ -424,7 +462,7 @@ class SessionManager:
             return None
         
         try:
-            key = f"session:{session_id}"
+            key = f"{SESSION_KEY_PREFIX}{session_id}"
             data = await self.redis_client.get(key)
             
             if data:
@@ -443,36 +481,46 @@ class SessionManager:
             return
         
         try:
-            key = f"session:{session_id}"
-            await self.redis_client.delete(key)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.delete(f"{SESSION_KEY_PREFIX}{session_id}")
+            pipe.zrem(ACTIVE_INDEX_KEY, session_id)
+            await pipe.execute()
             
         except Exception as e:
             self.logger.error(f"Failed to remove session from Redis: {e}")
     
     async def _get_redis_session_ids(self) -> List[str]:
-        """Get all session IDs from Redis"""
+        """Get active session IDs from the Redis index (O(log n + k))"""
         if not self.redis_client:
             return []
         
         try:
-            keys = await self.redis_client.keys("session:*")
-            session_ids = [key.decode().split(":", 1)[1] for key in keys]
-            return session_ids
+            window_start = self._window_start()
+            pipe = self.redis_client.pipeline(transaction=False)
+            # Trim entries of sessions whose keys have already expired.
+            pipe.zremrangebyscore(ACTIVE_INDEX_KEY, "-inf", f"({window_start}")
+            pipe.zrangebyscore(ACTIVE_INDEX_KEY, window_start, "+inf")
+            _, members = await pipe.execute()
+            return [m.decode() if isinstance(m, bytes) else m for m in members]
             
         except Exception as e:
             self.logger.error(f"Failed to get Redis session IDs: {e}")
             return []
     
     async def _persist_all_sessions(self):
-        """Persist all in-memory sessions to Redis"""
+        """Persist all in-memory sessions to Redis in pipelined batches"""
         if not self.redis_client:
             return
         
         try:
-            for session in self._sessions.values():
-                await self._persist_session(session)
-            
-            self.logger.info(f"Persisted {len(self._sessions)} sessions to Redis")
+            sessions = list(self._sessions.values())
+            for start in range(0, len(sessions), PERSIST_BATCH_SIZE):
+                pipe = self.redis_client.pipeline(transaction=False)
+                for session in sessions[start:start + PERSIST_BATCH_SIZE]:
+                    self._queue_persist(pipe, session)
+                await pipe.execute()
+            
+            self.logger.info(f"Persisted {len(sessions)} sessions to Redis")
             
         except Exception as e:
             self.logger.error(f"Failed to persist all sessions: {e}")
@@ -2117,9 +2117,8 @@ class PipecatVoiceHandler(BaseVoiceHandler, ABC):
 
                     if self.user_state.system_prompt:
                         if self.use_flows:
-                            # NEW: Section-based approach with conditional branching
-                            self._logger.info("🚀 Using SECTION-BASED flow generation (conditional branching enabled)")
-                            from super.core.voice.workflows.flows.flow_generator import create_section_based_flow
+                            # Served from the flow compile cache, which is filled when the prompt is saved
+                            self._logger.info("🚀 Using SMART flow generation (compiled blueprint cache)")
 
                             # CRITICAL FIX: Pass assistant_prompt to preserve full context in flow nodes
                             # This ensures agent identity, rules, guidelines are available in every node
@@ -2133,7 +2132,7 @@ class PipecatVoiceHandler(BaseVoiceHandler, ABC):
 
                             # GAP #5 FIX: Pass global utility function handlers to inject into all nodes
                             # This makes get_docs, handover_call, end_call available from any node
-                            self.nodes = await create_section_based_flow(
+                            self.nodes = await create_smart_flow(
                                 system_prompt=self.user_state.system_prompt,
                                 assistant_prompt=assistant_prompt,
                                 get_docs_handler=self.get_docs if self._tool_calling else None,
@@ -2142,9 +2141,9 @@ class PipecatVoiceHandler(BaseVoiceHandler, ABC):
                             )
 
                             if self.nodes:
-                                self._logger.info(f"✅ Section-based flow: Generated {len(self.nodes)} nodes with conditional branching + full context + global utilities")
+                                self._logger.info(f"✅ Smart flow: Generated {len(self.nodes)} nodes with full context + global utilities")
                             else:
-                                self._logger.warning("⚠️  Section-based flow generation failed, falling back to hybrid approach")
+                                self._logger.warning("⚠️  Smart flow generation failed, falling back to hybrid approach")
 
                     # Fallback or default: Hybrid DSPy approach
                     # if not self.nodes:
@@ -0,0 +1,179 @@
+"""
+Local filler-phrase cache for the filler plugin.
+
+Most turns do not need a fresh LLM request to say "Let me check". Each
+(agent, language) pair has a phrase bank, and a filler is looked up in
+two steps before falling back to the LLM:
+
+1. Nearest neighbour over recent utterances. Utterances are embedded as
+   hashed word/bigram vectors, and one close enough to the new
+   utterance reuses the filler generated for it.
+2. Intent class. A rule-based classifier picks question, request,
+   problem or statement, and the bank rotates through that intent's
+   phrases.
+
+LLM generations are written back to both, so a bank for a new language
+or agent fills up after a few turns. Banks from FillerCache are shared
+across the calls of a worker process; the processor keeps fillers that
+were prompted with a caller's conversation in an unseeded per-call bank.
+"""
+
+import math
+import re
+import zlib
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+Vector = Dict[int, float]
+
+INTENT_PATTERNS: List[Tuple[str, "re.Pattern[str]"]] = [
+    (
+        "problem",
+        re.compile(
+            r"\b(not working|doesn'?t work|issue|problem|wrong|error|broken|"
+            r"complain\w*|angry|frustrat\w*|upset|refund)\b"
+        ),
+    ),
+    (
+        "request",
+        re.compile(
+            r"\b(please|i want|i need|i'?d like|can you|could you|would you|"
+            r"help me|book|schedule|send|cancel|change|update|order)\b"
+        ),
+    ),
+    (
+        "question",
+        re.compile(
+            r"(\?\s*$)|^(what|how|why|when|where|who|which|can|could|do|does|"
+            r"did|is|are|will|would|should)\b"
+        ),
+    ),
+]
+
+DEFAULT_INTENT = "statement"
+
+DEFAULT_PHRASES: Dict[str, Dict[str, List[str]]] = {
+    "en": {
+        "question": ["Let me check", "Good question", "Let me see"],
+        "request": ["Sure, one moment", "On it", "Let me do that"],
+        "problem": ["I understand", "Sorry to hear that", "Let me look into it"],
+        "statement": ["Got it", "I see", "Okay"],
+    },
+}
+
+_TOKEN = re.compile(r"[\w']+")
+
+
+def classify_intent(text: str) -> str:
+    text = text.lower().strip()
+    for intent, pattern in INTENT_PATTERNS:
+        if pattern.search(text):
+            return intent
+    return DEFAULT_INTENT
+
+
+def embed(text: str) -> Vector:
+    """L2-normalised hashed bag of words and word bigrams."""
+    tokens = _TOKEN.findall(text.lower())
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    vector: Vector = {}
+    for feature in features:
+        index = zlib.crc32(feature.encode())
+        vector[index] = vector.get(index, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in vector.values()))
+    return {k: v / norm for k, v in vector.items()} if norm else vector
+
+
+def cosine(a: Vector, b: Vector) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+class FillerBank:
+    """Filler phrases of one agent and language."""
+
+    def __init__(
+        self,
+        language: str = "en",
+        similarity_threshold: float = 0.6,
+        recent_size: int = 256,
+        max_phrases: int = 12,
+        min_phrases: int = 2,
+        seed: bool = True,
+    ):
+        self.language = language
+        self.similarity_threshold = similarity_threshold
+        self.min_phrases = min_phrases
+        self._recent: Deque[Tuple[Vector, str]] = deque(maxlen=recent_size)
+        self._phrases: Dict[str, Deque[str]] = {}
+        self._rotation: Dict[str, int] = {}
+        self._max_phrases = max_phrases
+        defaults = DEFAULT_PHRASES.get(language.split("-")[0].lower(), {}) if seed else {}
+        for intent, phrases in defaults.items():
+            self._phrases[intent] = deque(phrases, maxlen=max_phrases)
+
+    def lookup(self, text: str, avoid: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """
+        Cached ``(filler, source)`` for ``text`` (source is "neighbour" or
+        "intent"), or None when the LLM should generate one.
+        """
+        vector = embed(text)
+        best, best_score = None, self.similarity_threshold
+        for other, filler in self._recent:
+            if filler == avoid:
+                continue
+            score = cosine(vector, other)
+            if score >= best_score:
+                best, best_score = filler, score
+        if best is not None:
+            return best, "neighbour"
+
+        intent = classify_intent(text)
+        phrases = self._phrases.get(intent)
+        if not phrases or len(phrases) < self.min_phrases:
+            return None
+        start = self._rotation.get(intent, 0)
+        for offset in range(len(phrases)):
+            filler = phrases[(start + offset) % len(phrases)]
+            if filler != avoid:
+                self._rotation[intent] = start + offset + 1
+                return filler, "intent"
+        return None
+
+    def remember(self, text: str, filler: str) -> None:
+        """Write back a generated filler for ``text``."""
+        self._recent.append((embed(text), filler))
+        intent = classify_intent(text)
+        phrases = self._phrases.setdefault(intent, deque(maxlen=self._max_phrases))
+        if filler.lower() not in (p.lower() for p in phrases):
+            phrases.append(filler)
+
+
+class FillerCache:
+    """Banks per (agent, language), least recently used dropped first."""
+
+    def __init__(self, max_banks: int = 256, **bank_options):
+        self.max_banks = max_banks
+        self._bank_options = bank_options
+        self._banks: "OrderedDict[Tuple[str, str], FillerBank]" = OrderedDict()
+
+    def bank(self, agent_id: str, language: str) -> FillerBank:
+        key = (agent_id or "", (language or "en").lower())
+        bank = self._banks.get(key)
+        if bank is None:
+            bank = self._banks[key] = FillerBank(key[1], **self._bank_options)
+        self._banks.move_to_end(key)
+        while len(self._banks) > self.max_banks:
+            self._banks.popitem(last=False)
+        return bank
+
+
+_cache: Optional[FillerCache] = None
+
+
+def get_filler_cache() -> FillerCache:
+    global _cache
+    if _cache is None:
+        _cache = FillerCache()
+    return _cache
@@ -10,6 +10,12 @@ Uses a fast LLM to generate 1-5 word fillers like:
 
 Supports multiple providers: openai, anthropic, google, groq
 
+Fillers are looked up in a per-agent, per-language phrase bank first
+(see filler_cache.py); the LLM is only called on a cache miss and its
+output is written back for later turns. Fillers generated without any
+conversation context go to the shared bank; ones prompted with this call's
+transcript stay in a bank private to the call.
+
 This plugin adds a FillerProcessor to the pipeline at PRE_LLM priority.
 The processor intercepts TranscriptionFrame (final user speech) and generates
 a filler response BEFORE the LLM starts processing, reducing perceived latency.
@@ -25,7 +31,9 @@ from typing import TYPE_CHECKING, Any, List, Optional, Set
 from pipecat.frames.frames import Frame, TranscriptionFrame, TTSSpeakFrame
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 
+from super.core.utils.latency_histogram import LatencyHistogram
 from super.core.voice.plugins.base import PipelinePlugin, PluginConfig, PluginPriority
+from super.core.voice.plugins.filler_cache import FillerBank, get_filler_cache
 
 if TYPE_CHECKING:
     from super.core.voice.pipecat.lite_handler import LiteVoiceHandler
@@ -77,6 +85,9 @@ Requirements:
 
 Filler response:"""
 
+# Context string when there is no conversation to prompt with yet
+NO_CONTEXT = "No prior context"
+
 
 class FillerProcessor(FrameProcessor):
     """
@@ -84,6 +95,8 @@ class FillerProcessor(FrameProcessor):
 
     Intercepts TranscriptionFrame at PRE_LLM position in the pipeline.
     Generates a quick filler and sends TTSSpeakFrame BEFORE the LLM processes.
+    With a ``bank``, cached fillers are used first and the LLM only runs on
+    a miss.
     """
 
     def __init__(
@@ -98,6 +111,7 @@ class FillerProcessor(FrameProcessor):
         get_context_callback: Any,
         enabled: bool = True,
         logger: Optional[logging.Logger] = None,
+        bank: Optional[FillerBank] = None,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -111,6 +125,9 @@ class FillerProcessor(FrameProcessor):
         self._get_context_callback = get_context_callback
         self._enabled = enabled
         self._logger = logger or logging.getLogger(__name__)
+        self._bank = bank
+        self._session_bank = FillerBank(bank.language, seed=False) if bank else None
+        self._last_filler: Optional[str] = None
 
         # Metrics
         self._total_requests: int = 0
@@ -118,6 +135,10 @@ class FillerProcessor(FrameProcessor):
         self._total_skipped: int = 0
         self._total_timeouts: int = 0
         self._total_latency_ms: float = 0.0
+        self._cache_hits: int = 0
+        self._cache_misses: int = 0
+        self._llm_calls: int = 0
+        self._latency = LatencyHistogram(min_value=0.01, max_value=1e5)
 
     async def process_frame(
         self, frame: Frame, direction: FrameDirection
@@ -169,17 +190,40 @@ class FillerProcessor(FrameProcessor):
         try:
             start_time = time.perf_counter()
 
-            # Generate filler with timeout
-            filler = await asyncio.wait_for(
-                self._generate_filler(text),
-                timeout=self._timeout,
-            )
+            cached = None
+            if self._bank:
+                cached = self._session_bank.lookup(
+                    text, avoid=self._last_filler
+                ) or self._bank.lookup(text, avoid=self._last_filler)
+            if cached:
+                filler, source = cached
+                self._cache_hits += 1
+            else:
+                source = "llm"
+                if self._bank:
+                    self._cache_misses += 1
+                self._llm_calls += 1
+                context_str = self._get_context_callback()
+                # Generate filler with timeout
+                filler = await asyncio.wait_for(
+                    self._generate_filler(text, context_str),
+                    timeout=self._timeout,
+                )
+                if filler and self._bank:
+                    # The prompt carried this caller's transcript, so only
+                    # context-free fillers may be replayed to other calls.
+                    if context_str == NO_CONTEXT:
+                        self._bank.remember(text, filler)
+                    else:
+                        self._session_bank.remember(text, filler)
 
             elapsed_ms = (time.perf_counter() - start_time) * 1000
             self._total_latency_ms += elapsed_ms
 
             if filler:
                 self._total_generated += 1
+                self._last_filler = filler
+                self._latency.observe(elapsed_ms)
                 # Push filler frame downstream - it will flow through to TTS
                 # Since we're in a background task, we push directly to the processor
                 await self.push_frame(
@@ -187,7 +231,7 @@ class FillerProcessor(FrameProcessor):
                     FrameDirection.DOWNSTREAM
                 )
                 self._logger.info(
-                    f"Filler generated in {elapsed_ms:.0f}ms: '{filler}'"
+                    f"Filler ({source}) in {elapsed_ms:.0f}ms: '{filler}'"
                 )
             else:
                 self._logger.debug("No filler generated")
@@ -217,14 +261,13 @@ class FillerProcessor(FrameProcessor):
 
         return False
 
-    async def _generate_filler(self, user_message: str) -> Optional[str]:
+    async def _generate_filler(
+        self, user_message: str, context_str: str = NO_CONTEXT
+    ) -> Optional[str]:
         """Generate filler response using the configured LLM provider."""
         if not self._client:
             return None
 
-        # Get recent context
-        context_str = self._get_context_callback()
-
         # Build prompt
         prompt = FILLER_PROMPT.format(
             context=context_str,
@@ -317,6 +360,7 @@ class FillerProcessor(FrameProcessor):
             if self._total_generated > 0
             else 0.0
         )
+        lookups = self._cache_hits + self._cache_misses
 
         return {
             "total_requests": self._total_requests,
@@ -324,6 +368,12 @@ class FillerProcessor(FrameProcessor):
             "total_skipped": self._total_skipped,
             "total_timeouts": self._total_timeouts,
             "avg_latency_ms": round(avg_latency, 2),
+            "p95_latency_ms": round(self._latency.quantile(0.95), 2),
+            "cache_hits": self._cache_hits,
+            "cache_misses": self._cache_misses,
+            "cache_hit_rate": round(self._cache_hits / lookups, 3) if lookups else 0.0,
+            "llm_calls": self._llm_calls,
+            "llm_calls_saved": self._cache_hits,
             "enabled": self._enabled,
             "provider": self._provider.value,
             "model": self._model,
@@ -356,6 +406,7 @@ class FillerResponsePlugin(PipelinePlugin):
         temperature: LLM temperature (default: 0.7)
         timeout: Filler generation timeout in seconds (default: 0.5)
         skip_patterns: Additional patterns to skip (list of strings)
+        cache: Look up fillers in the phrase bank before the LLM (default: True)
 
     Environment variables:
         FILLER_ENABLED: Enable/disable plugin (true/false)
@@ -365,6 +416,7 @@ class FillerResponsePlugin(PipelinePlugin):
         FILLER_TEMPERATURE: Temperature (default: 0.7)
         FILLER_TIMEOUT: Timeout in seconds (default: 0.5)
         FILLER_SKIP_PATTERNS: Comma-separated patterns to skip
+        FILLER_CACHE_ENABLED: Enable/disable the phrase bank (true/false)
     """
 
     name = "filler"
@@ -445,6 +497,18 @@ class FillerResponsePlugin(PipelinePlugin):
         # Initialize provider client
         await self._init_client()
 
+        cache_enabled = os.getenv(
+            "FILLER_CACHE_ENABLED",
+            str(self.options.get("cache", True)),
+        ).lower() == "true"
+        bank = None
+        if cache_enabled:
+            handler_config = getattr(handler, "config", None) or {}
+            bank = get_filler_cache().bank(
+                str(handler_config.get("agent_id", "")),
+                handler_config.get("language") or "en",
+            )
+
         # Create processor if client initialized successfully
         if self._client and self._config.enabled:
             self._processor = FillerProcessor(
@@ -458,6 +522,7 @@ class FillerResponsePlugin(PipelinePlugin):
                 get_context_callback=self._get_recent_context,
                 enabled=self._config.enabled,
                 logger=self._logger,
+                bank=bank,
             )
             self._logger.info(
                 f"FillerPlugin initialized with processor "
@@ -566,11 +631,11 @@ class FillerResponsePlugin(PipelinePlugin):
     def _get_recent_context(self) -> str:
         """Get last 2 conversation turns for context."""
         if not self._handler or not self._handler.user_state:
-            return "No prior context"
+            return NO_CONTEXT
 
         transcript = getattr(self._handler.user_state, "transcript", [])
         if not transcript:
-            return "No prior context"
+            return NO_CONTEXT
 
         # Get last 2 entries
         recent = transcript[-2:] if len(transcript) >= 2 else transcript
@@ -580,7 +645,7 @@ class FillerResponsePlugin(PipelinePlugin):
             content = entry.get("content", "")[:100]  # Truncate
             context_parts.append(f"{role}: {content}")
 
-        return "\n".join(context_parts) if context_parts else "No prior context"
+        return "\n".join(context_parts) if context_parts else NO_CONTEXT
 
     def get_metrics(self) -> Optional[dict]:
         """Get filler plugin metrics."""
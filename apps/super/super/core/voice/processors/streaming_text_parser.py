@@ -6,7 +6,7 @@ while the LLM is still generating responses. This reduces end-to-end latency by
 500-1500ms compared to waiting for complete responses.
 
 The parser supports structured JSON responses with fields like:
-- spoke_response: Text to be spoken (streamed character-by-character)
+- spoke_response: Text to be spoken (streamed as it arrives)
 - code_blocks: Code snippets (buffered until complete)
 - links: URLs (buffered and validated)
 
@@ -49,6 +49,15 @@ class ParseState(enum.Enum):
     PLAIN_TEXT = "plain_text"
 
 
+# Next character that matters in each parser state.
+_STRING_STOP = re.compile(r'["\\]')
+_NON_SPACE = re.compile(r"\S")
+_KEY_OR_OBJECT_END = re.compile(r'["}]')
+_VALUE_START = re.compile(r'["\[]')
+_BRACKET = re.compile(r"[\[\]]")
+_COMMA_OR_OBJECT_END = re.compile(r"[,}]")
+
+
 @dataclass
 class StreamingTextBuffer:
     """Buffer for accumulating streaming text chunks."""
@@ -61,10 +70,11 @@ class StreamingTextBuffer:
 
 class StreamingTextParser:
     """
-    Character-by-character streaming JSON parser for LLM responses.
+    Streaming JSON parser for LLM responses.
 
     Enables TTS synthesis to begin while LLM is still generating by
-    streaming the `spoke_response` field character-by-character.
+    streaming the `spoke_response` field as it arrives, one segment per
+    incoming chunk.
 
     Supports both JSON structured responses and plain text fallback.
 
@@ -90,12 +100,12 @@ class StreamingTextParser:
         Initialize the streaming parser.
 
         Args:
-            streamable_fields: JSON fields to stream character-by-character.
+            streamable_fields: JSON fields to stream as they arrive.
                               Default: ["spoke_response", "response", "text", "answer"]
             sentence_end_pattern: Regex pattern for sentence boundaries.
                                  Default: r'[.!?]\\s+'
             min_chunk_size: Minimum characters before emitting a chunk.
-                           Default: 1 (character-by-character streaming)
+                           Default: 1 (emit everything as soon as it arrives)
             logger: Optional logger instance.
         """
         self._logger = logger or logging.getLogger(__name__)
@@ -132,6 +142,7 @@ class StreamingTextParser:
         # Buffers
         self.buffer = StreamingTextBuffer()
         self._pending_chunk = ""
+        self._segment_parts: List[str] = []
 
         # Flags
         self._streaming_active = False
@@ -164,6 +175,12 @@ class StreamingTextParser:
         """
         Process a chunk of streaming content.
 
+        The chunk is scanned a run at a time: within each parser state the
+        next significant character is found with a precompiled regex, and
+        everything before it is handled in one step. Streamed text is
+        emitted as whole segments (at most one per string value per call)
+        rather than one chunk per character.
+
         Args:
             content: Text chunk from LLM.
 
@@ -171,240 +188,231 @@ class StreamingTextParser:
             List of text chunks to emit for TTS.
         """
         emitted_chunks: List[str] = []
+        self.buffer.raw_text += content
 
-        for char in content:
-            chunk = await self._process_char(char)
-            if chunk:
-                emitted_chunks.append(chunk)
+        pos = 0
+        while pos < len(content):
+            pos = self._scan(content, pos, emitted_chunks)
 
+        self._close_segment(emitted_chunks)
         return emitted_chunks
 
-    async def _process_char(self, char: str) -> Optional[str]:
+    def _scan(self, content: str, pos: int, emitted_chunks: List[str]) -> int:
         """
-        Process a single character through the state machine.
-
-        Args:
-            char: Single character to process.
+        Advance the state machine over ``content`` from ``pos``.
 
         Returns:
-            Text chunk to emit (if any).
+            Position of the first character not yet consumed.
         """
-        # Accumulate raw text
-        self.buffer.raw_text += char
-
-        # Handle escape sequences in strings
+        # Handle escape sequences in strings: the escaped character is
+        # streamed as-is and never reaches the key/value.
         if self.escape_next:
-            self._pending_chunk += char
             self.escape_next = False
-            return await self._maybe_emit_chunk()
-
-        if char == "\\" and self.in_string:
-            self._pending_chunk += char
-            self.escape_next = True
-            return await self._maybe_emit_chunk()
-
-        # State machine transitions
-        return await self._handle_state(char)
-
-    async def _handle_state(self, char: str) -> Optional[str]:
-        """Handle state machine transitions."""
-        if self.state == ParseState.WAITING_FOR_OBJECT_START:
-            return await self._handle_waiting_for_object(char)
-
-        elif self.state == ParseState.WAITING_FOR_KEY:
-            return await self._handle_waiting_for_key(char)
-
-        elif self.state == ParseState.IN_KEY:
-            return await self._handle_in_key(char)
-
-        elif self.state == ParseState.WAITING_FOR_COLON:
-            return await self._handle_waiting_for_colon(char)
-
-        elif self.state == ParseState.WAITING_FOR_VALUE:
-            return await self._handle_waiting_for_value(char)
-
-        elif self.state == ParseState.IN_STRING_VALUE:
-            return await self._handle_in_string_value(char)
-
-        elif self.state == ParseState.IN_ARRAY_VALUE:
-            return await self._handle_in_array_value(char)
-
-        elif self.state == ParseState.WAITING_FOR_COMMA_OR_END:
-            return await self._handle_waiting_for_comma_or_end(char)
-
-        elif self.state == ParseState.PLAIN_TEXT:
-            return await self._handle_plain_text(char)
-
-        return None
-
-    async def _handle_waiting_for_object(self, char: str) -> Optional[str]:
-        """Handle WAITING_FOR_OBJECT_START state."""
-        if char == "{":
-            self.brace_depth = 1
-            self.state = ParseState.WAITING_FOR_KEY
-        elif not char.isspace():
-            # Not JSON - switch to plain text mode
-            self._logger.debug("Non-JSON response detected, switching to plain text mode")
-            self.state = ParseState.PLAIN_TEXT
-            self._streaming_active = True
-            self._pending_chunk = char
-            return await self._maybe_emit_chunk()
-        return None
-
-    async def _handle_waiting_for_key(self, char: str) -> Optional[str]:
-        """Handle WAITING_FOR_KEY state."""
-        if char == '"':
-            self.in_string = True
-            self.current_key = ""
-            self.state = ParseState.IN_KEY
-        elif char == "}":
-            # Empty object or end
-            self.brace_depth -= 1
-            if self.brace_depth == 0:
-                self.state = ParseState.COMPLETE
-                await self._handle_parse_complete()
-        return None
-
-    async def _handle_in_key(self, char: str) -> Optional[str]:
-        """Handle IN_KEY state."""
-        if char == '"' and not self.escape_next:
-            self.in_string = False
-            self.current_field = self.current_key
-            self.state = ParseState.WAITING_FOR_COLON
-        else:
-            self.current_key += char
-        return None
-
-    async def _handle_waiting_for_colon(self, char: str) -> Optional[str]:
-        """Handle WAITING_FOR_COLON state."""
-        if char == ":":
-            self.state = ParseState.WAITING_FOR_VALUE
-        return None
-
-    async def _handle_waiting_for_value(self, char: str) -> Optional[str]:
-        """Handle WAITING_FOR_VALUE state."""
-        if char == '"':
-            self.in_string = True
-            self.current_value = ""
-            self.state = ParseState.IN_STRING_VALUE
-
-            # Start streaming if this is a streamable field
-            if self.current_field in self._streamable_fields:
+            self._stream_text(content[pos])
+            return pos + 1
+
+        state = self.state
+
+        if state == ParseState.IN_STRING_VALUE or state == ParseState.IN_KEY:
+            match = _STRING_STOP.search(content, pos)
+            end = match.start() if match else len(content)
+            if end > pos:
+                run = content[pos:end]
+                if state == ParseState.IN_KEY:
+                    self.current_key += run
+                else:
+                    self.current_value += run
+                    # Stream if this is a streamable field
+                    if self._streaming_active and self.current_field in self._streamable_fields:
+                        self._stream_text(run)
+                return end
+
+            if content[pos] == "\\":
+                self.escape_next = True
+                self._stream_text("\\")
+            elif state == ParseState.IN_KEY:
+                self.in_string = False
+                self.current_field = self.current_key
+                self.state = ParseState.WAITING_FOR_COLON
+            else:
+                self.in_string = False
+                self._handle_string_complete()
+                self.state = ParseState.WAITING_FOR_COMMA_OR_END
+                # Flush any remaining pending chunk
+                if self._pending_chunk:
+                    self._segment_parts.append(self._pending_chunk)
+                    self._pending_chunk = ""
+                self._close_segment(emitted_chunks)
+            return pos + 1
+
+        if state == ParseState.PLAIN_TEXT:
+            self._stream_text(content[pos:])
+            return len(content)
+
+        if state == ParseState.WAITING_FOR_OBJECT_START:
+            match = _NON_SPACE.search(content, pos)
+            if not match:
+                return len(content)
+            if match.group() == "{":
+                self.brace_depth = 1
+                self.state = ParseState.WAITING_FOR_KEY
+            else:
+                # Not JSON - switch to plain text mode
+                self._logger.debug("Non-JSON response detected, switching to plain text mode")
+                self.state = ParseState.PLAIN_TEXT
                 self._streaming_active = True
-                self._logger.debug(f"Started streaming field: {self.current_field}")
-
-        elif char == "[":
-            self.bracket_depth = 1
-            self.current_value = char
-            self.state = ParseState.IN_ARRAY_VALUE
-
-        elif char == "{":
-            # Nested object - for now treat as string
-            self.brace_depth += 1
-            self.current_value = char
-
-        elif not char.isspace():
-            # Primitive value (number, boolean, null)
-            self.current_value = char
-
-        return None
-
-    async def _handle_in_string_value(self, char: str) -> Optional[str]:
-        """Handle IN_STRING_VALUE state."""
-        if char == '"' and not self.escape_next:
-            self.in_string = False
-            await self._handle_string_complete()
-            self.state = ParseState.WAITING_FOR_COMMA_OR_END
-            # Flush any remaining pending chunk
-            if self._pending_chunk:
-                chunk = self._pending_chunk
                 self._pending_chunk = ""
-                return chunk
-        else:
-            self.current_value += char
-
-            # Stream if this is a streamable field
-            if self._streaming_active and self.current_field in self._streamable_fields:
-                self._pending_chunk += char
-                return await self._maybe_emit_chunk()
-
-        return None
-
-    async def _handle_in_array_value(self, char: str) -> Optional[str]:
-        """Handle IN_ARRAY_VALUE state."""
-        self.current_value += char
-
-        if char == "[":
-            self.bracket_depth += 1
-        elif char == "]":
-            self.bracket_depth -= 1
-            if self.bracket_depth == 0:
-                await self._handle_array_complete()
-                self.state = ParseState.WAITING_FOR_COMMA_OR_END
-
-        return None
-
-    async def _handle_waiting_for_comma_or_end(self, char: str) -> Optional[str]:
-        """Handle WAITING_FOR_COMMA_OR_END state."""
-        if char == ",":
-            self.state = ParseState.WAITING_FOR_KEY
-        elif char == "}":
-            self.brace_depth -= 1
-            if self.brace_depth == 0:
-                self.state = ParseState.COMPLETE
-                await self._handle_parse_complete()
-        return None
-
-    async def _handle_plain_text(self, char: str) -> Optional[str]:
-        """Handle PLAIN_TEXT state (non-JSON responses)."""
-        self._pending_chunk += char
-        return await self._maybe_emit_chunk()
-
-    async def _maybe_emit_chunk(self) -> Optional[str]:
+                self._stream_text(match.group())
+            return match.end()
+
+        if state == ParseState.WAITING_FOR_KEY:
+            match = _KEY_OR_OBJECT_END.search(content, pos)
+            if not match:
+                return len(content)
+            if match.group() == '"':
+                self.in_string = True
+                self.current_key = ""
+                self.state = ParseState.IN_KEY
+            else:
+                # Empty object or end
+                self._close_object()
+            return match.end()
+
+        if state == ParseState.WAITING_FOR_COLON:
+            colon = content.find(":", pos)
+            if colon == -1:
+                return len(content)
+            self.state = ParseState.WAITING_FOR_VALUE
+            return colon + 1
+
+        if state == ParseState.WAITING_FOR_VALUE:
+            match = _VALUE_START.search(content, pos)
+            end = match.start() if match else len(content)
+            skipped = content[pos:end]
+            if skipped:
+                # Nested objects are only counted; a primitive value (number,
+                # boolean, null) keeps its last character.
+                self.brace_depth += skipped.count("{")
+                last = skipped.rstrip()
+                if last:
+                    self.current_value = last[-1]
+            if not match:
+                return len(content)
+            if match.group() == '"':
+                self.in_string = True
+                self.current_value = ""
+                self.state = ParseState.IN_STRING_VALUE
+
+                # Start streaming if this is a streamable field
+                if self.current_field in self._streamable_fields:
+                    self._streaming_active = True
+                    self._logger.debug(f"Started streaming field: {self.current_field}")
+            else:
+                self.bracket_depth = 1
+                self.current_value = "["
+                self.state = ParseState.IN_ARRAY_VALUE
+            return match.end()
+
+        if state == ParseState.IN_ARRAY_VALUE:
+            match = _BRACKET.search(content, pos)
+            if not match:
+                self.current_value += content[pos:]
+                return len(content)
+            self.current_value += content[pos:match.end()]
+            if match.group() == "[":
+                self.bracket_depth += 1
+            else:
+                self.bracket_depth -= 1
+                if self.bracket_depth == 0:
+                    self._handle_array_complete()
+                    self.state = ParseState.WAITING_FOR_COMMA_OR_END
+            return match.end()
+
+        if state == ParseState.WAITING_FOR_COMMA_OR_END:
+            match = _COMMA_OR_OBJECT_END.search(content, pos)
+            if not match:
+                return len(content)
+            if match.group() == ",":
+                self.state = ParseState.WAITING_FOR_KEY
+            else:
+                self._close_object()
+            return match.end()
+
+        # COMPLETE: anything after the JSON object is ignored
+        return len(content)
+
+    def _close_object(self) -> None:
+        self.brace_depth -= 1
+        if self.brace_depth == 0:
+            self.state = ParseState.COMPLETE
+            self._handle_parse_complete()
+
+    def _stream_text(self, text: str) -> None:
         """
-        Emit pending chunk if it meets criteria.
+        Append streamable text to the pending chunk and move every part
+        that is ready to the current segment.
 
-        Criteria:
-        - Minimum chunk size reached, OR
-        - Sentence boundary detected
-
-        Returns:
-            Text chunk to emit (if any).
+        A pending chunk is ready once it reaches ``min_chunk_size`` or
+        contains a sentence boundary, exactly as if the text had been
+        added one character at a time.
         """
-        if not self._pending_chunk:
-            return None
-
-        # Check if we should emit
-        should_emit = False
-
-        # Emit at sentence boundaries for more natural TTS
-        if self._sentence_end_pattern.search(self._pending_chunk):
-            should_emit = True
-
-        # Emit if minimum chunk size reached
-        if len(self._pending_chunk) >= self._min_chunk_size:
-            should_emit = True
-
-        if should_emit:
-            chunk = self._pending_chunk
+        text = self._pending_chunk + text
+        if self._min_chunk_size <= 1:
+            # Every character reaches the minimum size on its own.
+            self._segment_parts.append(text)
             self._pending_chunk = ""
+            return
 
-            # Track metrics
-            self._chunk_count += 1
-            if self._first_chunk_time is None:
-                self._first_chunk_time = time.perf_counter()
-                ttfc = (self._first_chunk_time - self._start_time) * 1000
-                self._logger.debug(f"Time to first chunk: {ttfc:.2f}ms")
+        start = 0
+        checked = len(self._pending_chunk)
+        while checked < len(text):
+            ready_at = min(start + self._min_chunk_size, len(text) + 1)
+            boundary = self._sentence_boundary(text, start, checked, min(ready_at, len(text)))
+            if boundary is not None:
+                ready_at = boundary
+            if ready_at > len(text):
+                break
+            self._segment_parts.append(text[start:ready_at])
+            start = checked = ready_at
+        self._pending_chunk = text[start:]
+
+    def _sentence_boundary(self, text: str, start: int, checked: int, end: int) -> Optional[int]:
+        """
+        Smallest ``stop`` in (checked, end] for which text[start:stop]
+        contains a sentence boundary, or None.
+        """
+        if end <= checked or not self._sentence_end_pattern.search(text[start:end]):
+            return None
+        low, high = checked + 1, end
+        while low < high:
+            middle = (low + high) // 2
+            if self._sentence_end_pattern.search(text[start:middle]):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def _close_segment(self, emitted_chunks: List[str]) -> None:
+        """Emit the text collected since the last segment as one chunk."""
+        if not self._segment_parts:
+            return
+        chunk = "".join(self._segment_parts)
+        self._segment_parts = []
 
-            # Call callback if set
-            if self._on_text_chunk:
-                self._on_text_chunk(chunk)
+        # Track metrics
+        self._chunk_count += 1
+        if self._first_chunk_time is None:
+            self._first_chunk_time = time.perf_counter()
+            ttfc = (self._first_chunk_time - self._start_time) * 1000
+            self._logger.debug(f"Time to first chunk: {ttfc:.2f}ms")
 
-            return chunk
+        # Call callback if set
+        if self._on_text_chunk:
+            self._on_text_chunk(chunk)
 
-        return None
+        emitted_chunks.append(chunk)
 
-    async def _handle_string_complete(self) -> None:
+    def _handle_string_complete(self) -> None:
         """Handle completion of a string value."""
         if not self.current_field:
             return
@@ -421,7 +429,7 @@ class StreamingTextParser:
 
         self._logger.debug(f"Field complete: {self.current_field} ({len(self.current_value)} chars)")
 
-    async def _handle_array_complete(self) -> None:
+    def _handle_array_complete(self) -> None:
         """Handle completion of an array value."""
         if not self.current_field:
             return
@@ -445,7 +453,7 @@ class StreamingTextParser:
         except json.JSONDecodeError as e:
             self._logger.warning(f"Failed to parse array for {self.current_field}: {e}")
 
-    async def _handle_parse_complete(self) -> None:
+    def _handle_parse_complete(self) -> None:
         """Handle completion of entire JSON parsing."""
         self._response_complete = True
 
@@ -637,7 +645,7 @@ def create_streaming_parser_processor(
 
     Args:
         streamable_fields: JSON fields to stream. Default: spoke_response, response, text, answer, content
-        min_chunk_size: Minimum characters per chunk. Default: 1 (character streaming)
+        min_chunk_size: Minimum characters per chunk. Default: 1 (no buffering)
         enabled: Whether to enable streaming. Default: True
         logger: Optional logger.
 
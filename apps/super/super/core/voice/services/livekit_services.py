@@ -43,6 +43,7 @@ from super.core.voice.services.service_common import (
     validate_google_model,
 )
 from super.core.voice.prompts.language_accent import LANGUAGE_ACCENT_PROMPT
+from super.core.voice.services.warm_pool import get_service_pool, service_key
 from time import perf_counter
 
 load_dotenv(override=True)
@@ -752,6 +753,46 @@ class LiveKitServiceFactory:
             return self._create_inference_tts()
         return self._create_plugin_tts()
 
+    # =========================================================================
+    # Warm Service Pool
+    # =========================================================================
+
+    # Factory config options the STT/TTS builders read beyond the typed configs
+    POOL_CONFIG_KEYS = ("aws_region",)
+
+    def _pool_key(self, service_type: str) -> tuple:
+        cfg = self.stt_config if service_type == "stt" else self.tts_config
+        options = {k: self.config.get(k) for k in self.POOL_CONFIG_KEYS}
+        return service_key(
+            service_type, cfg, self._should_use_inference(service_type), options
+        )
+
+    def _acquire_pooled(self, service_type: str) -> Any:
+        """
+        Take a pre-warmed STT/TTS instance for this config from the worker's
+        pool. Returns None on a miss, and the caller builds on demand.
+        """
+        service = get_service_pool().acquire(self._pool_key(service_type))
+        if service is None:
+            return None
+        self._logger.info(f"{service_type.upper()}: warm pool hit")
+        try:
+            if getattr(self.service_modes, f"{service_type}_type") != "inference":
+                setattr(self.service_modes, f"{service_type}_provider", service.provider)
+        except Exception:
+            pass
+        return service
+
+    def fill_pool(self) -> int:
+        """
+        Build STT/TTS instances for this config into the worker's pool. Called
+        from the process prewarm, before the job that will take them arrives.
+        """
+        pool = get_service_pool()
+        return pool.fill(self._pool_key("stt"), self.create_stt) + pool.fill(
+            self._pool_key("tts"), self.create_tts
+        )
+
     # =========================================================================
     # Service Creation with Retry Logic
     # =========================================================================
@@ -775,6 +816,10 @@ class LiveKitServiceFactory:
             os.getenv("STT_RETRY_BACKOFF", self.config.get("stt_retry_backoff", 0.5))
         )
 
+        pooled = self._acquire_pooled("stt")
+        if pooled is not None:
+            return pooled
+
         # Try primary provider first
         for attempt in range(1, max_retries + 1):
             try:
@@ -975,6 +1020,10 @@ class LiveKitServiceFactory:
             os.getenv("TTS_RETRY_BACKOFF", self.config.get("tts_retry_backoff", 0.5))
         )
 
+        pooled = self._acquire_pooled("tts")
+        if pooled is not None:
+            return pooled
+
         for attempt in range(1, max_retries + 1):
             try:
                 service = self.create_tts()
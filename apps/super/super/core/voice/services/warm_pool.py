@@ -0,0 +1,204 @@
+"""
+Per-worker pool of pre-built STT/TTS service instances.
+
+Building a plugin service for a call pays for the plugin import and, on
+first use, the TLS/websocket handshake with the provider. LiveKit runs
+each job in its own worker process, so instances built during a call
+never serve another one. Instead the pool is filled from the process
+prewarm, before any job is assigned, for the service configs listed in
+``LIVEKIT_WARM_POOL_CONFIGS``:
+
+- Instances are keyed by service kind, inference/plugin mode, provider,
+  model, voice, language, the remaining typed-config options and the
+  factory config options the builders read (e.g. ``aws_region``).
+- Prewarm runs without an event loop, so instances are only constructed
+  there. The session that takes one calls ``prewarm()`` on it, which
+  starts the connection handshake while the rest of the session is set up.
+- An instance is handed out at most once; the session that takes it owns
+  and closes it. Nothing is rebuilt after a take or after an on-demand
+  build, since the process ends with its job.
+- Instances idle for longer than ``max_idle_seconds`` are dropped on
+  acquire.
+- A miss returns None and the caller builds on demand as before.
+
+LLM clients are not pooled: they are plain HTTP clients and carry
+per-session options such as the prompt cache key.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger("livekit.services.pool")
+
+WARM_POOL_SIZE = int(os.getenv("LIVEKIT_WARM_POOL_SIZE", "1"))
+WARM_POOL_MAX_KEYS = int(os.getenv("LIVEKIT_WARM_POOL_MAX_KEYS", "32"))
+WARM_POOL_MAX_IDLE_SECONDS = float(os.getenv("LIVEKIT_WARM_POOL_MAX_IDLE_SECONDS", "3600"))
+
+PoolKey = Tuple[Hashable, ...]
+Builder = Callable[[], Any]
+
+
+def service_key(
+    kind: str, cfg: Any, use_inference: bool, options: Optional[Dict[str, Any]] = None
+) -> PoolKey:
+    """Pool key for an STTConfig/TTSConfig, the mode it is built in and the
+    factory config options its builder reads."""
+    extra = tuple(sorted((k, repr(v)) for k, v in (cfg.extra or {}).items()))
+    opts = tuple(sorted((k, repr(v)) for k, v in (options or {}).items()))
+    return (
+        kind,
+        use_inference,
+        cfg.provider,
+        cfg.model,
+        getattr(cfg, "voice", None),
+        cfg.language,
+        extra,
+        opts,
+    )
+
+
+def warm_pool_configs() -> List[Dict[str, Any]]:
+    """Model configs to fill the pool with, from ``LIVEKIT_WARM_POOL_CONFIGS``
+    (a JSON list of agent model configs)."""
+    raw = os.getenv("LIVEKIT_WARM_POOL_CONFIGS", "").strip()
+    if not raw:
+        return []
+    try:
+        configs = json.loads(raw)
+    except json.JSONDecodeError as e:
+        logger.warning(f"Ignoring invalid LIVEKIT_WARM_POOL_CONFIGS: {e}")
+        return []
+    if isinstance(configs, dict):
+        configs = [configs]
+    return [c for c in configs if isinstance(c, dict)]
+
+
+@dataclass
+class _Idle:
+    service: Any
+    created_at: float
+
+
+class ServiceWarmPool:
+    def __init__(
+        self,
+        size: int = WARM_POOL_SIZE,
+        max_keys: int = WARM_POOL_MAX_KEYS,
+        max_idle_seconds: float = WARM_POOL_MAX_IDLE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.size = size
+        self.max_keys = max_keys
+        self.max_idle_seconds = max_idle_seconds
+        self._clock = clock
+        self._idle: "OrderedDict[PoolKey, Deque[_Idle]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "built": 0, "discarded": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def fill(self, key: PoolKey, builder: Builder) -> int:
+        """
+        Build idle instances for ``key`` up to the pool size. Runs without an
+        event loop (process prewarm); a failed build stops the fill and the
+        key is left to on-demand creation. The least recently filled key
+        beyond ``max_keys`` is dropped.
+
+        Returns:
+            Number of instances built
+        """
+        if not self.enabled:
+            return 0
+        idle = self._idle.setdefault(key, deque())
+        self._idle.move_to_end(key)
+        while len(self._idle) > self.max_keys:
+            _, dropped = self._idle.popitem(last=False)
+            self._stats["discarded"] += len(dropped)
+        built = 0
+        while len(idle) < self.size:
+            try:
+                service = builder()
+            except Exception as e:
+                logger.warning(f"Warm pool build failed for {key[:4]}: {e}")
+                break
+            idle.append(_Idle(service, self._clock()))
+            built += 1
+        self._stats["built"] += built
+        return built
+
+    def acquire(self, key: PoolKey) -> Optional[Any]:
+        """
+        Take a ready instance for ``key`` and start its connection, or None
+        on a miss. Must be called from the session's event loop.
+        """
+        if not self.enabled:
+            return None
+        idle = self._idle.get(key)
+        now = self._clock()
+        while idle:
+            entry = idle.popleft()
+            if now - entry.created_at > self.max_idle_seconds:
+                self._discard(entry.service)
+                continue
+            try:
+                prewarm = getattr(entry.service, "prewarm", None)
+                if prewarm is not None:
+                    prewarm()
+            except Exception as e:
+                logger.debug(f"Warm pool prewarm failed for {key[:4]}: {e}")
+                self._discard(entry.service)
+                continue
+            self._stats["hits"] += 1
+            return entry.service
+        self._stats["misses"] += 1
+        return None
+
+    def _discard(self, service: Any) -> None:
+        self._stats["discarded"] += 1
+        aclose = getattr(service, "aclose", None)
+        if aclose is None:
+            return
+        try:
+            asyncio.get_running_loop().create_task(aclose())
+        except Exception as e:
+            logger.debug(f"Error closing pooled service: {e}")
+
+    async def aclose(self) -> None:
+        """Close every idle instance."""
+        for idle in self._idle.values():
+            for entry in idle:
+                aclose = getattr(entry.service, "aclose", None)
+                if aclose is not None:
+                    try:
+                        await aclose()
+                    except Exception as e:
+                        logger.debug(f"Error closing pooled service: {e}")
+        self._idle.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["idle"] = sum(len(idle) for idle in self._idle.values())
+        stats["keys"] = len(self._idle)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+_pool: Optional[ServiceWarmPool] = None
+_pool_pid: Optional[int] = None
+
+
+def get_service_pool() -> ServiceWarmPool:
+    """The warm pool of this worker process."""
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        _pool = ServiceWarmPool()
+        _pool_pid = os.getpid()
+    return _pool
@@ -3,12 +3,19 @@ Batch Evaluation Script for Voice Recordings - MongoDB Version
 
 This script processes all audio recordings in the db-and-recordings directory,
 evaluates them, and saves the results to MongoDB.
+
+Usage:
+    python batch_evaluate_recordings.py              # one worker per CPU core
+    python batch_evaluate_recordings.py --workers 1  # sequential, in-process
 """
 
+import argparse
 import asyncio
 import json
+import multiprocessing
 import os
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Union
@@ -20,11 +27,18 @@ from super_services.libs.core.model import *  # This applies the OID patch
 from super_services.db.services import *  # This initializes the connection
 from super_services.db.services.models.voice_evaluation import (
     CallSessionModel, CallSessionBaseModel,
-    ConversationTurnModel, ConversationTurnBaseModel,
+    ConversationTurnModel,
     CallEvaluationResultModel,
     CallQualityMetricsModel
 )
 from bson import ObjectId
+from pymongo import UpdateOne
+
+WHISPER_MODEL_NAME = os.getenv("EVAL_WHISPER_MODEL", "tiny")
+
+# Loaded once per process (the main process, or each pool worker)
+_whisper_model = None
+_worker_evaluator: Optional["BatchRecordingEvaluator"] = None
 
 
 def parse_timestamp(timestamp: Union[str, float, int]) -> datetime:
@@ -47,6 +61,43 @@ def parse_timestamp(timestamp: Union[str, float, int]) -> datetime:
         raise ValueError(f"Unsupported timestamp format: {type(timestamp)}")
 
 
+def _get_whisper_model(model_name: str = WHISPER_MODEL_NAME):
+    """Load the Whisper model on first use and reuse it for every later recording."""
+    global _whisper_model
+    if _whisper_model is None:
+        import whisper
+        import torch
+
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        print(f"⚡ Loading Whisper {model_name} model on {device} (pid {os.getpid()})...")
+        _whisper_model = whisper.load_model(model_name).to(device)
+    return _whisper_model
+
+
+def _init_worker(model_name: str) -> None:
+    """Process pool initializer: one evaluator and one ASR model per worker."""
+    global _worker_evaluator
+    _worker_evaluator = BatchRecordingEvaluator()
+    try:
+        _get_whisper_model(model_name)
+    except Exception as e:
+        # Recordings with stored transcripts don't need Whisper
+        print(f"⚠️ Whisper unavailable in worker {os.getpid()}: {e}")
+
+
+def _process_recording_in_worker(audio_path: str) -> Dict:
+    """Process pool entrypoint for a single recording."""
+    return asyncio.run(_worker_evaluator.process_recording(Path(audio_path)))
+
+
+def _report_progress(done: int, total: int, failed: int, started_at: float) -> None:
+    elapsed = max(time.time() - started_at, 1e-6)
+    rate = done / elapsed
+    eta = (total - done) / rate if rate else 0.0
+    print(f"📈 Progress: {done}/{total} ({done / total:.1%}) | failed: {failed} | "
+          f"{rate:.2f} recordings/s | elapsed {elapsed:.1f}s | ETA {eta:.1f}s")
+
+
 class BatchRecordingEvaluator:
     def __init__(self):
         self.base_dir = Path(__file__).parent
@@ -155,19 +206,12 @@ class BatchRecordingEvaluator:
             # PRIORITY 3: Fall back to Whisper if no transcript is found
             print("🔊 Step 3: Attempting to transcribe audio with Whisper (lowest quality, slowest)...")
             try:
-                import whisper
-                import torch
-
-                device = "cuda" if torch.cuda.is_available() else "cpu"
-                print(f"⚙️ Using device: {device}")
-
                 # Check if audio file is accessible
                 if not audio_path.exists():
                     raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
-                # Using tiny model for fastest CPU processing (lower accuracy but much faster)
-                print("⚡ Loading Whisper tiny model (fastest on CPU, lower accuracy)...")
-                model = whisper.load_model("tiny").to(device)
+                # Tiny model by default for fastest CPU processing; loaded once per process
+                model = _get_whisper_model()
 
                 # Transcribe audio
                 print(f"🎤 Transcribing audio: {audio_path}")
@@ -198,86 +242,162 @@ class BatchRecordingEvaluator:
             traceback.print_exc()
             return []
 
-    async def _process_turn(self, session_id: str, turn_number: int, role: str,
-                     content: str, timestamp: float) -> None:
+    def _save_turns(self, session_id: str, transcript: List[Dict]) -> int:
         """
-        Process a single conversation turn and save it to MongoDB.
+        Save every conversation turn of a transcript to MongoDB in one bulk write.
+
+        Segments alternate user/assistant; an assistant turn carries the user
+        text of the turn before it.
 
         Args:
             session_id: ID of the session
-            turn_number: Turn number in the conversation
-            role: Role of the speaker ('user' or 'assistant')
-            content: Text content of the turn
-            timestamp: Timestamp of the turn
+            transcript: Transcript segments with content and timestamp
+
+        Returns:
+            Number of turns written
         """
-        print(f"🔧 Processing turn {turn_number} for session {session_id}")
-        print(f"📝 Role: {role}, Timestamp: {timestamp}, Content: {content[:50]}...")
+        existing_turns = {
+            turn.turn_number: turn
+            for turn in ConversationTurnModel.find(session_id=session_id)
+        }
+        saved_user_text: Dict[int, str] = {}
+        operations = []
+        now = datetime.utcnow()
+
+        print(f"📊 Transcript segments to process: {len(transcript)}")
+        for i, segment in enumerate(transcript, 1):
+            # Determine if it's a user or assistant turn (alternating)
+            role = "assistant" if i % 2 == 0 else "user"
+
+            # Extract text and timestamp from the segment
+            text = segment.get('content', '').strip()
+            timestamp = segment.get('timestamp', 0)
+
+            # Skip empty segments
+            if not text:
+                print(f"   ⚠️ Empty text in segment {i}, skipping...")
+                continue
 
-        try:
-            # Check if turn already exists - use get()
-            existing = ConversationTurnModel.get(
-                session_id=session_id,
-                turn_number=turn_number
-            )
-
-            # Get the previous turn to link user questions with assistant responses
-            prev_turn = None
-            if turn_number > 1:
-                prev_turn = ConversationTurnModel.get(
-                    session_id=session_id,
-                    turn_number=turn_number - 1
-                )
+            print(f"🔊 Turn {i} ({role}) @ {timestamp}: {text[:50]}...")
+
+            if role == 'user':
+                user_text = text
+            elif i - 1 in saved_user_text:
+                user_text = saved_user_text[i - 1]
+            else:
+                prev_turn = existing_turns.get(i - 1)
+                user_text = prev_turn.user_speech_text if prev_turn else ''
+            saved_user_text[i] = user_text
 
             turn_data = {
                 "session_id": session_id,
-                "turn_number": turn_number,
+                "turn_number": i,
                 "turn_start_time": timestamp - 5,  # 5 seconds before the response
                 "turn_end_time": timestamp,
-                "user_speech_text": content if role == 'user' else (prev_turn.user_speech_text if prev_turn else ''),
-                "llm_response_text": content if role == 'assistant' else '',
+                "user_speech_text": user_text,
+                "llm_response_text": text if role == 'assistant' else '',
                 "voice_to_voice_response_time": 5.0,
                 "interrupted": False,
-                "wav_audio": None
+                "wav_audio": None,
+                "modified": now,
             }
+            operations.append(UpdateOne(
+                {"session_id": session_id, "turn_number": i},
+                {"$set": turn_data, "$setOnInsert": {"created": now}},
+                upsert=True
+            ))
+
+        if operations:
+            ConversationTurnModel._get_collection().bulk_write(operations, ordered=False)
+        print(f"✅ Saved {len(operations)} turns in one bulk write")
+        return len(operations)
+
+    async def run(self, workers: int = 1, model_name: str = WHISPER_MODEL_NAME) -> List[Dict]:
+        """
+        Process all unprocessed recordings.
 
-            if existing:
-                ConversationTurnModel._get_collection().update_one(
-                    {"session_id": session_id, "turn_number": turn_number},
-                    {"$set": turn_data}
-                )
-            else:
-                # Add id for MongoDB
-                turn_data["id"] = ObjectId()
-                turn = ConversationTurnBaseModel(**turn_data)
-                ConversationTurnModel.save(turn)
-
-            print(f"✅ Turn {turn_number} saved successfully")
-        except Exception as e:
-            print(f"❌ Error processing turn {turn_number}: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            raise
-
-    async def run(self):
-        """Process all unprocessed recordings."""
+        Args:
+            workers: Number of worker processes; 1 processes recordings in-process
+            model_name: Whisper model loaded once per worker for recordings without transcripts
+        """
         unprocessed = self.get_unprocessed_recordings()
         if not unprocessed:
             print("✅ No unprocessed recordings found.")
-            return
+            return []
 
         print(f"🔍 Found {len(unprocessed)} unprocessed recordings")
+        if workers > 1:
+            return await self.run_parallel(unprocessed, workers=workers, model_name=model_name)
 
-        for audio_path in unprocessed:
+        results = []
+        failed = 0
+        started_at = time.time()
+        for done, audio_path in enumerate(unprocessed, 1):
             try:
                 result = await self.process_recording(audio_path)
-                if result.get('status') == 'success':
-                    print(f"✅ Successfully processed {audio_path.name}")
-                else:
-                    print(f"❌ Failed to process {audio_path.name}: {result.get('error', 'Unknown error')}")
             except Exception as e:
-                print(f"❌ Error processing {audio_path.name}: {str(e)}")
                 import traceback
                 traceback.print_exc()
+                result = {"status": "error", "error": str(e)}
+            failed += self._log_result(audio_path, result)
+            results.append(result)
+            _report_progress(done, len(unprocessed), failed, started_at)
+        return results
+
+    async def run_parallel(
+        self,
+        recordings: List[Path],
+        workers: Optional[int] = None,
+        model_name: str = WHISPER_MODEL_NAME,
+    ) -> List[Dict]:
+        """
+        Shard recordings across a process pool, one worker per CPU core by default.
+
+        Each worker loads the ASR model once in its initializer and keeps it
+        for every recording it is handed, instead of reloading per recording.
+        """
+        workers = min(workers or os.cpu_count() or 1, len(recordings))
+        print(f"🚀 Processing {len(recordings)} recordings with {workers} worker processes")
+
+        loop = asyncio.get_running_loop()
+        results = []
+        failed = 0
+        started_at = time.time()
+        # spawn: neither the Mongo client nor torch survive a fork safely
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name,),
+        ) as pool:
+
+            async def _run_one(audio_path: Path):
+                try:
+                    result = await loop.run_in_executor(pool, _process_recording_in_worker, str(audio_path))
+                except Exception as e:
+                    result = {"status": "error", "error": str(e)}
+                return audio_path, result
+
+            pending = [_run_one(audio_path) for audio_path in recordings]
+            for done, next_result in enumerate(asyncio.as_completed(pending), 1):
+                audio_path, result = await next_result
+                failed += self._log_result(audio_path, result)
+                results.append(result)
+                _report_progress(done, len(recordings), failed, started_at)
+
+        elapsed = time.time() - started_at
+        print(f"🏁 Processed {len(recordings)} recordings in {elapsed:.1f}s "
+              f"({len(recordings) / max(elapsed, 1e-6):.2f} recordings/s, {workers} workers)")
+        return results
+
+    @staticmethod
+    def _log_result(audio_path: Path, result: Dict) -> int:
+        """Print the outcome of one recording; returns 1 if it failed."""
+        if result.get('status') == 'success':
+            print(f"✅ Successfully processed {audio_path.name}")
+            return 0
+        print(f"❌ Failed to process {audio_path.name}: {result.get('error', 'Unknown error')}")
+        return 1
 
     async def process_recording(self, audio_path: Path) -> Dict:
         """Process a single audio recording and store evaluation results."""
@@ -332,85 +452,16 @@ class BatchRecordingEvaluator:
                 session = CallSessionBaseModel(**session_data)
                 CallSessionModel.save(session)
 
-            # Process each turn in the transcript
-            print(f"📊 Transcript segments to process: {len(transcript)}")
-            for i, segment in enumerate(transcript, 1):
-                # Determine if it's a user or assistant turn (alternating)
-                role = "assistant" if i % 2 == 0 else "user"
-
-                # Extract text and timestamp from the segment
-                text = segment.get('content', '').strip()
-                timestamp = segment.get('timestamp', 0)
-
-                # Log the raw segment for debugging
-                print(f"🔍 Raw segment {i}:")
-                print(f"   Text: {text}")
-                print(f"   Timestamp: {timestamp}")
-                print(f"   Role: {role}")
-
-                # Skip empty segments
-                if not text:
-                    print("   ⚠️ Empty text, skipping...")
-                    continue
-
-                print(f"🔊 Processing turn {i} ({role}): {text[:50]}...")
+            # Save every turn of the transcript in one bulk write
+            turns_processed = self._save_turns(session_id, transcript)
 
-                await self._process_turn(
-                    session_id=session_id,
-                    turn_number=i,
-                    role=role,
-                    content=text,
-                    timestamp=timestamp
-                )
-                turns_processed += 1
-
-            # Extract and save audio chunks for each turn
+            # Extract and save audio chunks for each turn from a single read of the recording
             print(f"\n🎵 Extracting audio chunks for each turn from {audio_path.name}...")
             try:
-                import wave
-                import io
-
                 # Read all turns from MongoDB to get timestamps - use keyword args
                 turns = list(ConversationTurnModel.find(session_id=session_id))
                 turns.sort(key=lambda x: x.turn_number)
-
-                with wave.open(str(audio_path), 'rb') as wav_file:
-                    framerate = wav_file.getframerate()
-                    n_channels = wav_file.getnchannels()
-                    sampwidth = wav_file.getsampwidth()
-
-                    for turn in turns:
-                        try:
-                            # Calculate frame positions
-                            start_frame = int(turn.turn_start_time * framerate)
-                            end_frame = int(turn.turn_end_time * framerate)
-
-                            # Set position and read frames
-                            wav_file.setpos(start_frame)
-                            frames = wav_file.readframes(end_frame - start_frame)
-
-                            # Create a new WAV in memory
-                            output = io.BytesIO()
-                            with wave.open(output, 'wb') as out_wav:
-                                out_wav.setnchannels(n_channels)
-                                out_wav.setsampwidth(sampwidth)
-                                out_wav.setframerate(framerate)
-                                out_wav.writeframes(frames)
-
-                            audio_chunk = output.getvalue()
-
-                            # Update the turn with audio data in MongoDB using pymongo collection
-                            ConversationTurnModel._get_collection().update_one(
-                                {"session_id": session_id, "turn_number": turn.turn_number},
-                                {"$set": {"wav_audio": audio_chunk}}
-                            )
-
-                            print(f"   ✅ Saved audio chunk for turn {turn.turn_number} ({len(audio_chunk)} bytes)")
-
-                        except Exception as e:
-                            print(f"   ⚠️ Error extracting audio for turn {turn.turn_number}: {e}")
-
-                print(f"✅ Audio chunks saved for all {len(turns)} turns")
+                self.evaluator.save_turn_audio_chunks(session_id, str(audio_path), turns)
 
             except Exception as e:
                 print(f"❌ Error processing audio chunks: {e}")
@@ -452,8 +503,15 @@ class BatchRecordingEvaluator:
 
 
 async def main():
+    parser = argparse.ArgumentParser(description="Batch evaluate voice recordings")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count, 1 = sequential)")
+    parser.add_argument("--model", default=WHISPER_MODEL_NAME,
+                        help="Whisper model used when no transcript is stored")
+    args = parser.parse_args()
+
     evaluator = BatchRecordingEvaluator()
-    await evaluator.run()
+    await evaluator.run(workers=args.workers, model_name=args.model)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,224 @@
+"""
+QA Matcher Index
+Pre-built lookup structures over an agent's ground-truth QA pairs.
+
+VoiceCallEvaluator used to scan every QA pair for every turn (keyword
+substring tests, difflib fuzzy matching and a full similarity re-score).
+This index is built once per QA set and answers the same questions with:
+- an Aho-Corasick automaton over keywords and answers (exact, single pass)
+- a TF-IDF inverted index over questions that shortlists candidates before
+  the expensive character-level similarity is computed on the shortlist only
+"""
+
+import hashlib
+import heapq
+import math
+import threading
+from collections import OrderedDict, defaultdict
+from difflib import get_close_matches
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from super.core.utils.keyword_automaton import KeywordAutomaton
+
+DEFAULT_SHORTLIST_SIZE = 32
+MAX_CACHED_INDEXES = 32
+# Terms present in more than this fraction of questions carry almost no
+# ranking signal but dominate shortlist cost, so they are not posted.
+MAX_TERM_DOC_RATIO = 0.5
+
+
+def _question_features(text: str) -> Dict[str, int]:
+    """Word tokens plus character trigrams of normalised text (term -> tf)."""
+    features: Dict[str, int] = defaultdict(int)
+    for word in text.split():
+        features["w:" + word] += 1
+    padded = f" {text} "
+    for i in range(len(padded) - 2):
+        features["c:" + padded[i:i + 3]] += 1
+    return features
+
+
+class QAMatcherIndex:
+    """
+    Index over ground-truth QA pairs used by VoiceCallEvaluator.
+
+    Keyword and answer lookups are exact and keep the evaluator's
+    first-match semantics (lowest QA index wins ties). Question similarity
+    lookups re-score a TF-IDF shortlist with the caller's scorer; when the
+    QA set is no larger than the shortlist every pair is scored, so results
+    are identical to a full scan.
+    """
+
+    def __init__(self, qa_pairs: List[Dict[str, Any]], shortlist_size: int = DEFAULT_SHORTLIST_SIZE):
+        self.qa_pairs = qa_pairs
+        self.shortlist_size = shortlist_size
+
+        self._keywords = KeywordAutomaton()
+        self._keyword_owners: Dict[int, List[int]] = defaultdict(list)
+        self._answers = KeywordAutomaton()
+        self._answer_owners: Dict[int, List[int]] = defaultdict(list)
+        self._questions: List[str] = []
+        self._question_first_index: Dict[str, int] = {}
+        self._scorable: List[int] = []
+
+        for idx, qa in enumerate(qa_pairs):
+            for keyword in qa.get('keywords') or []:
+                self._keyword_owners[self._keywords.add(keyword.lower())].append(idx)
+
+            if 'answer' in qa:
+                self._answer_owners[self._answers.add(qa['answer'].lower())].append(idx)
+
+            question = str(qa.get('question', '')).lower()
+            self._questions.append(question)
+            self._question_first_index.setdefault(question, idx)
+
+            if 'question' in qa and 'answer' in qa:
+                self._scorable.append(idx)
+
+        self._keywords.build()
+        self._answers.build()
+        self._build_question_vectors()
+
+    def __len__(self) -> int:
+        return len(self.qa_pairs)
+
+    def _build_question_vectors(self) -> None:
+        doc_features = [_question_features(q.strip()) for q in self._questions]
+        doc_freq: Dict[str, int] = defaultdict(int)
+        for features in doc_features:
+            for term in features:
+                doc_freq[term] += 1
+
+        n_docs = len(doc_features)
+        self._idf = {term: math.log((1 + n_docs) / (1 + df)) + 1.0 for term, df in doc_freq.items()}
+
+        max_df = max(self.shortlist_size, int(n_docs * MAX_TERM_DOC_RATIO))
+        self._postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for idx, features in enumerate(doc_features):
+            weights = {term: tf * self._idf[term] for term, tf in features.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for term, weight in weights.items():
+                if doc_freq[term] <= max_df:
+                    self._postings[term].append((idx, weight / norm))
+
+    def shortlist(self, text: str, candidates: Optional[List[int]] = None) -> List[int]:
+        """
+        Return QA indices most similar to ``text`` by TF-IDF cosine, in index order.
+
+        Args:
+            text: Text to compare against the QA questions
+            candidates: Restrict results to these indices (defaults to all)
+        """
+        pool = list(range(len(self.qa_pairs))) if candidates is None else candidates
+        if len(pool) <= self.shortlist_size:
+            return pool
+
+        allowed = None if candidates is None else set(candidates)
+        query = _question_features(text.lower().strip())
+        scores: Dict[int, float] = defaultdict(float)
+        for term, tf in query.items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            weight = tf * self._idf[term]
+            for idx, doc_weight in postings:
+                if allowed is None or idx in allowed:
+                    scores[idx] += weight * doc_weight
+
+        top = heapq.nlargest(self.shortlist_size, scores.items(), key=lambda item: (item[1], -item[0]))
+        return sorted(idx for idx, _ in top)
+
+    def best_keyword_match(self, text: str, min_score: int = 2) -> Tuple[Optional[Dict[str, Any]], int]:
+        """
+        Find the QA pair with the most keywords contained in ``text``.
+
+        Returns:
+            (qa, score) for the first QA pair with the highest score if that
+            score reaches ``min_score``, otherwise (None, 0)
+        """
+        counts: Dict[int, int] = defaultdict(int)
+        for keyword_id in self._keywords.find_ids(text.lower()):
+            for idx in self._keyword_owners[keyword_id]:
+                counts[idx] += 1
+
+        if not counts:
+            return None, 0
+        best_idx = min(counts, key=lambda idx: (-counts[idx], idx))
+        if counts[best_idx] < min_score:
+            return None, 0
+        return self.qa_pairs[best_idx], counts[best_idx]
+
+    def first_answer_in(self, text: str) -> Optional[Dict[str, Any]]:
+        """Return the first QA pair whose answer is contained in ``text``."""
+        owners = [
+            idx
+            for answer_id in self._answers.find_ids(text.lower())
+            for idx in self._answer_owners[answer_id]
+        ]
+        return self.qa_pairs[min(owners)] if owners else None
+
+    def closest_question(self, text: str, cutoff: float = 0.6) -> Optional[Dict[str, Any]]:
+        """difflib.get_close_matches over the shortlisted questions."""
+        text_lower = text.lower()
+        candidates = [self._questions[idx] for idx in self.shortlist(text_lower)]
+        matches = get_close_matches(text_lower, candidates, n=1, cutoff=cutoff)
+        if not matches:
+            return None
+        return self.qa_pairs[self._question_first_index[matches[0]]]
+
+    def most_similar_question(
+            self,
+            text: str,
+            scorer: Callable[[str, str], float],
+    ) -> Tuple[float, Optional[Dict[str, Any]]]:
+        """
+        Re-score shortlisted QA pairs (with both question and answer) with ``scorer``.
+
+        Returns:
+            (best_score, qa) with the first QA pair winning ties, or (0.0, None)
+        """
+        best_score, best_qa = 0.0, None
+        for idx in self.shortlist(text, candidates=self._scorable):
+            qa = self.qa_pairs[idx]
+            score = scorer(text, qa['question'])
+            if best_qa is None or score > best_score:
+                best_score, best_qa = score, qa
+        return best_score, best_qa
+
+
+_index_cache: "OrderedDict[str, QAMatcherIndex]" = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def _fingerprint(qa_pairs: List[Dict[str, Any]]) -> str:
+    digest = hashlib.md5()
+    for qa in qa_pairs:
+        digest.update(str(qa.get('question', '')).encode("utf-8", "ignore"))
+        digest.update(b"\x1f")
+        digest.update(str(qa.get('answer', '')).encode("utf-8", "ignore"))
+        digest.update(b"\x1f")
+        digest.update("\x1e".join(qa.get('keywords') or []).encode("utf-8", "ignore"))
+        digest.update(b"\x1d")
+    return digest.hexdigest()
+
+
+def get_qa_matcher_index(qa_pairs: List[Dict[str, Any]]) -> QAMatcherIndex:
+    """
+    Return a QAMatcherIndex for ``qa_pairs``, reusing one built for an identical QA set.
+
+    Evaluators are created per call, so the cache keeps the index build to
+    once per agent QA set instead of once per call.
+    """
+    key = _fingerprint(qa_pairs)
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    index = QAMatcherIndex(qa_pairs)
+    with _index_cache_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > MAX_CACHED_INDEXES:
+            _index_cache.popitem(last=False)
+    return index
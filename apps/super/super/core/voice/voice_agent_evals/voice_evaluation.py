@@ -5,11 +5,15 @@ Stores conversation turns, audio, and metrics in MongoDB
 Does NOT depend on post_call.py
 """
 
+import io
+import mmap
 import os
+import struct
 import time
 import json
+import wave
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 from difflib import SequenceMatcher
 
@@ -26,6 +30,9 @@ from super_services.db.services.models.voice_evaluation import (
 )
 from bson import ObjectId
 from mongomantic.core.errors import DoesNotExistError
+from pymongo import UpdateOne
+
+from super.core.voice.voice_agent_evals.qa_matcher import get_qa_matcher_index
 
 # Optional: OpenTelemetry for tracing (like 002-bot-otel.py)
 IS_TRACING_ENABLED = bool(os.getenv("ENABLE_TRACING"))
@@ -48,6 +55,49 @@ if IS_TRACING_ENABLED:
         IS_TRACING_ENABLED = False
 
 
+def _parse_wav_layout(buf) -> Optional[Tuple[int, int, int, int, int]]:
+    """
+    Locate the PCM data chunk of a RIFF/WAVE buffer without copying it.
+
+    Returns:
+        (data_offset, data_size, n_channels, sampwidth, framerate), or None
+        if the buffer is not a PCM WAV file the fast path understands
+    """
+    if len(buf) < 12 or buf[0:4] != b'RIFF' or buf[8:12] != b'WAVE':
+        return None
+
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(buf):
+        chunk_id = buf[offset:offset + 4]
+        (chunk_size,) = struct.unpack_from('<I', buf, offset + 4)
+        body = offset + 8
+        if chunk_id == b'fmt ' and chunk_size >= 16:
+            audio_format, n_channels, framerate, _, _, bits = struct.unpack_from('<HHIIHH', buf, body)
+            # 1 = PCM, 0xFFFE = WAVE_FORMAT_EXTENSIBLE (PCM sub-format)
+            if audio_format not in (1, 0xFFFE) or not n_channels or bits % 8:
+                return None
+            fmt = (n_channels, bits // 8, framerate)
+        elif chunk_id == b'data':
+            if fmt is None:
+                return None
+            data_size = min(chunk_size, len(buf) - body)
+            return (body, data_size) + fmt
+        # Chunks are word aligned
+        offset = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+def _to_wav_bytes(frames: bytes, n_channels: int, sampwidth: int, framerate: int) -> bytes:
+    output = io.BytesIO()
+    with wave.open(output, 'wb') as out_wav:
+        out_wav.setnchannels(n_channels)
+        out_wav.setsampwidth(sampwidth)
+        out_wav.setframerate(framerate)
+        out_wav.writeframes(frames)
+    return output.getvalue()
+
+
 class VoiceCallEvaluator:
     """
     Independent Voice Call Evaluation System
@@ -76,6 +126,8 @@ class VoiceCallEvaluator:
 
         # Load QA pairs from MongoDB for this agent
         self.ground_truth = self._load_qa_pairs_from_db()
+        # Index is built once per QA set and shared by evaluators of the same agent
+        self.qa_index = get_qa_matcher_index(self.ground_truth)
         print(f"✅ VoiceCallEvaluator initialized for agent: {agent_id}")
 
     def _load_qa_pairs_from_db(self) -> List[Dict[str, Any]]:
@@ -151,9 +203,6 @@ class VoiceCallEvaluator:
             bytes: WAV audio chunk as bytes, or None if extraction fails
         """
         try:
-            import wave
-            import io
-
             with wave.open(wav_file_path, 'rb') as wav_file:
                 framerate = wav_file.getframerate()
                 n_channels = wav_file.getnchannels()
@@ -168,19 +217,91 @@ class VoiceCallEvaluator:
                 frames = wav_file.readframes(end_frame - start_frame)
 
                 # Create a new WAV in memory
-                output = io.BytesIO()
-                with wave.open(output, 'wb') as out_wav:
-                    out_wav.setnchannels(n_channels)
-                    out_wav.setsampwidth(sampwidth)
-                    out_wav.setframerate(framerate)
-                    out_wav.writeframes(frames)
-
-                return output.getvalue()
+                return _to_wav_bytes(frames, n_channels, sampwidth, framerate)
 
         except Exception as e:
             print(f"⚠️ Error extracting audio chunk: {e}")
             return None
 
+    def extract_audio_chunks(
+            self,
+            wav_file_path: str,
+            spans: List[Tuple[float, float]],
+    ) -> List[Optional[bytes]]:
+        """
+        Extract many chunks from one WAV file with a single memory-mapped read.
+
+        Produces the same bytes as calling extract_audio_chunk once per span,
+        without reopening and re-seeking the file for every turn.
+
+        Args:
+            wav_file_path: Path to the WAV file
+            spans: List of (start_time, end_time) in seconds
+
+        Returns:
+            List of WAV chunks (or None for spans that could not be extracted), in span order
+        """
+        try:
+            with open(wav_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                layout = _parse_wav_layout(mm)
+                if layout is None:
+                    # Compressed or unusual WAV - let the wave module handle each span
+                    return [self.extract_audio_chunk(wav_file_path, start, end) for start, end in spans]
+
+                data_offset, data_size, n_channels, sampwidth, framerate = layout
+                frame_size = n_channels * sampwidth
+                n_frames = data_size // frame_size
+
+                chunks = []
+                for start_time, end_time in spans:
+                    try:
+                        start_frame = int(start_time * framerate)
+                        end_frame = int(end_time * framerate)
+                        if start_frame < 0 or start_frame > n_frames:
+                            raise ValueError(f"position {start_frame} not in range")
+
+                        # Like wave.readframes, a negative count reads to the end of the data
+                        end_frame = n_frames if end_frame < start_frame else min(end_frame, n_frames)
+                        frames = mm[data_offset + start_frame * frame_size:data_offset + end_frame * frame_size]
+                        chunks.append(_to_wav_bytes(frames, n_channels, sampwidth, framerate))
+                    except Exception as e:
+                        print(f"⚠️ Error extracting audio chunk {start_time}-{end_time}: {e}")
+                        chunks.append(None)
+                return chunks
+
+        except Exception as e:
+            print(f"⚠️ Error extracting audio chunks: {e}")
+            return [None] * len(spans)
+
+    def save_turn_audio_chunks(self, session_id: str, wav_file_path: str, turns: List[Any]) -> int:
+        """
+        Slice the audio of every turn from the recording and store it in one bulk write.
+
+        Args:
+            session_id: Session the turns belong to
+            wav_file_path: Path to the full call recording
+            turns: ConversationTurnModel documents with turn_start_time / turn_end_time
+
+        Returns:
+            Number of turns updated with audio
+        """
+        chunks = self.extract_audio_chunks(
+            wav_file_path,
+            [(turn.turn_start_time, turn.turn_end_time) for turn in turns]
+        )
+        operations = [
+            UpdateOne(
+                {"session_id": session_id, "turn_number": turn.turn_number},
+                {"$set": {"wav_audio": chunk}}
+            )
+            for turn, chunk in zip(turns, chunks)
+            if chunk
+        ]
+        if operations:
+            ConversationTurnModel._get_collection().bulk_write(operations, ordered=False)
+        print(f"   ✅ Saved audio chunks for {len(operations)}/{len(turns)} turns")
+        return len(operations)
+
     def save_conversation_turn(
             self,
             session_id: str,
@@ -770,6 +891,9 @@ class VoiceCallEvaluator:
             return []
 
         evaluations = []
+        # Written once per call after the loop, one insert per collection
+        eval_results = []
+        not_found_records = []
 
         try:
             for pair in message_pairs:
@@ -812,60 +936,26 @@ class VoiceCallEvaluator:
 
                 # For user messages or user-agent pairs, try to find matching QA pairs
                 if user_question:
-                    user_question_lower = user_question.lower()
-
-                    # First pass: Look for exact keyword matches
-                    for qa in self.ground_truth:
-                        keywords = qa.get('keywords', [])
-                        if not keywords:
-                            continue
-
-                        # Calculate keyword match score
-                        score = sum(1 for k in keywords if k.lower() in user_question_lower)
-
-                        # If we have at least 2 keyword matches, consider it a potential match
-                        if score >= 2 and score > best_score:
-                            best_score = score
-                            matched_qa = qa
+                    # First pass: Look for exact keyword matches (at least 2 keywords)
+                    matched_qa, best_score = self.qa_index.best_keyword_match(user_question, min_score=2)
 
                     # If no good match found, try fuzzy matching on the question
-                    if best_score < 2 and user_question_lower:
-                        from difflib import get_close_matches
-
-                        # Get all questions from QA pairs
-                        all_questions = [qa['question'].lower() for qa in self.ground_truth]
-
-                        # Find closest matching question
-                        matches = get_close_matches(user_question_lower, all_questions, n=1, cutoff=0.6)
-
-                        if matches:
-                            # Find the QA pair with the matching question
-                            matched_qa = next((qa for qa in self.ground_truth
-                                             if qa['question'].lower() == matches[0]), None)
-                            if matched_qa:
-                                best_score = 2  # Set a decent score for fuzzy matches
+                    if best_score < 2:
+                        matched_qa = self.qa_index.closest_question(user_question, cutoff=0.6)
+                        if matched_qa:
+                            best_score = 2  # Set a decent score for fuzzy matches
 
                 # For standalone assistant messages, try to find matching answers
                 elif agent_reply and not user_question:
-                    agent_reply_lower = agent_reply.lower()
-
                     # First try to match with answer content
-                    for qa in self.ground_truth:
-                        if 'answer' in qa and qa['answer'].lower() in agent_reply_lower:
-                            matched_qa = qa
-                            best_score = 3  # High score for direct answer match
-                            break
+                    matched_qa = self.qa_index.first_answer_in(agent_reply)
+                    if matched_qa:
+                        best_score = 3  # High score for direct answer match
 
                     # If no direct answer match, try to match with questions
                     if best_score == 0:
-                        for qa in self.ground_truth:
-                            # Check if any keywords from the QA pair are in the agent's reply
-                            keywords = qa.get('keywords', [])
-                            score = sum(1 for k in keywords if k.lower() in agent_reply_lower)
-
-                            if score >= 2 and score > best_score:
-                                best_score = score
-                                matched_qa = qa
+                        # Check if any keywords from the QA pair are in the agent's reply
+                        matched_qa, best_score = self.qa_index.best_keyword_match(agent_reply, min_score=2)
 
                 # Initialize default values
                 similarity = 0.0
@@ -1003,12 +1093,10 @@ class VoiceCallEvaluator:
                             print(f"   📊 Turn {turn_number} latencies: LLM={eval_data['llm_latency']:.2f}ms, STT={eval_data['stt_latency']:.2f}ms, TTS={eval_data['tts_latency']:.2f}ms")
                             print(f"   ⏱️ Turn {turn_number} TTFB: LLM={eval_data['llm_ttfb']:.4f}s, STT={eval_data['stt_ttfb']:.4f}s, TTS={eval_data['tts_ttfb']:.4f}s")
 
-                    eval_result = CallEvaluationResultBaseModel(**eval_data)
-                    CallEvaluationResultModel.save(eval_result)
-                    print(f"   💾 Saved evaluation for turn {turn_number} to database")
+                    eval_results.append(CallEvaluationResultBaseModel(**eval_data))
 
                 except Exception as e:
-                    print(f"   ⚠️ Error saving evaluation to database: {str(e)}")
+                    print(f"   ⚠️ Error preparing evaluation for database: {str(e)}")
 
                 # Save to questions_not_found collection if question was not matched (independent save)
                 if not question_found and user_question and user_question.strip():
@@ -1021,11 +1109,9 @@ class VoiceCallEvaluator:
                             "user_question": user_question,
                             "agent_reply": agent_reply if agent_reply else ""
                         }
-                        not_found_record = QuestionNotFoundBaseModel(**not_found_data)
-                        QuestionNotFoundModel.save(not_found_record)
-                        print(f"   📝 Saved unmatched question to questions_not_found collection")
+                        not_found_records.append(QuestionNotFoundBaseModel(**not_found_data))
                     except Exception as e:
-                        print(f"   ⚠️ Error saving to questions_not_found: {str(e)}")
+                        print(f"   ⚠️ Error preparing questions_not_found record: {str(e)}")
 
                 evaluations.append(evaluation)
                 print(f"   📊 Evaluation: Similarity={similarity:.1%}, Relevancy={relevancy:.1%}, "
@@ -1035,30 +1121,29 @@ class VoiceCallEvaluator:
                 if not matched_qa and user_question:
                     print(f"   ℹ️ No matching QA pair found, looking for similar questions")
                     try:
-                        similarities = []
-                        for qa in self.ground_truth:
-                            if 'question' in qa and 'answer' in qa:
-                                sim = self._calculate_similarity(user_question, qa['question'])
-                                similarities.append((sim, qa))
-
-                        if similarities:
-                            best_sim, best_qa = max(similarities, key=lambda x: x[0])
-                            if best_sim > 0.3:  # Only use if there's some similarity
-                                eval_question = best_qa.get('question', 'No question')
-                                expected_output = best_qa.get('answer', 'No answer')
-                                similarity = best_sim
-                                relevancy = self._calculate_relevancy(agent_reply, expected_output)
-                                completeness = self._calculate_completeness(agent_reply, expected_output)
-                                accuracy = self._calculate_accuracy(agent_reply, expected_output)
-                                matched_keywords = [k for k in best_qa.get('keywords', [])
-                                                  if k.lower() in user_question.lower()]
-                                print(f"   ℹ️ Using similar question: {eval_question[:80]}...")
+                        best_sim, best_qa = self.qa_index.most_similar_question(
+                            user_question, self._calculate_similarity
+                        )
+
+                        if best_qa and best_sim > 0.3:  # Only use if there's some similarity
+                            eval_question = best_qa.get('question', 'No question')
+                            expected_output = best_qa.get('answer', 'No answer')
+                            similarity = best_sim
+                            relevancy = self._calculate_relevancy(agent_reply, expected_output)
+                            completeness = self._calculate_completeness(agent_reply, expected_output)
+                            accuracy = self._calculate_accuracy(agent_reply, expected_output)
+                            matched_keywords = [k for k in best_qa.get('keywords', [])
+                                              if k.lower() in user_question.lower()]
+                            print(f"   ℹ️ Using similar question: {eval_question[:80]}...")
                     except Exception as e:
                         print(f"   ⚠️ Error finding similar questions: {str(e)}")
 
                 print(f"   📊 Scores: Similarity={similarity:.2f}, Relevancy={relevancy:.2f}, "
                       f"Completeness={completeness:.2f}, Accuracy={accuracy:.2f}")
 
+            self._save_many(CallEvaluationResultModel, eval_results, "evaluations")
+            self._save_many(QuestionNotFoundModel, not_found_records, "unmatched questions")
+
             # After all evaluations, calculate and save quality metrics
             if evaluations:
                 self.calculate_quality_metrics(session_id, space_token=space_token)
@@ -1070,6 +1155,20 @@ class VoiceCallEvaluator:
         print(f"\n✅ Evaluation complete: {len(evaluations)} turns evaluated")
         return evaluations
 
+    @staticmethod
+    def _save_many(model, records: List[Any], label: str) -> int:
+        """Insert a call's records into ``model``'s collection in one write."""
+        if not records:
+            return 0
+        try:
+            documents = [record.to_mongo() for record in records]
+            model._get_collection().insert_many(documents, ordered=False)
+            print(f"   💾 Saved {len(documents)} {label} to database")
+            return len(documents)
+        except Exception as e:
+            print(f"   ⚠️ Error saving {label} to database: {str(e)}")
+            return 0
+
     def calculate_quality_metrics(self, session_id: str, space_token: Optional[str] = None):
         """Calculate aggregate quality metrics for a session using MongoDB"""
         try:
@@ -1283,21 +1382,7 @@ async def evaluate_voice_call(
             try:
                 # Get turns from MongoDB
                 turns = list(ConversationTurnModel.find(session_id=session_id))
-
-                for turn in turns:
-                    # Extract audio chunk for this turn
-                    audio_chunk = evaluator.extract_audio_chunk(
-                        audio_path,
-                        turn.turn_start_time,
-                        turn.turn_end_time
-                    )
-                    if audio_chunk:
-                        # Update the turn with audio data using pymongo collection directly
-                        ConversationTurnModel._get_collection().update_one(
-                            {"session_id": session_id, "turn_number": turn.turn_number},
-                            {"$set": {"wav_audio": audio_chunk}}
-                        )
-                        print(f"   ✅ Saved audio chunk for turn {turn.turn_number} ({len(audio_chunk)} bytes)")
+                evaluator.save_turn_audio_chunks(session_id, audio_path, turns)
 
             except Exception as e:
                 print(f"   ⚠️ Error saving audio chunks: {e}")
@@ -26,6 +26,7 @@ from super.core.voice.services.livekit_services import (
     DEFAULT_TTS_VOICE,
 )
 from super.core.voice.services import livekit_services
+from super.core.voice.services.warm_pool import get_service_pool, warm_pool_configs
 
 # from super.core.voice.managers.prompt_manager import PromptManager
 from super.core.voice.schema import (
@@ -332,6 +333,34 @@ def _prewarm_embedding_model(cache: ServiceCache, logger: logging.Logger) -> Non
         logger.warning(f"[PREWARM] Embedding preload failed (will load lazily): {e}")
 
 
+def _prewarm_service_pool(logger) -> None:
+    """
+    Build STT/TTS instances for the configs in LIVEKIT_WARM_POOL_CONFIGS
+    into this worker's pool, so the job it is assigned skips the plugin
+    setup when its agent uses one of them.
+    """
+    configs = warm_pool_configs()
+    if not configs or not get_service_pool().enabled:
+        return
+    if not livekit_services._ensure_livekit_plugins_loaded(logger):
+        logger.warning("[PREWARM] Skipping service pool; plugins not initialized")
+        return
+
+    _start = perf_counter()
+    built = 0
+    for config in configs:
+        try:
+            built += livekit_services.LiveKitServiceFactory(
+                dict(config), logger=logger
+            ).fill_pool()
+        except Exception as e:
+            logger.warning(f"[PREWARM] Service pool fill failed for {config}: {e}")
+    logger.info(
+        f"[PREWARM] Service pool filled: {built} instances for "
+        f"{len(configs)} configs in {(perf_counter() - _start) * 1000:.0f}ms"
+    )
+
+
 def prewarm_process(proc) -> None:
     """
     LiveKit prewarm function called before jobs are assigned to this process.
@@ -342,8 +371,9 @@ def prewarm_process(proc) -> None:
     - Embedding model: For KB search (~1-2s first time)
     - ChromaDB client: For in-memory vector storage
 
-    STT/TTS/LLM services are created dynamically based on model_config
-    and cached by config signature for reuse across calls with same config.
+    STT/TTS/LLM services are created dynamically based on model_config.
+    STT/TTS instances for the configs in LIVEKIT_WARM_POOL_CONFIGS are
+    built here into the worker's service pool.
 
     Args:
         proc: JobProcess instance from LiveKit, has userdata dict for storage
@@ -376,6 +406,8 @@ def prewarm_process(proc) -> None:
 
         logger.error(traceback.format_exc())
 
+    _prewarm_service_pool(logger)
+
     # Prewarm embedding model for KB search (config-independent)
     # This prevents the ~2s delay on first KB lookup
     enable_kb_prewarm = os.getenv("PREWARM_KB_EMBEDDINGS", "true").lower() == "true"
@@ -2275,13 +2307,20 @@ class VoiceAgentHandler(BaseVoiceHandler, ABC):
     ) -> Optional[Dict]:
         """Get model config with caching to reduce DB lookups."""
         from super_services.voice.models.config import ModelConfig
+        from super_services.voice.models.config_cache import get_agent_config_cache
 
         config_loader = ModelConfig()
         config = None
 
         if agent_handle:
             self._logger.info(f"Fetching config for agent_handle: {agent_handle}")
-            config = await asyncio.to_thread(config_loader.get_config, agent_handle)
+            # In-process hits skip the worker thread; misses load off-loop
+            # (concurrent misses for one agent share a single DB load).
+            config = get_agent_config_cache().get(agent_handle)
+            if config is None:
+                config = await asyncio.to_thread(
+                    config_loader.get_config, agent_handle
+                )
             if config:
                 self._logger.info(
                     f"Config found for agent_handle: {agent_handle}, "
@@ -0,0 +1,246 @@
+"""
+Flow Compile Cache
+
+Ahead-of-time cache for compiled flow blueprints.
+
+Compiling a system prompt into a flow blueprint costs several DSPy LLM calls
+(schema + task message per goal). The result only depends on the prompt text
+and the generator version, so it is cached in two tiers:
+
+- a process-local LRU (no I/O, used on the call setup hot path)
+- Redis (shared between workers, filled by precompilation on prompt save)
+
+Objects derived from a payload (e.g. lookup indexes) can be kept next to its
+local entry, so they are built once per process instead of once per call.
+Concurrent requests for the same prompt share one compilation.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+FLOW_CACHE_KEY_PREFIX = "flow_blueprint"
+FLOW_CACHE_TTL_SECONDS = int(os.getenv("FLOW_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+FLOW_CACHE_LOCAL_SIZE = int(os.getenv("FLOW_CACHE_LOCAL_SIZE", "128"))
+
+
+def flow_cache_key(system_prompt: str, version: str, variant: str = "") -> str:
+    """Cache key for a compiled flow: generator version + prompt hash."""
+    digest = hashlib.sha256(f"{variant}\x1f{system_prompt}".encode("utf-8")).hexdigest()
+    return f"{FLOW_CACHE_KEY_PREFIX}:{version}:{digest}"
+
+
+class FlowCompileCache:
+    """
+    Two-tier (local LRU + Redis) cache of compiled flow payloads.
+
+    Payloads are JSON-serialisable dicts; callers convert them to and from
+    their own dataclasses. Redis is optional: if it is not installed or not
+    reachable the cache degrades to the local tier only.
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        local_size: int = FLOW_CACHE_LOCAL_SIZE,
+        ttl_seconds: int = FLOW_CACHE_TTL_SECONDS,
+    ):
+        self._redis = redis_client
+        self._redis_initialized = redis_client is not None
+        self._local: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._artifacts: Dict[str, Dict[str, Any]] = {}
+        self._local_size = local_size
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "compiles": 0,
+            "compile_errors": 0,
+            "compile_time_total": 0.0,
+            "last_compile_time": 0.0,
+        }
+
+    def _get_redis(self):
+        if not self._redis_initialized:
+            self._redis_initialized = True
+            try:
+                from redis.asyncio import Redis
+
+                redis_url = os.getenv("SEARCH_REDIS_URL", "redis://localhost")
+                self._redis = Redis.from_url(redis_url, decode_responses=True)
+            except ImportError:
+                logger.warning("redis-py not installed. Flow compile cache is local only.")
+            except Exception as e:
+                logger.error(f"Failed to initialize Redis for flow compile cache: {e}")
+        return self._redis
+
+    # ------------------------------------------------------------------ #
+    # Local tier
+    # ------------------------------------------------------------------ #
+
+    def get_local(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            payload = self._local.get(key)
+            if payload is not None:
+                self._local.move_to_end(key)
+            return payload
+
+    def put_local(self, key: str, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self._local[key] = payload
+            self._local.move_to_end(key)
+            # Artifacts were derived from the payload being replaced.
+            self._artifacts.pop(key, None)
+            while len(self._local) > self._local_size:
+                evicted, _ = self._local.popitem(last=False)
+                self._artifacts.pop(evicted, None)
+
+    def local_artifact(self, key: str, name: str, build: Callable[[], Any]) -> Any:
+        """
+        Return the object ``name`` derived from the local payload for ``key``.
+
+        ``build`` runs once per local entry; the result is dropped with the
+        entry when it is evicted or overwritten. Without a local entry the
+        result is built but not kept.
+        """
+        with self._lock:
+            artifacts = self._artifacts.get(key)
+            if artifacts is not None and name in artifacts:
+                return artifacts[name]
+
+        value = build()
+        with self._lock:
+            if key in self._local:
+                value = self._artifacts.setdefault(key, {}).setdefault(name, value)
+        return value
+
+    # ------------------------------------------------------------------ #
+    # Redis tier
+    # ------------------------------------------------------------------ #
+
+    async def _get_remote(self, key: str) -> Optional[Dict[str, Any]]:
+        redis = self._get_redis()
+        if not redis:
+            return None
+        try:
+            cached = await redis.get(key)
+            return json.loads(cached) if cached else None
+        except Exception as e:
+            logger.warning(f"Flow compile cache read failed for {key}: {e}")
+            return None
+
+    async def _put_remote(self, key: str, payload: Dict[str, Any]) -> None:
+        redis = self._get_redis()
+        if not redis:
+            return
+        try:
+            await redis.set(key, json.dumps(payload), ex=self._ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Flow compile cache write failed for {key}: {e}")
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up ``key`` in the local tier, then Redis (promoting hits)."""
+        payload = self.get_local(key)
+        if payload is not None:
+            self._stats["local_hits"] += 1
+            return payload
+
+        payload = await self._get_remote(key)
+        if payload is not None:
+            self._stats["redis_hits"] += 1
+            self.put_local(key, payload)
+        return payload
+
+    async def put(self, key: str, payload: Dict[str, Any]) -> None:
+        self.put_local(key, payload)
+        await self._put_remote(key, payload)
+
+    async def get_or_compile(
+        self,
+        key: str,
+        compile_fn: Callable[[], Awaitable[Dict[str, Any]]],
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Return the cached payload for ``key`` or compile, store and return it.
+
+        Args:
+            key: Cache key from ``flow_cache_key``
+            compile_fn: Coroutine factory producing the payload on a miss
+            force: Skip lookups and recompile (used by precompilation)
+        """
+        if not force:
+            payload = await self.get(key)
+            if payload is not None:
+                return payload
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            if not force:
+                self._stats["misses"] += 1
+            start = time.perf_counter()
+            try:
+                payload = await compile_fn()
+            except Exception:
+                self._stats["compile_errors"] += 1
+                raise
+            elapsed = time.perf_counter() - start
+            self._stats["compiles"] += 1
+            self._stats["compile_time_total"] += elapsed
+            self._stats["last_compile_time"] = elapsed
+            logger.info(f"Compiled flow {key[-12:]} in {elapsed:.2f}s")
+
+            await self.put(key, payload)
+            future.set_result(payload)
+            return payload
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+                # Mark retrieved so an unawaited failure is not logged.
+                future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, hit rate and compile times."""
+        stats = dict(self._stats)
+        hits = stats["local_hits"] + stats["redis_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        stats["avg_compile_time"] = (
+            stats["compile_time_total"] / stats["compiles"] if stats["compiles"] else 0.0
+        )
+        stats["local_entries"] = len(self._local)
+        return stats
+
+
+_flow_compile_cache: Optional[FlowCompileCache] = None
+
+
+def get_flow_compile_cache() -> FlowCompileCache:
+    """Process-wide FlowCompileCache instance."""
+    global _flow_compile_cache
+    if _flow_compile_cache is None:
+        _flow_compile_cache = FlowCompileCache()
+    return _flow_compile_cache
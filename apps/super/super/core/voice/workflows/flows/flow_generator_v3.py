@@ -32,14 +32,16 @@ Architecture:
 Author: AI Senior Architect
 Date: 2025-11-08
 """
+import asyncio
 import json
 
 import re
 import os
+import time
 import dspy
 from enum import Enum
-from typing import List, Optional, Dict, Any, Callable
-from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Callable, Tuple
+from dataclasses import asdict, dataclass, field
 from pipecat_flows import (
     FlowArgs,
     FlowManager,
@@ -51,7 +53,13 @@ from dotenv import load_dotenv
 
 from pipecat_flows import ContextStrategy, ContextStrategyConfig
 
+from super.core.utils.keyword_automaton import KeywordAutomaton
+from super.core.utils.threadpool_concurrency import run_functions_tuples_in_parallel
 from super.core.voice.workflows.flows.conversation_flow import create_flow_from_plan
+from super.core.voice.workflows.flows.flow_compile_cache import (
+    flow_cache_key,
+    get_flow_compile_cache,
+)
 from super.core.voice.workflows.flows.pydantic_ai_section_parser import parse_conversation_plan_async
 from super.core.voice.workflows.flows.section_parser import SectionParser
 from super.core.voice.workflows.flows.react_node_builder import create_react_flow
@@ -68,6 +76,12 @@ load_dotenv(override=True)
 # Import DSPy configuration manager
 from ..dspy_config import get_dspy_lm
 
+# Bump whenever blueprint compilation output changes; invalidates cached flows.
+FLOW_GENERATOR_VERSION = "3.1"
+
+# Upper bound on concurrent DSPy calls while compiling one prompt.
+DSPY_MAX_CONCURRENCY = int(os.getenv("FLOW_DSPY_MAX_CONCURRENCY", "8"))
+
 
 # ============================================================================
 # SECTION 1: REUSE V2 BASE STRUCTURES
@@ -175,10 +189,51 @@ class ContextStrategyResolver:
         "end": ContextStrategy.RESET,
     }
 
+    def __init__(self):
+        self._resolved: Dict[str, ContextStrategyConfig] = {}
+
     def resolve(self, node_type: str) -> ContextStrategyConfig:
-        strategy = self.STRATEGY_MAP.get(node_type, ContextStrategy.RESET_WITH_SUMMARY)
-        summary = self.SUMMARY_PROMPTS.get(node_type)
-        return ContextStrategyConfig(strategy=strategy, summary_prompt=summary)
+        config = self._resolved.get(node_type)
+        if config is None:
+            strategy = self.STRATEGY_MAP.get(node_type, ContextStrategy.RESET_WITH_SUMMARY)
+            summary = self.SUMMARY_PROMPTS.get(node_type)
+            config = ContextStrategyConfig(strategy=strategy, summary_prompt=summary)
+            self._resolved[node_type] = config
+        return config
+
+
+class QALookupIndex:
+    """
+    Keyword/question index over a blueprint's QA pairs.
+
+    Matches a question against every QA keyword and every QA question in one
+    Aho-Corasick pass. The answer returned is the same as a linear scan
+    that picks the first pair (in blueprint order) with a keyword or
+    question contained in the lowercased user question.
+    """
+
+    def __init__(self, qa_pairs: List["QAPair"]):
+        self.qa_pairs = qa_pairs
+        self._automaton = KeywordAutomaton()
+        self._first_owner: Dict[int, int] = {}
+
+        for idx, pair in enumerate(qa_pairs):
+            patterns = [keyword for keyword in pair.keywords if keyword]
+            patterns.append(pair.question.lower())
+            for pattern in patterns:
+                # Pairs are added in order, so the first owner has priority.
+                self._first_owner.setdefault(self._automaton.add(pattern), idx)
+
+        self._automaton.build()
+
+    def find(self, question: str) -> Optional["QAPair"]:
+        if not question or not self.qa_pairs:
+            return None
+        owners = [
+            self._first_owner[pattern_id]
+            for pattern_id in self._automaton.find_ids(question.lower())
+        ]
+        return self.qa_pairs[min(owners)] if owners else None
 
 
 # ============================================================================
@@ -246,10 +301,17 @@ class IntelligentPromptSegmenter:
         normalized = self._normalize(system_prompt)
         raw_sections = self._split_sections(normalized)
 
-        segments = []
-        for idx, section in enumerate(raw_sections):
-            seg_type = self._classify_with_dspy(section["name"], section["content"])
+        # Sections are classified independently, so run the LLM calls concurrently
+        seg_types = run_functions_tuples_in_parallel(
+            [
+                (self._classify_with_dspy, (section["name"], section["content"]))
+                for section in raw_sections
+            ],
+            max_workers=DSPY_MAX_CONCURRENCY,
+        )
 
+        segments = []
+        for idx, (section, seg_type) in enumerate(zip(raw_sections, seg_types)):
             segment = PromptSegment(
                 segment_id=f"seg_{idx}",
                 segment_type=seg_type,
@@ -444,14 +506,17 @@ class IntelligentBlueprintBuilder:
                 metadata={"auto_generated": True}
             )]
 
+        # Use DSPy to extract fields (one independent call per goal)
+        extracted = run_functions_tuples_in_parallel(
+            [(self._extract_fields_with_dspy, (seg.content,)) for seg in segments],
+            max_workers=DSPY_MAX_CONCURRENCY,
+        )
+
         goals = []
-        for i, seg in enumerate(segments):
+        for i, (seg, (fields, description)) in enumerate(zip(segments, extracted)):
             goal_id = f"goal_{i}"
             title = seg.metadata.get("header") or goal_id
 
-            # Use DSPy to extract fields
-            fields, description = self._extract_fields_with_dspy(seg.content)
-
             goal = GoalItem(
                 goal_id=goal_id,
                 title=title,
@@ -782,6 +847,7 @@ class FlowOrchestrator:
         get_docs_handler: Optional[Callable] = None,
         handover_handler: Optional[Callable] = None,
         end_call_handler: Optional[Callable] = None,
+        qa_index: Optional[QALookupIndex] = None,
     ):
         self.blueprint = blueprint
         self.goal_configs = goal_configs
@@ -793,6 +859,8 @@ class FlowOrchestrator:
         self.goal_index_map = {
             cfg.goal.goal_id: idx for idx, cfg in enumerate(self.goal_configs)
         }
+        # Pass the index cached with the compiled blueprint to skip the rebuild.
+        self.qa_index = qa_index or QALookupIndex(blueprint.qa_pairs)
 
     # ------------------------------------------------------------------ #
     # Public API
@@ -1098,14 +1166,18 @@ class FlowOrchestrator:
     # ------------------------------------------------------------------ #
 
     def _inject_global_functions(self, nodes: List[NodeConfig]):
+        # Resolve the action catalog once instead of once per node
+        resolved_actions = [
+            (action, self._resolve_action_callable(action)) for action in self.blueprint.actions
+        ]
         for node in nodes:
             name = node.get("name")
             if name == self.END_NODE_NAME:
                 continue
             functions = node.get("functions", [])
             functions.append(self._build_question_function(origin_node=name))
-            for action in self.blueprint.actions:
-                action_function = self._build_action_function(action)
+            for action, handler_callable in resolved_actions:
+                action_function = self._build_action_function(action, handler_callable)
                 if action_function:
                     functions.append(action_function)
             node["functions"] = functions
@@ -1139,8 +1211,11 @@ class FlowOrchestrator:
             required=["question"],
         )
 
-    def _build_action_function(self, action: Action) -> Optional[FlowsFunctionSchema]:
-        handler_callable = self._resolve_action_callable(action)
+    def _build_action_function(
+        self, action: Action, handler_callable: Optional[Callable] = None
+    ) -> Optional[FlowsFunctionSchema]:
+        if handler_callable is None:
+            handler_callable = self._resolve_action_callable(action)
 
         if handler_callable is None:
             return None
@@ -1193,15 +1268,8 @@ class FlowOrchestrator:
         return self.node_lookup.get(node_name)
 
     def _find_qa_answer(self, question: str) -> Optional[str]:
-        if not question:
-            return None
-        q_lower = question.lower()
-        for pair in self.blueprint.qa_pairs:
-            if any(keyword and keyword in q_lower for keyword in pair.keywords):
-                return pair.answer
-            if pair.question.lower() in q_lower:
-                return pair.answer
-        return None
+        pair = self.qa_index.find(question)
+        return pair.answer if pair else None
 
     def _resolve_action_callable(self, action: Action) -> Optional[Callable]:
         if action.name == "handover_call" and self.handover_handler:
@@ -1236,10 +1304,15 @@ class IntelligentNodeCompiler:
         self,
         get_docs_handler: Optional[Callable] = None,
         handover_handler: Optional[Callable] = None,
-        end_call_handler: Optional[Callable] = None
+        end_call_handler: Optional[Callable] = None,
+        goal_configs: Optional[List[GoalRuntimeConfig]] = None,
     ) -> List[NodeConfig]:
-        """Compile blueprint to NodeConfig objects."""
-        goal_configs = [self._prepare_goal_runtime(goal) for goal in self.blueprint.goals]
+        """Compile blueprint to NodeConfig objects.
+
+        Pass precompiled ``goal_configs`` to skip DSPy schema generation.
+        """
+        if goal_configs is None:
+            goal_configs = self.prepare_goal_configs()
 
         orchestrator = FlowOrchestrator(
             blueprint=self.blueprint,
@@ -1252,6 +1325,13 @@ class IntelligentNodeCompiler:
 
         return orchestrator.build_nodes()
 
+    def prepare_goal_configs(self) -> List[GoalRuntimeConfig]:
+        """Generate runtime metadata for all goals, one concurrent DSPy call per goal."""
+        return run_functions_tuples_in_parallel(
+            [(self._prepare_goal_runtime, (goal,)) for goal in self.blueprint.goals],
+            max_workers=DSPY_MAX_CONCURRENCY,
+        )
+
     def _prepare_goal_runtime(self, goal: GoalItem) -> GoalRuntimeConfig:
         """Generate runtime metadata for a goal using DSPy."""
         with dspy.context(lm=self.lm):
@@ -1322,6 +1402,132 @@ class IntelligentNodeCompiler:
         return goal.description
 
 
+# ============================================================================
+# SECTION 5A: AHEAD-OF-TIME COMPILATION + CACHE
+# ============================================================================
+
+def compile_flow_blueprint(
+    system_prompt: str,
+    lm=None,
+) -> Tuple[FlowBlueprint, List[GoalRuntimeConfig]]:
+    """
+    Run every LLM-dependent compilation step for a prompt.
+
+    The result holds no handlers, so it can be cached and turned into
+    NodeConfigs per call with FlowOrchestrator.
+    """
+    parser = SectionParser()
+    parsed_config = parser.parse_prompt(system_prompt)
+    print(f"  Found {len(parsed_config.sections_by_id)} sections")
+    print(f"  Questions: {len(parsed_config.questions)}")
+    print(f"  Pitches: {len(parsed_config.pitches)}")
+    print(f"  FAQs: {len(parsed_config.faqs)}")
+
+    blueprint = build_blueprint_from_parsed_config(parsed_config)
+    goal_configs = IntelligentNodeCompiler(blueprint, lm=lm).prepare_goal_configs()
+    return blueprint, goal_configs
+
+
+def _compiled_flow_to_payload(
+    blueprint: FlowBlueprint, goal_configs: List[GoalRuntimeConfig]
+) -> Dict[str, Any]:
+    return {
+        "version": FLOW_GENERATOR_VERSION,
+        "blueprint": asdict(blueprint),
+        "goal_configs": [asdict(cfg) for cfg in goal_configs],
+    }
+
+
+def _compiled_flow_from_payload(
+    payload: Dict[str, Any],
+) -> Tuple[FlowBlueprint, List[GoalRuntimeConfig]]:
+    data = payload["blueprint"]
+    blueprint = FlowBlueprint(
+        instructions=MacroNode(**data["instructions"]),
+        identity=MacroNode(**data["identity"]),
+        goals=[GoalItem(**goal) for goal in data["goals"]],
+        qa_pairs=[QAPair(**qa) for qa in data["qa_pairs"]],
+        actions=[Action(**action) for action in data["actions"]],
+        conditions=data["conditions"],
+        residuals=data["residuals"],
+    )
+    goal_configs = [
+        GoalRuntimeConfig(**{**cfg, "goal": GoalItem(**cfg["goal"])})
+        for cfg in payload["goal_configs"]
+    ]
+    return blueprint, goal_configs
+
+
+def _flow_cache_key(system_prompt: str, lm=None) -> str:
+    # A caller-supplied LM produces different schemas than the default one.
+    variant = getattr(lm, "model", "") if lm is not None else ""
+    return flow_cache_key(system_prompt, FLOW_GENERATOR_VERSION, variant=variant)
+
+
+async def get_compiled_flow(
+    system_prompt: str,
+    lm=None,
+    force: bool = False,
+) -> Tuple[FlowBlueprint, List[GoalRuntimeConfig]]:
+    """
+    Return the compiled blueprint for a prompt, compiling only on a cache miss.
+
+    Args:
+        system_prompt: Full prompt text
+        lm: Optional DSPy LM override
+        force: Recompile and overwrite the cached entry
+
+    Returns:
+        (FlowBlueprint, goal runtime configs) - a fresh copy safe to mutate
+    """
+
+    async def _compile() -> Dict[str, Any]:
+        blueprint, goal_configs = await asyncio.to_thread(
+            compile_flow_blueprint, system_prompt, lm
+        )
+        return _compiled_flow_to_payload(blueprint, goal_configs)
+
+    payload = await get_flow_compile_cache().get_or_compile(
+        _flow_cache_key(system_prompt, lm), _compile, force=force
+    )
+    return _compiled_flow_from_payload(payload)
+
+
+def get_qa_index(system_prompt: str, blueprint: FlowBlueprint, lm=None) -> QALookupIndex:
+    """
+    Return the QA lookup index for a compiled prompt.
+
+    Built once per cached blueprint and kept with it in the local compile
+    cache tier. QA pairs are never changed per call, so every call can share it.
+    """
+    return get_flow_compile_cache().local_artifact(
+        _flow_cache_key(system_prompt, lm),
+        "qa_index",
+        lambda: QALookupIndex(blueprint.qa_pairs),
+    )
+
+
+async def precompile_flow(system_prompt: str, lm=None, force: bool = True) -> Dict[str, Any]:
+    """
+    Compile a prompt ahead of time so calls never compile on the hot path.
+
+    Called when an agent's prompt is saved. Returns the cache stats,
+    including compile time and hit rate.
+    """
+    start = time.perf_counter()
+    blueprint, goal_configs = await get_compiled_flow(system_prompt, lm=lm, force=force)
+    stats = get_flow_compile_cache().stats()
+    stats.update(
+        {
+            "key": _flow_cache_key(system_prompt, lm),
+            "goals": len(goal_configs),
+            "qa_pairs": len(blueprint.qa_pairs),
+            "duration": time.perf_counter() - start,
+        }
+    )
+    return stats
+
+
 # ============================================================================
 # SECTION 6: ENTRY POINT
 # ============================================================================
@@ -1362,32 +1568,34 @@ async def create_smart_flow(
     print(f"SMART FLOW GENERATOR V3 (HYBRID: Parser + DSPy)")
     print(f"{'='*60}")
 
-    # Step 1: Parse with SectionParser (deterministic structure extraction)
-    print("Step 1: Parsing prompt structure (SectionParser)...")
-    parser = SectionParser()
-    parsed_config = parser.parse_prompt(system_prompt)
-    print(f"  Found {len(parsed_config.sections_by_id)} sections")
-    print(f"  Questions: {len(parsed_config.questions)}")
-    print(f"  Pitches: {len(parsed_config.pitches)}")
-    print(f"  FAQs: {len(parsed_config.faqs)}")
-
-    # Step 2: Convert to FlowBlueprint
-    print("\nStep 2: Converting to FlowBlueprint...")
-    blueprint = build_blueprint_from_parsed_config(parsed_config)
+    # Steps 1-3: Parse, convert to FlowBlueprint and generate DSPy schemas.
+    # Served from the compile cache; precompile_flow fills it on prompt save.
+    print("Step 1-3: Loading compiled blueprint (SectionParser + DSPy)...")
+    start = time.perf_counter()
+    blueprint, goal_configs = await get_compiled_flow(system_prompt, lm=lm)
+    stats = get_flow_compile_cache().stats()
+    print(
+        f"  Blueprint ready in {time.perf_counter() - start:.3f}s "
+        f"(hit rate: {stats['hit_rate']:.0%}, avg compile: {stats['avg_compile_time']:.2f}s)"
+    )
 
-    # Inject assistant_prompt if provided
+    # Inject assistant_prompt if provided (per call, never cached)
     if assistant_prompt:
         blueprint.identity.content = f"{assistant_prompt}\n\n{blueprint.identity.content}"
         print(f"  ✓ Injected assistant prompt")
 
-    # Step 3: Compile with DSPy-enhanced schemas
-    print("\nStep 3: Compiling nodes with DSPy schema generation...")
-    compiler = IntelligentNodeCompiler(blueprint, lm=lm)
-    nodes = compiler.compile(
+    # Step 4: Build nodes with this call's handlers
+    print("\nStep 4: Building nodes...")
+    orchestrator = FlowOrchestrator(
+        blueprint=blueprint,
+        goal_configs=goal_configs,
+        context_strategy_resolver=ContextStrategyResolver(),
         get_docs_handler=get_docs_handler,
         handover_handler=handover_handler,
-        end_call_handler=end_call_handler
+        end_call_handler=end_call_handler,
+        qa_index=get_qa_index(system_prompt, blueprint, lm=lm),
     )
+    nodes = orchestrator.build_nodes()
     print(f"  Created {len(nodes)} nodes")
 
     print(f"\n✅ Smart flow generated!")
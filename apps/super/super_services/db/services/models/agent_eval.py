@@ -54,8 +54,9 @@ class KBQAPairBaseModel(MongoDBModel, CreateUpdateMixinModel):
     tool_name: Optional[str] = Field(default=None)
     source: Optional[str] = Field(default=None)
     language: Optional[str] = Field(default=None)
-    status: str = Field(default="active")  # "active" or "inactive"
+    status: str = Field(default="active")  # "active", "inactive" or "empty" (unit marker)
     batch_id: Optional[str] = Field(default=None)
+    content_hash: Optional[str] = Field(default=None)  # chunk × eval type key
 
 
 class KBQAPairModel(BaseRepository):
@@ -66,6 +67,7 @@ class KBQAPairModel(BaseRepository):
             Index(fields=["status"]),
             Index(fields=["batch_id"]),
             Index(fields=["eval_type"]),
+            Index(fields=["content_hash"]),
         ]
 
     def __init__(self, token):
@@ -0,0 +1,28 @@
+from typing import Dict, Optional
+from mongomantic import BaseRepository, MongoDBModel, Index
+from pydantic import Field
+
+from super_services.libs.core.mixin import CreateUpdateMixinModel
+
+
+class ContactProfileBaseModel(MongoDBModel, CreateUpdateMixinModel):
+    """Per-contact call rollup, $inc'd as each call of the contact finishes."""
+
+    ref_id: str = Field(...)  # Contact document id (task.ref_id)
+    total_calls: int = Field(default=0)
+    connected_calls: int = Field(default=0)
+    total_duration: float = Field(default=0)  # Seconds, connected calls only
+    call_hours: Dict = Field(default_factory=dict)  # Hour of day -> connected calls
+    last_connected: Optional[str] = Field(default=None)  # UTC ISO timestamp
+    profile_summary: Optional[Dict] = Field(default=None)
+    profile_summary_at: Optional[str] = Field(default=None)
+    rebuilt_at: Optional[str] = Field(default=None)
+
+
+class ContactProfileModel(BaseRepository):
+    class Meta:
+        model = ContactProfileBaseModel
+        collection = "contact_profiles"
+        indexes = [
+            Index(fields=["ref_id"], unique=True),
+        ]
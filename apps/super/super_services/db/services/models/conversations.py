@@ -21,4 +21,6 @@ class BlockModel(BaseRepository):
             Index(fields=["block_type"]),
             Index(fields=["block"]),
             Index(fields=["is_active"]),
+            # Guards seq_number allocation and serves keyset history reads.
+            Index(fields=["thread_id", "seq_number"], unique=True),
         ]
@@ -19,6 +19,8 @@ class RunBaseModel(MongoDBModel, CreateUpdateMixinModel, UserBaseSchema):
     call_analytics: Dict = Field(default_factory=dict)  # Call quality metrics
     execution_analytics: Dict = Field(default_factory=dict)  # Task execution metrics
     run_type: Optional[str] = Field(default=None)  # e.g., "call", "email"
+    task_counts: Dict = Field(default_factory=dict)  # Tasks per status ($inc'd)
+    analytics_updated_at: Optional[str] = Field(default=None)
 
 
 class RunModel(BaseRepository):
@@ -59,6 +61,15 @@ class TaskBaseModel(MongoDBModel, CreateUpdateMixinModel, UserBaseSchema):
     scheduled_timestamp: Optional[int] = Field(
         default=None
     )  # Scheduled timestamp for future tasks
+    dispatch_claim: Optional[str] = Field(
+        default=None
+    )  # Claim id of the run flow that dispatched this task
+    dispatch_lease_until: Optional[str] = Field(
+        default=None
+    )  # Claim expiry; the task can be dispatched again after it
+    profile_contribution: Optional[Dict] = Field(
+        default=None
+    )  # What this task last added to its contact's profile rollup
 
 
 class TaskModel(BaseRepository):
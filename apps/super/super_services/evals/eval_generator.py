@@ -3,6 +3,7 @@ Eval Generation Service
 Generates QA pairs from agent configuration and knowledge base documents using OpenAI.
 """
 
+import asyncio
 import os
 import json
 import uuid
@@ -11,6 +12,14 @@ from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 import openai
 import requests
+from super_services.evals.eval_pipeline import (
+    BASE_LANGUAGE,
+    EVAL_GENERATION_CONCURRENCY,
+    EVAL_TRANSLATION_CONCURRENCY,
+    EvalPipeline,
+    EvalUnit,
+    content_hash,
+)
 from super_services.voice.models.config import ModelConfig
 from super_services.db.services.models.agent_eval import (
     AgentQAPairModel,
@@ -288,7 +297,9 @@ class EvalGenerator:
                         )
                         if not translated_pairs:
                             continue
-                        self._apply_rule_based_fields(translated_pairs, source="agent")
+                        self._apply_rule_based_fields(
+                            translated_pairs, source="agent", language=language
+                        )
                         saved_count = await self._save_agent_qa_pairs(
                             eval_token, translated_pairs
                         )
@@ -348,7 +359,9 @@ class EvalGenerator:
                         default_kb_qa_pairs_en, language
                     )
                     if translated_pairs:
-                        self._apply_rule_based_fields(translated_pairs, source="kb")
+                        self._apply_rule_based_fields(
+                            translated_pairs, source="kb", language=language
+                        )
                         all_default_pairs.extend(translated_pairs)
                 results["kb_qa_count"] = len(all_default_pairs)
                 results["total_qa_count"] = (
@@ -389,7 +402,36 @@ class EvalGenerator:
                                 >= expected_per_type
                                 for t in self.KB_EVAL_TYPES
                             )
-                            if all_types_complete and not force_regenerate:
+                            units = self._build_kb_units(documents, kb_name)
+                            stored = self._load_stored_kb_pairs(eval_token)
+                            stale_keys = {key for key, _ in stored} - {
+                                unit.key for unit in units
+                            }
+                            pipeline = EvalPipeline(
+                                generate=self._generate_kb_unit,
+                                translate=self._translate_kb_unit,
+                                save=lambda unit, language, pairs, token=eval_token: (
+                                    self._save_kb_qa_pairs(
+                                        token, pairs, unit.key, language
+                                    )
+                                ),
+                                languages=self.languages,
+                                stored=stored,
+                                checkpoint=lambda progress, eval_id=eval_id: (
+                                    self._checkpoint_progress(eval_id, progress)
+                                ),
+                            )
+                            pending = (
+                                units if force_regenerate else pipeline.pending(units)
+                            )
+                            # KBs generated before content hashing have no keyed
+                            # pairs; they keep the count-based completeness check.
+                            up_to_date = (
+                                all_types_complete
+                                if not stored
+                                else not pending and not stale_keys
+                            )
+                            if up_to_date and not force_regenerate:
                                 total_existing = sum(existing_type_counts.values())
                                 skip_msg = f"KB '{kb_token}' all types complete ({total_existing} pairs) - skipping"
                                 print(skip_msg)
@@ -412,63 +454,34 @@ class EvalGenerator:
                                     extra_metadata={"already_generated": True},
                                 )
                                 continue
-                            print(f"Found {num_pages} pages for KB: {kb_name}")
-                            kb_type_status: Dict[str, Any] = {}
-                            kb_saved_total = 0
-                            kb_qa_pairs_en, type_status = (
-                                await self._generate_kb_qa_pairs(
-                                    documents,
-                                    kb_name,
-                                    existing_type_counts,
-                                    force_regenerate,
-                                    language="English",
-                                )
+                            print(
+                                f"Found {num_pages} pages for KB: {kb_name} - "
+                                f"{len(pending)}/{len(units)} chunk evals to (re)generate"
                             )
-                            saved_count_en = await self._save_kb_qa_pairs(
-                                eval_token, kb_qa_pairs_en
+                            stats = await pipeline.run(
+                                pending, force=force_regenerate
                             )
-                            kb_saved_total += saved_count_en
-                            for t, info in type_status.items():
-                                aggregate = kb_type_status.get(
-                                    t, {"count": 0, "action": "skipped"}
-                                )
-                                if info.get("action") == "generated":
-                                    aggregate["count"] += info.get("count", 0)
-                                    aggregate["action"] = "generated"
-                                kb_type_status[t] = aggregate
-                            for language in self.languages:
-                                if language == "English":
-                                    continue
-                                translated_pairs = await self._translate_qa_pairs(
-                                    kb_qa_pairs_en, language
-                                )
-                                if not translated_pairs:
-                                    continue
-                                self._apply_rule_based_fields(
-                                    translated_pairs, source="kb"
-                                )
-                                saved_count = await self._save_kb_qa_pairs(
-                                    eval_token, translated_pairs
-                                )
-                                kb_saved_total += saved_count
-                                for t in self.KB_EVAL_TYPES:
-                                    aggregate = kb_type_status.get(
-                                        t, {"count": 0, "action": "skipped"}
-                                    )
-                                    aggregate[
-                                        "count"
-                                    ] += self.KB_PAIRS_PER_TYPE_PER_PAGE * len(
-                                        documents
-                                    )
-                                    aggregate["action"] = "generated"
-                                    kb_type_status[t] = aggregate
+                            replaced_keys = stale_keys
+                            if force_regenerate:
+                                replaced_keys |= {key for key, _ in pipeline.stored}
+                            # After a clean run every unit has keyed pairs, so
+                            # unkeyed pairs (pre-hashing batches) are duplicates.
+                            deactivated = self._deactivate_kb_pairs(
+                                eval_token,
+                                replaced_keys,
+                                include_unkeyed=not stats.errors,
+                            )
+                            kb_saved_total = stats.saved
+                            results["errors"].extend(stats.errors)
                             results["kb_qa_count"] += kb_saved_total
                             results["type_status"]["kb"][kb_token] = {
                                 t: {
-                                    "action": kb_type_status.get(t, {}).get(
-                                        "action", "skipped"
+                                    "action": (
+                                        "generated"
+                                        if stats.saved_by_type.get(t)
+                                        else "skipped"
                                     ),
-                                    "count": kb_type_status.get(t, {}).get("count", 0),
+                                    "count": stats.saved_by_type.get(t, 0),
                                     "expected": expected_per_type,
                                     "existing": sum(
                                         existing_type_counts.get((t, lang), 0)
@@ -482,9 +495,17 @@ class EvalGenerator:
                                 "completed",
                                 results["batch_id"],
                                 kb_saved_total,
+                                extra_metadata={
+                                    "progress": {
+                                        "done": len(pending),
+                                        **stats.as_dict(),
+                                    },
+                                    "deactivated_count": deactivated,
+                                },
                             )
                             print(
-                                f"Generated {kb_saved_total} KB QA pairs for {kb_name} ({num_pages} pages)"
+                                f"Generated {kb_saved_total} KB QA pairs for {kb_name} ({num_pages} pages, "
+                                f"{stats.reused} chunk evals reused, {deactivated} stale pairs retired)"
                             )
                         else:
                             # No pages → generate KB_DEFAULT_PAIRS_TOTAL default pairs
@@ -503,7 +524,7 @@ class EvalGenerator:
                                 )
                                 if translated_pairs:
                                     self._apply_rule_based_fields(
-                                        translated_pairs, source="kb"
+                                        translated_pairs, source="kb", language=language
                                     )
                                     all_default_pairs.extend(translated_pairs)
                             if all_default_pairs:
@@ -688,6 +709,7 @@ class EvalGenerator:
         first_message = agent_config.get("first_message", "")
         all_qa_pairs: List[QAPair] = []
         type_status: Dict[str, Any] = {}
+        pending_types: List[str] = []
         for eval_type in self.AGENT_EVAL_TYPES:
             existing = existing_counts.get((eval_type, language), 0)
             if existing >= self.AGENT_PAIRS_PER_TYPE and not force_regenerate:
@@ -698,13 +720,21 @@ class EvalGenerator:
                     "language": language,
                 }
                 continue
+            pending_types.append(eval_type)
+        slots = asyncio.Semaphore(EVAL_GENERATION_CONCURRENCY)
+
+        async def generate(eval_type: str) -> List[QAPair]:
             prompt = self._generate_agent_eval_prompt(
                 eval_type, system_prompt, persona, first_message
             )
-            qa_pairs = await self._call_openai_for_qa_pairs(
-                prompt, max_pairs=self.AGENT_PAIRS_PER_TYPE, eval_type=eval_type
-            )
-            self._apply_rule_based_fields(qa_pairs, source="agent")
+            async with slots:
+                return await self._call_openai_for_qa_pairs(
+                    prompt, max_pairs=self.AGENT_PAIRS_PER_TYPE, eval_type=eval_type
+                )
+
+        generated = await asyncio.gather(*(generate(t) for t in pending_types))
+        for eval_type, qa_pairs in zip(pending_types, generated):
+            self._apply_rule_based_fields(qa_pairs, source="agent", language=language)
             all_qa_pairs.extend(qa_pairs)
             type_status[eval_type] = {
                 "action": "generated",
@@ -930,7 +960,9 @@ Output ONLY a valid JSON array:
             return True, "get_docs"
         return False, None
 
-    def _apply_rule_based_fields(self, qa_pairs: List[QAPair], source: str) -> None:
+    def _apply_rule_based_fields(
+        self, qa_pairs: List[QAPair], source: str, language: Optional[str] = None
+    ) -> None:
         for qa in qa_pairs:
             intent = self._infer_intent(qa.question, qa.answer)
             qa.intent = intent
@@ -941,7 +973,7 @@ Output ONLY a valid JSON array:
                 qa.question, qa.answer, intent
             )
             qa.source = source
-            qa.language = self.language
+            qa.language = language or self.language
 
     async def _generate_default_kb_evals(self) -> List[QAPair]:
         """
@@ -1027,60 +1059,139 @@ Output ONLY a valid JSON array:
         }
         return prompts.get(eval_type, prompts["Introduction"])
 
-    async def _generate_kb_qa_pairs(
-        self,
-        documents: List[Dict[str, Any]],
-        kb_name: str,
-        existing_counts: Dict[Tuple[str, str], int],
-        force_regenerate: bool = False,
-        language: str = "English",
-    ) -> Tuple[List[QAPair], Dict[str, Any]]:
-        """
-        Generate KB QA pairs only for eval_types that are missing or incomplete.
-        Expected per type = KB_PAIRS_PER_TYPE_PER_PAGE × num_pages.
-        """
-        self.language = language
-        all_qa_pairs: List[QAPair] = []
-        num_pages = len(documents)
-        expected_per_type = self.KB_PAIRS_PER_TYPE_PER_PAGE * num_pages
-        type_status: Dict[str, Any] = {}
-        for eval_type in self.KB_EVAL_TYPES:
-            existing = existing_counts.get((eval_type, language), 0)
-            if existing >= expected_per_type and not force_regenerate:
-                type_status[eval_type] = {
-                    "action": "skipped",
-                    "existing": existing,
-                    "expected": expected_per_type,
-                    "language": language,
-                }
+    def _build_kb_units(
+        self, documents: List[Dict[str, Any]], kb_name: str
+    ) -> List[EvalUnit]:
+        """One unit per (document chunk, eval type), keyed by a hash of its prompt inputs."""
+        self.language = BASE_LANGUAGE
+        units: Dict[str, EvalUnit] = {}
+        for doc in documents:
+            content = doc.get("content", "")
+            if not content or len(content.strip()) < 50:
                 continue
-            type_pairs: List[QAPair] = []
-            for doc in documents:
-                content = doc.get("content", "")
-                if not content or len(content.strip()) < 50:
-                    continue
-                if len(content) > 8000:
-                    content = content[:8000] + "..."
-                prompt = self._generate_kb_eval_prompt(eval_type, content, kb_name)
-                try:
-                    qa_pairs = await self._call_openai_for_qa_pairs(
-                        prompt,
-                        max_pairs=self.KB_PAIRS_PER_TYPE_PER_PAGE,
+            if len(content) > 8000:
+                content = content[:8000] + "..."
+            for eval_type in self.KB_EVAL_TYPES:
+                key = content_hash(self.OPENAI_MODEL, kb_name, eval_type, content)
+                if key not in units:
+                    units[key] = EvalUnit(
+                        key=key,
                         eval_type=eval_type,
+                        prompt=self._generate_kb_eval_prompt(
+                            eval_type, content, kb_name
+                        ),
                     )
-                    self._apply_rule_based_fields(qa_pairs, source="kb")
-                    type_pairs.extend(qa_pairs)
-                except Exception as e:
-                    self.logger.warning(f"Failed to generate QA for document: {e}")
+        return list(units.values())
+
+    async def _generate_kb_unit(self, unit: EvalUnit) -> List[QAPair]:
+        qa_pairs = await self._call_openai_for_qa_pairs(
+            unit.prompt,
+            max_pairs=self.KB_PAIRS_PER_TYPE_PER_PAGE,
+            eval_type=unit.eval_type,
+        )
+        self._apply_rule_based_fields(qa_pairs, source="kb", language=BASE_LANGUAGE)
+        return qa_pairs
+
+    async def _translate_kb_unit(
+        self, qa_pairs: List[QAPair], language: str
+    ) -> List[QAPair]:
+        translated = await self._translate_qa_pairs(qa_pairs, language)
+        self._apply_rule_based_fields(translated, source="kb", language=language)
+        return translated
+
+    def _load_stored_kb_pairs(
+        self, eval_token: str
+    ) -> Dict[Tuple[str, str], List[QAPair]]:
+        """
+        Active KB pairs that carry a content hash, as {(content_hash, language): pairs}.
+        Units saved without pairs map to an empty list.
+        """
+        stored: Dict[Tuple[str, str], List[QAPair]] = {}
+        try:
+            for marker in (
+                KBQAPairModel(eval_token)
+                ._get_collection()
+                .find({"status": "empty", "content_hash": {"$ne": None}})
+            ):
+                language = marker.get("language") or BASE_LANGUAGE
+                stored.setdefault((marker["content_hash"], language), [])
+            for qa in KBQAPairModel(eval_token).find(status="active"):
+                key = getattr(qa, "content_hash", None)
+                if not key:
                     continue
-            all_qa_pairs.extend(type_pairs)
-            type_status[eval_type] = {
-                "action": "generated",
-                "count": len(type_pairs),
-                "expected": expected_per_type,
-                "language": language,
-            }
-        return all_qa_pairs, type_status
+                language = getattr(qa, "language", None) or BASE_LANGUAGE
+                stored.setdefault((key, language), []).append(
+                    QAPair(
+                        question=qa.question,
+                        answer=qa.answer,
+                        is_first_message=qa.is_first_message,
+                        intent=qa.intent or "",
+                        tool_name=getattr(qa, "tool_name", None),
+                        is_tool_call=getattr(qa, "is_tool_call", False),
+                        eval_type=qa.eval_type or "general",
+                        source=getattr(qa, "source", "kb") or "kb",
+                        language=language,
+                    )
+                )
+        except Exception as e:
+            self.logger.info(f"Error fetching stored KB pairs: {e}")
+        return stored
+
+    def _deactivate_kb_pairs(
+        self, eval_token: str, content_hashes: set, include_unkeyed: bool = False
+    ) -> int:
+        """
+        Mark active pairs (and empty markers) from earlier batches inactive when
+        their chunk was removed, changed or regenerated. Pairs without a content
+        hash only with include_unkeyed.
+        """
+        clauses: List[Dict[str, Any]] = []
+        if content_hashes:
+            clauses.append({"content_hash": {"$in": sorted(content_hashes)}})
+        if include_unkeyed:
+            clauses.append({"content_hash": None})
+        if not clauses:
+            return 0
+        try:
+            result = (
+                KBQAPairModel(eval_token)
+                ._get_collection()
+                .update_many(
+                    {
+                        "status": {"$in": ["active", "empty"]},
+                        "batch_id": {"$ne": self.batch_id},
+                        "$or": clauses,
+                    },
+                    {"$set": {"status": "inactive"}},
+                )
+            )
+            return result.modified_count
+        except Exception as e:
+            self.logger.info(f"Error deactivating stale KB pairs: {e}")
+            return 0
+
+    async def _checkpoint_progress(
+        self, eval_id: str, progress: Dict[str, Any]
+    ) -> None:
+        """Record pipeline progress on the eval row while generation is running."""
+        from super_services.libs.core.db import executeQuery
+
+        try:
+            await asyncio.to_thread(
+                executeQuery,
+                """
+                UPDATE knowledge_base_knowledgebaseevals
+                SET eval_data = eval_data || %s
+                WHERE id = %s
+                """,
+                params=(
+                    json.dumps({"progress": progress, "last_batch_id": self.batch_id}),
+                    eval_id,
+                ),
+                commit=True,
+            )
+        except Exception as e:
+            self.logger.info(f"Error --> saving eval progress: {e}")
 
     def _generate_kb_eval_prompt(
         self, eval_type: str, content: str, kb_name: str
@@ -1299,13 +1410,21 @@ Output ONLY a valid JSON array:
             if target_language.lower() == "hindi"
             else "Use formal, respectful register."
         )
-        all_translated: List[QAPair] = []
-        for i in range(0, len(qa_pairs), batch_size):
-            batch = qa_pairs[i : i + batch_size]
-            translated = await self._translate_batch(
-                batch, target_language, formality_note
+        slots = asyncio.Semaphore(EVAL_TRANSLATION_CONCURRENCY)
+
+        async def translate(batch: List[QAPair]) -> List[QAPair]:
+            async with slots:
+                return await self._translate_batch(
+                    batch, target_language, formality_note
+                )
+
+        batches = await asyncio.gather(
+            *(
+                translate(qa_pairs[i : i + batch_size])
+                for i in range(0, len(qa_pairs), batch_size)
             )
-            all_translated.extend(translated)
+        )
+        all_translated: List[QAPair] = [qa for batch in batches for qa in batch]
         self.logger.info(
             f"Translated {len(all_translated)}/{len(qa_pairs)} pairs to {target_language}"
         )
@@ -1341,13 +1460,32 @@ Output ONLY a valid JSON array:
         saved_results = AgentQAPairModel(eval_token).save_many_to_db(final_data)
         return len(saved_results)
 
-    async def _save_kb_qa_pairs(self, eval_token: str, qa_pairs: List[QAPair]) -> int:
+    async def _save_kb_qa_pairs(
+        self,
+        eval_token: str,
+        qa_pairs: List[QAPair],
+        content_hash: Optional[str] = None,
+        language: Optional[str] = None,
+    ) -> int:
         """
         Save KB QA pairs to kb_qa_pairs collection.
+        content_hash tags the pairs with the chunk × eval type they came from;
+        a keyed unit without pairs is saved as an "empty" marker in `language`
+        so later runs do not regenerate it.
         Returns:
             Number of QA pairs saved
         """
         if not qa_pairs:
+            if content_hash:
+                KBQAPairModel(eval_token)._get_collection().insert_one(
+                    {
+                        "content_hash": content_hash,
+                        "language": language or BASE_LANGUAGE,
+                        "source": "kb",
+                        "status": "empty",
+                        "batch_id": self.batch_id,
+                    }
+                )
             return 0
         final_data = [
             {
@@ -1363,6 +1501,7 @@ Output ONLY a valid JSON array:
                 "keywords": [],
                 "status": "active",
                 "batch_id": self.batch_id,
+                "content_hash": content_hash,
             }
             for qa in qa_pairs
         ]
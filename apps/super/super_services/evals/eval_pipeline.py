@@ -0,0 +1,172 @@
+"""
+Eval Generation Pipeline
+Runs knowledge-base eval generation as independent units (one document chunk
+× one eval type): generate the English pairs, then translate them into each
+extra language. Each stage has its own concurrency bound.
+
+Units are keyed by a content hash of everything that shapes their prompt, and
+pairs are saved per unit and language as soon as they exist. The stored pairs
+are therefore both the cache and the checkpoint: a rerun (or a resumed,
+interrupted run) only spends tokens on units whose content changed or whose
+pairs are missing. A unit whose generation yields no pairs is saved as an
+empty entry, so it counts as stored and is not regenerated on every run.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import os
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+EVAL_GENERATION_CONCURRENCY = int(os.getenv("EVAL_GENERATION_CONCURRENCY", "8"))
+EVAL_TRANSLATION_CONCURRENCY = int(os.getenv("EVAL_TRANSLATION_CONCURRENCY", "8"))
+EVAL_CHECKPOINT_EVERY = int(os.getenv("EVAL_CHECKPOINT_EVERY", "10"))
+
+BASE_LANGUAGE = "English"
+
+
+def content_hash(*parts: str) -> str:
+    """Stable key for a unit: the hash of its prompt-shaping inputs."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()[:32]
+
+
+@dataclass
+class EvalUnit:
+    """One document chunk × one eval type."""
+
+    key: str
+    eval_type: str
+    prompt: str
+
+
+@dataclass
+class PipelineStats:
+    units: int = 0
+    generated: int = 0
+    translated: int = 0
+    reused: int = 0
+    saved: int = 0
+    saved_by_type: Dict[str, int] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "units": self.units,
+            "generated": self.generated,
+            "translated": self.translated,
+            "reused": self.reused,
+            "saved": self.saved,
+            "saved_by_type": dict(self.saved_by_type),
+            "errors": list(self.errors),
+        }
+
+
+class EvalPipeline:
+    """
+    Args:
+        generate: async (unit) -> English pairs
+        translate: async (pairs, language) -> translated pairs
+        save: async (unit, language, pairs) -> number saved; called with an
+            empty list for units that yielded no pairs
+        stored: {(unit key, language): pairs} already persisted
+        checkpoint: optional callable (sync or async) receiving progress every
+            few units
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[EvalUnit], Awaitable[List[Any]]],
+        translate: Callable[[List[Any], str], Awaitable[List[Any]]],
+        save: Callable[[EvalUnit, str, List[Any]], Awaitable[int]],
+        languages: List[str],
+        stored: Optional[Dict[Tuple[str, str], List[Any]]] = None,
+        checkpoint: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        generation_concurrency: int = EVAL_GENERATION_CONCURRENCY,
+        translation_concurrency: int = EVAL_TRANSLATION_CONCURRENCY,
+        checkpoint_every: int = EVAL_CHECKPOINT_EVERY,
+    ):
+        self._generate = generate
+        self._translate = translate
+        self._save = save
+        self.languages = languages
+        self.stored = stored or {}
+        self._checkpoint = checkpoint
+        self._generation_slots = asyncio.Semaphore(generation_concurrency)
+        self._translation_slots = asyncio.Semaphore(translation_concurrency)
+        self._checkpoint_every = max(1, checkpoint_every)
+        self._done = 0
+        self.stats = PipelineStats()
+
+    def pending(self, units: List[EvalUnit]) -> List[EvalUnit]:
+        """Units with at least one language not yet stored."""
+        return [
+            unit
+            for unit in units
+            if any((unit.key, language) not in self.stored for language in self.languages)
+        ]
+
+    async def run(self, units: List[EvalUnit], force: bool = False) -> PipelineStats:
+        if force:
+            self.stored = {}
+        self.stats.units = len(units)
+        await asyncio.gather(*(self._run_unit(unit) for unit in units))
+        await self._report()
+        return self.stats
+
+    async def _run_unit(self, unit: EvalUnit) -> None:
+        try:
+            english = self.stored.get((unit.key, BASE_LANGUAGE))
+            if english is None:
+                async with self._generation_slots:
+                    english = await self._generate(unit)
+                self.stats.generated += 1
+                await self._store(unit, BASE_LANGUAGE, english)
+            else:
+                self.stats.reused += 1
+            languages = [
+                language
+                for language in self.languages
+                if language != BASE_LANGUAGE and (unit.key, language) not in self.stored
+            ]
+            results = await asyncio.gather(
+                *(self._run_translation(unit, english, language) for language in languages),
+                return_exceptions=True,
+            )
+            for language, result in zip(languages, results):
+                if isinstance(result, Exception):
+                    self.stats.errors.append(
+                        f"{unit.eval_type} {unit.key[:8]} ({language}): {result}"
+                    )
+        except Exception as e:
+            self.stats.errors.append(f"{unit.eval_type} {unit.key[:8]}: {e}")
+        self._done += 1
+        if self._done % self._checkpoint_every == 0:
+            await self._report()
+
+    async def _run_translation(self, unit: EvalUnit, english: List[Any], language: str) -> None:
+        if not english:
+            await self._store(unit, language, [])
+            return
+        async with self._translation_slots:
+            translated = await self._translate(english, language)
+        self.stats.translated += 1
+        await self._store(unit, language, translated)
+
+    async def _store(self, unit: EvalUnit, language: str, pairs: List[Any]) -> None:
+        saved = await self._save(unit, language, pairs)
+        self.stored[(unit.key, language)] = pairs
+        self.stats.saved += saved
+        self.stats.saved_by_type[unit.eval_type] = (
+            self.stats.saved_by_type.get(unit.eval_type, 0) + saved
+        )
+
+    async def _report(self) -> None:
+        if self._checkpoint is not None:
+            result = self._checkpoint({"done": self._done, **self.stats.as_dict()})
+            if inspect.isawaitable(result):
+                await result
@@ -22,6 +22,7 @@ import os
 import sys
 import asyncio
 import argparse
+import logging
 from datetime import datetime
 from typing import Dict, List
 import uuid
@@ -40,6 +41,7 @@ from super_services.evals.eval_generator import (
     get_kb_qa_pairs,
     get_all_qa_pairs_for_agent,
 )
+from super_services.evals.eval_pipeline import EvalPipeline
 from super_services.db.services.models.agent_eval import (
     AgentQAPairModel,
     KBQAPairModel,
@@ -143,18 +145,9 @@ class EvalFlowE2ETester:
 
         try:
             # Use EvalGenerator to generate KB QA pairs
-            generator = EvalGenerator(self.agent_id)
-
-            # Check if KB QA pairs already exist (unless force_regenerate is True)
-            existing_kb_qa = generator._kb_qa_pairs_exist(self.kb_token)
-            if existing_kb_qa > 0 and not self.force_regenerate:
-                self.log(f"SKIPPED: KB QA pairs already exist ({existing_kb_qa} pairs)", "WARN")
-                self.results["kb_generation"] = {
-                    "kb_token": self.kb_token,
-                    "skipped": True,
-                    "existing_count": existing_kb_qa,
-                }
-                return True
+            generator = EvalGenerator(
+                "knowledgebase", self.agent_id, self.kb_token, logging.getLogger(__name__)
+            )
 
             # Fetch KB documents
             self.log("Fetching KB documents...")
@@ -166,16 +159,36 @@ class EvalFlowE2ETester:
 
             self.log(f"Found {len(documents)} documents in KB", "SUCCESS")
 
-            # Generate QA pairs from KB documents
-            self.log("Generating QA pairs from KB documents...")
-            kb_qa_pairs = await generator._generate_kb_qa_pairs(documents, f"KB-{self.kb_token[:8]}")
+            # Chunk × eval type units; pairs already stored for a unit are reused
+            units = generator._build_kb_units(documents, f"KB-{self.kb_token[:8]}")
+            pipeline = EvalPipeline(
+                generate=generator._generate_kb_unit,
+                translate=generator._translate_kb_unit,
+                save=lambda unit, language, pairs: generator._save_kb_qa_pairs(
+                    self.kb_token, pairs, unit.key, language
+                ),
+                languages=generator.languages,
+                stored=generator._load_stored_kb_pairs(self.kb_token),
+            )
+            pending = units if self.force_regenerate else pipeline.pending(units)
+            if not pending:
+                existing_kb_qa = sum(len(pairs) for pairs in pipeline.stored.values())
+                self.log(f"SKIPPED: KB QA pairs already exist ({existing_kb_qa} pairs)", "WARN")
+                self.results["kb_generation"] = {
+                    "kb_token": self.kb_token,
+                    "skipped": True,
+                    "existing_count": existing_kb_qa,
+                }
+                return True
 
-            if not kb_qa_pairs:
-                self.log("No QA pairs generated from KB", "ERROR")
-                return False
+            # Generate and save QA pairs from KB documents
+            self.log(f"Generating QA pairs for {len(pending)}/{len(units)} chunk evals...")
+            stats = await pipeline.run(pending, force=self.force_regenerate)
+            kb_qa_pairs = [qa for pairs in pipeline.stored.values() for qa in pairs]
+            saved_count = stats.saved
 
-            # Save KB QA pairs to kb_qa_pairs collection
-            saved_count = await generator._save_kb_qa_pairs(kb_qa_pairs, self.kb_token)
+            if stats.errors:
+                self.log(f"KB QA generation errors: {stats.errors[:3]}", "WARN")
 
             self.results["kb_generation"] = {
                 "kb_token": self.kb_token,
@@ -194,7 +207,7 @@ class EvalFlowE2ETester:
                 for i, qa in enumerate(kb_qa_pairs[:3]):
                     self.log(f"  Q{i+1}: {qa.question[:80]}...")
                     self.log(f"  A{i+1}: {qa.answer[:80]}...")
-                    self.log(f"  Keywords: {qa.keywords[:5]}")
+                    self.log(f"  Type: {qa.eval_type} ({qa.language})")
                     self.log("")
 
             return saved_count > 0
@@ -4,6 +4,7 @@ from super_services.libs.core.generator import generateRandomKey
 from super_services.libs.core.jsondecoder import convertFromBaseModel
 from super_services.libs.core.datetime import get_datetime_now
 from super_services.libs.core.message import send_message
+from super_services.libs.core.sequence import SequenceAllocator
 
 def get_pilot(pilot: str):
     return {
@@ -13,15 +14,27 @@ def get_pilot(pilot: str):
     }
 
 
-def get_seq_number(thread_id):
-    redis_key = f"{thread_id}_seq_number"
-    seq_data = REDIS.get(redis_key)
-    if seq_data:
-        seq_data = int(seq_data)
-        return redis_key, seq_data
-    else:
-        seq_data = BlockModel.count(thread_id=thread_id)
-        return redis_key, seq_data
+SEQUENCE = SequenceAllocator(REDIS, lambda: BlockModel._get_collection())
+
+
+def save_block(create_data, thread_id):
+    """Save a block under a freshly allocated seq_number.
+
+    The unique (thread_id, seq_number) index rejects a number that is already
+    taken (e.g. after Redis lost the counter); the counter is then resynced
+    from the collection and the save retried once.
+    """
+    from pymongo.errors import DuplicateKeyError
+
+    for attempt in range(2):
+        create_data["seq_number"] = SEQUENCE.allocate(thread_id)
+        try:
+            return BlockModel.save_single_to_db(create_data)
+        except DuplicateKeyError:
+            if attempt:
+                raise
+            SEQUENCE.resync(thread_id)
+
 
 def getUser(user):
     user = user.copy()
@@ -40,10 +53,7 @@ def processSaveBlock(block, user, thread_id):
         "block_id": generateRandomKey("", unique=True, length=0),
     }
     create_data.update(block)
-    redis_key, seq_data = get_seq_number(thread_id)
-    create_data["seq_number"] = seq_data + 1
-    create_data = BlockModel.save_single_to_db(create_data)
-    REDIS.set(redis_key, create_data.seq_number)
+    create_data = save_block(create_data, thread_id)
     create_data = convertFromBaseModel(create_data)
     return create_data
 
@@ -2,7 +2,8 @@
 Database abstraction layer.
 
 This module provides a unified interface for database operations,
-routing to the PostgreSQL implementation.
+routing to the PostgreSQL implementation. Async callers use
+aexecuteQuery, which runs the same queries on an asyncpg pool.
 
 For backward compatibility, executeMysqlQuery is aliased to executeQuery.
 """
@@ -12,6 +13,11 @@ from super_services.libs.core.postgres import (
     get_connection,
     close_pool,
 )
+from super_services.libs.core.postgres_async import (
+    aexecuteQuery,
+    close_async_pool,
+    health_check,
+)
 
 # Backward compatibility alias
 executeMysqlQuery = executeQuery
@@ -21,4 +27,7 @@ __all__ = [
     "executeMysqlQuery",
     "get_connection",
     "close_pool",
+    "aexecuteQuery",
+    "close_async_pool",
+    "health_check",
 ]
@@ -2,10 +2,14 @@
 PostgreSQL Connection Pool with process-aware management.
 
 Key optimizations:
-- Reduced pool size per process (2 connections)
+- Small thread-safe pool per process (2 connections by default)
 - Connection timeout and retry logic
+- Server-side statement timeout and a liveness check on checkout
 - Proper error handling for exhausted pools
 - Process-aware pool naming to avoid conflicts
+
+Code running on an event loop should use ``postgres_async.aexecuteQuery``,
+which takes the same queries without blocking the loop.
 """
 
 import logging
@@ -21,15 +25,21 @@ from super_services.libs.config import settings
 
 logger = logging.getLogger(__name__)
 
-_pool: pool.SimpleConnectionPool | None = None
+POOL_MIN_SIZE = int(os.getenv("POSTGRES_POOL_MIN_SIZE", "1"))
+POOL_MAX_SIZE = int(os.getenv("POSTGRES_POOL_MAX_SIZE", "2"))
+STATEMENT_TIMEOUT_MS = int(os.getenv("POSTGRES_STATEMENT_TIMEOUT_MS", "30000"))
+
+_pool: pool.ThreadedConnectionPool | None = None
 _pool_pid: int | None = None
 
 
-def _get_pool() -> pool.SimpleConnectionPool:
+def _get_pool() -> pool.ThreadedConnectionPool:
     """
     Get or create the connection pool for the current process.
 
-    Each process gets its own pool with a small size (2 connections).
+    Each process gets its own pool with a small size (2 connections by
+    default). The pool is thread-safe, since sync queries are also run from
+    worker threads via ``asyncio.to_thread``.
     Pool is recreated if accessed from a different process (fork safety).
     """
     global _pool, _pool_pid
@@ -44,9 +54,10 @@ def _get_pool() -> pool.SimpleConnectionPool:
 
     if _pool is None:
         try:
-            _pool = pool.SimpleConnectionPool(
-                minconn=1,
-                maxconn=2,
+            _pool = pool.ThreadedConnectionPool(
+                minconn=POOL_MIN_SIZE,
+                maxconn=POOL_MAX_SIZE,
+                options=f"-c statement_timeout={STATEMENT_TIMEOUT_MS}",
                 **settings.POSTGRES_CONFIG,
             )
             _pool_pid = current_pid
@@ -94,6 +105,10 @@ def get_connection(max_retries: int = 3, retry_delay: float = 0.5):
     for attempt in range(max_retries):
         try:
             conn = current_pool.getconn()
+            if conn.closed:
+                # Dropped by the server while idle; replace it.
+                current_pool.putconn(conn, close=True)
+                conn = current_pool.getconn()
             break
         except pool.PoolError as e:
             last_error = e
@@ -0,0 +1,234 @@
+"""
+Async PostgreSQL access on an asyncpg connection pool.
+
+Queries written for the sync facade (psycopg2 ``%s`` / ``%(name)s``
+placeholders) run unchanged: they are rewritten to asyncpg's ``$n`` form
+once per query shape and cached, and asyncpg keeps a per-connection cache
+of the prepared statements.
+
+- One pool per process and event loop (asyncpg pools are loop-bound);
+  pools whose loop has been closed are terminated on the next lookup.
+- Pool size, statement cache size and timeouts come from the environment.
+- Every connection gets a server-side statement_timeout; idle connections
+  are recycled and broken ones are dropped by the pool on release.
+- JSON columns decode to Python objects, as with psycopg2.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any
+
+import asyncpg
+
+from super_services.libs.config import settings
+
+logger = logging.getLogger(__name__)
+
+POOL_MIN_SIZE = int(os.getenv("POSTGRES_ASYNC_POOL_MIN_SIZE", "1"))
+POOL_MAX_SIZE = int(os.getenv("POSTGRES_ASYNC_POOL_MAX_SIZE", "8"))
+STATEMENT_CACHE_SIZE = int(os.getenv("POSTGRES_STATEMENT_CACHE_SIZE", "256"))
+STATEMENT_TIMEOUT_MS = int(os.getenv("POSTGRES_STATEMENT_TIMEOUT_MS", "30000"))
+ACQUIRE_TIMEOUT_SECONDS = float(os.getenv("POSTGRES_ACQUIRE_TIMEOUT_SECONDS", "10"))
+MAX_INACTIVE_CONNECTION_SECONDS = float(
+    os.getenv("POSTGRES_MAX_INACTIVE_CONNECTION_SECONDS", "300")
+)
+
+_PLACEHOLDER = re.compile(r"%%|%\((\w+)\)s|%s")
+
+# Keyed by the loop object itself. A pool holds its loop, so a weak mapping
+# would never drop entries; pools of closed loops are swept instead.
+_pools: dict[asyncio.AbstractEventLoop, asyncpg.Pool] = {}
+_pool_creation: dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+_pools_pid: int | None = None
+
+
+@lru_cache(maxsize=512)
+def _compile(query: str) -> tuple[str, tuple[str | int, ...]]:
+    """
+    ``%s`` / ``%(name)s`` query -> ``$n`` query and the parameter each
+    placeholder reads (a name, or a positional index).
+    """
+    names: list[str] = []
+    order: list[str | int] = []
+    position = 0
+
+    def replace(match: re.Match) -> str:
+        nonlocal position
+        if match.group(0) == "%%":
+            return "%"
+        name = match.group(1)
+        if name is None:
+            order.append(position)
+            position += 1
+            return f"${len(order)}"
+        if name not in names:
+            names.append(name)
+            order.append(name)
+        return f"${order.index(name) + 1}"
+
+    return _PLACEHOLDER.sub(replace, query), tuple(order)
+
+
+def to_asyncpg_query(
+    query: str, params: dict[str, Any] | tuple[Any, ...] | list[Any] | None = None
+) -> tuple[str, list[Any]]:
+    """
+    Rewrite a psycopg2-style query for asyncpg.
+
+    Tuple values expand to a parenthesised list, as psycopg2 adapts them
+    for ``IN %(ids)s``; lists stay arrays (``= ANY(%(ids)s)``).
+    """
+    if not params:
+        # executeQuery runs the query verbatim when there are no params.
+        return query, []
+    sql, order = _compile(query)
+    values = [params[key] for key in order]
+    if not any(isinstance(value, tuple) for value in values):
+        return sql, values
+
+    args: list[Any] = []
+    placeholders: list[str] = []
+    for value in values:
+        if isinstance(value, tuple):
+            start = len(args) + 1
+            args.extend(value)
+            placeholders.append(
+                "(" + ", ".join(f"${i}" for i in range(start, len(args) + 1)) + ")"
+            )
+        else:
+            args.append(value)
+            placeholders.append(f"${len(args)}")
+    sql = re.sub(r"\$(\d+)\b", lambda m: placeholders[int(m.group(1)) - 1], sql)
+    return sql, args
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
+        )
+
+
+async def _create_pool() -> asyncpg.Pool:
+    config = settings.POSTGRES_CONFIG
+    return await asyncpg.create_pool(
+        host=config.get("host"),
+        port=config.get("port"),
+        user=config.get("user"),
+        password=config.get("password"),
+        database=config.get("database") or config.get("dbname"),
+        min_size=POOL_MIN_SIZE,
+        max_size=POOL_MAX_SIZE,
+        statement_cache_size=STATEMENT_CACHE_SIZE,
+        max_inactive_connection_lifetime=MAX_INACTIVE_CONNECTION_SECONDS,
+        command_timeout=STATEMENT_TIMEOUT_MS / 1000 + 1,
+        server_settings={"statement_timeout": str(STATEMENT_TIMEOUT_MS)},
+        init=_init_connection,
+    )
+
+
+def _sweep_pools() -> None:
+    """Forget pools inherited over fork and terminate those of closed loops."""
+    global _pools_pid
+    if _pools_pid != os.getpid():
+        # The parent's connections must not be used (or closed) here.
+        _pools.clear()
+        _pool_creation.clear()
+        _pools_pid = os.getpid()
+        return
+    for loop in [loop for loop in _pools if loop.is_closed()]:
+        pool = _pools.pop(loop)
+        try:
+            pool.terminate()
+        except Exception as e:
+            # The loop cannot run transport callbacks any more; dropping the
+            # pool lets its sockets be closed when they are collected.
+            logger.debug(f"Error terminating pool of a closed loop: {e}")
+
+
+async def get_async_pool() -> asyncpg.Pool:
+    """Pool for the current process and event loop, created on first use."""
+    _sweep_pools()
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is not None and not pool.is_closing():
+        return pool
+
+    # Concurrent first callers share one pool creation.
+    task = _pool_creation.get(loop)
+    if task is None:
+        task = loop.create_task(_create_pool())
+        _pool_creation[loop] = task
+        task.add_done_callback(lambda _: _pool_creation.pop(loop, None))
+    try:
+        pool = await asyncio.shield(task)
+    except (OSError, asyncpg.PostgresError) as e:
+        logger.error(f"Failed to create async PostgreSQL pool: {e}")
+        raise
+    _pools[loop] = pool
+    logger.debug(f"Created async PostgreSQL pool for process {os.getpid()}")
+    return pool
+
+
+async def close_async_pool() -> None:
+    """Close this process's pool for the running event loop."""
+    _sweep_pools()
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        try:
+            await pool.close()
+        except Exception as e:
+            logger.debug(f"Error during async pool cleanup: {e}")
+
+
+@asynccontextmanager
+async def get_async_connection(timeout: float = ACQUIRE_TIMEOUT_SECONDS):
+    """Acquire a pooled asyncpg connection."""
+    pool = await get_async_pool()
+    async with pool.acquire(timeout=timeout) as conn:
+        yield conn
+
+
+async def health_check(timeout: float = 2.0) -> bool:
+    """True when a pooled connection answers ``SELECT 1`` within ``timeout``."""
+    try:
+        async with get_async_connection(timeout=timeout) as conn:
+            return await conn.fetchval("SELECT 1", timeout=timeout) == 1
+    except Exception as e:
+        logger.warning(f"PostgreSQL health check failed: {e}")
+        return False
+
+
+async def aexecuteQuery(
+    query: str,
+    params: dict[str, Any] | tuple[Any, ...] | None = None,
+    many: bool = False,
+    commit: bool = False,
+) -> dict[str, Any] | list[dict[str, Any]] | None:
+    """
+    Async executeQuery: same arguments and result shapes as the sync facade.
+
+    Args:
+        query: SQL query string with psycopg2 placeholders
+        params: Query parameters (dict for named params, tuple for positional)
+        many: If True, return all rows; if False, return first row
+        commit: If True, execute a write and return None
+
+    Returns:
+        Query result as dict(s) or None
+    """
+    sql, args = to_asyncpg_query(query, params)
+    async with get_async_connection() as conn:
+        if commit:
+            await conn.execute(sql, *args)
+            return None
+        if many:
+            rows = await conn.fetch(sql, *args)
+            return [dict(row) for row in rows]
+        row = await conn.fetchrow(sql, *args)
+        return dict(row) if row else None
@@ -0,0 +1,193 @@
+"""
+Batch reconciliation helpers for the calls sync cron.
+
+- resolve_tasks_for_calls: matches a window of VAPI calls to tasks with two
+  ``$in`` queries (by call_id, then by agent + contact number) instead of
+  up to three queries per call.
+- SbcRecordingIndex: SBC recordings grouped by normalized destination
+  number and sorted by time, so matching a task is a bisect plus a short
+  walk inside the time window instead of a scan over every recording.
+- sbc_listing_prefixes: S3 prefixes covering a period, hourly on the
+  partial first/last days, so they can be listed concurrently.
+"""
+
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Optional
+
+# Task statuses a call can still be matched to by agent + contact number.
+OPEN_TASK_STATUSES = ["pending", "in_progress", "queued", "failed"]
+
+# Maximum distance between a task and its SBC recording (90 minutes).
+SBC_MATCH_WINDOW_SECONDS = 5400
+
+SBC_TIME_FORMAT = "%Y-%m-%d-%H-%M-%S"
+
+
+def call_contact_number(call_data: dict) -> Optional[str]:
+    return call_data.get("customer", {}).get("number") or call_data.get(
+        "destination", {}
+    ).get("number")
+
+
+def parse_sbc_key(key: str) -> Optional[dict]:
+    """
+    Parse sbc_prefix/YYYY/YYYY-MM-DD-HH-MM-SS_+source_+dest_uuid.wav into
+    {source, destination, time}, or None when the key is not a recording.
+    """
+    if not key.endswith(".wav"):
+        return None
+    parts = key.split("/")[-1].split("_")
+    if len(parts) < 3:
+        return None
+    try:
+        file_time = datetime.strptime(parts[0], SBC_TIME_FORMAT)
+    except ValueError:
+        return None
+    return {
+        "source": parts[1].lstrip("+").lstrip("0")[-10:],
+        "destination": parts[2].lstrip("+").lstrip("0")[-10:],
+        "time": file_time,
+    }
+
+
+def sbc_listing_prefixes(base: str, start: datetime, end: datetime) -> list[str]:
+    """
+    S3 prefixes covering [start, end] (naive datetimes).
+
+    Full days get one prefix each; the first and last day are split into
+    hourly prefixes so hours outside the period are never listed.
+    """
+    prefixes: list[str] = []
+    first_day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    last_day = end.replace(hour=0, minute=0, second=0, microsecond=0)
+    day = first_day
+    while day <= last_day:
+        day_prefix = f"{base}/{day.year}/{day.strftime('%Y-%m-%d')}"
+        first_hour = start.hour if day == first_day else 0
+        last_hour = end.hour if day == last_day else 23
+        if first_hour == 0 and last_hour == 23:
+            prefixes.append(day_prefix)
+        else:
+            prefixes.extend(
+                f"{day_prefix}-{hour:02d}" for hour in range(first_hour, last_hour + 1)
+            )
+        day += timedelta(days=1)
+    return prefixes
+
+
+class SbcRecordingIndex:
+    """SBC recordings keyed by destination number, each list sorted by time."""
+
+    def __init__(self, recordings: Iterable[dict]):
+        by_destination: dict[str, list[tuple[datetime, str, str]]] = {}
+        for recording in recordings:
+            by_destination.setdefault(recording["destination"], []).append(
+                (recording["time"], recording["source"], recording["url"])
+            )
+        self._entries: dict[str, list[tuple[datetime, str, str]]] = {}
+        self._times: dict[str, list[datetime]] = {}
+        for destination, entries in by_destination.items():
+            entries.sort(key=lambda entry: entry[0])
+            self._entries[destination] = entries
+            self._times[destination] = [entry[0] for entry in entries]
+
+    @classmethod
+    def from_map(cls, recordings_map: dict[str, dict]) -> "SbcRecordingIndex":
+        return cls(recordings_map.values())
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def match(
+        self,
+        destination: str,
+        source: str,
+        at: Optional[datetime],
+        window_seconds: float = SBC_MATCH_WINDOW_SECONDS,
+    ) -> Optional[str]:
+        """URL of the recording closest to ``at`` within the window, if any."""
+        entries = self._entries.get(destination)
+        if not entries or at is None:
+            return None
+
+        times = self._times[destination]
+        right = bisect_left(times, at)
+        left = right - 1
+        # Walk outwards from ``at``, nearest recording first.
+        while left >= 0 or right < len(entries):
+            left_diff = (at - times[left]).total_seconds() if left >= 0 else None
+            right_diff = (
+                (times[right] - at).total_seconds() if right < len(entries) else None
+            )
+            if right_diff is None or (left_diff is not None and left_diff <= right_diff):
+                diff, entry = left_diff, entries[left]
+                left -= 1
+            else:
+                diff, entry = right_diff, entries[right]
+                right += 1
+            if diff > window_seconds:
+                return None
+            if not source or entry[1] == source:
+                return entry[2]
+        return None
+
+
+def resolve_tasks_for_calls(
+    calls: list[dict],
+    find: Callable[[dict], Iterable[dict]],
+) -> list[Optional[dict]]:
+    """
+    Match each call to its most recently modified task, aligned with ``calls``.
+
+    Same priorities as matching one call at a time:
+    1. output.call_id == call id
+    2. open task with the call's vapi_agent_id + contact_number + number_id
+    3. open task with the call's vapi_agent_id + contact_number
+
+    ``find(query)`` runs a task query sorted by ``modified`` descending;
+    at most two queries are issued for the whole batch.
+    """
+    results: list[Optional[dict]] = [None] * len(calls)
+
+    call_ids = list({call["id"] for call in calls if call.get("id")})
+    by_call_id: dict[str, dict] = {}
+    if call_ids:
+        for task in find({"output.call_id": {"$in": call_ids}}):
+            call_id = task.get("output", {}).get("call_id")
+            by_call_id.setdefault(call_id, task)
+
+    unresolved: list[int] = []
+    for idx, call in enumerate(calls):
+        task = by_call_id.get(call.get("id")) if call.get("id") else None
+        if task is not None:
+            results[idx] = task
+        elif call.get("assistantId") and call_contact_number(call):
+            unresolved.append(idx)
+
+    if not unresolved:
+        return results
+
+    assistant_ids = list({calls[idx]["assistantId"] for idx in unresolved})
+    contacts = list({call_contact_number(calls[idx]) for idx in unresolved})
+    by_number_id: dict[tuple, dict] = {}
+    by_contact: dict[tuple, dict] = {}
+    for task in find(
+        {
+            "input.vapi_agent_id": {"$in": assistant_ids},
+            "input.contact_number": {"$in": contacts},
+            "status": {"$in": OPEN_TASK_STATUSES},
+        }
+    ):
+        task_input = task.get("input", {})
+        key = (task_input.get("vapi_agent_id"), task_input.get("contact_number"))
+        by_contact.setdefault(key, task)
+        by_number_id.setdefault(key + (task_input.get("number_id"),), task)
+
+    for idx in unresolved:
+        call = calls[idx]
+        key = (call["assistantId"], call_contact_number(call))
+        phone_number_id = call.get("phoneNumberId")
+        task = by_number_id.get(key + (phone_number_id,)) if phone_number_id else None
+        results[idx] = task or by_contact.get(key)
+    return results
@@ -16,8 +16,9 @@ import os
 import time
 import traceback
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Union
 
 import boto3
 import requests
@@ -31,6 +32,12 @@ from super_services.db.services.models.task import (
     TaskModel,
 )
 from super_services.db.services.schemas.task import TaskStatusEnum
+from super_services.orchestration.cron_jobs.call_reconciliation import (
+    SbcRecordingIndex,
+    parse_sbc_key,
+    resolve_tasks_for_calls,
+    sbc_listing_prefixes,
+)
 from super_services.voice.models.config import ModelConfig
 from super_services.libs.core.db import executeQuery
 
@@ -59,6 +66,7 @@ class CallsSyncService:
         self.aws_region = os.getenv("AWS_DEFAULT_REGION", "ap-south-1")
         self.vapi_s3_prefix = os.getenv("VAPI_S3_FILE_PATH", "")
         self.sbc_s3_prefix = os.getenv("S3_FILE_PATH", "")
+        self.s3_list_concurrency = int(os.getenv("SBC_S3_LIST_CONCURRENCY", "16"))
         self._s3_client: Optional[boto3.client] = None
         self._phone_number_cache: dict[str, str] = {}  # Cache for phone numbers
         self._failed_phone_ids: set[str] = set()  # Track failed phone number IDs
@@ -379,71 +387,26 @@ class CallsSyncService:
         Returns:
             Task dict if found, None otherwise
         """
-        call_id = call_data.get("id")
-
-        # Strategy 1: Match by call_id
-        if call_id:
-            try:
-                tasks = list(
-                    TaskModel._get_collection().find(
-                        {"output.call_id": call_id}, sort=[("modified", -1)]
-                    )
-                )
-                if tasks:
-                    return tasks[0]
-            except Exception as e:
-                print(f"Error finding task by call_id {call_id}: {e}")
-
-        # Strategy 2: Match by vapi_agent_id + number_id + contact_number
-        assistant_id = call_data.get("assistantId")
-        phone_number_id = call_data.get("phoneNumberId")
-
-        # Get contact number from customer or destination
-        contact_number = call_data.get("customer", {}).get("number")
-        if not contact_number:
-            contact_number = call_data.get("destination", {}).get("number")
-
-        if assistant_id and contact_number:
-            try:
-                # Build query for matching pending/in-progress/failed tasks
-                query = {
-                    "input.vapi_agent_id": assistant_id,
-                    "input.contact_number": contact_number,
-                    "status": {"$in": ["pending", "in_progress", "queued", "failed"]},
-                }
+        return self.find_tasks_for_calls([call_data])[0]
 
-                # Add number_id filter if available
-                if phone_number_id:
-                    query["input.number_id"] = phone_number_id
-
-                tasks = list(
-                    TaskModel._get_collection().find(query, sort=[("modified", -1)])
-                )
+    def find_tasks_for_calls(self, calls: list[dict]) -> list[Optional[dict]]:
+        """
+        Batch version of find_task_for_call, aligned with ``calls``.
 
-                if tasks:
-                    return tasks[0]
-
-                # Fallback: Try without number_id (some tasks may not have it)
-                if phone_number_id:
-                    query_without_number = {
-                        "input.vapi_agent_id": assistant_id,
-                        "input.contact_number": contact_number,
-                        "status": {
-                            "$in": ["pending", "in_progress", "queued", "failed"]
-                        },
-                    }
-                    tasks = list(
-                        TaskModel._get_collection().find(
-                            query_without_number, sort=[("modified", -1)]
-                        )
-                    )
-                    if tasks:
-                        return tasks[0]
+        Resolves the whole window with two ``$in`` queries instead of up to
+        three queries per call.
+        """
 
-            except Exception as e:
-                print(f"Error finding task by agent+number: {e}")
+        def find(query: dict) -> list[dict]:
+            return list(
+                TaskModel._get_collection().find(query, sort=[("modified", -1)])
+            )
 
-        return None
+        try:
+            return resolve_tasks_for_calls(calls, find)
+        except Exception as e:
+            print(f"Error finding tasks for {len(calls)} calls: {e}")
+            return [None] * len(calls)
 
     def find_task_by_call_id(self, call_id: str) -> Optional[dict]:
         """Find existing task by call_id in output field (legacy method)."""
@@ -649,59 +612,38 @@ class CallsSyncService:
         recordings_map: dict[str, dict] = {}
         url_prefix = f"https://{self.aws_bucket}.s3.{self.aws_region}.amazonaws.com/"
 
-        try:
-            paginator = self.s3_client.get_paginator("list_objects_v2")
-
-            # Build date-specific prefixes: sbc_prefix/YYYY/YYYY-MM-DD
-            date_prefixes: list[str] = []
-            current = start_naive.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_date = end_naive.replace(hour=23, minute=59, second=59)
-
-            while current <= end_date:
-                date_str = current.strftime("%Y-%m-%d")
-                prefix = f"{self.sbc_s3_prefix}/{current.year}/{date_str}"
-                date_prefixes.append(prefix)
-                current += timedelta(days=1)
-
-            print(f"Searching SBC recordings in {len(date_prefixes)} date prefix(es)")
+        def list_prefix(prefix: str) -> list[str]:
+            paginator = s3_client.get_paginator("list_objects_v2")
+            return [
+                obj["Key"]
+                for page in paginator.paginate(Bucket=self.aws_bucket, Prefix=prefix)
+                for obj in page.get("Contents", [])
+            ]
 
-            for date_prefix in date_prefixes:
-                for page in paginator.paginate(
-                    Bucket=self.aws_bucket, Prefix=date_prefix
-                ):
-                    for obj in page.get("Contents", []):
-                        key = obj["Key"]
+        try:
+            s3_client = self.s3_client  # created once, shared by the workers
 
-                        if not key.endswith(".wav"):
-                            continue
+            # Date/hour prefixes: sbc_prefix/YYYY/YYYY-MM-DD[-HH]
+            prefixes = sbc_listing_prefixes(self.sbc_s3_prefix, start_naive, end_naive)
+            print(f"Searching SBC recordings in {len(prefixes)} prefix(es)")
 
-                        # Parse filename: sbc_prefix/YYYY/YYYY-MM-DD-HH-MM-SS_+source_+dest_uuid.wav
-                        filename = key.split("/")[-1]
-                        parts = filename.split("_")
-                        if len(parts) < 3:
-                            continue
+            # Listing is I/O bound; list every prefix at once.
+            workers = max(1, min(self.s3_list_concurrency, len(prefixes)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                listings = list(executor.map(list_prefix, prefixes))
 
-                        try:
-                            time_part = parts[0]
-                            file_time = datetime.strptime(
-                                time_part, "%Y-%m-%d-%H-%M-%S"
-                            )
-                        except (ValueError, IndexError):
-                            continue
+            for keys in listings:
+                for key in keys:
+                    recording = parse_sbc_key(key)
+                    if not recording:
+                        continue
 
-                        # Filter by time range
-                        if file_time < start_naive or file_time > end_naive:
-                            continue
+                    # Filter by time range
+                    if not start_naive <= recording["time"] <= end_naive:
+                        continue
 
-                        raw_source = parts[1].lstrip("+").lstrip("0")[-10:]
-                        raw_dest = parts[2].lstrip("+").lstrip("0")[-10:]
-
-                        recordings_map[key] = {
-                            "url": url_prefix + key,
-                            "source": raw_source,
-                            "destination": raw_dest,
-                            "time": file_time,
-                        }
+                    recording["url"] = url_prefix + key
+                    recordings_map[key] = recording
 
             print(f"Found {len(recordings_map)} SBC recordings in period")
             return recordings_map
@@ -713,14 +655,15 @@ class CallsSyncService:
     def match_task_to_sbc_recording(
         self,
         task: dict,
-        recordings_map: dict[str, dict],
+        recordings: Union[dict[str, dict], SbcRecordingIndex],
     ) -> Optional[str]:
         """
-        Match a task to an SBC recording from the pre-fetched map.
+        Match a task to the closest SBC recording within 90 minutes.
 
         Args:
             task: Task dict with input/output containing phone numbers
-            recordings_map: Pre-fetched recordings map
+            recordings: Pre-built SbcRecordingIndex, or a pre-fetched
+                recordings map (indexed on the fly)
 
         Returns:
             Recording URL if matched, None otherwise
@@ -740,37 +683,18 @@ class CallsSyncService:
         if not dest_normalized:
             return None
 
-        best_match: Optional[dict] = None
-        best_diff = float("inf")
-
-        for recording in recordings_map.values():
-            if recording["destination"] != dest_normalized:
-                continue
-
-            # Check source if available
-            if source_normalized and recording["source"] != source_normalized:
-                continue
-
-            # Calculate time difference
-            if task_modified:
-                record_time = recording["time"]
-                diff = abs((task_modified - record_time).total_seconds())
-                if diff < best_diff:
-                    best_diff = diff
-                    best_match = recording
-
-        # Return best match if within threshold (90 minutes for single, 5 min for multiple)
-        if best_match and best_diff <= 5400:  # 90 minutes max
-            return best_match["url"]
-
-        return None
+        if not isinstance(recordings, SbcRecordingIndex):
+            recordings = SbcRecordingIndex.from_map(recordings)
+        return recordings.match(dest_normalized, source_normalized, task_modified)
 
     async def get_recording_url(
         self,
         call_id: str,
         call_data: dict,
         task: Optional[dict],
-        sbc_recordings_map: Optional[dict[str, dict]] = None,
+        sbc_recordings_map: Optional[
+            Union[dict[str, dict], SbcRecordingIndex]
+        ] = None,
     ) -> str:
         """
         Get recording URL - check task first, then call data, then S3, then SBC, then provider API.
@@ -779,7 +703,7 @@ class CallsSyncService:
             call_id: The call ID
             call_data: Raw call data from VAPI API
             task: Existing task dict (if found)
-            sbc_recordings_map: Pre-fetched SBC recordings map for batch matching
+            sbc_recordings_map: Pre-fetched SBC recordings (index or map) for batch matching
 
         Returns:
             Recording URL or empty string
@@ -974,7 +898,11 @@ class CallsSyncService:
         }
 
         try:
+            from super_services.orchestration.task.task_service import TaskService
+
             TaskModel.save_single_to_db(task_data)
+            # A reused run already has task_counts; count the new task in it
+            TaskService()._bump_run_task_counts(run_id, None, TaskStatusEnum.completed)
             print(f"Created task {task_id} for call {call_id}")
             return task_data
         except Exception as e:
@@ -1308,7 +1236,12 @@ class CallsSyncService:
                 )
             except ValueError:
                 pass
-        sbc_recordings_map = self.fetch_sbc_recordings_for_period(sbc_start_time)
+        sbc_recordings = SbcRecordingIndex.from_map(
+            self.fetch_sbc_recordings_for_period(sbc_start_time)
+        )
+
+        # Resolve existing tasks for the whole window up front
+        matched_tasks = self.find_tasks_for_calls(all_calls)
 
         # Step 4: Process each call
         print(f"[SYNC] Step 4: Processing {len(all_calls)} calls...")
@@ -1322,8 +1255,8 @@ class CallsSyncService:
                 continue
 
             try:
-                # Find existing task using multiple matching strategies
-                task = self.find_task_for_call(call)
+                # Existing task matched by call_id or agent + contact number
+                task = matched_tasks[idx]
 
                 if task:
                     stats["tasks_found"] += 1
@@ -1356,7 +1289,7 @@ class CallsSyncService:
                 recording_url = task.get("output", {}).get("recording_url")
                 if not recording_url:
                     recording_url = await self.get_recording_url(
-                        call_id, call, task, sbc_recordings_map
+                        call_id, call, task, sbc_recordings
                     )
                     if recording_url:
                         output = task.get("output", {})
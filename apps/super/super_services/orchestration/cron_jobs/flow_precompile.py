@@ -0,0 +1,50 @@
+from typing import Any, Dict, Optional
+
+from prefect import task, flow
+
+from super_services.voice.models.config import ModelConfig
+
+
+@task(
+    name="precompile_flow_blueprint",
+)
+async def precompile_flow_blueprint(system_prompt: str) -> Dict[str, Any]:
+    from super.core.voice.workflows.flows.flow_generator_v3 import precompile_flow
+
+    return await precompile_flow(system_prompt)
+
+
+@flow(
+    name="precompile_agent_flow",
+    description="Compile an agent's flow blueprint when its prompt is saved",
+    log_prints=True,
+)
+async def precompile_agent_flow(
+    agent_id: str,
+    system_prompt: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Compile and cache the flow blueprint for an agent's system prompt.
+
+    Args:
+        agent_id: Agent handle whose prompt was saved
+        system_prompt: Saved prompt; fetched from the agent config if omitted
+
+    Returns:
+        Flow compile cache stats (compile time, hit rate, goals)
+    """
+    if not system_prompt:
+        config = ModelConfig().get_config(agent_id=agent_id)
+        system_prompt = (config or {}).get("system_prompt")
+
+    if not system_prompt:
+        print(f"No system prompt for agent {agent_id}, nothing to precompile")
+        return {"agent_id": agent_id, "skipped": True}
+
+    stats = await precompile_flow_blueprint(system_prompt)
+    print(
+        f"Precompiled flow for {agent_id}: {stats.get('goals')} goals in "
+        f"{stats.get('last_compile_time', 0.0):.2f}s "
+        f"(cache hit rate {stats.get('hit_rate', 0.0):.0%})"
+    )
+    return {"agent_id": agent_id, **stats}
@@ -132,7 +132,9 @@ async def update_task(
         updated_data["collection_ref"] = doc_ref
         run_data["collection_ref"] = doc_ref
 
-    TaskModel.update_one({"task_id": task.task_id}, updated_data)
+    from super_services.orchestration.task.task_service import TaskService
+
+    TaskService().update_task(task.task_id, updated_data)
     RunModel.update_one({"run_id": task.run_id}, run_data)
 
     await save_execution_log(
@@ -229,8 +231,10 @@ def generate_post_flow_name():
 @task(name="update-task-status")
 async def update_task_status(task_id,call_result):
     try:
+        from super_services.orchestration.task.task_service import TaskService
+
         update_data = {"status": TaskStatusEnum.completed, "output": {"call_status": call_result.call_status,"data":"call completed evaluated data will be available soon"}}
-        TaskModel.update_one({"task_id": task_id}, update_data)
+        TaskService().update_task(task_id, update_data)
     except Exception as e:
         pass
 
@@ -258,8 +258,10 @@ class CallUpdater:
             )
             output_data["recording_url"] = recordings.get(call_id)
 
+        from super_services.orchestration.task.task_service import TaskService
+
         new_data = {"status": TaskStatusEnum.completed, "output": output_data}
-        TaskModel.update_one({"task_id": task.task_id}, new_data)
+        TaskService().update_task(task.task_id, new_data)
 
         print("updating task")
         print("sending webhook request")
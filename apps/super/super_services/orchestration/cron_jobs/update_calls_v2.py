@@ -160,12 +160,7 @@ class VapiCallUpdater:
             "retry_attempt": int(retry_attempt + 1),
             "output.call_end_reason": call_end_reason,
         }
-        TaskModel._get_collection().update_one(
-            {
-                "task_id": task_id,
-            },
-            {"$set": new_data},
-        )
+        TaskService().update_task(task_id, new_data)
         print_log(f"Marking task {task_id} as pending due to specific error reason")
 
     def mark_call_to_schedule(
@@ -189,7 +184,7 @@ class VapiCallUpdater:
             "retry_attempt": int(retry_attempt + 1),
             "output.call_end_reason": call_end_reason,
         }
-        TaskModel._get_collection().update_one({"task_id": task_id}, {"$set": new_data})
+        TaskService().update_task(task_id, new_data)
         _reschedule_to_prefect(task_id, schedule_time)
 
     def mark_failed_max_retries(self, task_id, call_end_reason, retry_attempt):
@@ -201,12 +196,7 @@ class VapiCallUpdater:
             "retry_attempt": int(retry_attempt + 1),
         }
 
-        TaskModel._get_collection().update_one(
-            {
-                "task_id": task_id,
-            },
-            {"$set": new_data},
-        )
+        TaskService().update_task(task_id, new_data)
         print_log(f"Marking task {task_id} as failed after maximum retries")
 
     def check_sms_assignee(self, assignee):
@@ -343,10 +333,7 @@ class VapiCallUpdater:
                 updated_data[f"output.{key}"] = value
 
         print_log("updating task")
-        TaskModel._get_collection().update_one(
-            {"task_id": task.get("task_id")},
-            {"$set": updated_data},
-        )
+        TaskService().update_task(task.get("task_id"), updated_data)
         print_log("sending webhook request")
 
         asyncio.run(self.webhook_handler.execute(task_id=task.get("task_id")))
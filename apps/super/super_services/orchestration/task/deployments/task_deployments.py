@@ -15,6 +15,7 @@ from super_services.voice.consumers.prefect_task_consumer import (
 )
 from super_services.orchestration.cron_jobs.post_call import post_call_flow
 from super_services.orchestration.cron_jobs.eval_testing import test_agent_evals
+from super_services.orchestration.cron_jobs.flow_precompile import precompile_agent_flow
 # from super_services.orchestration.cron_jobs.calls_cron import inbound_calls_flow
 # from super_services.orchestration.cron_jobs.recordings_cron import recordings_cron
 
@@ -81,6 +82,15 @@ DEPLOYMENT_CONFIGURATIONS = [
         "tags": ["evals", "agent_testing"],
         "concurrency": 10,
         "job_variables": {"env": CALL_ENVS},
+    },
+    {
+        "name": "Precompile-Agent-Flow",
+        "flow": precompile_agent_flow,
+        "docker_image": DOCKER_IMAGES["call_task"],
+        "work_pool_name": CALL_WORK_POOL,
+        "tags": ["call", "flow_compile"],
+        "concurrency": 4,
+        "job_variables": {"env": CALL_ENVS},
     }
     # {
     #     "name": "Inbound Calls",
@@ -0,0 +1,244 @@
+"""
+Server-side run analytics.
+
+The aggregation below computes, in one pass inside Mongo, the same numbers
+TaskService.calculate_run_analytics derives from a run's task documents.
+It groups by task status (and raw success score), so a few small documents
+come back instead of every task of the run.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from super_services.db.services.schemas.task import TaskStatusEnum
+
+CALL_STATUS_BUCKETS = {
+    "interested": ["InterestedIn", "Interested"],
+    "call_back": ["Call Back"],
+    "send_details": ["Send Details"],
+    "not_interested": ["Not Interested"],
+    "not_connected": ["Not Connected"],
+}
+
+_EXECUTION_STATUS_KEYS = ("completed", "failed", "pending", "in_progress")
+
+# Statuses in which a task no longer blocks its run from finishing.
+RUN_TERMINAL_TASK_STATUSES = [TaskStatusEnum.completed.value, TaskStatusEnum.failed.value]
+
+
+def _sum_if(condition) -> Dict[str, Any]:
+    return {"$sum": {"$cond": [condition, 1, 0]}}
+
+
+def run_analytics_pipeline(run_id: str) -> List[Dict[str, Any]]:
+    """Aggregation pipeline producing per-status analytics groups for a run."""
+    transcript = "$output.transcript"
+    has_transcript = {
+        "$cond": [
+            {"$isArray": transcript},
+            {"$gt": [{"$size": transcript}, 0]},
+            # Non-empty string: in BSON order strings sort above "" and
+            # below documents.
+            {"$and": [{"$gt": [transcript, ""]}, {"$lt": [transcript, {}]}]},
+        ]
+    }
+    with_transcript = {"$and": [{"$eq": ["$execution_type", "call"]}, has_transcript]}
+    group: Dict[str, Any] = {
+        # Success scores are grouped by raw value and parsed in Python, the
+        # same way calculate_run_analytics parses them; runs only have a
+        # handful of distinct values.
+        "_id": {"status": "$status", "score": "$score"},
+        "count": {"$sum": 1},
+        "total_retries": {"$sum": "$retry_attempt"},
+        "calls": _sum_if("$is_call"),
+        "transcript_available": _sum_if("$with_transcript"),
+        "error_or_unknown": _sum_if(
+            {"$and": ["$is_call", {"$in": ["$call_status", ["Error", "Unknown"]]}]}
+        ),
+    }
+    for bucket, statuses in CALL_STATUS_BUCKETS.items():
+        group[bucket] = _sum_if({"$and": ["$is_call", {"$in": ["$call_status", statuses]}]})
+
+    return [
+        {"$match": {"run_id": run_id}},
+        {
+            "$project": {
+                "status": 1,
+                "retry_attempt": {"$ifNull": ["$retry_attempt", 0]},
+                "is_call": {"$eq": ["$execution_type", "call"]},
+                "call_status": {
+                    "$ifNull": ["$output.post_call_data.summary.status", "Unknown"]
+                },
+                "with_transcript": with_transcript,
+                "score": {
+                    "$cond": [
+                        with_transcript,
+                        {"$ifNull": ["$output.post_call_data.success_evaluator", None]},
+                        None,
+                    ]
+                },
+            }
+        },
+        {"$group": group},
+    ]
+
+
+def run_task_counts_pipeline(run_id: str) -> List[Dict[str, Any]]:
+    return [
+        {"$match": {"run_id": run_id}},
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+    ]
+
+
+def empty_run_analytics(total_tasks: int = 0) -> Tuple[Dict, Dict]:
+    call_analytics = {
+        "total_calls": 0,
+        "interested": 0,
+        "call_back": 0,
+        "send_details": 0,
+        "not_interested": 0,
+        "not_connected": 0,
+        "failed": 0,
+        "quality_metrics": {
+            "transcript_available": 0,
+            "no_transcript": 0,
+            "transcript_rate": 0.0,
+            "avg_success_score": 0.0,
+            "total_success_score": 0,
+            "success_score_count": 0,
+        },
+    }
+    execution_analytics = {
+        "total_tasks": total_tasks,
+        "completed": 0,
+        "failed": 0,
+        "pending": 0,
+        "in_progress": 0,
+        "success_rate": 0.0,
+        "completion_rate": 0.0,
+        "avg_retry_attempts": 0.0,
+        "total_retries": 0,
+    }
+    return call_analytics, execution_analytics
+
+
+def finalize_run_analytics(call_analytics: Dict, execution_analytics: Dict) -> None:
+    """Fill in the derived rates from the raw counters, in place."""
+    if execution_analytics["total_tasks"] > 0:
+        execution_analytics["success_rate"] = round(
+            (execution_analytics["completed"] / execution_analytics["total_tasks"])
+            * 100,
+            2,
+        )
+        execution_analytics["completion_rate"] = round(
+            (
+                (execution_analytics["completed"] + execution_analytics["failed"])
+                / execution_analytics["total_tasks"]
+            )
+            * 100,
+            2,
+        )
+        execution_analytics["avg_retry_attempts"] = round(
+            execution_analytics["total_retries"] / execution_analytics["total_tasks"],
+            2,
+        )
+
+    quality = call_analytics["quality_metrics"]
+    if call_analytics["total_calls"] > 0:
+        quality["transcript_rate"] = round(
+            (quality["transcript_available"] / call_analytics["total_calls"]) * 100,
+            2,
+        )
+    if quality["success_score_count"] > 0:
+        quality["avg_success_score"] = round(
+            quality["total_success_score"] / quality["success_score_count"], 2
+        )
+
+
+def _success_score(value: Any) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        score = float(value)
+    except (ValueError, TypeError):
+        return None
+    return score if 1 <= score <= 10 else None
+
+
+def analytics_from_groups(
+    groups: Iterable[Dict[str, Any]],
+) -> Tuple[Dict, Dict, Dict[str, int]]:
+    """
+    Build (call_analytics, execution_analytics, task_counts) from the
+    output of run_analytics_pipeline.
+    """
+    task_counts: Dict[str, int] = {}
+    call_analytics, execution_analytics = empty_run_analytics()
+    quality = call_analytics["quality_metrics"]
+
+    for g in groups:
+        status = str(g["_id"].get("status"))
+        count = int(g["count"])
+        task_counts[status] = task_counts.get(status, 0) + count
+        if status in _EXECUTION_STATUS_KEYS:
+            execution_analytics[status] += count
+        execution_analytics["total_retries"] += g["total_retries"]
+
+        call_analytics["total_calls"] += g["calls"]
+        classified = 0
+        for bucket in CALL_STATUS_BUCKETS:
+            call_analytics[bucket] += g[bucket]
+            classified += g[bucket]
+        # Failed tasks without a recognised summary status count as failed calls.
+        call_analytics["failed"] += (
+            g["calls"] - classified
+            if status == TaskStatusEnum.failed
+            else g["error_or_unknown"]
+        )
+        quality["transcript_available"] += g["transcript_available"]
+        quality["no_transcript"] += g["calls"] - g["transcript_available"]
+
+        # Only call tasks with a transcript carry a score key.
+        score = _success_score(g["_id"].get("score"))
+        if score is not None:
+            quality["total_success_score"] += score * count
+            quality["success_score_count"] += count
+
+    execution_analytics["total_tasks"] = sum(task_counts.values())
+    finalize_run_analytics(call_analytics, execution_analytics)
+    return call_analytics, execution_analytics, task_counts
+
+
+def resolve_run_status(task_counts: Dict[str, int]) -> Optional[TaskStatusEnum]:
+    """Run status implied by its task counts, or None while it is still running."""
+    total = sum(task_counts.values())
+    if not total:
+        return None
+    completed = task_counts.get(TaskStatusEnum.completed.value, 0)
+    failed = task_counts.get(TaskStatusEnum.failed.value, 0)
+    if failed == total:
+        return TaskStatusEnum.failed
+    if completed == total:
+        return TaskStatusEnum.completed
+    if completed + failed == total:
+        return TaskStatusEnum.partially_completed
+    return None
+
+
+def run_may_be_finished(task_counts: Dict[str, int]) -> bool:
+    return resolve_run_status(task_counts) is not None
+
+
+def task_count_transition(
+    from_status: Optional[str], to_status: Optional[str], count: int = 1
+) -> Dict[str, int]:
+    """``$inc`` document moving ``count`` tasks between run task_counts buckets."""
+    from_status = getattr(from_status, "value", from_status)
+    to_status = getattr(to_status, "value", to_status)
+    if not count or from_status == to_status:
+        return {}
+    inc = {}
+    if from_status:
+        inc[f"task_counts.{from_status}"] = -count
+    if to_status:
+        inc[f"task_counts.{to_status}"] = count
+    return inc
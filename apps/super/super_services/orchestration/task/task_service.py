@@ -23,6 +23,17 @@ from super_services.db.services.repository.wallet import (
     checkWallet,
 )
 from super_services.db.services.schemas.task import TaskStatusEnum
+from super_services.orchestration.task.run_analytics import (
+    RUN_TERMINAL_TASK_STATUSES,
+    analytics_from_groups,
+    empty_run_analytics,
+    finalize_run_analytics,
+    resolve_run_status,
+    run_analytics_pipeline,
+    run_may_be_finished,
+    run_task_counts_pipeline,
+    task_count_transition,
+)
 from super_services.libs.core.jsondecoder import convertFromMongo
 from super_services.libs.core.model import updateModelInstance
 from super_services.libs.core.db import executeQuery
@@ -301,6 +312,7 @@ class TaskService:
             **task_data_kargs,
         }
         task = TaskModel.save_single_to_db(task_obj)
+        self._bump_run_task_counts(run_id, None, TaskStatusEnum.pending)
         return task.dict()
 
     def update_task_status(
@@ -347,18 +359,17 @@ class TaskService:
             )
 
         # Perform atomic update
-        result = TaskModel._get_collection().update_one(query, {"$set": update_data})
+        self._set_task_fields(query, update_data)
 
-        if result:
-            # Fetch updated task to return
-            updated_task = TaskModel.get(task_id=task_id)
-            if updated_task:
-                if expected_status is not None:
-                    print_log(
-                        f"Atomic status update succeeded for task {task_id}: {expected_status} → {status}",
-                        "atomic_status_update_success",
-                    )
-                return updated_task.dict()
+        # Fetch updated task to return
+        updated_task = TaskModel.get(task_id=task_id)
+        if updated_task:
+            if expected_status is not None:
+                print_log(
+                    f"Atomic status update succeeded for task {task_id}: {expected_status} → {status}",
+                    "atomic_status_update_success",
+                )
+            return updated_task.dict()
 
         # Update failed - check why
         task = TaskModel.get(task_id=task_id)
@@ -385,6 +396,33 @@ class TaskService:
 
         return {"error": "Update failed"}
 
+    def update_task(self, task_id: str, update_data: Dict) -> bool:
+        """
+        $set fields on a task, moving the run's task counters when the
+        update changes its status.
+
+        Writers that set a task status outside update_task_status (crons,
+        post-call flows) go through here so task_counts stays in step.
+
+        Returns:
+            True if the task was found and updated
+        """
+        return self._set_task_fields({"task_id": task_id}, update_data)
+
+    def _set_task_fields(self, query: Dict, update_data: Dict) -> bool:
+        """$set update_data on the task matching query; the pre-image gives
+        the status transition for the run's task counters."""
+        previous = TaskModel._get_collection().find_one_and_update(
+            query, {"$set": update_data}, projection={"status": 1, "run_id": 1}
+        )
+        if not previous:
+            return False
+        if "status" in update_data:
+            self._bump_run_task_counts(
+                previous.get("run_id"), previous.get("status"), update_data["status"]
+            )
+        return True
+
     def update_task_status_atomic(
         self,
         task_id: str,
@@ -705,6 +743,9 @@ class TaskService:
                     "output": response["data"],
                     "retry_attempt": retry_attempt,
                     "last_status_change": datetime.utcnow().isoformat(),  # Update timestamp
+                    # The flow has taken the task over; a retry must be claimable again.
+                    "dispatch_claim": None,
+                    "dispatch_lease_until": None,
                 }
                 if last_failure_reason:
                     update_data["last_failure_reason"] = last_failure_reason
@@ -714,6 +755,7 @@ class TaskService:
                     {"task_id": task.task_id},
                     update_data,
                 )
+                self._bump_run_task_counts(task.run_id, task.status, task_status)
                 TaskExecutionLogModel.update_one(
                     {"task_exec_id": exec_id},
                     {"status": exec_status, "output": response["data"]},
@@ -753,14 +795,17 @@ class TaskService:
         if not run:
             return {"error": "Run not found"}
 
-        tasks = list(TaskModel.find(run_id=run_id))
+        task_counts = {
+            group["_id"]: group["count"]
+            for group in TaskModel._get_collection().aggregate(
+                run_task_counts_pipeline(run_id)
+            )
+        }
         task_stats = {
-            "total": len(tasks),
-            "completed": len(
-                [t for t in tasks if t.status == TaskStatusEnum.completed]
-            ),
-            "failed": len([t for t in tasks if t.status == TaskStatusEnum.failed]),
-            "pending": len([t for t in tasks if t.status == TaskStatusEnum.pending]),
+            "total": sum(task_counts.values()),
+            "completed": task_counts.get(TaskStatusEnum.completed.value, 0),
+            "failed": task_counts.get(TaskStatusEnum.failed.value, 0),
+            "pending": task_counts.get(TaskStatusEnum.pending.value, 0),
         }
 
         return {"run": run, "task_stats": task_stats}
@@ -817,21 +862,21 @@ class TaskService:
             # Also check tasks that may need status updates (exclude completed and hold)
             # OPTIMIZATION: Don't fetch completed or hold tasks as they require no action
             if run_id:
+                # mark_task_status only acts on failed and processing tasks here
+                # (in_progress is excluded), so pending tasks are not fetched.
                 all_tasks = list(
                     TaskModel.find(
                         run_id=run_id,
                         status={
-                            "$nin": [
-                                TaskStatusEnum.completed,
-                                TaskStatusEnum.hold,
-                                TaskStatusEnum.scheduled,
-                                TaskStatusEnum.in_progress,
+                            "$in": [
+                                TaskStatusEnum.failed,
+                                TaskStatusEnum.processing,
                             ]
-                        },  # Exclude completed and hold tasks
+                        },
                     )
                 )
                 print_log(
-                    f"Total actionable tasks for run {run_id}: {len(all_tasks)} (excluding completed and hold)",
+                    f"Total actionable tasks for run {run_id}: {len(all_tasks)} (failed or processing)",
                     "get_pending_tasks_total",
                 )
                 for task in all_tasks:
@@ -855,6 +900,72 @@ class TaskService:
             )
             return []
 
+    def claim_tasks_for_dispatch(
+        self,
+        run_id: str,
+        task_ids: List[str],
+        claim_id: str,
+        lease_seconds: int = 600,
+    ) -> List[str]:
+        """
+        Claim tasks of a run for dispatch with one conditional update.
+
+        Only pending/scheduled tasks without a live dispatch lease are claimed,
+        so overlapping run flows never start the same task twice. Status is
+        left untouched; the task flow still does pending -> processing and
+        drops the claim when it writes the task's new status.
+
+        Returns:
+            Task ids claimed by ``claim_id``
+        """
+        from datetime import datetime, timedelta
+
+        if not task_ids:
+            return []
+        now = datetime.utcnow()
+        collection = TaskModel._get_collection()
+        collection.update_many(
+            {
+                "run_id": run_id,
+                "task_id": {"$in": task_ids},
+                "status": {
+                    "$in": [TaskStatusEnum.pending, TaskStatusEnum.scheduled]
+                },
+                "$or": [
+                    {"dispatch_lease_until": None},
+                    {"dispatch_lease_until": {"$lt": now.isoformat()}},
+                ],
+            },
+            {
+                "$set": {
+                    "dispatch_claim": claim_id,
+                    "dispatch_lease_until": (
+                        now + timedelta(seconds=lease_seconds)
+                    ).isoformat(),
+                }
+            },
+        )
+        claimed = [
+            doc["task_id"]
+            for doc in collection.find(
+                {"run_id": run_id, "dispatch_claim": claim_id}, {"task_id": 1}
+            )
+        ]
+        print_log(
+            f"Claimed {len(claimed)}/{len(task_ids)} tasks of run {run_id} for dispatch",
+            "claim_tasks_for_dispatch",
+        )
+        return claimed
+
+    def release_dispatch_claim(self, task_ids: List[str], claim_id: str) -> None:
+        """Drop the dispatch lease of tasks whose flow run was not created."""
+        if not task_ids:
+            return
+        TaskModel._get_collection().update_many(
+            {"task_id": {"$in": task_ids}, "dispatch_claim": claim_id},
+            {"$set": {"dispatch_claim": None, "dispatch_lease_until": None}},
+        )
+
     def get_query(
         self,
         space_id: Optional[str] = None,
@@ -948,6 +1059,7 @@ class TaskService:
                     },
                 },
             )
+            self._bump_run_task_counts(task.run_id, task.status, TaskStatusEnum.failed)
             print_log(
                 f"Task {task.task_id} marked as permanently failed",
                 "task_permanently_failed",
@@ -1207,6 +1319,7 @@ class TaskService:
             }
         if task_status:
             TaskModel.update_one({"task_id": task.task_id}, update_data)
+            self._bump_run_task_counts(task.run_id, task.status, task_status)
             stats["stuck_tasks_retried"] += 1
             print_log(
                 f"Task {task.task_id} status updated to {task_status}, retry_attempt={retry_attempt + 1}",
@@ -1374,36 +1487,7 @@ class TaskService:
         Returns:
             Tuple of (call_analytics dict, execution_analytics dict)
         """
-        # Initialize analytics structures
-        call_analytics = {
-            "total_calls": 0,
-            "interested": 0,
-            "call_back": 0,
-            "send_details": 0,
-            "not_interested": 0,
-            "not_connected": 0,
-            "failed": 0,
-            "quality_metrics": {
-                "transcript_available": 0,
-                "no_transcript": 0,
-                "transcript_rate": 0.0,
-                "avg_success_score": 0.0,
-                "total_success_score": 0,
-                "success_score_count": 0,
-            },
-        }
-
-        execution_analytics = {
-            "total_tasks": len(tasks),
-            "completed": 0,
-            "failed": 0,
-            "pending": 0,
-            "in_progress": 0,
-            "success_rate": 0.0,
-            "completion_rate": 0.0,
-            "avg_retry_attempts": 0.0,
-            "total_retries": 0,
-        }
+        call_analytics, execution_analytics = empty_run_analytics(len(tasks))
 
         # Track call-specific tasks
         call_tasks = [t for t in tasks if t.execution_type == "call"]
@@ -1463,8 +1547,11 @@ class TaskService:
                 else:
                     call_analytics["quality_metrics"]["no_transcript"] += 1
 
-                # Get call status from post_call_data.summary.status
-                call_status = post_call_data.get("summary", {}).get("status", "Unknown")
+                # Get call status from post_call_data.summary.status; a null
+                # summary or status is Unknown, like $ifNull in run_analytics_pipeline
+                call_status = (post_call_data.get("summary") or {}).get("status")
+                if call_status is None:
+                    call_status = "Unknown"
 
                 # Increment counters based on call status
                 if call_status == "InterestedIn" or call_status == "Interested":
@@ -1483,50 +1570,63 @@ class TaskService:
                 ]:
                     call_analytics["failed"] += 1
 
-        # Calculate percentages and rates
-        if execution_analytics["total_tasks"] > 0:
-            execution_analytics["success_rate"] = round(
-                (execution_analytics["completed"] / execution_analytics["total_tasks"])
-                * 100,
-                2,
-            )
-            execution_analytics["completion_rate"] = round(
-                (
-                    (execution_analytics["completed"] + execution_analytics["failed"])
-                    / execution_analytics["total_tasks"]
-                )
-                * 100,
-                2,
-            )
-            execution_analytics["avg_retry_attempts"] = round(
-                execution_analytics["total_retries"]
-                / execution_analytics["total_tasks"],
-                2,
-            )
+        finalize_run_analytics(call_analytics, execution_analytics)
 
-        if call_analytics["total_calls"] > 0:
-            call_analytics["quality_metrics"]["transcript_rate"] = round(
-                (
-                    call_analytics["quality_metrics"]["transcript_available"]
-                    / call_analytics["total_calls"]
-                )
-                * 100,
-                2,
-            )
+        return call_analytics, execution_analytics
 
-        # Calculate average success score for calls with transcript
-        # Average is calculated across all calls with transcript (missing success_evaluator treated as 0)
-        if call_analytics["quality_metrics"]["success_score_count"] > 0:
-            call_analytics["quality_metrics"]["avg_success_score"] = round(
-                call_analytics["quality_metrics"]["total_success_score"]
-                / call_analytics["quality_metrics"]["success_score_count"],
-                2,
-            )
+    def _run_needs_reconcile(self, run_id: str, run) -> bool:
+        """
+        Whether a run's status/analytics must be recomputed after a task update.
 
-        return call_analytics, execution_analytics
+        The run's task_counts counters ($inc'd on status transitions) answer
+        this in O(1) while the run is in flight. Counters can lag writes made
+        outside the tracked paths, so a run that looks unfinished is confirmed
+        with an indexed existence probe, and analytics are refreshed at least
+        every RUN_ANALYTICS_REFRESH_SECONDS.
+        """
+        from datetime import datetime, timedelta
+
+        task_counts = run.get("task_counts")
+        if not task_counts or run_may_be_finished(task_counts):
+            return True
+
+        refreshed_at = run.get("analytics_updated_at")
+        refresh_seconds = int(os.getenv("RUN_ANALYTICS_REFRESH_SECONDS", "30"))
+        try:
+            refreshed_at = datetime.fromisoformat(refreshed_at)
+        except (TypeError, ValueError):
+            return True
+        if datetime.utcnow() - refreshed_at > timedelta(seconds=refresh_seconds):
+            return True
+
+        open_task = TaskModel._get_collection().find_one(
+            {"run_id": run_id, "status": {"$nin": RUN_TERMINAL_TASK_STATUSES}},
+            {"_id": 1},
+        )
+        return open_task is None
+
+    def _bump_run_task_counts(
+        self, run_id: Optional[str], from_status, to_status, count: int = 1
+    ) -> None:
+        """Move tasks between the run's task_counts buckets (once initialised)."""
+        inc = task_count_transition(from_status, to_status, count)
+        if not run_id or not inc:
+            return
+        try:
+            RunModel._get_collection().update_one(
+                {"run_id": run_id, "task_counts": {"$exists": True}},
+                {"$inc": inc},
+            )
+        except Exception as ex:
+            print_log(
+                f"Failed to update task counters for run {run_id}: {ex}",
+                "run_task_counts_error",
+            )
 
     def check_and_update_run_status(self, run_id: str) -> None:
         """Check if run should be updated to failed status based on task failures"""
+        from datetime import datetime
+
         try:
             run = RunModel.find_one(run_id=run_id)
             if not run:
@@ -1536,25 +1636,30 @@ class TaskService:
                 )
                 return
 
-            # Get all tasks for this run
-            tasks = list(TaskModel.find(run_id=run_id))
+            if not self._run_needs_reconcile(run_id, run):
+                print_log(
+                    f"Run {run_id} still has open tasks, analytics are fresh",
+                    "run_status_check_skipped",
+                )
+                return
 
-            if not tasks:
+            # Counts and analytics are aggregated inside Mongo; only one
+            # small document per task status comes back.
+            groups = list(
+                TaskModel._get_collection().aggregate(run_analytics_pipeline(run_id))
+            )
+            if not groups:
                 print_log(f"No tasks found for run {run_id}", "no_tasks_for_run")
                 return
 
-            # Calculate task stats
-            total_tasks = len(tasks)
-            completed_tasks = len(
-                [t for t in tasks if t.status == TaskStatusEnum.completed]
-            )
-            failed_tasks = len([t for t in tasks if t.status == TaskStatusEnum.failed])
-            pending_tasks = len(
-                [t for t in tasks if t.status == TaskStatusEnum.pending]
-            )
-            in_progress_tasks = len(
-                [t for t in tasks if t.status == TaskStatusEnum.in_progress]
+            call_analytics, execution_analytics, task_counts = analytics_from_groups(
+                groups
             )
+            total_tasks = execution_analytics["total_tasks"]
+            completed_tasks = execution_analytics["completed"]
+            failed_tasks = execution_analytics["failed"]
+            pending_tasks = execution_analytics["pending"]
+            in_progress_tasks = execution_analytics["in_progress"]
 
             print_log(
                 f"Run {run_id} task stats: {completed_tasks} completed, {failed_tasks} failed, {pending_tasks} pending, {in_progress_tasks} in_progress out of {total_tasks} total",
@@ -1562,39 +1667,13 @@ class TaskService:
             )
 
             # Determine if run should be updated
-            new_run_status = None
-
-            if failed_tasks == total_tasks:
-                # All tasks have permanently failed
-                new_run_status = TaskStatusEnum.failed
-                print_log(
-                    f"Run {run_id} all tasks failed, marking run as failed",
-                    "run_all_tasks_failed",
-                )
-
-            elif completed_tasks == total_tasks:
-                # All tasks completed successfully
-                new_run_status = TaskStatusEnum.completed
+            new_run_status = resolve_run_status(task_counts)
+            if new_run_status:
                 print_log(
-                    f"Run {run_id} all tasks completed, marking run as completed",
-                    "run_all_tasks_completed",
+                    f"Run {run_id} finished, marking run as {new_run_status.value}",
+                    f"run_all_tasks_{new_run_status.value}",
                 )
 
-            elif (
-                completed_tasks + failed_tasks == total_tasks
-                and pending_tasks == 0
-                and in_progress_tasks == 0
-            ):
-                # No more pending or in_progress tasks, mix of completed and failed
-                new_run_status = TaskStatusEnum.partially_completed
-                print_log(
-                    f"Run {run_id} has mix of completed and failed tasks, marking as partially completed",
-                    "run_partially_completed",
-                )
-
-            # Calculate analytics for the run
-            call_analytics, execution_analytics = self.calculate_run_analytics(tasks)
-
             print_log(
                 f"Run {run_id} analytics calculated - Call Success: {call_analytics.get('success_rate', 0)}%, Execution Success: {execution_analytics.get('success_rate', 0)}%",
                 "run_analytics_calculated",
@@ -1605,9 +1684,11 @@ class TaskService:
             if new_run_status and run.get("status") != new_run_status:
                 update_data["status"] = new_run_status
 
-            # Always update analytics
+            # Always update analytics; this also reconciles the task counters
             update_data["call_analytics"] = call_analytics
             update_data["execution_analytics"] = execution_analytics
+            update_data["task_counts"] = task_counts
+            update_data["analytics_updated_at"] = datetime.utcnow().isoformat()
 
             if update_data:
                 RunModel.update_one({"run_id": run_id}, update_data)
@@ -1678,6 +1759,7 @@ class TaskService:
                         success = TaskModel.update_one(
                             {"task_id": task_id}, update_data
                         )
+                        self._bump_run_task_counts(run_id, task.status, task_status)
                         print_log(
                             f"Updated task {task_id} status from {task.status} to {task_status} is {success}",
                             "task_status_updated",
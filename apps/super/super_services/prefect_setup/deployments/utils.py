@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from typing import Optional
 
 from prefect import get_client
@@ -47,8 +48,15 @@ def _get_config(name: str) -> Optional[dict]:
     return None
 
 
-async def trigger_deployment(deployment_name, parameters, **kwargs):
-    """Trigger a deployment using config from MongoDB or local JSON."""
+@asynccontextmanager
+async def deployment_runner(deployment_name):
+    """
+    Resolve a deployment once and yield a function that creates flow runs
+    from it over a single Prefect client.
+
+    Use this instead of calling trigger_deployment in a loop when starting
+    many runs of the same deployment.
+    """
     config = _get_config(deployment_name)
     if not config:
         raise ValueError(
@@ -73,10 +81,20 @@ async def trigger_deployment(deployment_name, parameters, **kwargs):
             raise ValueError(
                 f"Deployment {deployment_name} not found in Prefect"
             )
-        await client.create_flow_run_from_deployment(
-            deployment.id, parameters=parameters, **kwargs
-        )
-        print(f"Flow Run Created: {deployment_name} (flow: {flow_name})")
+
+        async def create_run(parameters, **kwargs):
+            return await client.create_flow_run_from_deployment(
+                deployment.id, parameters=parameters, **kwargs
+            )
+
+        yield create_run
+
+
+async def trigger_deployment(deployment_name, parameters, **kwargs):
+    """Trigger a deployment using config from MongoDB or local JSON."""
+    async with deployment_runner(deployment_name) as create_run:
+        await create_run(parameters, **kwargs)
+    print(f"Flow Run Created: {deployment_name}")
 
 
 def get_available_deployments(
@@ -3,8 +3,12 @@
 Voice Task Consumer Monitoring Dashboard
 
 Real-time monitoring of consumer health, worker utilization, and latency metrics.
+
+With --prometheus the fleet-wide task latency summary is printed once in the
+Prometheus text format instead (e.g. for a node_exporter textfile collector).
 """
 
+import argparse
 import os
 import sys
 import time
@@ -44,18 +48,12 @@ def get_worker_counts(mode):
 def get_latency_stats(mode):
     """Get latency statistics for a specific mode."""
     try:
-        avg = MetricsCollector.get_average_latency(mode)
-        p95 = MetricsCollector.get_p95_latency(mode)
-
-        # Count recent entries
-        redis_key = f"metrics:task_latency:{mode}"
-        entries = REDIS.lrange(redis_key, 0, -1)
-        sample_count = len(entries)
+        stats = MetricsCollector.get_latency_stats(mode)
 
         return {
-            "avg": avg,
-            "p95": p95,
-            "sample_count": sample_count
+            "avg": stats["avg"],
+            "p95": stats["p95"],
+            "sample_count": stats["count"]
         }
     except Exception:
         return {"avg": 0.0, "p95": 0.0, "sample_count": 0}
@@ -212,6 +210,18 @@ def print_dashboard():
 
 def main():
     """Main monitoring loop."""
+    parser = argparse.ArgumentParser(description="Voice Task Consumer Monitoring")
+    parser.add_argument(
+        "--prometheus",
+        action="store_true",
+        help="Print task latency metrics in the Prometheus text format and exit",
+    )
+    args = parser.parse_args()
+
+    if args.prometheus:
+        sys.stdout.write(MetricsCollector.get_prometheus_metrics())
+        return
+
     print("\033[1;32mStarting Voice Task Consumer Monitoring...\033[0m")
     print("Connecting to Redis...")
 
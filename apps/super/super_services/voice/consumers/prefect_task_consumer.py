@@ -1,4 +1,3 @@
-import asyncio
 import os
 import time
 import traceback
@@ -9,11 +8,15 @@ from prefect.runtime import flow_run
 from pydantic import BaseModel, Field
 from super_services.libs.core.sms import send_sms_msg91
 from super_services.libs.core.jsondecoder import sanitize_data_for_mongodb
-from super_services.prefect_setup.deployments.utils import trigger_deployment
+from super_services.prefect_setup.deployments.utils import (
+    deployment_runner,
+    trigger_deployment,
+)
 from super_services.prefect_setup.deployments.tag_concurrency import (
     create_run_concurrency_tag,
     delete_run_concurrency_tag,
 )
+from super_services.voice.consumers.run_dispatcher import RunDispatcher
 
 HIGH_PRIORITY = "call-high-priority"
 
@@ -431,37 +434,26 @@ async def process_run_flow(job):
         f"Created concurrency tag '{run_tag}' with limit {run_wise_concurrency}"
     )
 
-    triggered = 0
-    try:
-        for index, task in enumerate(tasks):
-            task_id = task.get("task_id")
-            task_flow_name = f"{run_type}-{run_id}-task-{task_id}"
-            extra_kargs = {}
-            if len(tasks) < 5:
-                extra_kargs["work_queue_name"] = HIGH_PRIORITY
-            try:
-                await trigger_deployment(
-                    "Execute-Task",
-                    {
-                        "job": {
-                            "task_id": task_id,
-                            "run_type": run_type,
-                            "run_id": run_id,
-                        }
-                    },
-                    tags=[run_tag],
-                    name=task_flow_name,
-                    **extra_kargs,
-                )
-                triggered += 1
-                logger.info(
-                    f"Triggered task {task_id} for run {run_id} index, {index+1}"
-                )
-            except Exception as ex:
-                logger.error(f"Failed to trigger task {task_id} for run {run_id}: {ex}")
-            await asyncio.sleep(0.5)
-    finally:
-        logger.info(f"Triggered {triggered}/{len(tasks)} tasks for run {run_id}")
+    # Claim the tasks in bulk and create flow runs concurrently, paced by
+    # PREFECT_DISPATCH_RATE / TELEPHONY_CALLS_PER_SECOND.
+    work_queue_name = HIGH_PRIORITY if len(tasks) < 5 else None
+    async with deployment_runner("Execute-Task") as create_run:
+        dispatcher = RunDispatcher(
+            create_run,
+            claim_tasks=task_service.claim_tasks_for_dispatch,
+            release_tasks=task_service.release_dispatch_claim,
+        )
+        report = await dispatcher.dispatch(
+            run_id,
+            run_type,
+            tasks,
+            tags=[run_tag],
+            work_queue_name=work_queue_name,
+        )
+    for task_id, error in report.errors.items():
+        logger.error(f"Failed to trigger task {task_id} for run {run_id}: {error}")
+    logger.info(report.summary())
+    return report.as_dict()
 
 
 class TaskJob(BaseModel):
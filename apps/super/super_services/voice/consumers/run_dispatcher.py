@@ -0,0 +1,241 @@
+"""
+Rate-governed bulk dispatch of campaign run tasks to Prefect.
+
+A run with thousands of tasks used to be dispatched one flow run at a time
+with a fixed sleep in between. RunDispatcher instead:
+
+  1. Claims every dispatchable task of the run with one conditional update
+     (a short dispatch lease, so two overlapping run flows never start the
+     same task twice).
+  2. Creates flow runs concurrently, paced by a token bucket sized to the
+     Prefect API and telephony capacity and capped by a concurrency limit.
+  3. Releases the claim of tasks whose flow run could not be created, so
+     the next run flow picks them up again. Triggered tasks keep the claim
+     until their task flow writes the task's new status and clears it.
+  4. Returns a DispatchReport with throughput numbers for logging.
+
+Dependencies are injected (create_run / claim_tasks / release_tasks), which
+keeps this module free of Prefect and Mongo imports.
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+CreateRunFn = Callable[..., Awaitable[Any]]
+ClaimTasksFn = Callable[[str, List[str], str, int], Iterable[str]]
+ReleaseTasksFn = Callable[[List[str], str], Any]
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def default_dispatch_rate() -> float:
+    """
+    Flow runs per second: the lower of the Prefect API budget and the
+    telephony provider's call setup rate (calls per second).
+    """
+    prefect_rate = _env_float("PREFECT_DISPATCH_RATE", 20.0)
+    telephony_cps = _env_float("TELEPHONY_CALLS_PER_SECOND", 0.0)
+    if telephony_cps > 0:
+        return min(prefect_rate, telephony_cps)
+    return prefect_rate
+
+
+class TokenBucket:
+    """
+    Async token bucket.
+
+    ``rate`` tokens are added per second up to ``capacity``; each acquire
+    takes one token and waits when the bucket is empty. A non-positive rate
+    disables pacing.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.capacity = max(1.0, capacity if capacity is not None else rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+@dataclass
+class DispatchReport:
+    run_id: str
+    requested: int = 0
+    claimed: int = 0
+    triggered: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Flow runs created per second."""
+        return self.triggered / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "requested": self.requested,
+            "claimed": self.claimed,
+            "triggered": self.triggered,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "elapsed": round(self.elapsed, 3),
+            "throughput": round(self.throughput, 2),
+        }
+
+    def summary(self) -> str:
+        return (
+            f"Triggered {self.triggered}/{self.requested} tasks for run {self.run_id} "
+            f"(claimed={self.claimed}, skipped={self.skipped}, failed={self.failed}) "
+            f"in {self.elapsed:.2f}s, {self.throughput:.1f} runs/s"
+        )
+
+
+class RunDispatcher:
+    """
+    Dispatch a run's tasks as Prefect flow runs.
+
+    Usage:
+        async with deployment_runner("Execute-Task") as create_run:
+            dispatcher = RunDispatcher(
+                create_run,
+                claim_tasks=task_service.claim_tasks_for_dispatch,
+                release_tasks=task_service.release_dispatch_claim,
+            )
+            report = await dispatcher.dispatch(run_id, run_type, tasks, tags=[tag])
+    """
+
+    def __init__(
+        self,
+        create_run: CreateRunFn,
+        claim_tasks: Optional[ClaimTasksFn] = None,
+        release_tasks: Optional[ReleaseTasksFn] = None,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+    ):
+        self.create_run = create_run
+        self.claim_tasks = claim_tasks
+        self.release_tasks = release_tasks
+        rate = default_dispatch_rate() if rate is None else rate
+        if burst is None:
+            burst = _env_float("PREFECT_DISPATCH_BURST", rate)
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = max(
+            1,
+            int(
+                concurrency
+                if concurrency is not None
+                else _env_float("PREFECT_DISPATCH_CONCURRENCY", 10)
+            ),
+        )
+        self.lease_seconds = int(
+            lease_seconds
+            if lease_seconds is not None
+            else _env_float("PREFECT_DISPATCH_LEASE_SECONDS", 600)
+        )
+
+    async def _claim(self, run_id: str, task_ids: List[str], claim_id: str) -> Set[str]:
+        if not self.claim_tasks:
+            return set(task_ids)
+        claimed = await asyncio.to_thread(
+            self.claim_tasks, run_id, task_ids, claim_id, self.lease_seconds
+        )
+        return set(claimed or ())
+
+    async def _release(self, task_ids: List[str], claim_id: str) -> None:
+        if not self.release_tasks or not task_ids:
+            return
+        try:
+            await asyncio.to_thread(self.release_tasks, task_ids, claim_id)
+        except Exception as ex:
+            print(f"Failed to release dispatch claim {claim_id}: {ex}")
+
+    async def dispatch(
+        self,
+        run_id: str,
+        run_type: str,
+        tasks: List[Dict[str, Any]],
+        tags: Optional[List[str]] = None,
+        work_queue_name: Optional[str] = None,
+    ) -> DispatchReport:
+        started = time.perf_counter()
+        report = DispatchReport(run_id=run_id, requested=len(tasks))
+        task_ids = [task.get("task_id") for task in tasks if task.get("task_id")]
+        if not task_ids:
+            return report
+
+        claim_id = uuid.uuid4().hex
+        claimed = await self._claim(run_id, task_ids, claim_id)
+        report.claimed = len(claimed)
+        report.skipped = len(task_ids) - len(claimed)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        extra_kwargs = {"work_queue_name": work_queue_name} if work_queue_name else {}
+
+        async def _trigger(task_id: str) -> bool:
+            async with semaphore:
+                await self.bucket.acquire()
+                try:
+                    await self.create_run(
+                        {
+                            "job": {
+                                "task_id": task_id,
+                                "run_type": run_type,
+                                "run_id": run_id,
+                            }
+                        },
+                        tags=list(tags or []),
+                        name=f"{run_type}-{run_id}-task-{task_id}",
+                        **extra_kwargs,
+                    )
+                    return True
+                except Exception as ex:
+                    report.errors[task_id] = str(ex)
+                    return False
+
+        ordered = [task_id for task_id in task_ids if task_id in claimed]
+        results = await asyncio.gather(*[_trigger(task_id) for task_id in ordered])
+
+        failed_ids = [task_id for task_id, ok in zip(ordered, results) if not ok]
+        report.triggered = len(ordered) - len(failed_ids)
+        report.failed = len(failed_ids)
+        await self._release(failed_ids, claim_id)
+
+        report.elapsed = time.perf_counter() - started
+        return report
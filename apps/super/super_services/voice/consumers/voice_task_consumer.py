@@ -2,8 +2,11 @@
 Voice Task Consumer
 """
 
+import atexit
 import os
+import socket
 import sys
+import threading
 import traceback
 from datetime import datetime, timedelta, timezone
 
@@ -12,6 +15,7 @@ from super.app.providers import CallProviderFactory
 
 from super_services.orchestration.webhook.webhook_handler import WebhookHandler
 from super.core.logging.logging import print_log
+from super.core.utils.latency_histogram import LatencyHistogram
 from super_services.db.services.models.task import TaskModel
 from super_services.db.services.schemas.task import TaskStatusEnum
 from super_services.libs.config import settings
@@ -2086,27 +2090,115 @@ class TaskServiceQueueManager(object):
                 time.sleep(5)
 
 
+# Task latencies are kept as mergeable histograms: each worker process
+# accumulates its own per window and writes it (compactly encoded) into a Redis
+# hash field; readers merge every worker's histogram for the windows they need.
+LATENCY_WINDOW_SECONDS = 300
+LATENCY_RETENTION_SECONDS = 3600
+LATENCY_FLUSH_INTERVAL_SECONDS = float(os.getenv("LATENCY_FLUSH_INTERVAL_SECONDS", "10"))
+
+
 class MetricsCollector:
     """Collects and tracks latency and throughput metrics per topic type."""
 
+    _lock = threading.Lock()
+    _pid = None
+    _histograms = {}  # topic_type -> (window_start, LatencyHistogram)
+    _flushed_at = {}  # topic_type -> last flush time
+    _dirty = set()  # topic types with observations not yet in Redis
+    _flusher = None  # Background thread flushing idle workers' histograms
+
+    @staticmethod
+    def _latency_key(topic_type: str, window_start: int) -> str:
+        return f"metrics:task_latency_hist:{topic_type}:{window_start}"
+
     @staticmethod
-    def record_task_latency(topic_type: str, task_id: str, latency_ms: float):
+    def _worker_id() -> str:
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    @classmethod
+    def _local_histograms(cls) -> dict:
+        # Forked workers must not re-publish the parent's observations.
+        if cls._pid != os.getpid():
+            cls._pid = os.getpid()
+            cls._histograms = {}
+            cls._flushed_at = {}
+            cls._dirty = set()
+            cls._flusher = None
+        return cls._histograms
+
+    @classmethod
+    def _start_flusher(cls):
+        """
+        Flush every LATENCY_FLUSH_INTERVAL_SECONDS from a daemon thread, so a
+        worker that goes quiet still publishes its last observations, and
+        once more at interpreter exit.
+        """
+        if cls._flusher is not None:
+            return
+
+        def _run():
+            while True:
+                time.sleep(max(LATENCY_FLUSH_INTERVAL_SECONDS, 1.0))
+                cls.flush()
+
+        cls._flusher = threading.Thread(target=_run, name="latency-flusher", daemon=True)
+        cls._flusher.start()
+        atexit.register(cls.flush)
+
+    @classmethod
+    def _flush(cls, topic_type: str, window_start: int, histogram: LatencyHistogram):
+        key = cls._latency_key(topic_type, window_start)
+        pipe = REDIS.pipeline(transaction=False)
+        pipe.hset(key, cls._worker_id(), histogram.to_bytes())
+        pipe.expire(key, LATENCY_RETENTION_SECONDS + LATENCY_WINDOW_SECONDS)
+        pipe.execute()
+        cls._flushed_at[topic_type] = time.time()
+        cls._dirty.discard(topic_type)
+
+    @classmethod
+    def flush(cls):
+        """Write this worker's pending histograms to Redis."""
+        try:
+            with cls._lock:
+                histograms = cls._local_histograms()
+                for topic_type in list(cls._dirty):
+                    if topic_type in histograms:
+                        cls._flush(topic_type, *histograms[topic_type])
+        except Exception as ex:
+            print_log(f"Failed to flush task latency: {str(ex)}", "metrics_error")
+
+    @classmethod
+    def record_task_latency(cls, topic_type: str, task_id: str, latency_ms: float):
         """
         Record end-to-end latency from Kafka to processing completion.
 
+        The observation is added to this worker's histogram, which is written
+        to Redis at most every LATENCY_FLUSH_INTERVAL_SECONDS (and by the
+        background flusher when no further tasks arrive).
+
         Args:
             topic_type: "normal" or "bulk"
             task_id: Task identifier
             latency_ms: Latency in milliseconds
         """
         try:
-            redis_key = f"metrics:task_latency:{topic_type}"
-            timestamp = time.time()
-            entry = f"{task_id}:{latency_ms:.2f}:{timestamp}"
-
-            REDIS.lpush(redis_key, entry)
-            REDIS.ltrim(redis_key, 0, 999)  # Keep last 1000 entries
-            REDIS.expire(redis_key, 3600)  # 1 hour TTL
+            now = time.time()
+            window_start = int(now // LATENCY_WINDOW_SECONDS * LATENCY_WINDOW_SECONDS)
+            with cls._lock:
+                histograms = cls._local_histograms()
+                current = histograms.get(topic_type)
+                if current and current[0] != window_start:
+                    cls._flush(topic_type, *current)
+                    current = None
+                if current is None:
+                    current = (window_start, LatencyHistogram())
+                    histograms[topic_type] = current
+                current[1].observe(latency_ms)
+                cls._dirty.add(topic_type)
+                if now - cls._flushed_at.get(topic_type, 0) >= LATENCY_FLUSH_INTERVAL_SECONDS:
+                    cls._flush(topic_type, *current)
+                cls._start_flusher()
 
             # Alert if latency exceeds SLA
             if topic_type == "normal" and latency_ms > 5000:  # 5 second SLA for normal
@@ -2117,8 +2209,49 @@ class MetricsCollector:
         except Exception as ex:
             print_log(f"Failed to record task latency: {str(ex)}", "metrics_error")
 
-    @staticmethod
-    def get_average_latency(topic_type: str) -> float:
+    @classmethod
+    def get_latency_histogram(
+        cls, topic_type: str, window_seconds: int = LATENCY_RETENTION_SECONDS
+    ) -> LatencyHistogram:
+        """
+        Fleet-wide latency histogram for topic type over the last window_seconds,
+        merged from every worker's flushed histograms.
+        """
+        now_window = int(time.time() // LATENCY_WINDOW_SECONDS * LATENCY_WINDOW_SECONDS)
+        windows = range(
+            now_window - window_seconds + LATENCY_WINDOW_SECONDS,
+            now_window + LATENCY_WINDOW_SECONDS,
+            LATENCY_WINDOW_SECONDS,
+        )
+        pipe = REDIS.pipeline(transaction=False)
+        for window_start in windows:
+            pipe.hvals(cls._latency_key(topic_type, window_start))
+        merged = LatencyHistogram()
+        for encoded_values in pipe.execute():
+            for encoded in encoded_values:
+                merged.merge(LatencyHistogram.from_bytes(encoded))
+        return merged
+
+    @classmethod
+    def get_latency_stats(cls, topic_type: str) -> dict:
+        """Count, average and percentiles (ms) for topic type in last hour."""
+        try:
+            histogram = cls.get_latency_histogram(topic_type)
+            p50, p95, p99 = histogram.quantiles([0.5, 0.95, 0.99])
+            return {
+                "count": histogram.count,
+                "sum": histogram.sum,
+                "avg": histogram.avg,
+                "p50": p50,
+                "p95": p95,
+                "p99": p99,
+            }
+        except Exception as ex:
+            print_log(f"Failed to get latency stats: {str(ex)}", "metrics_error")
+            return {"count": 0, "sum": 0.0, "avg": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+    @classmethod
+    def get_average_latency(cls, topic_type: str) -> float:
         """
         Get average latency for topic type in last hour.
 
@@ -2128,26 +2261,10 @@ class MetricsCollector:
         Returns:
             Average latency in milliseconds
         """
-        try:
-            redis_key = f"metrics:task_latency:{topic_type}"
-            entries = REDIS.lrange(redis_key, 0, -1)
-
-            if not entries:
-                return 0.0
+        return cls.get_latency_stats(topic_type)["avg"]
 
-            latencies = []
-            for entry in entries:
-                parts = entry.decode().split(':')
-                if len(parts) >= 2:
-                    latencies.append(float(parts[1]))
-
-            return sum(latencies) / len(latencies) if latencies else 0.0
-        except Exception as ex:
-            print_log(f"Failed to get average latency: {str(ex)}", "metrics_error")
-            return 0.0
-
-    @staticmethod
-    def get_p95_latency(topic_type: str) -> float:
+    @classmethod
+    def get_p95_latency(cls, topic_type: str) -> float:
         """
         Get 95th percentile latency for topic type.
 
@@ -2157,28 +2274,25 @@ class MetricsCollector:
         Returns:
             P95 latency in milliseconds
         """
-        try:
-            redis_key = f"metrics:task_latency:{topic_type}"
-            entries = REDIS.lrange(redis_key, 0, -1)
-
-            if not entries:
-                return 0.0
-
-            latencies = []
-            for entry in entries:
-                parts = entry.decode().split(':')
-                if len(parts) >= 2:
-                    latencies.append(float(parts[1]))
-
-            if not latencies:
-                return 0.0
-
-            latencies.sort()
-            p95_index = int(len(latencies) * 0.95)
-            return latencies[p95_index] if p95_index < len(latencies) else latencies[-1]
-        except Exception as ex:
-            print_log(f"Failed to get P95 latency: {str(ex)}", "metrics_error")
-            return 0.0
+        return cls.get_latency_stats(topic_type)["p95"]
+
+    @classmethod
+    def get_prometheus_metrics(cls, topic_types=("normal", "bulk")) -> str:
+        """Fleet-wide task latency as a Prometheus summary, in seconds."""
+        name = "voice_task_latency_seconds"
+        lines = [
+            f"# HELP {name} End-to-end task latency over the last hour",
+            f"# TYPE {name} summary",
+        ]
+        for topic_type in topic_types:
+            stats = cls.get_latency_stats(topic_type)
+            for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+                lines.append(
+                    f'{name}{{topic="{topic_type}",quantile="{quantile}"}} {stats[key] / 1000}'
+                )
+            lines.append(f'{name}_sum{{topic="{topic_type}"}} {stats["sum"] / 1000}')
+            lines.append(f'{name}_count{{topic="{topic_type}"}} {stats["count"]}')
+        return "\n".join(lines) + "\n"
 
 
 if __name__ == "__main__":
@@ -0,0 +1,257 @@
+"""
+In-process (L1) cache for agent configs, in front of the Redis (L2) cache.
+
+- Bounded LRU with a TTL, so a hit costs no network round trip.
+- Single-flight: concurrent misses for the same agent share one load, both
+  across threads (get_or_load) and across coroutines (aget_or_load).
+- Push invalidation: backend-core publishes the agent handle on
+  AGENT_CONFIG_INVALIDATION_CHANNEL when a pilot or a row its config is
+  built from is saved ("*" for shared models, providers and voices); every
+  process running the listener drops its L1 entries straight away instead
+  of serving the old config until the TTL expires.
+
+Entries are deep-copied on read and write because callers mutate the
+config dicts they get back.
+"""
+
+import asyncio
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from super_services.libs.logger import logger
+
+AGENT_CONFIG_INVALIDATION_CHANNEL = "agent_config:invalidate"
+
+LoaderFn = Callable[[], Optional[Dict[str, Any]]]
+AsyncLoaderFn = Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class AgentConfigCache:
+    def __init__(
+        self,
+        max_size: int = 512,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._generation: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._loading: Dict[str, _Flight] = {}
+        self._async_loading: Dict[Tuple[int, str], asyncio.Task] = {}
+        self._listener = None
+        self._stats = {"hits": 0, "misses": 0, "loads": 0, "invalidations": 0}
+
+    # ── L1 ──────────────────────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Dict[str, Any], generation: Optional[int] = None) -> None:
+        """
+        Store ``value``. When ``generation`` is given and the key was
+        invalidated after it was read, the (stale) value is dropped.
+        """
+        value = copy.deepcopy(value)
+        with self._lock:
+            if generation is not None and self._generation.get(key, 0) != generation:
+                return
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one key, or every key when ``key`` is None."""
+        with self._lock:
+            self._stats["invalidations"] += 1
+            if key is None:
+                for cached_key in self._entries:
+                    self._generation[cached_key] = self._generation.get(cached_key, 0) + 1
+                self._entries.clear()
+                return
+            self._generation[key] = self._generation.get(key, 0) + 1
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _record_hit(self) -> None:
+        with self._lock:
+            self._stats["hits"] += 1
+
+    # ── Single-flight loading ──────────────────────────────────────────
+
+    def get_or_load(self, key: str, loader: LoaderFn) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached config, or run ``loader`` once for all threads
+        missing on ``key`` at the same time. Followers get the leader's
+        result (or exception). Empty results are shared but not cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            self._record_hit()
+            return value
+
+        with self._lock:
+            self._stats["misses"] += 1
+            flight = self._loading.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._loading[key] = _Flight()
+                generation = self._generation.get(key, 0)
+                self._stats["loads"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        try:
+            flight.result = loader()
+            if flight.result:
+                self.put(key, flight.result, generation=generation)
+            # Followers copy flight.result after done is set, so the leader's
+            # caller must not get (and mutate) the shared object either.
+            return copy.deepcopy(flight.result)
+        except Exception as ex:
+            flight.error = ex
+            raise
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+            flight.done.set()
+
+    async def aget_or_load(
+        self, key: str, loader: LoaderFn, aloader: Optional[AsyncLoaderFn] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Async variant: L1 hits never leave the event loop. Misses run
+        ``aloader`` on the loop when given, otherwise the (blocking)
+        ``loader`` in a worker thread; one load per key per event loop.
+        """
+        value = self.get(key)
+        if value is not None:
+            self._record_hit()
+            return value
+
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        task = self._async_loading.get(flight_key)
+        if task is None:
+            if aloader is not None:
+                task = loop.create_task(self._aload(key, aloader))
+            else:
+                task = loop.create_task(asyncio.to_thread(self.get_or_load, key, loader))
+            self._async_loading[flight_key] = task
+            task.add_done_callback(lambda _: self._async_loading.pop(flight_key, None))
+        # Shielded so one cancelled caller does not cancel the shared load.
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result) if result else result
+
+    async def _aload(self, key: str, aloader: AsyncLoaderFn) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._stats["misses"] += 1
+            self._stats["loads"] += 1
+            generation = self._generation.get(key, 0)
+        result = await aloader()
+        if result:
+            self.put(key, result, generation=generation)
+        return result
+
+    # ── Push invalidation ──────────────────────────────────────────────
+
+    def handle_invalidation(self, message: Any) -> None:
+        """Apply one invalidation message (agent handle, or JSON with 'handle')."""
+        if isinstance(message, dict):
+            message = message.get("data")
+        if isinstance(message, bytes):
+            message = message.decode()
+        if not isinstance(message, str):
+            return
+        handle: Optional[str] = message
+        try:
+            payload = json.loads(message)
+            if isinstance(payload, dict):
+                handle = payload.get("handle")
+        except ValueError:
+            pass
+        if handle == "*":
+            self.invalidate()
+        elif handle:
+            self.invalidate(handle)
+
+    def start_invalidation_listener(self, redis_client=None) -> bool:
+        """
+        Subscribe to AGENT_CONFIG_INVALIDATION_CHANNEL in a daemon thread.
+
+        Safe to call repeatedly; returns False when Redis is unavailable, in
+        which case entries still expire after ``ttl_seconds``.
+        """
+        if self._listener is not None:
+            return True
+        try:
+            if redis_client is None:
+                from super_services.libs.core.redis import REDIS
+
+                redis_client = REDIS
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(
+                **{AGENT_CONFIG_INVALIDATION_CHANNEL: self.handle_invalidation}
+            )
+            self._listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+            return True
+        except Exception as ex:
+            logger.warning(f"Agent config invalidation listener not started: {ex}")
+            return False
+
+
+_agent_config_cache: Optional[AgentConfigCache] = None
+_agent_config_cache_lock = threading.Lock()
+
+
+def get_agent_config_cache() -> AgentConfigCache:
+    """Process-wide agent config cache, with its invalidation listener."""
+    global _agent_config_cache
+    if _agent_config_cache is None:
+        with _agent_config_cache_lock:
+            if _agent_config_cache is None:
+                cache = AgentConfigCache(
+                    max_size=int(os.getenv("AGENT_CONFIG_L1_SIZE", "512")),
+                    ttl_seconds=float(os.getenv("AGENT_CONFIG_L1_TTL", "300")),
+                )
+                if os.getenv("USE_REDIS", "true").lower() == "true":
+                    cache.start_invalidation_listener()
+                _agent_config_cache = cache
+    return _agent_config_cache
@@ -0,0 +1,301 @@
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from time import perf_counter
+
+import pytest
+
+from super_services.orchestration.cron_jobs.call_reconciliation import (
+    SbcRecordingIndex,
+    parse_sbc_key,
+    resolve_tasks_for_calls,
+    sbc_listing_prefixes,
+)
+
+mongomock = pytest.importorskip("mongomock")
+
+DAY = datetime(2025, 3, 4)
+
+
+def _recording(dest: str, source: str, at: datetime, tag: str = "") -> dict:
+    return {"destination": dest, "source": source, "time": at, "url": f"{dest}-{at}{tag}"}
+
+
+def _naive_match(recordings, dest, source, at):
+    """The previous scan over every recording, for parity checks."""
+    best, best_diff = None, float("inf")
+    for recording in recordings:
+        if recording["destination"] != dest:
+            continue
+        if source and recording["source"] != source:
+            continue
+        diff = abs((at - recording["time"]).total_seconds())
+        if diff < best_diff:
+            best, best_diff = recording, diff
+    return best["url"] if best and best_diff <= 5400 else None
+
+
+def test_parse_sbc_key() -> None:
+    parsed = parse_sbc_key("sbc/2025/2025-03-04-10-15-00_+0919876543210_+0918123456789_ab.wav")
+    assert parsed == {
+        "source": "9876543210",
+        "destination": "8123456789",
+        "time": datetime(2025, 3, 4, 10, 15),
+    }
+    assert parse_sbc_key("sbc/2025/2025-03-04-10-15-00_+1_+2_ab.mp3") is None
+    assert parse_sbc_key("sbc/2025/garbage_+1_+2.wav") is None
+
+
+def test_listing_prefixes_split_partial_days_by_hour() -> None:
+    prefixes = sbc_listing_prefixes("sbc", DAY.replace(hour=22), DAY + timedelta(days=2, hours=1))
+    assert prefixes == [
+        "sbc/2025/2025-03-04-22",
+        "sbc/2025/2025-03-04-23",
+        "sbc/2025/2025-03-05",
+        "sbc/2025/2025-03-06-00",
+        "sbc/2025/2025-03-06-01",
+    ]
+    assert sbc_listing_prefixes("sbc", DAY, DAY.replace(hour=23, minute=59)) == [
+        "sbc/2025/2025-03-04"
+    ]
+
+
+def test_index_matches_naive_scan() -> None:
+    rng = random.Random(3)
+    numbers = [f"98765{i:05d}" for i in range(30)]
+    sources = ["1111111111", "2222222222"]
+    recordings = [
+        _recording(
+            rng.choice(numbers),
+            rng.choice(sources),
+            DAY + timedelta(seconds=rng.randrange(86400)),
+            tag=str(i),
+        )
+        for i in range(2000)
+    ]
+    index = SbcRecordingIndex(recordings)
+
+    for _ in range(500):
+        dest = rng.choice(numbers + ["0000000000"])
+        source = rng.choice(sources + [""])
+        at = DAY + timedelta(seconds=rng.randrange(-7200, 86400 + 7200))
+        expected = _naive_match(recordings, dest, source, at)
+        got = index.match(dest, source, at)
+        if expected != got:
+            # Equal distances on both sides may resolve to either recording.
+            times = {r["url"]: r["time"] for r in recordings}
+            assert abs((times[got] - at).total_seconds()) == abs(
+                (times[expected] - at).total_seconds()
+            )
+
+
+def test_index_respects_window_and_source() -> None:
+    index = SbcRecordingIndex(
+        [
+            _recording("9", "a", DAY),
+            _recording("9", "b", DAY + timedelta(minutes=10)),
+        ]
+    )
+    assert index.match("9", "b", DAY) == f"9-{DAY + timedelta(minutes=10)}"
+    assert index.match("9", "", DAY + timedelta(minutes=4)) == f"9-{DAY}"
+    assert index.match("9", "a", DAY + timedelta(minutes=91)) is None
+    assert index.match("9", "a", None) is None
+
+
+class _CountingFind:
+    def __init__(self, collection):
+        self.collection = collection
+        self.queries = 0
+
+    def __call__(self, query):
+        self.queries += 1
+        return list(self.collection.find(query, sort=[("modified", -1)]))
+
+
+def _task(task_id, modified, status="pending", call_id=None, number_id=None, contact="+911"):
+    doc = {
+        "task_id": task_id,
+        "status": status,
+        "modified": modified,
+        "input": {"vapi_agent_id": "agent", "contact_number": contact},
+        "output": {},
+    }
+    if call_id:
+        doc["output"]["call_id"] = call_id
+    if number_id:
+        doc["input"]["number_id"] = number_id
+    return doc
+
+
+def test_resolve_tasks_keeps_matching_priorities() -> None:
+    collection = mongomock.MongoClient().db.tasks
+    collection.insert_many(
+        [
+            _task("by-call-old", DAY, status="completed", call_id="c1"),
+            _task("by-call", DAY + timedelta(hours=1), status="completed", call_id="c1"),
+            _task("number", DAY, number_id="pn1", contact="+912"),
+            _task("no-number", DAY + timedelta(hours=1), contact="+912"),
+            _task("closed", DAY + timedelta(hours=2), status="completed", contact="+913"),
+        ]
+    )
+    calls = [
+        {"id": "c1", "assistantId": "agent", "customer": {"number": "+912"}},
+        {"id": "c2", "assistantId": "agent", "phoneNumberId": "pn1", "customer": {"number": "+912"}},
+        {"id": "c3", "assistantId": "agent", "phoneNumberId": "pn9", "destination": {"number": "+912"}},
+        {"id": "c4", "assistantId": "agent", "customer": {"number": "+913"}},
+        {"id": "c5"},
+    ]
+    find = _CountingFind(collection)
+
+    tasks = resolve_tasks_for_calls(calls, find)
+
+    assert [t and t["task_id"] for t in tasks] == ["by-call", "number", "no-number", None, None]
+    assert find.queries == 2
+
+
+class _FakePaginator:
+    def __init__(self, client):
+        self.client = client
+
+    def paginate(self, Bucket, Prefix):
+        with self.client.lock:
+            self.client.in_flight += 1
+            self.client.max_in_flight = max(self.client.max_in_flight, self.client.in_flight)
+        time.sleep(self.client.latency)
+        with self.client.lock:
+            self.client.in_flight -= 1
+            self.client.prefixes.append(Prefix)
+        keys = [k for k in self.client.keys if k.startswith(Prefix)]
+        yield {"Contents": [{"Key": k} for k in keys]}
+
+
+class _FakeS3:
+    def __init__(self, keys, latency=0.0):
+        self.keys = keys
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.in_flight = self.max_in_flight = 0
+        self.prefixes = []
+
+    def get_paginator(self, name):
+        return _FakePaginator(self)
+
+
+def _sbc_keys(count, rng, days=1):
+    keys = []
+    for i in range(count):
+        at = DAY + timedelta(seconds=rng.randrange(86400 * days))
+        keys.append(
+            f"sbc/{at.year}/{at.strftime('%Y-%m-%d-%H-%M-%S')}"
+            f"_+911111111111_+91{9000000000 + rng.randrange(2000)}_{i}.wav"
+        )
+    return keys
+
+
+@pytest.fixture
+def calls_service(monkeypatch):
+    from super_services.orchestration.cron_jobs import calls_cron
+
+    monkeypatch.setenv("S3_FILE_PATH", "sbc")
+    return calls_cron.CallsSyncService()
+
+
+def test_fetch_recordings_lists_prefixes_concurrently(calls_service) -> None:
+    rng = random.Random(5)
+    s3 = _FakeS3(_sbc_keys(500, rng, days=3) + ["sbc/2025/2025-03-04-notes.txt"], latency=0.02)
+    calls_service._s3_client = s3
+
+    recordings = calls_service.fetch_sbc_recordings_for_period(
+        DAY.replace(hour=6), DAY + timedelta(days=2, hours=12)
+    )
+
+    expected = {
+        k for k in s3.keys
+        if k.endswith(".wav") and DAY.replace(hour=6)
+        <= parse_sbc_key(k)["time"]
+        <= DAY + timedelta(days=2, hours=12)
+    }
+    assert set(recordings) == expected
+    assert len(s3.prefixes) == 18 + 1 + 13
+    assert s3.max_in_flight > 1
+
+
+def test_match_task_accepts_map_or_index(calls_service) -> None:
+    recordings = {"k": _recording("8123456789", "9876543210", DAY)}
+    task = {
+        "input": {"contact_number": "+918123456789"},
+        "output": {"assistant_number": "+919876543210"},
+        "modified": DAY + timedelta(minutes=30),
+    }
+    url = recordings["k"]["url"]
+    assert calls_service.match_task_to_sbc_recording(task, recordings) == url
+    assert (
+        calls_service.match_task_to_sbc_recording(task, SbcRecordingIndex.from_map(recordings))
+        == url
+    )
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark
+def test_calls_reconciliation_benchmark() -> None:
+    rng = random.Random(9)
+    latency = 0.0005  # simulated Mongo round trip
+
+    for count in (1000, 4000):
+        collection = mongomock.MongoClient().db.tasks
+        contacts = [f"+91{9000000000 + i}" for i in range(count)]
+        collection.insert_many(
+            [
+                _task(f"t{i}", DAY, call_id=f"c{i}" if i % 2 else None, contact=contacts[i])
+                for i in range(count)
+            ]
+        )
+        calls = [
+            {"id": f"c{i}", "assistantId": "agent", "customer": {"number": contacts[i]}}
+            for i in range(count)
+        ]
+        find = _CountingFind(collection)
+
+        def slow_find(query):
+            time.sleep(latency)
+            return find(query)
+
+        # Per-call queries, as before (timed on a sample, extrapolated).
+        sample = calls[:50]
+        start = perf_counter()
+        for call in sample:
+            resolve_tasks_for_calls([call], slow_find)
+        per_call_s = (perf_counter() - start) * count / len(sample)
+        per_call_queries = find.queries * count // len(sample)
+
+        find.queries = 0
+        start = perf_counter()
+        tasks = resolve_tasks_for_calls(calls, slow_find)
+        batched_s = perf_counter() - start
+        assert all(tasks) and find.queries == 2
+
+        recordings = [
+            _recording(contacts[rng.randrange(count)][-10:], "", DAY + timedelta(seconds=rng.randrange(86400)))
+            for _ in range(count)
+        ]
+        probes = [
+            (contacts[i][-10:], DAY + timedelta(seconds=rng.randrange(86400)))
+            for i in range(0, count, 10)
+        ]
+        start = perf_counter()
+        naive = [_naive_match(recordings, d, "", at) for d, at in probes]
+        scan_s = (perf_counter() - start) * 10
+        start = perf_counter()
+        index = SbcRecordingIndex(recordings)
+        indexed = [index.match(d, "", at) for d, at in probes]
+        index_s = (perf_counter() - start) * 10
+        assert sum(map(bool, naive)) == sum(map(bool, indexed))
+
+        print(
+            f"[LATENCY] calls_reconciliation calls={count} "
+            f"per_call_queries={per_call_queries} per_call_s={per_call_s:.2f} "
+            f"batched_queries={find.queries} batched_s={batched_s:.2f} "
+            f"recording_scan_s={scan_s:.2f} recording_index_s={index_s:.3f}"
+        )
+        assert index_s < scan_s
@@ -0,0 +1,229 @@
+import random
+from datetime import datetime, timedelta
+from time import perf_counter
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+DOC_ID = "doc-1"
+START = datetime(2025, 5, 1, 6, 0)
+
+
+def _task_doc(i: int, rng: random.Random, status=None, ref_id: str = DOC_ID) -> dict:
+    # Calls happen roughly in task creation order.
+    started = START + timedelta(hours=3 * i + rng.randrange(3), minutes=rng.randrange(60))
+    output = {}
+    status = status or rng.choice(["completed", "completed", "failed", "in_progress"])
+    if rng.random() < 0.7:
+        output["transcript"] = [{"role": "user", "content": f"hello {i}"}] * rng.randrange(1, 40)
+    if rng.random() < 0.5:
+        output["duration"] = rng.choice([rng.randrange(5, 600), "n/a", 0])
+    output["start_time"] = started.isoformat() + "Z"
+    output["end_time"] = (started + timedelta(seconds=rng.randrange(10, 900))).isoformat() + "Z"
+    post_call = {"summary": {"status": rng.choice(["Interested", "Not Interested", ""])}}
+    if rng.random() < 0.6:
+        post_call["classification"] = {"summary": f"spoke about plan {i}"}
+    if rng.random() < 0.3:
+        post_call["profile_summary"] = {"sentiment": rng.choice(["Positive", "Negative"]), "n": i}
+    output["post_call_data"] = post_call
+    return {
+        "_id": i,  # Insertion order, like an ObjectId
+        "task_id": f"t{i:05d}",
+        "ref_id": ref_id,
+        "status": status,
+        "execution_type": "call" if rng.random() < 0.95 else "email",
+        "modified": started + timedelta(minutes=20),
+        "created": started,
+        "output": output,
+    }
+
+
+class _CountingCollection:
+    """Wraps a mongomock collection and counts documents sent to the client."""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.docs_returned = 0
+
+    def find(self, *args, **kwargs):
+        docs = list(self._collection.find(*args, **kwargs))
+        self.docs_returned += len(docs)
+        return docs
+
+    def find_one(self, *args, **kwargs):
+        doc = self._collection.find_one(*args, **kwargs)
+        self.docs_returned += doc is not None
+        return doc
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+@pytest.fixture
+def profile_db(monkeypatch):
+    from super.app import call_profile
+
+    db = mongomock.MongoClient().db
+    tasks = _CountingCollection(db.tasks)
+    profiles = db.contact_profiles
+    monkeypatch.setattr(call_profile.TaskModel, "_get_collection", lambda: tasks, raising=False)
+    monkeypatch.setattr(
+        call_profile.ContactProfileModel, "_get_collection", lambda: profiles, raising=False
+    )
+    return call_profile, tasks, profiles
+
+
+def _full_overview(call_profile):
+    service = call_profile.ProfileUpdateService(DOC_ID, "token")
+    return service.build_overview(tasks=service.fetch_tasks_by_document())
+
+
+def _full_analytics(service):
+    return service.calculate_profile_analytics(service.fetch_tasks_by_document())
+
+
+def test_incremental_rollup_matches_full_recompute(profile_db) -> None:
+    call_profile, tasks, profiles = profile_db
+    rng = random.Random(21)
+    docs = [_task_doc(i, rng) for i in range(120)]
+    tasks.insert_many([dict(d) for d in docs[:40]])
+
+    service = call_profile.ProfileUpdateService(DOC_ID, "token")
+    service.build_overview(task_id="t00039")  # First update builds the rollup
+    assert profiles.find_one()["total_calls"] == 40
+
+    for doc in docs[40:]:
+        tasks.insert_one(dict(doc))
+        overview = service.build_overview(task_id=doc["task_id"])
+
+    full = _full_overview(call_profile)
+    assert overview["analytics"] == full["analytics"]
+    assert overview["profile_summary"] == full["profile_summary"]
+    assert overview["recent_conversations"] == full["recent_conversations"]
+    assert overview["profile_status"] == full["profile_status"]
+    assert overview["summary"] == full["summary"]
+
+
+def test_tasks_that_never_complete_still_count_as_calls(profile_db) -> None:
+    call_profile, tasks, _ = profile_db
+    rng = random.Random(13)
+    service = call_profile.ProfileUpdateService(DOC_ID, "token")
+
+    # Only completed calls run the post-call profile update.
+    for i in range(60):
+        doc = _task_doc(i, rng, status="completed" if i % 3 == 2 else "failed")
+        tasks.insert_one(doc)
+        if doc["status"] == "completed":
+            overview = service.build_overview(task_id=doc["task_id"])
+
+    full = _full_overview(call_profile)
+    assert overview["analytics"]["total_calls"] == 60
+    assert overview["analytics"] == full["analytics"]
+    assert overview["profile_status"] == full["profile_status"]
+    assert overview["summary"] == full["summary"]
+
+
+def test_reapplying_a_task_adds_only_the_difference(profile_db) -> None:
+    call_profile, tasks, profiles = profile_db
+    service = call_profile.ProfileUpdateService(DOC_ID, "token")
+    rng = random.Random(4)
+    tasks.insert_one(_task_doc(0, rng, status="completed"))
+    service.build_overview(task_id="t00000")
+
+    task = _task_doc(1, rng, status="in_progress")
+    task["output"]["transcript"] = []
+    tasks.insert_one(task)
+    service.apply_task("t00001")
+    service.apply_task("t00001")
+    assert profiles.find_one()["total_calls"] == 2
+    connected = profiles.find_one()["connected_calls"]
+
+    # The call connects later (e.g. the transcript lands after post-call).
+    tasks.update_one(
+        {"task_id": "t00001"},
+        {"$set": {"status": "completed", "output.transcript": [{"role": "user"}], "output.duration": 30}},
+    )
+    service.apply_task("t00001")
+    service.apply_task("t00001")
+
+    rollup = profiles.find_one()
+    assert rollup["total_calls"] == 2
+    assert rollup["connected_calls"] == connected + 1
+    assert service.analytics_from_rollup(rollup) == _full_analytics(service)
+
+
+def test_rebuild_repairs_a_drifted_rollup(profile_db) -> None:
+    call_profile, tasks, profiles = profile_db
+    rng = random.Random(8)
+    tasks.insert_many([_task_doc(i, rng) for i in range(30)])
+    service = call_profile.ProfileUpdateService(DOC_ID, "token")
+    service.build_overview(task_id="t00029")
+
+    profiles.update_one({}, {"$inc": {"total_calls": 7, "connected_calls": -3}})
+    service.rebuild_rollup()
+
+    assert service.analytics_from_rollup(service.get_rollup()) == _full_analytics(service)
+    # Contributions were re-recorded, so applying again is a no-op.
+    before = service.get_rollup()
+    service.apply_task("t00010")
+    after = service.get_rollup()
+    assert {k: after[k] for k in ("total_calls", "connected_calls", "total_duration")} == {
+        k: before[k] for k in ("total_calls", "connected_calls", "total_duration")
+    }
+
+
+def test_recent_history_is_projected(profile_db) -> None:
+    call_profile, tasks, _ = profile_db
+    rng = random.Random(2)
+    tasks.insert_many([_task_doc(i, rng) for i in range(30)])
+
+    recent = call_profile.ProfileUpdateService(DOC_ID, "token").fetch_recent_call_tasks()
+
+    assert len(recent) == call_profile.PROFILE_HISTORY_WINDOW
+    assert all("transcript" not in task["output"] for task in recent)
+
+
+@pytest.mark.benchmark
+def test_profile_update_benchmark(profile_db) -> None:
+    call_profile, tasks, _ = profile_db
+    rng = random.Random(5)
+    next_id = 0
+    results = []
+
+    for history in (200, 2000):
+        ref_id = f"contact-{history}"
+        tasks.insert_many(
+            [_task_doc(next_id + i, rng, ref_id=ref_id) for i in range(history)]
+        )
+        next_id += history
+        service = call_profile.ProfileUpdateService(ref_id, "token")
+        service.rebuild_rollup()
+
+        # Before: every update refetched and re-analysed the whole history.
+        tasks.docs_returned = 0
+        start = perf_counter()
+        full = service.build_overview(tasks=service.fetch_tasks_by_document())
+        full_ms = (perf_counter() - start) * 1000
+        full_docs = tasks.docs_returned
+        assert full["analytics"]["total_calls"] == history
+
+        samples = 10
+        tasks.docs_returned = 0
+        start = perf_counter()
+        for _ in range(samples):
+            tasks.insert_one(_task_doc(next_id, rng, status="completed", ref_id=ref_id))
+            service.build_overview(task_id=f"t{next_id:05d}")
+            next_id += 1
+        incremental_ms = (perf_counter() - start) * 1000 / samples
+        incremental_docs = tasks.docs_returned / samples
+        results.append(incremental_docs)
+        print(
+            f"[LATENCY] contact_profile_update history={history} full_ms={full_ms:.1f} "
+            f"full_docs={full_docs} incremental_ms={incremental_ms:.1f} "
+            f"incremental_docs={incremental_docs:.0f}"
+        )
+
+    # mongomock scans where Mongo would use the ref_id index, so only the
+    # transferred document count is compared.
+    assert results[0] == results[1] <= 1 + call_profile.PROFILE_HISTORY_WINDOW
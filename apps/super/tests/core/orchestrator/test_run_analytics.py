@@ -0,0 +1,369 @@
+import random
+from datetime import datetime
+from time import perf_counter
+from types import SimpleNamespace
+
+import pytest
+
+from super_services.orchestration.task.run_analytics import (
+    analytics_from_groups,
+    resolve_run_status,
+    run_analytics_pipeline,
+    task_count_transition,
+)
+
+mongomock = pytest.importorskip("mongomock")
+
+CALL_STATUSES = [
+    "Interested", "InterestedIn", "Call Back", "Send Details", "Not Interested",
+    "Not Connected", "Error", "Unknown", "Voicemail", None,
+]
+TASK_STATUSES = ["completed", "failed", "pending", "in_progress", "processing", "hold"]
+
+
+def _task_doc(i: int, rng: random.Random, run_id: str = "run-1", status=None) -> dict:
+    output = {}
+    roll = rng.random()
+    if roll < 0.4:
+        output["transcript"] = [{"role": "user", "content": "hi"}]
+    elif roll < 0.5:
+        output["transcript"] = "agent: hello"
+    elif roll < 0.6:
+        output["transcript"] = []
+    post_call = {}
+    call_status = rng.choice(CALL_STATUSES)
+    if call_status:
+        post_call["summary"] = {"status": call_status}
+    post_call["success_evaluator"] = rng.choice([None, "", "7", 9, "11", "n/a", 0, "3.5"])
+    output["post_call_data"] = post_call
+    return {
+        "task_id": f"t{i}",
+        "run_id": run_id,
+        "status": status or rng.choice(TASK_STATUSES),
+        "execution_type": "call" if rng.random() < 0.9 else "email",
+        "retry_attempt": rng.randrange(4),
+        "output": output,
+    }
+
+
+def _as_task(doc: dict) -> SimpleNamespace:
+    return SimpleNamespace(**doc)
+
+
+def _python_analytics(docs):
+    from super_services.orchestration.task.task_service import TaskService
+
+    return TaskService().calculate_run_analytics([_as_task(d) for d in docs])
+
+
+def _aggregate(collection, run_id="run-1"):
+    return analytics_from_groups(collection.aggregate(run_analytics_pipeline(run_id)))
+
+
+def test_pipeline_matches_python_analytics() -> None:
+    rng = random.Random(7)
+    docs = [_task_doc(i, rng) for i in range(2000)]
+    # Explicit nulls count like a missing summary status.
+    for i, summary in enumerate(({"status": None}, None), start=2000):
+        doc = _task_doc(i, rng, status="completed")
+        doc["execution_type"] = "call"
+        doc["output"]["post_call_data"]["summary"] = summary
+        docs.append(doc)
+    collection = mongomock.MongoClient().db.tasks
+    collection.insert_many([dict(d) for d in docs])
+    collection.insert_one(_task_doc(99999, rng, run_id="other-run"))
+
+    call_analytics, execution_analytics, task_counts = _aggregate(collection)
+
+    assert (call_analytics, execution_analytics) == _python_analytics(docs)
+    assert sum(task_counts.values()) == 2002
+
+
+def test_resolve_run_status() -> None:
+    assert resolve_run_status({}) is None
+    assert resolve_run_status({"completed": 3}) == "completed"
+    assert resolve_run_status({"failed": 3}) == "failed"
+    assert resolve_run_status({"completed": 2, "failed": 1}) == "partially_completed"
+    assert resolve_run_status({"completed": 2, "hold": 1}) is None
+
+
+def test_task_count_transition() -> None:
+    assert task_count_transition("pending", "completed") == {
+        "task_counts.pending": -1,
+        "task_counts.completed": 1,
+    }
+    assert task_count_transition("failed", "failed") == {}
+    assert task_count_transition(None, "pending", 3) == {"task_counts.pending": 3}
+
+
+@pytest.fixture
+def mongo_task_service(monkeypatch):
+    from super_services.orchestration.task import task_service as module
+
+    db = mongomock.MongoClient().db
+    tasks, runs = db.tasks, db.runs
+    monkeypatch.setattr(module.TaskModel, "_get_collection", lambda: tasks, raising=False)
+    monkeypatch.setattr(
+        module.TaskModel, "get", lambda **q: None, raising=False
+    )
+    monkeypatch.setattr(module.RunModel, "_get_collection", lambda: runs, raising=False)
+    monkeypatch.setattr(
+        module.RunModel, "find_one", lambda **q: runs.find_one(q), raising=False
+    )
+    monkeypatch.setattr(
+        module.RunModel,
+        "update_one",
+        lambda query, data: runs.update_one(query, {"$set": data}),
+        raising=False,
+    )
+    return module.TaskService(), tasks, runs
+
+
+class _TaskDoc(SimpleNamespace):
+    def dict(self):
+        return dict(vars(self))
+
+
+@pytest.fixture
+def mongo_task_flow(mongo_task_service, monkeypatch):
+    """mongo_task_service with the TaskModel calls process_task makes."""
+    from super_services.orchestration.task import task_service as module
+
+    service, tasks, runs = mongo_task_service
+    monkeypatch.setattr(
+        module.TaskModel,
+        "get",
+        lambda **q: _TaskDoc(**tasks.find_one(q, {"_id": 0})),
+        raising=False,
+    )
+    # BSON stores str enums as their value; mongomock keeps the enum object.
+    monkeypatch.setattr(
+        module.TaskModel,
+        "update_one",
+        lambda query, data: tasks.update_one(
+            query, {"$set": {k: getattr(v, "value", v) for k, v in data.items()}}
+        ),
+        raising=False,
+    )
+    monkeypatch.setattr(
+        module.TaskModel,
+        "save_single_to_db",
+        lambda data: tasks.insert_one(dict(data)) and _TaskDoc(**data),
+        raising=False,
+    )
+    monkeypatch.setattr(
+        module.TaskExecutionLogModel, "save_single_to_db", lambda data: data, raising=False
+    )
+    monkeypatch.setattr(
+        module.TaskExecutionLogModel, "update_one", lambda *args: None, raising=False
+    )
+    return service, tasks, runs
+
+
+def _flow_task(i: int, **extra) -> dict:
+    return {
+        "task_id": f"t{i}",
+        "run_id": "run-1",
+        "status": "pending",
+        "execution_type": "email",
+        "retry_attempt": 0,
+        "input": {"email": "a@b.c"},
+        "output": {},
+        "space_id": "space-1",
+        **extra,
+    }
+
+
+def test_counters_track_transitions_and_complete_run(mongo_task_service) -> None:
+    service, tasks, runs = mongo_task_service
+    runs.insert_one({"run_id": "run-1", "status": "in_progress"})
+    tasks.insert_many(
+        [{"task_id": f"t{i}", "run_id": "run-1", "status": "pending"} for i in range(3)]
+    )
+
+    service.check_and_update_run_status("run-1")
+    assert runs.find_one()["task_counts"] == {"pending": 3}
+
+    for i in range(3):
+        service.update_task_status(f"t{i}", "completed", expected_status="pending")
+        counts = runs.find_one()["task_counts"]
+        assert counts["completed"] == i + 1 and counts["pending"] == 2 - i
+        service.check_and_update_run_status("run-1")
+
+    run = runs.find_one()
+    assert run["status"] == "completed"
+    assert run["execution_analytics"]["completed"] == 3
+    assert run["task_counts"] == {"completed": 3}
+
+
+def test_cron_status_writers_move_the_run_counters(mongo_task_service) -> None:
+    from super_services.orchestration.cron_jobs.update_calls_v2 import VapiCallUpdater
+
+    service, tasks, runs = mongo_task_service
+    runs.insert_one({"run_id": "run-1", "status": "in_progress"})
+    tasks.insert_many(
+        [{"task_id": f"t{i}", "run_id": "run-1", "status": "in_progress"} for i in range(3)]
+    )
+    service.check_and_update_run_status("run-1")
+
+    updater = object.__new__(VapiCallUpdater)
+    updater.mark_failed_max_retries("t0", "customer-busy", 2)
+    updater.mark_pending_for_error("t1", 0, "twilio-failed")
+    assert service.update_task("t2", {"output": {"call_id": "c2"}})
+    assert runs.find_one()["task_counts"] == {"in_progress": 1, "failed": 1, "pending": 1}
+
+    assert service.update_task("t2", {"status": "completed"})
+    assert not service.update_task("missing", {"status": "completed"})
+    assert runs.find_one()["task_counts"] == {
+        "in_progress": 0,
+        "failed": 1,
+        "pending": 1,
+        "completed": 1,
+    }
+
+
+def test_in_flight_run_skips_recompute_until_stale(mongo_task_service) -> None:
+    service, tasks, runs = mongo_task_service
+    runs.insert_one({"run_id": "run-1", "status": "in_progress"})
+    tasks.insert_many(
+        [{"task_id": f"t{i}", "run_id": "run-1", "status": "pending"} for i in range(2)]
+    )
+    service.check_and_update_run_status("run-1")
+    refreshed = runs.find_one()["analytics_updated_at"]
+
+    service.update_task_status("t0", "completed")
+    service.check_and_update_run_status("run-1")
+    assert runs.find_one()["analytics_updated_at"] == refreshed
+
+    # A write the counters did not see still finishes the run.
+    tasks.update_one({"task_id": "t1"}, {"$set": {"status": "failed"}})
+    service.check_and_update_run_status("run-1")
+    assert runs.find_one()["status"] == "partially_completed"
+
+    runs.update_one({}, {"$set": {"analytics_updated_at": datetime(2000, 1, 1).isoformat()}})
+    assert service._run_needs_reconcile("run-1", runs.find_one())
+
+
+def test_task_flow_drops_the_dispatch_claim(mongo_task_flow) -> None:
+    service, tasks, runs = mongo_task_flow
+    runs.insert_one({"run_id": "run-1", "status": "in_progress"})
+    tasks.insert_many([_flow_task(0), _flow_task(1)])
+
+    assert service.claim_tasks_for_dispatch("run-1", ["t0", "t1"], "claim-a") == ["t0", "t1"]
+    assert service.claim_tasks_for_dispatch("run-1", ["t0", "t1"], "claim-b") == []
+
+    service.process_task("t0")
+
+    task = tasks.find_one({"task_id": "t0"})
+    assert task["status"] == "completed"
+    assert task["dispatch_claim"] is None and task["dispatch_lease_until"] is None
+    assert tasks.find_one({"task_id": "t1"})["dispatch_claim"] == "claim-a"
+
+
+def test_task_flow_keeps_counters_in_step_with_the_pipeline(mongo_task_flow) -> None:
+    service, tasks, runs = mongo_task_flow
+    runs.insert_one({"run_id": "run-1", "status": "in_progress"})
+    tasks.insert_many([_flow_task(0), _flow_task(1), _flow_task(2, retry_attempt=9)])
+    service.check_and_update_run_status("run-1")
+    refreshed = runs.find_one()["analytics_updated_at"]
+
+    added = service.add_task(
+        "run-1", {"objective": "mail"}, "agent", "ref", execution_type="email",
+        input={"email": "a@b.c"}, output={}, space_id="space-1",
+    )
+    service.process_task("t0")
+    service.process_task("t2")
+    service.process_task(added["task_id"])
+
+    # t1 stays pending, so the counters were never reconciled from the tasks.
+    run = runs.find_one()
+    assert run["analytics_updated_at"] == refreshed
+    assert run["task_counts"] == _aggregate(tasks)[2]
+    assert run["task_counts"] == {"completed": 2, "failed": 1, "pending": 1}
+
+
+class _CountingCollection:
+    """Wraps a mongomock collection and counts documents sent to the client."""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.docs_returned = 0
+
+    def find(self, *args, **kwargs):
+        docs = list(self._collection.find(*args, **kwargs))
+        self.docs_returned += len(docs)
+        return docs
+
+    def find_one(self, *args, **kwargs):
+        doc = self._collection.find_one(*args, **kwargs)
+        self.docs_returned += doc is not None
+        return doc
+
+    def find_one_and_update(self, *args, **kwargs):
+        doc = self._collection.find_one_and_update(*args, **kwargs)
+        self.docs_returned += doc is not None
+        return doc
+
+    def aggregate(self, pipeline):
+        docs = list(self._collection.aggregate(pipeline))
+        self.docs_returned += len(docs)
+        return docs
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark
+def test_run_status_check_benchmark_50k_tasks(monkeypatch) -> None:
+    from super_services.orchestration.task import task_service as module
+
+    rng = random.Random(11)
+    db = mongomock.MongoClient().db
+    db.tasks.insert_many(
+        [_task_doc(i, rng, status="completed" if i % 2 else "pending") for i in range(50_000)]
+    )
+    tasks, runs = _CountingCollection(db.tasks), db.runs
+    monkeypatch.setattr(module.TaskModel, "_get_collection", lambda: tasks, raising=False)
+    monkeypatch.setattr(module.TaskModel, "get", lambda **q: None, raising=False)
+    monkeypatch.setattr(module.RunModel, "_get_collection", lambda: runs, raising=False)
+    monkeypatch.setattr(module.RunModel, "find_one", lambda **q: runs.find_one(q), raising=False)
+    monkeypatch.setattr(
+        module.RunModel, "update_one", lambda q, d: runs.update_one(q, {"$set": d}), raising=False
+    )
+    service = module.TaskService()
+    half = 25_000
+    runs.insert_one(
+        {
+            "run_id": "run-1",
+            "status": "in_progress",
+            "task_counts": {"completed": half, "pending": half},
+        }
+    )
+
+    # Before: every completion reloaded the whole run and counted in Python.
+    tasks.docs_returned = 0
+    start = perf_counter()
+    service.calculate_run_analytics([_as_task(d) for d in tasks.find({"run_id": "run-1"})])
+    full_scan_ms = (perf_counter() - start) * 1000
+    full_scan_docs = tasks.docs_returned
+
+    # After: a completion moves the run counters and probes for an open task.
+    # (mongomock scans where Mongo would use the run_id/status indexes, so
+    # only the transferred document count is compared.)
+    samples = 5
+    runs.update_one({}, {"$set": {"analytics_updated_at": datetime.utcnow().isoformat()}})
+    tasks.docs_returned = 0
+    start = perf_counter()
+    for i in range(samples):
+        service.update_task_status(f"t{2 * i}", "completed")
+        service.check_and_update_run_status("run-1")
+    per_completion_ms = (perf_counter() - start) * 1000 / samples
+    per_completion_docs = tasks.docs_returned / samples
+
+    print(
+        f"[LATENCY] run_status_check tasks=50000 full_scan_ms={full_scan_ms:.0f} "
+        f"full_scan_docs={full_scan_docs} per_completion_ms={per_completion_ms:.1f} "
+        f"per_completion_docs={per_completion_docs:.0f}"
+    )
+    counts = runs.find_one()["task_counts"]
+    assert counts == {"completed": half + samples, "pending": half - samples}
+    assert per_completion_docs <= 2
+    assert full_scan_docs == 50_000
@@ -0,0 +1,156 @@
+"""Tests for the indexed action store and SharedContext eviction/batching."""
+
+from typing import Dict, List, Optional
+
+import pytest
+
+from super.core.orchestrator.three_layer.action_store import ActionStore
+from super.core.orchestrator.three_layer.models import (
+    ActionState,
+    ActionStatus,
+    create_action_state,
+)
+from super.core.orchestrator.three_layer.shared_context import SharedContext
+
+
+class BatchingAdapter:
+    """Adapter that records every write, single or batched."""
+
+    def __init__(self) -> None:
+        self.storage: Dict[str, ActionState] = {}
+        self.single_writes = 0
+        self.batches: List[List[str]] = []
+
+    async def save_action(self, action: ActionState) -> None:
+        self.single_writes += 1
+        self.storage[action["action_id"]] = dict(action)
+
+    async def save_actions(self, actions: List[ActionState]) -> None:
+        self.batches.append([a["action_id"] for a in actions])
+        for action in actions:
+            self.storage[action["action_id"]] = dict(action)
+
+    async def load_action(self, action_id: str) -> Optional[ActionState]:
+        return self.storage.get(action_id)
+
+    async def load_thread_actions(self, thread_id: str) -> List[ActionState]:
+        return [a for a in self.storage.values() if a["thread_id"] == thread_id]
+
+
+def _action(action_id: str, thread_id: str) -> ActionState:
+    return create_action_state(action_id=action_id, thread_id=thread_id, input_text=action_id)
+
+
+class TestActionStore:
+    """Tests for ActionStore indexes."""
+
+    def test_lookups_are_scoped_to_thread_and_status(self) -> None:
+        store = ActionStore()
+        for i in range(4):
+            store.add(_action(f"a{i}", "t1"))
+            store.add(_action(f"b{i}", "t2"))
+
+        store.set_status(store.get("a1"), ActionStatus.DONE)
+
+        assert [a["action_id"] for a in store.by_status("t1", ActionStatus.PENDING)] == [
+            "a0", "a2", "a3",
+        ]
+        assert [a["action_id"] for a in store.by_status("t1", ActionStatus.DONE)] == ["a1"]
+        assert len(store.by_status("t2", ActionStatus.PENDING)) == 4
+        assert store.by_status("t3", ActionStatus.PENDING) == []
+
+    def test_first_with_status_prefers_creation_order(self) -> None:
+        store = ActionStore()
+        first, second = _action("a0", "t1"), _action("a1", "t1")
+        store.add(first)
+        store.add(second)
+
+        # The later action becomes active first; a full scan would still return a0.
+        store.set_status(second, ActionStatus.PROCESSING)
+        store.set_status(first, ActionStatus.WAITING)
+
+        assert store.first_with_status("t1", ActionStatus.PROCESSING, ActionStatus.WAITING) is first
+
+    def test_remove_and_replace_thread_keep_indexes_consistent(self) -> None:
+        store = ActionStore()
+        store.add(_action("a0", "t1"))
+        store.add(_action("b0", "t2"))
+
+        store.replace_thread("t1", [_action("a9", "t1")])
+        store.remove("b0")
+
+        assert list(store.actions) == ["a9"]
+        assert store.by_status("t2", ActionStatus.PENDING) == []
+        assert store.thread_actions("t1")[0]["action_id"] == "a9"
+
+    def test_expired_terminal_respects_ttl(self) -> None:
+        store = ActionStore(terminal_ttl=10)
+        action = _action("a0", "t1")
+        store.add(action)
+        store.set_status(action, ActionStatus.DONE)
+
+        assert store.expired_terminal() == []
+        assert store.expired_terminal(now=float("inf")) == ["a0"]
+        assert ActionStore().expired_terminal(now=float("inf")) == []
+
+
+class TestSharedContextEviction:
+    """Tests for terminal-state eviction and archiving."""
+
+    @pytest.mark.anyio
+    async def test_finished_actions_are_archived_then_evicted(self) -> None:
+        adapter = BatchingAdapter()
+        context = SharedContext(persistence=adapter, terminal_ttl=0)
+
+        done = await context.create_action(thread_id="t1", input_text="first")
+        await context.complete_action(done["action_id"], {"ok": True})
+        assert adapter.storage[done["action_id"]]["status"] == ActionStatus.DONE
+
+        await context.create_action(thread_id="t1", input_text="second")
+
+        assert context.get_action(done["action_id"]) is None
+        assert len(context.get_pending_actions("t1")) == 1
+        assert adapter.storage[done["action_id"]]["result"] == {"ok": True}
+
+    @pytest.mark.anyio
+    async def test_no_ttl_keeps_finished_actions(self) -> None:
+        context = SharedContext(terminal_ttl=None)
+        action = await context.create_action(thread_id="t1", input_text="x")
+        await context.cancel_action(action["action_id"], "user changed mind")
+        await context.create_action(thread_id="t1", input_text="y")
+
+        assert context.get_action(action["action_id"])["status"] == ActionStatus.CANCELLED
+
+
+class TestSharedContextBatching:
+    """Tests for batched persistence writes."""
+
+    @pytest.mark.anyio
+    async def test_writes_are_coalesced_into_batches(self) -> None:
+        adapter = BatchingAdapter()
+        context = SharedContext(persistence=adapter, persist_batch_size=3)
+
+        a = await context.create_action(thread_id="t1", input_text="a")
+        await context.update_status(a["action_id"], ActionStatus.PROCESSING)
+        b = await context.create_action(thread_id="t1", input_text="b")
+        assert adapter.batches == []
+
+        c = await context.create_action(thread_id="t1", input_text="c")
+
+        assert adapter.batches == [[a["action_id"], b["action_id"], c["action_id"]]]
+        assert adapter.storage[a["action_id"]]["status"] == ActionStatus.PROCESSING
+        assert adapter.single_writes == 0
+
+    @pytest.mark.anyio
+    async def test_terminal_status_and_load_flush_pending_writes(self) -> None:
+        adapter = BatchingAdapter()
+        context = SharedContext(persistence=adapter, persist_batch_size=10)
+
+        a = await context.create_action(thread_id="t1", input_text="a")
+        await context.complete_action(a["action_id"], {"done": 1})
+        assert adapter.storage[a["action_id"]]["status"] == ActionStatus.DONE
+
+        b = await context.create_action(thread_id="t2", input_text="b")
+        await context.load_thread_state("t2")
+        assert context.get_action(b["action_id"]) is not None
+        assert context.get_action(a["action_id"]) is not None
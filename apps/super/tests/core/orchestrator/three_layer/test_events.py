@@ -1,5 +1,7 @@
 """Tests for three-layer events."""
 
+import asyncio
+
 import pytest
 from typing import Any, Dict, List
 
@@ -87,3 +89,52 @@ class TestEventEmitter:
         await emitter.emit(event)
 
         assert call_count == 0
+
+    @pytest.mark.anyio
+    async def test_failing_handler_does_not_affect_others(
+        self, emitter: EventEmitter
+    ) -> None:
+        results: List[str] = []
+
+        async def broken(event: Event) -> None:
+            raise RuntimeError("subscriber bug")
+
+        async def healthy(event: Event) -> None:
+            results.append("ok")
+
+        emitter.subscribe(EventType.ACTION_COMPLETED, broken)
+        emitter.subscribe(EventType.ACTION_COMPLETED, healthy)
+
+        await emitter.emit(
+            create_event(event_type=EventType.ACTION_COMPLETED, action_id="a1", data={})
+        )
+
+        assert results == ["ok"]
+
+    @pytest.mark.anyio
+    async def test_slow_handler_does_not_block_emit_with_timeout(self) -> None:
+        emitter = EventEmitter(handler_timeout=0.05)
+        release = asyncio.Event()
+        results: List[str] = []
+
+        async def slow(event: Event) -> None:
+            await release.wait()
+            results.append("slow")
+
+        async def fast(event: Event) -> None:
+            results.append("fast")
+
+        emitter.subscribe(EventType.STATUS_CHANGED, slow)
+        emitter.subscribe(EventType.STATUS_CHANGED, fast)
+
+        await asyncio.wait_for(
+            emitter.emit(
+                create_event(event_type=EventType.STATUS_CHANGED, action_id="a1", data={})
+            ),
+            timeout=1,
+        )
+        assert results == ["fast"]
+
+        release.set()
+        await asyncio.sleep(0.01)
+        assert results == ["fast", "slow"]
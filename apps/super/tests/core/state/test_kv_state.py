@@ -0,0 +1,241 @@
+import json
+from time import perf_counter
+
+import pytest
+
+from super.core.context.schema import Context
+from super.core.state import kv
+from super.core.state.kv import KVState
+
+
+class _FakeRedis:
+    """The string, list and hash commands KVState uses, counting bytes written."""
+
+    def __init__(self):
+        self.data = {}
+        self.bytes_written = 0
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def _written(self, *values):
+        self.bytes_written += sum(len(str(v)) for v in values)
+
+    def _set(self, key, value, ex=None):
+        self._written(value)
+        self.data[key] = value.encode()
+
+    def _get(self, key):
+        return self.data.get(key)
+
+    def _delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def _rpush(self, key, *values):
+        self._written(*values)
+        self.data.setdefault(key, []).extend(v.encode() for v in values)
+        return len(self.data[key])
+
+    def _lset(self, key, index, value):
+        self._written(value)
+        self.data[key][index] = value.encode()
+
+    def _lrange(self, key, start, end):
+        items = self.data.get(key, [])
+        start = max(0, len(items) + start) if start < 0 else start
+        end = len(items) + end if end < 0 else end
+        return items[start:end + 1]
+
+    def _llen(self, key):
+        return len(self.data.get(key, []))
+
+    def _hset(self, key, mapping):
+        self._written(*mapping.values())
+        self.data.setdefault(key, {}).update({k: str(v).encode() for k, v in mapping.items()})
+
+    def _hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    def __getattr__(self, name):
+        async def command(*args, **kwargs):
+            return getattr(self, f"_{name}")(*args, **kwargs)
+
+        return command
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._queued = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._queued.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [getattr(self._redis, f"_{name}")(*a, **kw) for name, a, kw in self._queued]
+
+
+def _state(redis, session_id="s1"):
+    state = KVState(session_id)
+    state._memory._memory = redis
+    return state
+
+
+def _blob(context):
+    # The previous format: the whole conversation as one JSON document.
+    return json.loads(json.dumps(context.to_memories()))
+
+
+def _turn(context, n):
+    context.add_user_message(f"question {n}")
+    context.add_assistant_message(f"answer {n}", data={"turn": n})
+
+
+@pytest.mark.asyncio
+async def test_deltas_round_trip_to_the_full_blob():
+    redis = _FakeRedis()
+    writer = _state(redis)
+    context = Context("s1")
+    for n in range(6):
+        _turn(context, n)
+        await writer.save(context)
+    context.messages[-1].message = "answer 5, revised"
+    context.messages[-2].data = {"edited": True}
+    await writer.save(context)
+
+    loaded = await _state(redis).load()
+
+    assert loaded.to_memories() == _blob(context)
+    assert loaded.objective == "question 5"
+    assert loaded.active_message == len(context.messages) - 1
+    assert redis.data["session_context:s1:header"] == {"count": b"12"}
+
+
+@pytest.mark.asyncio
+async def test_edit_to_an_early_message_round_trips():
+    redis = _FakeRedis()
+    writer = _state(redis)
+    context = Context("s1")
+    for n in range(10):
+        _turn(context, n)
+        await writer.save(context)
+
+    context.messages[1].message = "answer 0, revised"
+    context.messages[2].data = {"edited": True}
+    before = redis.bytes_written
+    await writer.save(context)
+
+    assert redis.bytes_written - before < len(json.dumps(context.to_memories())) / 4
+    assert (await _state(redis).load()).to_memories() == _blob(context)
+
+
+@pytest.mark.asyncio
+async def test_save_cost_does_not_grow_with_the_conversation():
+    redis = _FakeRedis()
+    state = _state(redis)
+    context = Context("s1")
+    costs = []
+    for n in range(60):
+        _turn(context, n)
+        before = redis.bytes_written
+        await state.save(context)
+        costs.append(redis.bytes_written - before)
+
+    assert max(costs[1:]) < 2 * min(costs[1:])
+    assert redis.bytes_written < len(json.dumps(context.to_memories())) * 2
+
+
+@pytest.mark.asyncio
+async def test_legacy_blob_is_read_and_migrated():
+    redis = _FakeRedis()
+    context = Context("s1")
+    for n in range(3):
+        _turn(context, n)
+    redis.data["session_context:s1"] = json.dumps(context.to_memories()).encode()
+
+    state = _state(redis)
+    loaded = await state.load()
+    assert loaded.to_memories() == _blob(context)
+
+    _turn(loaded, 3)
+    await state.save(loaded)
+    assert "session_context:s1" not in redis.data
+    assert (await _state(redis).load()).to_memories() == _blob(loaded)
+
+
+@pytest.mark.asyncio
+async def test_windowed_load_and_earlier_pages():
+    redis = _FakeRedis()
+    context = Context("s1")
+    for n in range(10):
+        _turn(context, n)
+    await _state(redis).save(context)
+
+    state = _state(redis)
+    tail = await state.load(window=4)
+    assert [m.message for m in tail.messages] == ["question 8", "answer 8", "question 9", "answer 9"]
+
+    _turn(tail, 10)
+    tail.messages[-3].message = "answer 9, revised"
+    await state.save(tail)
+    assert await state.load_earlier(tail, 6) == 6
+    assert tail.messages[0].message == "question 5"
+
+    full = await _state(redis).load()
+    assert len(full.messages) == 22
+    assert full.messages[19].message == "answer 9, revised"
+    assert full.to_memories()[:16] == _blob(context)[:16]
+
+
+@pytest.mark.asyncio
+async def test_truncation_drift_and_compaction_rewrite(monkeypatch):
+    monkeypatch.setattr(kv, "STATE_COMPACT_EVERY", 3)
+    redis = _FakeRedis()
+    state = _state(redis)
+    context = Context("s1")
+    for n in range(4):
+        _turn(context, n)
+    await state.save(context)
+
+    context.messages = context.messages[:5]
+    await state.save(context)
+    assert len(redis.data["session_context:s1:messages"]) == 5
+
+    redis.data["session_context:s1:messages"].append(b"{}")  # a stray writer
+    _turn(context, 4)
+    await state.save(context)  # third save compacts
+    assert (await _state(redis).load()).to_memories() == _blob(context)
+
+    await state.clear()
+    assert redis.data == {}
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_state_save_benchmark():
+    turns = 300
+    legacy_redis, delta_redis = _FakeRedis(), _FakeRedis()
+    delta = _state(delta_redis)
+    context = Context("s1")
+    legacy_s = delta_s = 0.0
+    for n in range(turns):
+        _turn(context, n)
+        start = perf_counter()
+        # The previous save: serialise and SET the full conversation.
+        await legacy_redis.set("session_context:s1", json.dumps(context.to_memories()))
+        legacy_s += perf_counter() - start
+        start = perf_counter()
+        await delta.save(context)
+        delta_s += perf_counter() - start
+
+    assert (await _state(delta_redis).load()).to_memories() == _blob(context)
+    print(
+        f"[LATENCY] state_save turns={turns} "
+        f"full_blob_us={legacy_s / turns * 1e6:.0f} delta_us={delta_s / turns * 1e6:.0f} "
+        f"full_blob_kb={legacy_redis.bytes_written / 1024:.0f} delta_kb={delta_redis.bytes_written / 1024:.0f}"
+    )
+    assert delta_redis.bytes_written * 10 < legacy_redis.bytes_written
@@ -0,0 +1,239 @@
+import random
+from time import perf_counter
+
+import pytest
+
+from super.core.utils.latency_histogram import LatencyHistogram
+from super.core.voice.managers.metrics import Histogram, MetricsCollector
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def _latencies(rng, n):
+    # Mostly fast responses with a long tail.
+    return [rng.lognormvariate(6, 0.8) + (rng.random() < 0.02) * 20000 for _ in range(n)]
+
+
+def test_quantiles_within_relative_accuracy() -> None:
+    values = _latencies(random.Random(1), 50_000)
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.observe(value)
+
+    for q in (0.5, 0.9, 0.95, 0.99, 0.999):
+        assert histogram.quantile(q) == pytest.approx(_exact(values, q), rel=0.01)
+    assert histogram.quantiles([0.99, 0.5]) == [histogram.quantile(0.99), histogram.quantile(0.5)]
+    assert histogram.avg == pytest.approx(sum(values) / len(values))
+    assert histogram.quantile(1.0) == max(values)
+
+
+def test_merge_matches_single_histogram_and_round_trips() -> None:
+    rng = random.Random(2)
+    workers = [_latencies(rng, 3000) for _ in range(8)]
+    single = LatencyHistogram()
+    merged = LatencyHistogram()
+    for values in workers:
+        worker = LatencyHistogram()
+        for value in values:
+            single.observe(value)
+            worker.observe(value)
+        merged.merge(LatencyHistogram.from_bytes(worker.to_bytes()))
+
+    assert merged.count == single.count == 24_000
+    assert merged.quantiles([0.5, 0.95, 0.99]) == single.quantiles([0.5, 0.95, 0.99])
+    assert merged.sum == pytest.approx(single.sum)
+    assert (merged.min, merged.max) == (single.min, single.max)
+    assert len(single.to_bytes()) < 1500
+
+    with pytest.raises(ValueError):
+        merged.merge(LatencyHistogram(relative_accuracy=0.02))
+
+
+def test_small_and_out_of_range_values() -> None:
+    histogram = LatencyHistogram(min_value=1.0, max_value=100.0)
+    for value in (0.0, 0.5, 50.0, 5000.0):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.0) == 0.0
+    assert histogram.quantile(0.5) == pytest.approx(50.0, rel=0.01)
+    assert histogram.quantile(1.0) == 5000.0
+    assert LatencyHistogram().quantile(0.5) == 0.0
+    restored = LatencyHistogram.from_bytes(histogram.to_bytes())
+    assert restored.quantiles([0.0, 0.5, 1.0]) == histogram.quantiles([0.0, 0.5, 1.0])
+
+
+@pytest.mark.asyncio
+async def test_metrics_histogram_keeps_every_sample() -> None:
+    collector = MetricsCollector()
+    values = [i / 1000 for i in range(1, 5001)]  # Beyond the old 1000-sample window
+    for value in values:
+        await collector.record_latency("agent_response", value)
+
+    stats = collector.agent_response_histogram.get_stats()
+    assert stats["count"] == 5000
+    assert stats["p50"] == pytest.approx(_exact(values, 0.5), rel=0.01)
+    assert stats["p99"] == pytest.approx(_exact(values, 0.99), rel=0.01)
+
+    other = Histogram("agent_response_duration_seconds")
+    other.observe(7.5)
+    collector.agent_response_histogram.merge(other)
+    assert collector.agent_response_histogram.count == 5001
+    assert collector.agent_response_histogram.bucket_counts[10] == 5001
+
+    text = await collector.get_prometheus_metrics()
+    assert 'agent_response_duration_seconds_quantiles{quantile="0.95"}' in text
+    assert 'agent_response_duration_seconds_bucket{le="+Inf"} 5001' in text
+
+    collector.reset_metrics()
+    assert collector.agent_response_histogram.get_stats()["p95"] == 0.0
+
+
+class _FakeRedis:
+    """Hash-only in-memory Redis with pipelines, for the latency collector."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.commands = 0
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    def hvals(self, key):
+        return list(self.hashes.get(key, {}).values())
+
+    def expire(self, key, seconds):
+        pass
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.calls.append((name, args))
+            return self
+
+        return queue
+
+    def execute(self):
+        self.redis.commands += 1
+        return [getattr(self.redis, name)(*args) for name, args in self.calls]
+
+
+@pytest.fixture
+def consumer(monkeypatch):
+    from super_services.voice.consumers import voice_task_consumer
+
+    redis = _FakeRedis()
+    monkeypatch.setattr(voice_task_consumer, "REDIS", redis)
+    monkeypatch.setattr(voice_task_consumer.MetricsCollector, "_pid", None)
+    # Tests flush explicitly instead of from the background thread.
+    monkeypatch.setattr(
+        voice_task_consumer.MetricsCollector, "_start_flusher", classmethod(lambda cls: None)
+    )
+    return voice_task_consumer, redis
+
+
+def test_task_latency_merges_workers(consumer, monkeypatch) -> None:
+    module, redis = consumer
+    collector = module.MetricsCollector
+    monkeypatch.setattr(module, "LATENCY_FLUSH_INTERVAL_SECONDS", 0)
+    rng = random.Random(3)
+    values = []
+    for worker in range(4):
+        monkeypatch.setattr(collector, "_worker_id", staticmethod(lambda w=worker: f"host:{w}"))
+        monkeypatch.setattr(collector, "_pid", None)  # A new worker process
+        for _ in range(2500):
+            value = rng.lognormvariate(5, 0.5)
+            values.append(value)
+            collector.record_task_latency("normal", "task", value)
+
+    stats = collector.get_latency_stats("normal")
+    assert stats["count"] == 10_000
+    assert stats["avg"] == pytest.approx(sum(values) / len(values))
+    assert stats["p95"] == pytest.approx(_exact(values, 0.95), rel=0.01)
+    assert collector.get_p95_latency("normal") == stats["p95"]
+    assert collector.get_latency_stats("bulk")["count"] == 0
+    assert 'voice_task_latency_seconds{topic="normal",quantile="0.99"}' in (
+        collector.get_prometheus_metrics()
+    )
+
+
+def test_task_latency_flushes_periodically(consumer, monkeypatch) -> None:
+    module, redis = consumer
+    monkeypatch.setattr(module, "LATENCY_FLUSH_INTERVAL_SECONDS", 3600)
+    monkeypatch.setattr(module.MetricsCollector, "_flushed_at", {})
+    for i in range(500):
+        module.MetricsCollector.record_task_latency("bulk", f"t{i}", 100.0 + i)
+
+    assert redis.commands == 1  # First observation only; the rest stay local.
+    assert module.MetricsCollector.get_latency_stats("bulk")["count"] == 1
+
+    # The background/exit flush publishes what an idle worker still holds.
+    module.MetricsCollector.flush()
+    module.MetricsCollector.flush()
+    assert redis.commands == 3  # One read and one flush; the second had nothing to write.
+    assert module.MetricsCollector.get_latency_stats("bulk")["count"] == 500
+
+
+def test_monitor_prints_prometheus_metrics(consumer, monkeypatch, capsys) -> None:
+    from super_services.voice.consumers import monitor_consumers
+
+    module, _ = consumer
+    monkeypatch.setattr(module, "LATENCY_FLUSH_INTERVAL_SECONDS", 0)
+    module.MetricsCollector.record_task_latency("normal", "t1", 250.0)
+    monkeypatch.setattr("sys.argv", ["monitor_consumers", "--prometheus"])
+
+    monitor_consumers.main()
+
+    out = capsys.readouterr().out
+    assert 'voice_task_latency_seconds_count{topic="normal"} 1' in out
+    assert 'voice_task_latency_seconds_count{topic="bulk"} 0' in out
+
+
+@pytest.mark.benchmark
+def test_latency_histogram_benchmark() -> None:
+    values = _latencies(random.Random(4), 200_000)
+
+    # Before: last 1000 samples, sorted for every percentile read.
+    start = perf_counter()
+    window = values[-1000:]
+    for _ in range(200):
+        _exact(window, 0.95)
+    sorted_read_us = (perf_counter() - start) * 1e6 / 200
+    window_error = abs(_exact(window, 0.99) - _exact(values, 0.99)) / _exact(values, 0.99)
+
+    histogram = LatencyHistogram()
+    start = perf_counter()
+    for value in values:
+        histogram.observe(value)
+    observe_us = (perf_counter() - start) * 1e6 / len(values)
+    start = perf_counter()
+    for _ in range(200):
+        histogram.quantile(0.95)
+    sketch_read_us = (perf_counter() - start) * 1e6 / 200
+    sketch_error = abs(histogram.quantile(0.99) - _exact(values, 0.99)) / _exact(values, 0.99)
+
+    workers = [LatencyHistogram.from_bytes(histogram.to_bytes()) for _ in range(16)]
+    start = perf_counter()
+    fleet = LatencyHistogram()
+    for worker in workers:
+        fleet.merge(worker)
+    merge_ms = (perf_counter() - start) * 1000
+
+    print(
+        f"[LATENCY] latency_histogram samples={len(values)} observe_us={observe_us:.2f} "
+        f"sorted_window_read_us={sorted_read_us:.1f} sketch_read_us={sketch_read_us:.1f} "
+        f"window_p99_error={window_error:.3f} sketch_p99_error={sketch_error:.4f} "
+        f"encoded_bytes={len(histogram.to_bytes())} merge_16_workers_ms={merge_ms:.2f}"
+    )
+    assert sketch_error <= 0.01
+    assert fleet.count == 16 * len(values)
@@ -0,0 +1,217 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from time import perf_counter
+
+import pytest
+
+from super_services.libs.core import postgres, postgres_async
+from super_services.libs.core.postgres_async import aexecuteQuery, to_asyncpg_query
+
+
+def test_positional_and_named_placeholders() -> None:
+    assert to_asyncpg_query("select * from t where a = %s and b = %s", ("x", 2)) == (
+        "select * from t where a = $1 and b = $2",
+        ["x", 2],
+    )
+    assert to_asyncpg_query(
+        "select %(b)s, %(a)s where name = %(b)s", {"a": 1, "b": "n"}
+    ) == ("select $1, $2 where name = $1", ["n", 1])
+
+
+def test_tuples_expand_and_lists_stay_arrays() -> None:
+    sql, args = to_asyncpg_query(
+        "select * from t where id in %(ids)s and slug = ANY(%(slugs)s) and x = %(x)s",
+        {"ids": (4, 5, 6), "slugs": ["a", "b"], "x": 1},
+    )
+
+    assert sql == "select * from t where id in ($1, $2, $3) and slug = ANY($4) and x = $5"
+    assert args == [4, 5, 6, ["a", "b"], 1]
+
+
+def test_percent_literals() -> None:
+    assert to_asyncpg_query("select 'a%%' where x = %s", (1,)) == (
+        "select 'a%' where x = $1",
+        [1],
+    )
+    # Like executeQuery, a query without params runs verbatim.
+    assert to_asyncpg_query("select '50%'") == ("select '50%'", [])
+
+
+class _FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def fetch(self, sql, *args):
+        self.calls.append(("fetch", sql, args))
+        return self.rows
+
+    async def fetchrow(self, sql, *args):
+        self.calls.append(("fetchrow", sql, args))
+        return self.rows[0] if self.rows else None
+
+    async def execute(self, sql, *args):
+        self.calls.append(("execute", sql, args))
+        return "UPDATE 1"
+
+
+def _use_connection(monkeypatch, conn):
+    @asynccontextmanager
+    async def get_async_connection(timeout=None):
+        yield conn
+
+    monkeypatch.setattr(postgres_async, "get_async_connection", get_async_connection)
+
+
+@pytest.mark.asyncio
+async def test_aexecute_query_result_shapes(monkeypatch) -> None:
+    conn = _FakeConnection([{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+    _use_connection(monkeypatch, conn)
+
+    assert await aexecuteQuery("select * from t where id = %s", (1,)) == {
+        "id": 1,
+        "name": "a",
+    }
+    assert await aexecuteQuery("select * from t", many=True) == [
+        {"id": 1, "name": "a"},
+        {"id": 2, "name": "b"},
+    ]
+    assert await aexecuteQuery("update t set a = %(a)s", {"a": 1}, commit=True) is None
+    assert conn.calls[-1] == ("execute", "update t set a = $1", (1,))
+
+    conn.rows = []
+    assert await aexecuteQuery("select 1", many=True) == []
+    assert await aexecuteQuery("select 1") is None
+
+
+def test_async_pool_per_loop_and_closed_loops_are_swept(monkeypatch) -> None:
+    class _Pool:
+        def __init__(self):
+            self.terminated = False
+
+        def is_closing(self):
+            return self.terminated
+
+        def terminate(self):
+            self.terminated = True
+
+    async def _create_pool():
+        return _Pool()
+
+    monkeypatch.setattr(postgres_async, "_create_pool", _create_pool)
+    monkeypatch.setattr(postgres_async, "_pools", {})
+    monkeypatch.setattr(postgres_async, "_pool_creation", {})
+
+    async def _get_twice():
+        pools = await asyncio.gather(postgres_async.get_async_pool(), postgres_async.get_async_pool())
+        assert pools[0] is pools[1]
+        return pools[0]
+
+    first = asyncio.run(_get_twice())
+    assert not first.terminated
+    second = asyncio.run(_get_twice())
+
+    assert second is not first
+    assert first.terminated  # Its loop was closed by the first asyncio.run.
+    assert list(postgres_async._pools.values()) == [second]
+
+
+def test_sync_pool_is_threaded_with_statement_timeout(monkeypatch) -> None:
+    created = {}
+
+    class _Pool:
+        def __init__(self, minconn, maxconn, **kwargs):
+            created.update(minconn=minconn, maxconn=maxconn, **kwargs)
+
+    monkeypatch.setattr(postgres.pool, "ThreadedConnectionPool", _Pool)
+    monkeypatch.setattr(postgres, "_pool", None)
+
+    assert isinstance(postgres._get_pool(), _Pool)
+    assert created["maxconn"] == postgres.POOL_MAX_SIZE
+    assert created["options"] == f"-c statement_timeout={postgres.STATEMENT_TIMEOUT_MS}"
+    monkeypatch.setattr(postgres, "_pool", None)
+
+
+def test_closed_connection_is_replaced_on_checkout(monkeypatch) -> None:
+    class _Conn:
+        def __init__(self, closed):
+            self.closed = closed
+
+    class _Pool:
+        def __init__(self):
+            self.idle = [_Conn(0), _Conn(1)]
+            self.discarded = []
+
+        def getconn(self):
+            return self.idle.pop()
+
+        def putconn(self, conn, close=False):
+            if close:
+                self.discarded.append(conn)
+            else:
+                self.idle.append(conn)
+
+    fake_pool = _Pool()
+    monkeypatch.setattr(postgres, "_get_pool", lambda: fake_pool)
+
+    with postgres.get_connection() as conn:
+        assert not conn.closed
+
+    assert [c.closed for c in fake_pool.discarded] == [1]
+    assert fake_pool.idle == [conn]
+
+
+# A config load: the agent row, then the STT, TTS and voice lookups. Server
+# time per query is simulated with pg_sleep so no schema is needed.
+_MAIN_QUERY = "select %s::text as handle, pg_sleep(0.002)::text as slept"
+_LOOKUP_QUERY = "select %(name)s::text as name, pg_sleep(0.002)::text as slept"
+
+
+def _sync_config_load(agent_id):
+    postgres.executeQuery(_MAIN_QUERY, params=(agent_id,), many=True)
+    for name in ("stt", "tts", "voice"):
+        postgres.executeQuery(_LOOKUP_QUERY, params={"name": name})
+
+
+async def _async_config_load(agent_id):
+    await aexecuteQuery(_MAIN_QUERY, params=(agent_id,), many=True)
+    await asyncio.gather(
+        *(aexecuteQuery(_LOOKUP_QUERY, params={"name": name}) for name in ("stt", "tts", "voice"))
+    )
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_postgres_config_load_benchmark() -> None:
+    if not await postgres_async.health_check(timeout=1.0):
+        pytest.skip("No local PostgreSQL reachable via POSTGRES_CONFIG")
+    loads = 64
+
+    try:
+        # The sync pool serves at most POOL_MAX_SIZE loads at a time.
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=postgres.POOL_MAX_SIZE) as executor:
+            start = perf_counter()
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(executor, _sync_config_load, f"agent-{i}")
+                    for i in range(loads)
+                )
+            )
+            sync_s = perf_counter() - start
+
+        start = perf_counter()
+        await asyncio.gather(*(_async_config_load(f"agent-{i}") for i in range(loads)))
+        async_s = perf_counter() - start
+    finally:
+        postgres.close_pool()
+        await postgres_async.close_async_pool()
+
+    print(
+        f"[LATENCY] postgres_config_load loads={loads} "
+        f"sync_pool={postgres.POOL_MAX_SIZE} sync_ms={sync_s * 1000:.0f} "
+        f"async_pool={postgres_async.POOL_MAX_SIZE} async_ms={async_s * 1000:.0f}"
+    )
+    assert async_s < sync_s
@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from time import perf_counter
+
+import pytest
+
+from super.core.utils.batching import arun_in_batches, run_in_batches
+from super.core.utils.threadpool_concurrency import (
+    BoundedExecutor,
+    FunctionCall,
+    arun_functions_tuples_in_parallel,
+    get_executor,
+    run_functions_in_parallel,
+    run_functions_tuples_in_parallel,
+)
+
+
+def _sleep_and_return(seconds, value):
+    time.sleep(seconds)
+    return value
+
+
+def test_results_keep_order_and_threads_are_reused():
+    pool = BoundedExecutor("order", max_workers=4)
+    threads = set()
+
+    def work(n):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.001 * (5 - n % 5))
+        return n * n
+
+    for _ in range(3):
+        results = run_functions_tuples_in_parallel([(work, (n,)) for n in range(20)], executor=pool)
+        assert results == [n * n for n in range(20)]
+
+    assert len(threads) <= 4
+    stats = pool.stats()
+    assert stats["completed"] == 60 and stats["queue_depth"] == 0
+    assert stats["peak_queue_depth"] > 4
+    pool.shutdown()
+
+
+def test_max_workers_bounds_a_single_call():
+    pool = BoundedExecutor("window", max_workers=8)
+    running = peak = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+
+    run_functions_tuples_in_parallel([(work, ()) for _ in range(12)], max_workers=3, executor=pool)
+    assert peak == 3
+    pool.shutdown()
+
+
+def test_timeout_cancels_calls_that_have_not_started():
+    pool = BoundedExecutor("timeout", max_workers=1)
+    calls = [(_sleep_and_return, (0.05, n)) for n in range(5)]
+
+    with pytest.raises(FuturesTimeoutError):
+        run_functions_tuples_in_parallel(calls, timeout=0.02, executor=pool)
+    results = run_functions_tuples_in_parallel(calls, timeout=0.02, allow_failures=True, executor=pool)
+
+    assert results == [None] * 5
+    time.sleep(0.1)
+    stats = pool.stats()
+    assert stats["timeouts"] == 2 and stats["cancelled"] >= 6
+    assert stats["queue_depth"] == 0
+    pool.shutdown()
+
+
+def test_failures_raise_or_become_none():
+    def boom():
+        raise ValueError("bad")
+
+    calls = [(boom, ()), (_sleep_and_return, (0, 1))]
+    with pytest.raises(ValueError):
+        run_functions_tuples_in_parallel(calls)
+    assert run_functions_tuples_in_parallel(calls, allow_failures=True) == [None, 1]
+
+    call = FunctionCall(_sleep_and_return, (0, "x"))
+    assert run_functions_in_parallel([call]) == {call.result_id: "x"}
+
+
+def test_nested_calls_on_the_same_pool_do_not_deadlock():
+    pool = BoundedExecutor("nested", max_workers=1)
+
+    def outer():
+        return run_functions_tuples_in_parallel([(_sleep_and_return, (0, 2))], executor=pool)
+
+    assert run_functions_tuples_in_parallel([(outer, ())], timeout=1, executor=pool) == [[2]]
+    pool.shutdown()
+
+
+def test_named_executors_are_shared():
+    assert get_executor("shared-test", max_workers=2) is get_executor("shared-test")
+    assert get_executor("shared-test").max_workers == 2
+
+
+@pytest.mark.asyncio
+async def test_async_variant_keeps_the_loop_running():
+    pool = BoundedExecutor("async", max_workers=4)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    tick = asyncio.create_task(ticker())
+    results = await arun_functions_tuples_in_parallel(
+        [(_sleep_and_return, (0.05, n)) for n in range(4)], executor=pool
+    )
+    tick.cancel()
+
+    assert results == [0, 1, 2, 3]
+    assert ticks >= 5
+
+    with pytest.raises(asyncio.TimeoutError):
+        await arun_functions_tuples_in_parallel(
+            [(_sleep_and_return, (0.05, n)) for n in range(8)], timeout=0.01, executor=pool
+        )
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_batches_run_on_a_named_executor():
+    pool = BoundedExecutor("batches", max_workers=2)
+
+    assert run_in_batches(range(10), 4, sum, executor=pool) == [6, 22, 17]
+    assert await arun_in_batches(range(10), 4, len, executor=pool) == [4, 4, 2]
+    assert pool.stats()["completed"] == 6
+    pool.shutdown()
+
+
+@pytest.mark.benchmark
+def test_shared_executor_benchmark():
+    requests, fanout = 300, 8
+    calls = [(_sleep_and_return, (0, n)) for n in range(fanout)]
+
+    def per_call_pool():
+        # The previous behaviour: a fresh pool sized to the call, per request.
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            return [f.result() for f in [executor.submit(fn, *args) for fn, args in calls]]
+
+    start = perf_counter()
+    for _ in range(requests):
+        per_call_pool()
+    fresh = perf_counter() - start
+
+    pool = BoundedExecutor("bench", max_workers=fanout)
+    start = perf_counter()
+    for _ in range(requests):
+        run_functions_tuples_in_parallel(calls, executor=pool)
+    shared = perf_counter() - start
+    stats = pool.stats()
+    pool.shutdown()
+
+    print(
+        f"[LATENCY] threadpool requests={requests} fanout={fanout} "
+        f"per_call_pool_us={fresh / requests * 1e6:.0f} shared_pool_us={shared / requests * 1e6:.0f} "
+        f"peak_queue_depth={stats['peak_queue_depth']}"
+    )
+    assert shared < fresh
@@ -0,0 +1,190 @@
+import asyncio
+import gc
+import logging
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from pipecat.frames.frames import InterimTranscriptionFrame, TranscriptionFrame
+from pipecat.processors.frame_processor import FrameDirection
+
+from super.core.voice.managers.context_processor import FAISSContextProcessor
+
+ENCODE_SECONDS = 0.03
+
+
+class _Encoder:
+    """Sentence-transformer stand-in: encoding holds the calling thread."""
+
+    def __init__(self, seconds=ENCODE_SECONDS):
+        self.seconds = seconds
+        self.texts = []
+
+    def encode(self, texts, convert_to_tensor=False):
+        self.texts.extend(texts)
+        time.sleep(self.seconds)
+        return np.ones((len(texts), 8), dtype=np.float32)
+
+
+class _Retrieval:
+    def __init__(self):
+        self._hot_chunks = {"1": {"content": "Opening hours are 9 to 5."}}
+
+    async def search_context(self, query_embedding, k=5, use_cache=True):
+        return [1], None
+
+
+class _LegacyProcessor(FAISSContextProcessor):
+    """Embeds on the event loop and searches only on the final transcript."""
+
+    async def _retrieve(self, text):
+        handler = self.voice_handler
+        query_embedding = handler._embedding_model.encode([text], convert_to_tensor=False)
+        chunk_ids, _ = await handler._context_retrieval.search_context(
+            query_embedding=query_embedding, k=2, use_cache=True
+        )
+        return [handler._context_retrieval._hot_chunks[str(i)]["content"] for i in chunk_ids]
+
+
+def _processor(cls=FAISSContextProcessor, encoder=None, **kwargs):
+    handler = SimpleNamespace(
+        _logger=logging.getLogger("test"),
+        _embedding_model=encoder or _Encoder(),
+        _context_retrieval=_Retrieval(),
+    )
+    processor = cls(handler, **kwargs)
+    pushed = []
+
+    async def push_frame(frame, direction=FrameDirection.DOWNSTREAM):
+        pushed.append((time.perf_counter(), frame))
+
+    processor.push_frame = push_frame
+    return processor, pushed
+
+
+def _interim(text):
+    return InterimTranscriptionFrame(text=text, user_id="u", timestamp="")
+
+
+def _final(text):
+    return TranscriptionFrame(text=text, user_id="u", timestamp="")
+
+
+@pytest.mark.asyncio
+async def test_final_transcript_reuses_matching_speculation():
+    encoder = _Encoder(seconds=0.01)
+    processor, pushed = _processor(encoder=encoder)
+
+    await processor.process_frame(_interim("what are your opening hours"), FrameDirection.DOWNSTREAM)
+    await processor.process_frame(_final("What are your opening hours?"), FrameDirection.DOWNSTREAM)
+
+    assert encoder.texts == ["what are your opening hours"]
+    assert "Opening hours are 9 to 5." in pushed[-1][1].text
+    assert processor.get_stats()["speculative_reused"] == 1
+
+
+@pytest.mark.asyncio
+async def test_diverging_final_transcript_cancels_speculation():
+    encoder = _Encoder(seconds=0.01)
+    processor, pushed = _processor(encoder=encoder)
+
+    await processor.process_frame(_interim("what are"), FrameDirection.DOWNSTREAM)
+    await processor.process_frame(_final("Where is the nearest branch?"), FrameDirection.DOWNSTREAM)
+
+    assert encoder.texts[-1] == "Where is the nearest branch?"
+    assert processor.get_stats()["speculative_cancelled"] == 1
+    assert [type(frame) for _, frame in pushed] == [InterimTranscriptionFrame, TranscriptionFrame]
+
+
+@pytest.mark.asyncio
+async def test_retrieval_failure_still_releases_the_frame():
+    processor, pushed = _processor()
+    processor.voice_handler._context_retrieval = None
+
+    await processor.process_frame(_final("What are your opening hours?"), FrameDirection.DOWNSTREAM)
+
+    assert pushed[-1][1].text == "What are your opening hours?"
+
+
+@pytest.mark.asyncio
+async def test_superseded_and_pending_speculations_are_reaped():
+    class _FailingEncoder(_Encoder):
+        def encode(self, texts, convert_to_tensor=False):
+            if texts == ["what are"]:
+                raise RuntimeError("encoder down")
+            return super().encode(texts, convert_to_tensor)
+
+    loop = asyncio.get_running_loop()
+    unretrieved = []
+    loop.set_exception_handler(lambda _, context: unretrieved.append(context))
+    try:
+        processor, _ = _processor(encoder=_FailingEncoder(seconds=0.01))
+        await processor.process_frame(_interim("what are"), FrameDirection.DOWNSTREAM)
+        await asyncio.sleep(0.02)
+        await processor.process_frame(_interim("where is the nearest branch"), FrameDirection.DOWNSTREAM)
+        pending = processor._pending[1]
+
+        await processor.cleanup()
+        await asyncio.sleep(0.02)
+        gc.collect()
+    finally:
+        loop.set_exception_handler(None)
+
+    assert pending.cancelled() and processor._pending is None
+    assert processor.get_stats()["speculative_cancelled"] == 1
+    assert unretrieved == []
+
+
+async def _turn(processor, pushed, words, interim=True):
+    """Stream a turn word by word; return final-frame-to-release latency and max loop stall."""
+    stalls = []
+
+    async def ticker():
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            stalls.append(time.perf_counter() - start - 0.005)
+
+    tick = asyncio.create_task(ticker())
+    for n in range(1, len(words) + 1):
+        if interim:
+            await processor.process_frame(_interim(" ".join(words[:n])), FrameDirection.DOWNSTREAM)
+        # Gap between interim results from the STT.
+        await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    await processor.process_frame(_final(" ".join(words) + "?"), FrameDirection.DOWNSTREAM)
+    latency = pushed[-1][0] - start
+    await asyncio.sleep(0.01)
+    tick.cancel()
+    return latency, max(stalls)
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_kb_context_turn_latency_benchmark():
+    words = "what time do you open on saturdays".split()
+    turns = 10
+    results = {}
+    for label, cls, speculative in (
+        ("legacy", _LegacyProcessor, False),
+        ("off_loop", FAISSContextProcessor, False),
+        ("speculative", FAISSContextProcessor, True),
+    ):
+        processor, pushed = _processor(cls, speculative=speculative)
+        samples = [await _turn(processor, pushed, words) for _ in range(turns)]
+        results[label] = (
+            sorted(s[0] for s in samples)[turns // 2],
+            max(s[1] for s in samples),
+        )
+
+    print(
+        f"[LATENCY] kb_context_turn turns={turns} encode_ms={ENCODE_SECONDS * 1000:.0f} "
+        + " ".join(
+            f"{label}_p50_ms={lat * 1000:.1f} {label}_loop_stall_ms={stall * 1000:.1f}"
+            for label, (lat, stall) in results.items()
+        )
+    )
+    assert results["off_loop"][1] < results["legacy"][1]
+    assert results["speculative"][0] < results["legacy"][0] / 2
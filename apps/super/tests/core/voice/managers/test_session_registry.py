@@ -0,0 +1,218 @@
+import asyncio
+import os
+import time
+import uuid
+from time import perf_counter
+
+import pytest
+
+from super.core.voice.managers.session_manager import ACTIVE_INDEX_KEY, SessionManager
+from super.core.voice.schema import CallMeta
+
+
+class _FakeRedis:
+    """Enough of redis.asyncio for the session registry, recording commands."""
+
+    def __init__(self):
+        self.strings = {}
+        self.ttls = {}
+        self.zsets = {}
+        self.commands = []
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def _run(self, name, *args, **kwargs):
+        self.commands.append(name)
+        return getattr(self, f"_{name}")(*args, **kwargs)
+
+    def _set(self, key, value, ex=None):
+        self.strings[key] = value.encode()
+        self.ttls[key] = ex
+        return True
+
+    def _get(self, key):
+        return self.strings.get(key)
+
+    def _delete(self, key):
+        self.ttls.pop(key, None)
+        return int(self.strings.pop(key, None) is not None)
+
+    def _zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def _zrem(self, key, member):
+        self.zsets.get(key, {}).pop(member, None)
+
+    @staticmethod
+    def _bound(value):
+        if value in ("-inf", "+inf"):
+            return float(value), False
+        if isinstance(value, str) and value.startswith("("):
+            return float(value[1:]), True
+        return float(value), False
+
+    def _in_range(self, score, low, high):
+        (lo, lo_open), (hi, hi_open) = self._bound(low), self._bound(high)
+        return (score > lo if lo_open else score >= lo) and (score < hi if hi_open else score <= hi)
+
+    def _zrangebyscore(self, key, low, high):
+        items = sorted(self.zsets.get(key, {}).items(), key=lambda kv: kv[1])
+        return [m.encode() for m, score in items if self._in_range(score, low, high)]
+
+    def _zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        doomed = [m for m, score in zset.items() if self._in_range(score, low, high)]
+        for member in doomed:
+            del zset[member]
+        return len(doomed)
+
+    def _zcount(self, key, low, high):
+        return len(self._zrangebyscore(key, low, high))
+
+    def __getattr__(self, name):
+        async def command(*args, **kwargs):
+            self.round_trips += 1
+            return self._run(name, *args, **kwargs)
+
+        return command
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._queued = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._queued.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        self._redis.round_trips += 1
+        return [self._redis._run(name, *a, **kw) for name, a, kw in self._queued]
+
+
+def _meta(n):
+    return CallMeta(call_id=f"call-{n}", direction="inbound")
+
+
+@pytest.mark.asyncio
+async def test_active_sessions_come_from_the_index_without_keys():
+    redis = _FakeRedis()
+    worker_a = SessionManager(redis_client=redis)
+    worker_b = SessionManager(redis_client=redis)
+
+    await worker_a.create_session("s1", "sip", _meta(1))
+    await worker_b.create_session("s2", "webrtc", _meta(2))
+    await worker_b.update_session("s2", {"state": "ended"})
+
+    assert await worker_a.get_active_sessions() == ["s1"]
+    assert await worker_a.count_active_sessions() == 1
+    assert (await worker_a.get_session_stats())["active_sessions"] == 1
+    assert "keys" not in redis.commands and "scan" not in redis.commands
+    assert redis.ttls["session:s1"] == 3600
+
+
+@pytest.mark.asyncio
+async def test_stale_index_entries_are_trimmed():
+    redis = _FakeRedis()
+    manager = SessionManager(redis_client=redis)
+    await manager.create_session("live", "sip", _meta(1))
+    # A session of a crashed worker whose key has expired server-side.
+    redis.zsets[ACTIVE_INDEX_KEY]["gone"] = time.time() - 7200
+
+    assert await manager.get_active_sessions() == ["live"]
+    assert "gone" not in redis.zsets[ACTIVE_INDEX_KEY]
+
+
+@pytest.mark.asyncio
+async def test_bulk_persist_is_pipelined():
+    redis = _FakeRedis()
+    manager = SessionManager()
+    for n in range(1200):
+        await manager.create_session(f"s{n}", "sip", _meta(n))
+    manager.redis_client = redis
+
+    await manager._persist_all_sessions()
+
+    assert redis.round_trips == 3
+    assert len(redis.zsets[ACTIVE_INDEX_KEY]) == 1200
+
+    await manager.remove_session("s0")
+    assert "session:s0" not in redis.strings
+    assert "s0" not in redis.zsets[ACTIVE_INDEX_KEY]
+
+
+async def _redis_client(url):
+    import redis.asyncio as redis
+
+    client = redis.from_url(url)
+    try:
+        await asyncio.wait_for(client.ping(), 1.0)
+        return client
+    except Exception:
+        await client.aclose()
+        return None
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_session_registry_load_benchmark():
+    url = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+    client = await _redis_client(url)
+    if client is None:
+        pytest.skip(f"No local Redis at {url}")
+    sessions = int(os.environ.get("SESSION_BENCH_SESSIONS", 5000))
+    # Unrelated keys of other tenants that a KEYS scan walks through.
+    noise = sessions * 20
+    run = uuid.uuid4().hex[:8]
+    manager = SessionManager(redis_client=client)
+    try:
+        pipe = client.pipeline(transaction=False)
+        for n in range(noise):
+            pipe.set(f"bench-{run}:{n}", "x", ex=600)
+        await pipe.execute()
+
+        for n in range(sessions):
+            await manager.create_session(f"{run}-{n}", "sip", _meta(n))
+
+        start = perf_counter()
+        for session in manager._sessions.values():
+            await client.setex(f"session:{session.session_id}", 3600, "{}")
+        sequential = perf_counter() - start
+        start = perf_counter()
+        await manager._persist_all_sessions()
+        pipelined = perf_counter() - start
+
+        start = perf_counter()
+        await client.keys("session:*")
+        keys_scan = perf_counter() - start
+        start = perf_counter()
+        await manager._get_redis_session_ids()
+        indexed = perf_counter() - start
+        start = perf_counter()
+        await manager.count_active_sessions()
+        counted = perf_counter() - start
+    finally:
+        pipe = client.pipeline(transaction=False)
+        for n in range(noise):
+            pipe.delete(f"bench-{run}:{n}")
+        for session_id in list(manager._sessions):
+            pipe.delete(f"session:{session_id}")
+            pipe.zrem(ACTIVE_INDEX_KEY, session_id)
+        await pipe.execute()
+        await client.aclose()
+
+    print(
+        f"[LATENCY] session_registry sessions={sessions} other_keys={noise} "
+        f"persist_sequential_ms={sequential * 1000:.0f} persist_pipelined_ms={pipelined * 1000:.0f} "
+        f"keys_scan_ms={keys_scan * 1000:.1f} index_range_ms={indexed * 1000:.1f} "
+        f"index_count_ms={counted * 1000:.2f}"
+    )
+    assert pipelined < sequential
+    assert counted < keys_scan
@@ -0,0 +1 @@
+"""Tests for voice plugins."""
@@ -0,0 +1,167 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from pipecat.frames.frames import TranscriptionFrame
+
+from super.core.voice.plugins.filler_cache import FillerBank, FillerCache, classify_intent
+from super.core.voice.plugins.filler_plugin import FillerProcessor, FillerProvider, SKIP_PATTERNS
+
+LLM_SECONDS = 0.05
+
+
+class _StubLLM:
+    """OpenAI-shaped client that answers after a fixed delay."""
+
+    def __init__(self, answers=("Let me check that",)):
+        self.calls = 0
+        self._answers = answers
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(LLM_SECONDS)
+        content = self._answers[(self.calls - 1) % len(self._answers)]
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _processor(client, bank, context="No prior context"):
+    processor = FillerProcessor(
+        client=client,
+        provider=FillerProvider.OPENAI,
+        model="stub",
+        max_tokens=10,
+        temperature=0.7,
+        timeout=1.0,
+        skip_patterns=SKIP_PATTERNS,
+        get_context_callback=lambda: context,
+        bank=bank,
+    )
+    pushed = []
+
+    async def push_frame(frame, direction=None):
+        pushed.append(frame.text)
+
+    processor.push_frame = push_frame
+    return processor, pushed
+
+
+async def _say(processor, text):
+    await processor._handle_transcription_async(
+        TranscriptionFrame(text=text, user_id="u", timestamp="")
+    )
+
+
+def test_intent_classes():
+    assert classify_intent("My card is not working") == "problem"
+    assert classify_intent("Can you book a table for two") == "request"
+    assert classify_intent("What time do you open?") == "question"
+    assert classify_intent("I was at the store yesterday") == "statement"
+
+
+def test_neighbour_reuses_written_back_filler():
+    bank = FillerBank("xx")
+    assert bank.lookup("the parcel arrived damaged yesterday") is None
+
+    bank.remember("the parcel arrived damaged yesterday", "Oh no")
+    assert bank.lookup("my parcel arrived damaged yesterday") == ("Oh no", "neighbour")
+    assert bank.lookup("my parcel arrived damaged yesterday", avoid="Oh no") is None
+    assert bank.lookup("completely different words here") is None
+
+
+def test_intent_rotation_avoids_repeating_the_last_filler():
+    bank = FillerBank("en")
+    first, source = bank.lookup("What are your opening hours?")
+    second, _ = bank.lookup("Where is the nearest branch?", avoid=first)
+    assert source == "intent" and first != second
+
+
+def test_banks_are_per_agent_and_language():
+    cache = FillerCache(max_banks=2)
+    en = cache.bank("agent-1", "en")
+    assert cache.bank("agent-1", "EN") is en
+    assert cache.bank("agent-1", "hi") is not en
+    cache.bank("agent-2", "en")
+    assert cache.bank("agent-1", "en") is not en
+
+
+@pytest.mark.asyncio
+async def test_llm_runs_only_on_a_miss():
+    llm = _StubLLM(["Hmm, one sec", "I see"])
+    processor, pushed = _processor(llm, FillerBank("xx"))
+
+    await _say(processor, "the parcel arrived damaged yesterday")
+    await _say(processor, "my neighbour took it in")
+    await _say(processor, "so the parcel arrived damaged yesterday")
+
+    assert pushed == ["Hmm, one sec", "I see", "Hmm, one sec"]
+    assert llm.calls == 2
+    metrics = processor.get_metrics()
+    assert (metrics["cache_hits"], metrics["cache_misses"]) == (1, 2)
+    assert metrics["llm_calls_saved"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fillers_prompted_with_a_transcript_stay_in_the_call():
+    llm = _StubLLM(["Sorry about the parcel, Priya", "I see", "Hmm"])
+    bank = FillerBank("xx")
+    first, pushed = _processor(llm, bank, context="user: I'm Priya, order 4417")
+
+    await _say(first, "the parcel arrived damaged yesterday")
+    await _say(first, "my neighbour took it in")
+    await _say(first, "so the parcel arrived damaged yesterday")
+    assert pushed == ["Sorry about the parcel, Priya", "I see", "Sorry about the parcel, Priya"]
+    assert llm.calls == 2
+    assert bank.lookup("the parcel arrived damaged yesterday") is None
+
+    second, pushed = _processor(llm, bank)
+    await _say(second, "the parcel arrived damaged yesterday")
+    assert pushed == ["Hmm"]
+    assert llm.calls == 3
+
+
+CALL = [
+    "Hi, I want to check my order status",
+    "What time does the store open?",
+    "Can you send me the invoice again",
+    "My payment is not working",
+    "I placed the order last Tuesday",
+    "How long does delivery usually take?",
+    "Could you update my delivery address",
+    "The app shows an error at checkout",
+    "I also bought a charger",
+    "When will the refund arrive?",
+    "Please cancel the second item",
+    "The tracking page is broken",
+]
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_filler_cache_benchmark():
+    calls = 5
+    results = {}
+    # An unseeded language, so the bank is filled by write-back alone.
+    for label, bank in (("llm_only", None), ("cached", FillerCache().bank("agent", "xx"))):
+        llm = _StubLLM(["One moment", "Let me see", "Got it", "Sure thing"])
+        hits = 0
+        for _ in range(calls):
+            processor, pushed = _processor(llm, bank)
+            for utterance in CALL:
+                await _say(processor, utterance)
+            assert len(pushed) == len(CALL)
+            hits += processor.get_metrics()["cache_hits"]
+        p95 = processor.get_metrics()["p95_latency_ms"]
+        results[label] = (llm.calls / calls, p95, hits / (calls * len(CALL)))
+
+    saved = results["llm_only"][0] - results["cached"][0]
+    print(
+        f"[LATENCY] filler calls={calls} turns={len(CALL)} "
+        f"llm_only_p95_ms={results['llm_only'][1]:.1f} "
+        f"cached_last_call_p95_ms={results['cached'][1]:.2f} "
+        f"hit_rate={results['cached'][2]:.2f} "
+        f"llm_calls_saved_per_call={saved:.1f}"
+    )
+    assert results["cached"][2] >= 0.7
+    assert results["cached"][1] < results["llm_only"][1] / 2
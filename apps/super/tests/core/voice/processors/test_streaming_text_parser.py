@@ -0,0 +1,111 @@
+import json
+from pathlib import Path
+from time import perf_counter
+
+import pytest
+
+from super.core.voice.processors.streaming_text_parser import StreamingTextParser
+
+# Recorded LLM streams (JSON and plain text responses split into tokens)
+# with the output of the previous character-by-character parser.
+GOLDEN = json.loads(
+    (Path(__file__).parent / "golden" / "streaming_text_parser_streams.json").read_text()
+)["cases"]
+
+
+async def _run(tokens, min_chunk_size):
+    parser = StreamingTextParser(min_chunk_size=min_chunk_size)
+    fields, text_chunks = [], []
+    parser.set_callbacks(
+        on_text_chunk=text_chunks.append,
+        on_field_complete=lambda key, value: fields.append([key, value]),
+    )
+    outputs, chunk_lists = [], []
+    for token in tokens:
+        chunks = await parser.process_chunk(token)
+        chunk_lists.append(chunks)
+        outputs.append("".join(chunks))
+    return parser, outputs, chunk_lists, fields, text_chunks
+
+
+@pytest.mark.parametrize("case", GOLDEN, ids=[case["name"] for case in GOLDEN])
+@pytest.mark.asyncio
+async def test_matches_recorded_output(case) -> None:
+    expected = case["expected"]
+    parser, outputs, chunk_lists, fields, _ = await _run(
+        case["tokens"], case["min_chunk_size"]
+    )
+
+    # Same text for TTS after every token, and the same parse results.
+    assert outputs == expected["outputs"]
+    assert await parser.flush() == expected["flush"]
+    assert parser.buffer.spoke_response == expected["spoke_response"]
+    assert parser.buffer.code_blocks == expected["code_blocks"]
+    assert parser.buffer.links == expected["links"]
+    assert parser.buffer.raw_text == expected["raw_text"]
+    assert fields == expected["fields"]
+    assert parser.state.value == expected["state"]
+    assert parser.get_metrics()["is_complete"] == expected["is_complete"]
+    assert all(len(chunks) <= 3 for chunks in chunk_lists)
+
+
+@pytest.mark.asyncio
+async def test_token_is_emitted_as_one_segment() -> None:
+    parser, outputs, chunk_lists, _, text_chunks = await _run(
+        ['{"spoke_response": "', "Hello there. ", "How are", ' you?"}'], 1
+    )
+
+    assert chunk_lists == [[], ["Hello there. "], ["How are"], [" you?"]]
+    assert text_chunks == ["Hello there. ", "How are", " you?"]
+    assert parser.get_metrics()["chunk_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_min_chunk_size_and_sentence_boundaries() -> None:
+    parser, outputs, _, _, _ = await _run(["Hi. Welcome to", " the clinic today"], 8)
+
+    # "Hi. " ends a sentence; then 8-character pieces until the remainder.
+    assert outputs == ["Hi. Welcome ", "to the clinic to"]
+    assert await parser.flush() == "day"
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_streaming_text_parser_benchmark() -> None:
+    long_case = next(
+        case for case in GOLDEN
+        if case["name"].startswith("long_response/tokens") and case["min_chunk_size"] == 1
+    )
+    tokens, rounds = long_case["tokens"], 20
+
+    class _CharParser(StreamingTextParser):
+        # The previous shape: one awaited step per character.
+        async def process_chunk(self, content):
+            chunks = []
+            for char in content:
+                chunks.extend(await self._char_step(char))
+            return chunks
+
+        async def _char_step(self, char):
+            return await StreamingTextParser.process_chunk(self, char)
+
+    results = {}
+    for label, parser_cls in (("per_char", _CharParser), ("chunked", StreamingTextParser)):
+        parser = parser_cls(min_chunk_size=1)
+        emitted, elapsed = 0, 0.0
+        for _ in range(rounds):
+            parser.reset()
+            start = perf_counter()
+            for token in tokens:
+                emitted += len(await parser.process_chunk(token))
+            elapsed += perf_counter() - start
+        results[label] = (elapsed * 1e6 / (len(tokens) * rounds), emitted // rounds)
+
+    print(
+        f"[LATENCY] streaming_text_parser tokens={len(tokens)} "
+        f"per_char_us_per_token={results['per_char'][0]:.1f} "
+        f"chunked_us_per_token={results['chunked'][0]:.1f} "
+        f"per_char_chunks={results['per_char'][1]} chunked_chunks={results['chunked'][1]}"
+    )
+    assert results["chunked"][0] < results["per_char"][0]
+    assert results["chunked"][1] < results["per_char"][1]
@@ -0,0 +1,207 @@
+import asyncio
+import json
+import threading
+import time
+from time import perf_counter
+
+import pytest
+
+from super_services.voice.models.config_cache import AgentConfigCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _slow_loader(value, delay=0.05):
+    calls = []
+
+    def loader():
+        calls.append(threading.get_ident())
+        time.sleep(delay)
+        return dict(value)
+
+    return loader, calls
+
+
+def test_entries_expire_after_ttl_and_evict_lru() -> None:
+    clock = _Clock()
+    cache = AgentConfigCache(max_size=2, ttl_seconds=10, clock=clock)
+    cache.put("a", {"v": "a"})
+    cache.put("b", {"v": "b"})
+    cache.get("a")
+    cache.put("c", {"v": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": "a"}
+    clock.now = 11
+    assert cache.get("a") is None
+
+
+def test_returned_configs_are_copies() -> None:
+    cache = AgentConfigCache()
+    cache.put("a", {"nested": {"v": 1}})
+    cache.get("a")["nested"]["v"] = 2
+
+    assert cache.get("a") == {"nested": {"v": 1}}
+
+
+def test_concurrent_thread_misses_share_one_load() -> None:
+    cache = AgentConfigCache()
+    loader, calls = _slow_loader({"agent_id": "a"})
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load("a", loader)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"agent_id": "a"}] * 8
+    assert len({id(result) for result in results}) == 8
+    assert cache.stats()["loads"] == 1
+
+
+def test_empty_results_are_not_cached() -> None:
+    cache = AgentConfigCache()
+    assert cache.get_or_load("missing", lambda: {}) == {}
+    assert cache.get_or_load("missing", lambda: {"v": 1}) == {"v": 1}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_async_misses_share_one_load() -> None:
+    cache = AgentConfigCache()
+    loader, calls = _slow_loader({"agent_id": "a"})
+
+    results = await asyncio.gather(*[cache.aget_or_load("a", loader) for _ in range(20)])
+
+    assert len(calls) == 1
+    assert all(result == {"agent_id": "a"} for result in results)
+    assert len({id(result) for result in results}) == 20
+    assert await cache.aget_or_load("a", loader) == {"agent_id": "a"}
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_loader_runs_on_the_loop_once() -> None:
+    cache = AgentConfigCache()
+    threads, calls = [], []
+
+    def loader():
+        threads.append(threading.get_ident())
+        return {"agent_id": "a"}
+
+    async def aloader():
+        calls.append(threading.get_ident())
+        await asyncio.sleep(0.02)
+        return {"agent_id": "a"}
+
+    results = await asyncio.gather(
+        *[cache.aget_or_load("a", loader, aloader=aloader) for _ in range(20)]
+    )
+
+    assert calls == [threading.get_ident()] and not threads
+    assert all(result == {"agent_id": "a"} for result in results)
+    assert cache.get("a") == {"agent_id": "a"}
+    assert cache.stats()["loads"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_load() -> None:
+    cache = AgentConfigCache()
+    loader, calls = _slow_loader({"v": 1}, delay=0.05)
+
+    first = asyncio.ensure_future(cache.aget_or_load("a", loader))
+    second = asyncio.ensure_future(cache.aget_or_load("a", loader))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == {"v": 1}
+    assert len(calls) == 1
+
+
+def test_invalidation_message_drops_entry() -> None:
+    cache = AgentConfigCache()
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 1})
+
+    cache.handle_invalidation({"type": "message", "data": json.dumps({"handle": "a"}).encode()})
+    assert cache.get("a") is None and cache.get("b") == {"v": 1}
+
+    cache.handle_invalidation({"type": "message", "data": b"b"})
+    assert cache.get("b") is None
+
+
+def test_invalidation_during_load_discards_stale_result() -> None:
+    cache = AgentConfigCache()
+
+    def loader():
+        # The agent is saved while its old config is being read.
+        cache.invalidate("a")
+        return {"v": "old"}
+
+    assert cache.get_or_load("a", loader) == {"v": "old"}
+    assert cache.get("a") is None
+
+
+class _FakePubSub:
+    def __init__(self):
+        self.handlers = {}
+
+    def subscribe(self, **handlers):
+        self.handlers.update(handlers)
+
+    def run_in_thread(self, sleep_time, daemon):
+        return object()
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.pubsub_obj = _FakePubSub()
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return self.pubsub_obj
+
+
+def test_listener_subscribes_invalidation_channel() -> None:
+    from super_services.voice.models.config_cache import AGENT_CONFIG_INVALIDATION_CHANNEL
+
+    cache = AgentConfigCache()
+    redis = _FakeRedis()
+    assert cache.start_invalidation_listener(redis)
+    assert cache.start_invalidation_listener(redis)
+
+    cache.put("a", {"v": 1})
+    redis.pubsub_obj.handlers[AGENT_CONFIG_INVALIDATION_CHANNEL]({"data": b"a"})
+    assert cache.get("a") is None
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_agent_config_cache_benchmark() -> None:
+    cache = AgentConfigCache()
+    loader, calls = _slow_loader({"agent_id": "a", "system_prompt": "x" * 4000}, delay=0.02)
+
+    start = perf_counter()
+    await asyncio.gather(*[cache.aget_or_load("a", loader) for _ in range(200)])
+    cold_ms = (perf_counter() - start) * 1000
+
+    start = perf_counter()
+    for _ in range(2000):
+        await cache.aget_or_load("a", loader)
+    warm_us = (perf_counter() - start) * 1e6 / 2000
+
+    print(
+        f"[LATENCY] agent_config_cache burst=200 loads={len(calls)} "
+        f"cold_burst_ms={cold_ms:.1f} warm_hit_us={warm_us:.1f}"
+    )
+    assert len(calls) == 1
+    assert warm_us < 20000
@@ -0,0 +1,227 @@
+import asyncio
+import importlib
+import statistics
+import sys
+import time
+from time import perf_counter
+
+import pytest
+
+from super.core.voice.services.warm_pool import ServiceWarmPool
+
+_LIVEKIT_SERVICES = "super.core.voice.services.livekit_services"
+
+HANDSHAKE_SECONDS = 0.03
+# Plugin import/construction, and the rest of session setup (LLM, VAD, room)
+BUILD_SECONDS = 0.02
+SESSION_SETUP_SECONDS = 0.03
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _StubService:
+    """Provider stand-in: the first audio waits for a connection handshake."""
+
+    provider = "stub"
+
+    def __init__(self):
+        self.closed = False
+        self.healthy = True
+        self._connected = asyncio.Event()
+        self._connecting = None
+
+    def prewarm(self):
+        if not self.healthy:
+            raise ConnectionError("dropped")
+        if self._connecting is None:
+            self._connecting = asyncio.get_running_loop().create_task(self._connect())
+
+    async def _connect(self):
+        await asyncio.sleep(HANDSHAKE_SECONDS)
+        self._connected.set()
+
+    async def first_audio(self):
+        self.prewarm()
+        await self._connected.wait()
+
+    async def aclose(self):
+        self.closed = True
+
+
+def _counting_builder():
+    built = []
+
+    def builder():
+        built.append(_StubService())
+        return built[-1]
+
+    return builder, built
+
+
+def test_fill_builds_without_a_loop_and_acquire_starts_the_connection():
+    pool = ServiceWarmPool(size=2)
+    builder, built = _counting_builder()
+
+    assert pool.fill("k", builder) == 2
+    assert pool.fill("k", builder) == 0
+    assert all(service._connecting is None for service in built)
+
+    async def take():
+        return [pool.acquire("k") for _ in range(3)]
+
+    first, second, third = asyncio.run(take())
+    assert (first, second, third) == (built[0], built[1], None)
+    assert first._connecting is not None
+    # Nothing is rebuilt once the prewarmed instances are taken.
+    assert len(built) == 2
+    stats = pool.stats()
+    assert (stats["hits"], stats["misses"], stats["idle"]) == (2, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_acquire_drops_expired_and_unhealthy_instances():
+    clock = _Clock()
+    pool = ServiceWarmPool(size=2, max_idle_seconds=60, clock=clock)
+    builder, built = _counting_builder()
+    pool.fill("a", builder)
+    pool.fill("b", builder)
+    broken = built[2]
+    broken.healthy = False
+
+    assert pool.acquire("b") is built[3]
+    await asyncio.sleep(0)
+    assert broken.closed
+
+    clock.now = 100
+    assert pool.acquire("a") is None
+    await asyncio.sleep(0)
+    assert built[0].closed and built[1].closed
+    await pool.aclose()
+
+
+def test_failed_build_leaves_the_key_to_on_demand_creation():
+    pool = ServiceWarmPool(size=1)
+
+    def builder():
+        raise RuntimeError("provider down")
+
+    assert pool.fill("k", builder) == 0
+    assert pool.stats()["idle"] == 0
+
+
+@pytest.mark.asyncio
+async def test_least_recent_key_is_evicted():
+    pool = ServiceWarmPool(size=1, max_keys=2)
+    for key in ("a", "b", "c"):
+        pool.fill(key, _StubService)
+
+    assert pool.acquire("a") is None
+    assert pool.acquire("c") is not None
+    await pool.aclose()
+
+
+@pytest.fixture
+def livekit_services():
+    """
+    The real livekit_services, imported at test time: importing it at
+    collection loads LiveKit plugins that sibling tests mock, and those
+    tests stub this module in sys.modules.
+    """
+    if not hasattr(sys.modules.get(_LIVEKIT_SERVICES), "LiveKitServiceFactory"):
+        sys.modules.pop(_LIVEKIT_SERVICES, None)
+    return importlib.import_module(_LIVEKIT_SERVICES)
+
+
+def _factory(livekit_services):
+    return livekit_services.LiveKitServiceFactory(
+        {
+            "stt_provider": "deepgram",
+            "stt_model": "nova-3",
+            "tts_provider": "cartesia",
+            "tts_model": "sonic-2",
+            "tts_voice": "a0e99841-438c-4a64-b679-ae501e7d6091",
+            "llm_provider": "openai",
+            "llm_model": "gpt-4o-mini",
+        }
+    )
+
+
+async def _call_setup(factory):
+    """Build STT and TTS for a call; time until the TTS can play audio."""
+    start = perf_counter()
+    stt, tts = await asyncio.gather(
+        factory.create_stt_with_retry(), factory.create_tts_with_retry()
+    )
+    await asyncio.sleep(SESSION_SETUP_SECONDS)
+    await asyncio.gather(stt.first_audio(), tts.first_audio())
+    return perf_counter() - start
+
+
+def _stub_builders(monkeypatch, livekit_services, build_seconds=0.0):
+    built = []
+
+    def create(self):
+        time.sleep(build_seconds)
+        built.append(_StubService())
+        return built[-1]
+
+    factory_cls = livekit_services.LiveKitServiceFactory
+    monkeypatch.setattr(factory_cls, "create_stt", create)
+    monkeypatch.setattr(factory_cls, "create_tts", create)
+    return built
+
+
+@pytest.mark.asyncio
+async def test_on_demand_build_does_not_warm_spares(monkeypatch, livekit_services):
+    built = _stub_builders(monkeypatch, livekit_services)
+    pool = ServiceWarmPool(size=1)
+    monkeypatch.setattr(livekit_services, "get_service_pool", lambda: pool)
+
+    await _call_setup(_factory(livekit_services))
+
+    assert len(built) == 2
+    assert pool.stats()["idle"] == 0
+
+
+def test_pool_key_includes_factory_options(livekit_services):
+    factory = _factory(livekit_services)
+    regional = _factory(livekit_services)
+    regional.config["aws_region"] = "us-east-1"
+
+    assert factory._pool_key("stt") != regional._pool_key("stt")
+    assert factory._pool_key("tts") != regional._pool_key("tts")
+    assert factory._pool_key("tts") == _factory(livekit_services)._pool_key("tts")
+
+
+@pytest.mark.benchmark
+def test_warm_pool_call_setup_benchmark(monkeypatch, livekit_services):
+    """Each call runs in a fresh worker process, as LiveKit schedules jobs."""
+    built = _stub_builders(monkeypatch, livekit_services, BUILD_SECONDS)
+    calls = 20
+    results = {}
+    for label, size in (("cold", 0), ("warm", 1)):
+        timings, hits = [], 0
+        for _ in range(calls):
+            pool = ServiceWarmPool(size=size)
+            monkeypatch.setattr(livekit_services, "get_service_pool", lambda: pool)
+            _factory(livekit_services).fill_pool()  # process prewarm
+            built.clear()
+            timings.append(asyncio.run(_call_setup(_factory(livekit_services))))
+            hits += pool.stats()["hits"]
+            assert len(built) == (2 if label == "cold" else 0)
+        results[label] = (statistics.median(timings), hits / (2 * calls))
+
+    print(
+        f"[LATENCY] call_setup_first_audio calls={calls} "
+        f"cold_p50_ms={results['cold'][0] * 1000:.1f} "
+        f"warm_p50_ms={results['warm'][0] * 1000:.1f} "
+        f"warm_hit_rate={results['warm'][1]:.2f}"
+    )
+    assert results["warm"][1] == 1.0
+    assert results["warm"][0] < results["cold"][0] / 2
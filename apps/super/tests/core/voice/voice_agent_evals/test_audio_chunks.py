@@ -0,0 +1,133 @@
+import io
+import sys
+import types
+import wave
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+
+class _UpdateOne:
+    def __init__(self, filter, update, upsert=False):
+        self._filter = filter
+        self._doc = update
+        self._upsert = upsert
+
+
+def _load_voice_evaluation(monkeypatch):
+    # Importing the module opens a Mongo connection; stub the services package.
+    services = types.ModuleType("super_services.db.services")
+    monkeypatch.setitem(sys.modules, "super_services.db.services", services)
+    models = types.ModuleType("super_services.db.services.models.voice_evaluation")
+    for name in (
+        "CallSessionModel", "CallSessionBaseModel",
+        "ConversationTurnModel", "ConversationTurnBaseModel",
+        "CallEvaluationResultModel", "CallEvaluationResultBaseModel",
+        "CallQualityMetricsModel", "CallQualityMetricsBaseModel",
+        "QuestionNotFoundModel", "QuestionNotFoundBaseModel",
+    ):
+        setattr(models, name, MagicMock())
+    monkeypatch.setitem(sys.modules, "super_services.db.services.models.voice_evaluation", models)
+    # tests/conftest.py replaces bson with a stub, which real pymongo cannot import.
+    pymongo = types.ModuleType("pymongo")
+    pymongo.UpdateOne = _UpdateOne
+    monkeypatch.setitem(sys.modules, "pymongo", pymongo)
+    monkeypatch.delitem(sys.modules, "super.core.voice.voice_agent_evals.voice_evaluation", raising=False)
+
+    import super.core.voice.voice_agent_evals.voice_evaluation as ve
+
+    return ve
+
+
+def _write_wav(path, seconds: float = 3.0, framerate: int = 8000, channels: int = 2) -> None:
+    frames = bytes(i % 251 for i in range(int(seconds * framerate) * channels * 2))
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(framerate)
+        wav_file.writeframes(frames)
+
+
+@pytest.fixture
+def evaluator(monkeypatch):
+    ve = _load_voice_evaluation(monkeypatch)
+    return ve, object.__new__(ve.VoiceCallEvaluator)
+
+
+def test_mmap_chunks_match_per_turn_extraction(tmp_path, evaluator) -> None:
+    _, ev = evaluator
+    wav_path = tmp_path / "call.wav"
+    _write_wav(wav_path)
+    spans = [(0.0, 1.0), (0.5, 2.25), (2.9, 10.0), (2.0, 1.0), (-5.0, 0.0), (4.0, 5.0), (0.0, 0.0)]
+
+    chunks = ev.extract_audio_chunks(str(wav_path), spans)
+
+    assert chunks == [ev.extract_audio_chunk(str(wav_path), start, end) for start, end in spans]
+    assert chunks[4] is None and chunks[5] is None
+    with wave.open(io.BytesIO(chunks[0]), "rb") as chunk:
+        assert chunk.getnframes() == 8000
+        assert chunk.getnchannels() == 2
+
+
+def test_non_wav_file_yields_no_chunks(tmp_path, evaluator) -> None:
+    _, ev = evaluator
+    bogus = tmp_path / "call.wav"
+    bogus.write_bytes(b"not a wav file at all")
+
+    assert ev.extract_audio_chunks(str(bogus), [(0.0, 1.0)]) == [None]
+
+
+def test_turn_audio_is_saved_with_one_bulk_write(tmp_path, evaluator) -> None:
+    ve, ev = evaluator
+    wav_path = tmp_path / "call.wav"
+    _write_wav(wav_path)
+    collection = MagicMock()
+    ve.ConversationTurnModel._get_collection.return_value = collection
+    turns = [
+        SimpleNamespace(turn_number=1, turn_start_time=0.0, turn_end_time=1.0),
+        SimpleNamespace(turn_number=2, turn_start_time=-4.0, turn_end_time=1.0),
+        SimpleNamespace(turn_number=3, turn_start_time=1.0, turn_end_time=2.5),
+    ]
+
+    saved = ev.save_turn_audio_chunks("s1", str(wav_path), turns)
+
+    assert saved == 2
+    collection.bulk_write.assert_called_once()
+    operations = collection.bulk_write.call_args.args[0]
+    assert [op._filter["turn_number"] for op in operations] == [1, 3]
+    collection.update_one.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_call_evaluation_results_are_saved_with_one_insert_per_collection(evaluator) -> None:
+    ve, ev = evaluator
+    ev.ground_truth = [
+        {"question": "What are your opening hours?", "answer": "We open at nine.", "keywords": ["opening", "hours"]},
+    ]
+    ev.qa_index = ve.get_qa_matcher_index(ev.ground_truth)
+    ev._calculate_similarity = ev._calculate_relevancy = lambda a, b: 0.5
+    ev._calculate_completeness = ev._calculate_accuracy = lambda a, b: 0.5
+    ev.save_conversation_turn = MagicMock()
+    ev.calculate_quality_metrics = MagicMock()
+    results, not_found = MagicMock(), MagicMock()
+    ve.CallEvaluationResultModel._get_collection.return_value = results
+    ve.QuestionNotFoundModel._get_collection.return_value = not_found
+    transcript = [
+        {"role": "user", "content": "What are your opening hours?"},
+        {"role": "assistant", "content": "We open at nine."},
+        {"role": "user", "content": "Do you sell gift cards?"},
+        {"role": "assistant", "content": "Let me check."},
+        {"role": "user", "content": "Is parking free?"},
+        {"role": "assistant", "content": "Yes."},
+    ]
+
+    evaluations = await ev.evaluate_call_quality("s1", transcript, space_token="space")
+
+    assert len(evaluations) == 3
+    results.insert_many.assert_called_once()
+    assert len(results.insert_many.call_args.args[0]) == 3
+    not_found.insert_many.assert_called_once()
+    assert len(not_found.insert_many.call_args.args[0]) == 2
+    ve.CallEvaluationResultModel.save.assert_not_called()
+    ve.QuestionNotFoundModel.save.assert_not_called()
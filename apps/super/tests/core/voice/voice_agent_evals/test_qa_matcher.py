@@ -0,0 +1,165 @@
+import random
+from difflib import SequenceMatcher, get_close_matches
+from time import perf_counter
+
+import pytest
+
+from super.core.utils.keyword_automaton import KeywordAutomaton
+from super.core.voice.voice_agent_evals.qa_matcher import (
+    QAMatcherIndex,
+    get_qa_matcher_index,
+)
+
+TOPICS = [
+    "fees", "admission", "hostel", "scholarship", "syllabus", "exam", "batch",
+    "timing", "refund", "faculty", "library", "transport", "placement", "mock test",
+    "study material", "online class", "doubt session", "certificate", "branch", "discount",
+]
+VERBS = ["what is", "how do i", "when does", "can i get", "tell me about", "where is"]
+FILLER = ["please", "actually", "the", "for", "my", "course", "today", "again", "sir"]
+
+
+def _similarity(text1: str, text2: str) -> float:
+    """Same scoring as VoiceCallEvaluator._calculate_similarity."""
+    text1, text2 = text1.lower().strip(), text2.lower().strip()
+    if not text1 or not text2:
+        return 0.0
+    seq_match = SequenceMatcher(None, text1, text2).ratio()
+    words1, words2 = set(text1.split()), set(text2.split())
+    union = len(words1 | words2)
+    jaccard = len(words1 & words2) / union if union else 0.0
+    containment = 1.0 if (text1 in text2 or text2 in text1) else 0.5
+    return max(0.0, min(1.0, seq_match * 0.5 + jaccard * 0.3 + containment * 0.2))
+
+
+def _qa_pairs(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    pairs = []
+    for i in range(count):
+        topic = rng.choice(TOPICS)
+        question = f"{rng.choice(VERBS)} the {topic} for {rng.choice(FILLER)} plan {i}"
+        words = question.lower().split()
+        keywords = {w for w in words if len(w) > 2}
+        keywords.update(" ".join(words[j:j + 2]) for j in range(len(words) - 1))
+        pairs.append({
+            "question": question,
+            "answer": f"the {topic} answer number {i} is available at the front desk",
+            "keywords": sorted(keywords),
+        })
+    return pairs
+
+
+def _turns(pairs, count: int, seed: int = 11):
+    rng = random.Random(seed)
+    turns = []
+    for _ in range(count):
+        qa = rng.choice(pairs)
+        words = qa["question"].split()
+        rng.shuffle(words)
+        turns.append(" ".join(words[: rng.randint(2, len(words))] + [rng.choice(FILLER)]))
+    return turns
+
+
+def _scan_keyword_match(pairs, text):
+    text_lower = text.lower()
+    matched, best = None, 0
+    for qa in pairs:
+        keywords = qa.get("keywords", [])
+        if not keywords:
+            continue
+        score = sum(1 for k in keywords if k.lower() in text_lower)
+        if score >= 2 and score > best:
+            best, matched = score, qa
+    return matched, best
+
+
+def _scan_answer_match(pairs, text):
+    text_lower = text.lower()
+    return next((qa for qa in pairs if "answer" in qa and qa["answer"].lower() in text_lower), None)
+
+
+def _scan_most_similar(pairs, text):
+    sims = [(_similarity(text, qa["question"]), qa) for qa in pairs if "question" in qa and "answer" in qa]
+    return max(sims, key=lambda x: x[0])
+
+
+def test_keyword_automaton_matches_substring_scan() -> None:
+    keywords = ["he", "she", "his", "hers", "", "ushers", "sh", "x"]
+    automaton = KeywordAutomaton(keywords)
+    for text in ["ushers", "ahishers", "", "xylophone", "nothing"]:
+        assert automaton.find(text) == {k for k in keywords if k in text}
+
+
+def test_keyword_automaton_accepts_keywords_after_search() -> None:
+    automaton = KeywordAutomaton(["fee"])
+    assert automaton.find("fees due") == {"fee"}
+    automaton.add("due")
+    assert automaton.find("fees due") == {"fee", "due"}
+
+
+def test_keyword_and_answer_lookups_match_full_scan() -> None:
+    pairs = _qa_pairs(300)
+    index = QAMatcherIndex(pairs)
+    for turn in _turns(pairs, 200):
+        assert index.best_keyword_match(turn) == _scan_keyword_match(pairs, turn)
+
+    reply = "Sure! " + pairs[42]["answer"].upper() + " and also " + pairs[7]["answer"]
+    assert index.first_answer_in(reply) is _scan_answer_match(pairs, reply) is pairs[7]
+    assert index.first_answer_in("no answer here") is None
+
+
+def test_small_qa_sets_are_scored_exhaustively() -> None:
+    pairs = _qa_pairs(20)
+    index = QAMatcherIndex(pairs, shortlist_size=32)
+    for turn in _turns(pairs, 50):
+        assert index.most_similar_question(turn, _similarity) == _scan_most_similar(pairs, turn)
+        expected = get_close_matches(turn.lower(), [qa["question"].lower() for qa in pairs], n=1, cutoff=0.6)
+        match = index.closest_question(turn)
+        assert (match["question"].lower() if match else None) == (expected[0] if expected else None)
+
+
+def test_shortlisted_similarity_within_tolerance() -> None:
+    pairs = _qa_pairs(1000)
+    index = QAMatcherIndex(pairs)
+    for turn in _turns(pairs, 30):
+        indexed_score, _ = index.most_similar_question(turn, _similarity)
+        scan_score, _ = _scan_most_similar(pairs, turn)
+        assert indexed_score == pytest.approx(scan_score, abs=0.05)
+
+
+def test_index_is_reused_for_identical_qa_sets() -> None:
+    pairs = _qa_pairs(10)
+    assert get_qa_matcher_index(pairs) is get_qa_matcher_index([dict(qa) for qa in pairs])
+    assert get_qa_matcher_index(pairs) is not get_qa_matcher_index(pairs[:5])
+
+
+@pytest.mark.benchmark
+def test_indexed_matching_benchmark_1000_pairs_200_turns() -> None:
+    pairs = _qa_pairs(1000)
+    turns = _turns(pairs, 200)
+
+    start = perf_counter()
+    index = QAMatcherIndex(pairs)
+    build_ms = (perf_counter() - start) * 1000
+
+    start = perf_counter()
+    for turn in turns:
+        index.best_keyword_match(turn)
+        index.closest_question(turn)
+        index.most_similar_question(turn, _similarity)
+    indexed_ms = (perf_counter() - start) * 1000
+
+    # The full scan takes about a minute for all 200 turns; time a sample and extrapolate.
+    sample = turns[:20]
+    start = perf_counter()
+    for turn in sample:
+        _scan_keyword_match(pairs, turn)
+        get_close_matches(turn.lower(), [qa["question"].lower() for qa in pairs], n=1, cutoff=0.6)
+        _scan_most_similar(pairs, turn)
+    scan_ms = (perf_counter() - start) * 1000 * len(turns) / len(sample)
+
+    print(
+        f"[LATENCY] qa_matcher pairs={len(pairs)} turns={len(turns)} build_ms={build_ms:.1f} "
+        f"indexed_ms={indexed_ms:.1f} scan_ms~{scan_ms:.1f} speedup={scan_ms / indexed_ms:.1f}x"
+    )
+    assert indexed_ms * 3 < scan_ms
@@ -0,0 +1,263 @@
+import asyncio
+import json
+
+import pytest
+
+from super.core.voice.workflows.flows.flow_compile_cache import (
+    FlowCompileCache,
+    flow_cache_key,
+)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+        self.ttls[key] = ex
+
+
+class _BrokenRedis:
+    async def get(self, key):
+        raise ConnectionError("redis down")
+
+    async def set(self, key, value, ex=None):
+        raise ConnectionError("redis down")
+
+
+def _counting_compiler(payload, delay: float = 0.0):
+    calls = []
+
+    async def compile_fn():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return payload
+
+    return compile_fn, calls
+
+
+def test_cache_key_changes_with_prompt_and_version() -> None:
+    key = flow_cache_key("prompt", "3.1")
+    assert key.startswith("flow_blueprint:3.1:")
+    assert key == flow_cache_key("prompt", "3.1")
+    assert key != flow_cache_key("prompt ", "3.1")
+    assert key != flow_cache_key("prompt", "3.2")
+    assert key != flow_cache_key("prompt", "3.1", variant="openai/gpt-4o")
+
+
+@pytest.mark.asyncio
+async def test_miss_compiles_once_then_hits_local() -> None:
+    redis = _FakeRedis()
+    cache = FlowCompileCache(redis_client=redis, ttl_seconds=60)
+    compile_fn, calls = _counting_compiler({"goals": [1]})
+
+    first = await cache.get_or_compile("k", compile_fn)
+    second = await cache.get_or_compile("k", compile_fn)
+
+    assert first == second == {"goals": [1]}
+    assert len(calls) == 1
+    assert json.loads(redis.store["k"]) == {"goals": [1]}
+    assert redis.ttls["k"] == 60
+    stats = cache.stats()
+    assert (stats["misses"], stats["local_hits"], stats["redis_hits"]) == (1, 1, 0)
+    assert stats["hit_rate"] == pytest.approx(0.5)
+    assert stats["compiles"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_hit_is_promoted_to_local() -> None:
+    redis = _FakeRedis()
+    redis.store["k"] = json.dumps({"from": "redis"})
+    cache = FlowCompileCache(redis_client=redis)
+    compile_fn, calls = _counting_compiler({"from": "compile"})
+
+    assert await cache.get_or_compile("k", compile_fn) == {"from": "redis"}
+    redis.store.clear()
+    assert await cache.get_or_compile("k", compile_fn) == {"from": "redis"}
+
+    assert calls == []
+    stats = cache.stats()
+    assert (stats["redis_hits"], stats["local_hits"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_compile() -> None:
+    cache = FlowCompileCache(redis_client=_FakeRedis())
+    compile_fn, calls = _counting_compiler({"v": 1}, delay=0.05)
+
+    results = await asyncio.gather(*[cache.get_or_compile("k", compile_fn) for _ in range(10)])
+
+    assert results == [{"v": 1}] * 10
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_compile_is_not_cached() -> None:
+    cache = FlowCompileCache(redis_client=_FakeRedis())
+
+    async def broken():
+        raise RuntimeError("llm unavailable")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_compile("k", broken)
+
+    compile_fn, calls = _counting_compiler({"v": 2})
+    assert await cache.get_or_compile("k", compile_fn) == {"v": 2}
+    assert len(calls) == 1
+    assert cache.stats()["compile_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_force_recompiles_and_overwrites() -> None:
+    redis = _FakeRedis()
+    cache = FlowCompileCache(redis_client=redis)
+    await cache.get_or_compile("k", _counting_compiler({"v": 1})[0])
+
+    await cache.get_or_compile("k", _counting_compiler({"v": 2})[0], force=True)
+
+    assert cache.get_local("k") == {"v": 2}
+    assert json.loads(redis.store["k"]) == {"v": 2}
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_degrade_to_local_cache() -> None:
+    cache = FlowCompileCache(redis_client=_BrokenRedis())
+    compile_fn, calls = _counting_compiler({"v": 1})
+
+    assert await cache.get_or_compile("k", compile_fn) == {"v": 1}
+    assert await cache.get_or_compile("k", compile_fn) == {"v": 1}
+    assert len(calls) == 1
+
+
+def test_local_tier_evicts_least_recently_used() -> None:
+    cache = FlowCompileCache(redis_client=_FakeRedis(), local_size=2)
+    cache.put_local("a", {"v": "a"})
+    cache.put_local("b", {"v": "b"})
+    cache.get_local("a")
+    cache.put_local("c", {"v": "c"})
+
+    assert cache.get_local("b") is None
+    assert cache.get_local("a") == {"v": "a"}
+    assert cache.get_local("c") == {"v": "c"}
+
+
+def test_local_artifact_is_built_once_and_dropped_with_its_entry() -> None:
+    cache = FlowCompileCache(redis_client=_FakeRedis(), local_size=1)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return object()
+
+    assert cache.local_artifact("a", "index", build) is not cache.local_artifact("a", "index", build)
+
+    cache.put_local("a", {"v": "a"})
+    first = cache.local_artifact("a", "index", build)
+    assert cache.local_artifact("a", "index", build) is first
+    assert len(builds) == 3
+
+    cache.put_local("a", {"v": "a2"})
+    assert cache.local_artifact("a", "index", build) is not first
+    cache.put_local("b", {"v": "b"})
+    assert "a" not in cache._artifacts
+
+
+SYSTEM_PROMPT = """[Identity]
+You are Asha from Acme Coaching.
+
+[Ask Name]
+Ask the caller for their full name.
+
+[Ask Course]
+Ask which course the caller is interested in.
+
+[FAQ]
+Q: What are the fees? A: The fees are 20000 rupees per year.
+"""
+
+
+@pytest.fixture
+def flow_v3(monkeypatch):
+    import super.core.voice.workflows.flows.flow_generator_v3 as v3
+
+    cache = FlowCompileCache(redis_client=_FakeRedis())
+    monkeypatch.setattr(v3, "get_flow_compile_cache", lambda: cache)
+    compiles = []
+
+    def fake_compile(system_prompt, lm=None):
+        # Same structure as compile_flow_blueprint, without the DSPy calls.
+        compiles.append(system_prompt)
+        parsed = v3.SectionParser().parse_prompt(system_prompt)
+        blueprint = v3.build_blueprint_from_parsed_config(parsed)
+        goal_configs = [
+            v3.GoalRuntimeConfig(
+                goal=goal,
+                function_name=f"collect_{goal.goal_id}",
+                required_fields=goal.required_fields,
+                function_description=goal.description,
+                task_message=goal.content,
+            )
+            for goal in blueprint.goals
+        ]
+        return blueprint, goal_configs
+
+    monkeypatch.setattr(v3, "compile_flow_blueprint", fake_compile)
+    return v3, cache, compiles
+
+
+@pytest.mark.asyncio
+async def test_smart_flow_compiles_each_prompt_once(flow_v3) -> None:
+    v3, cache, compiles = flow_v3
+
+    first = await v3.create_smart_flow(SYSTEM_PROMPT, assistant_prompt="CALL CONTEXT")
+    second = await v3.create_smart_flow(SYSTEM_PROMPT)
+
+    assert len(compiles) == 1
+    assert [node["name"] for node in first] == [node["name"] for node in second]
+    # The per-call assistant prompt must not leak into the cached blueprint.
+    blueprint, _ = await v3.get_compiled_flow(SYSTEM_PROMPT)
+    assert "CALL CONTEXT" not in blueprint.identity.content
+    assert cache.stats()["hit_rate"] == pytest.approx(2 / 3)
+
+
+@pytest.mark.asyncio
+async def test_qa_index_is_shared_by_calls_for_the_same_prompt(flow_v3, monkeypatch) -> None:
+    v3, cache, compiles = flow_v3
+    built = []
+    real_index = v3.QALookupIndex
+
+    def counting_index(qa_pairs):
+        built.append(len(qa_pairs))
+        return real_index(qa_pairs)
+
+    monkeypatch.setattr(v3, "QALookupIndex", counting_index)
+
+    await v3.create_smart_flow(SYSTEM_PROMPT)
+    await v3.create_smart_flow(SYSTEM_PROMPT, assistant_prompt="CALL CONTEXT")
+
+    assert built == [1]
+    blueprint, _ = await v3.get_compiled_flow(SYSTEM_PROMPT)
+    assert v3.get_qa_index(SYSTEM_PROMPT, blueprint).find("what are the fees?").answer.startswith(
+        "The fees are"
+    )
+
+
+@pytest.mark.asyncio
+async def test_precompile_warms_cache_and_reports_stats(flow_v3) -> None:
+    v3, cache, compiles = flow_v3
+
+    stats = await v3.precompile_flow(SYSTEM_PROMPT)
+    blueprint, goal_configs = await v3.get_compiled_flow(SYSTEM_PROMPT)
+
+    assert len(compiles) == 1
+    assert stats["compiles"] == 1 and stats["goals"] == len(goal_configs)
+    assert stats["key"].startswith(f"flow_blueprint:{v3.FLOW_GENERATOR_VERSION}:")
+    assert cache.stats()["local_hits"] == 1
+    expected, expected_goals = v3.compile_flow_blueprint(SYSTEM_PROMPT)
+    assert blueprint == expected
+    assert goal_configs == expected_goals
@@ -0,0 +1,108 @@
+import random
+from time import perf_counter
+
+import pytest
+
+from super.core.voice.workflows.flows.flow_generator_v3 import (
+    QALookupIndex,
+    QAPair,
+    SectionParser,
+    build_blueprint_from_parsed_config,
+)
+
+TOPICS = [
+    "fees", "admission", "hostel", "scholarship", "syllabus", "exam", "batch",
+    "timing", "refund", "faculty", "library", "transport", "placement", "mock",
+    "material", "online", "doubt", "certificate", "branch", "discount",
+]
+
+
+def _scan_find(qa_pairs, question):
+    """Reference: the linear scan FlowOrchestrator._find_qa_answer used to do."""
+    if not question:
+        return None
+    q_lower = question.lower()
+    for pair in qa_pairs:
+        if any(keyword and keyword in q_lower for keyword in pair.keywords):
+            return pair
+        if pair.question.lower() in q_lower:
+            return pair
+    return None
+
+
+def _faq_prompt(count: int, seed: int = 3) -> str:
+    rng = random.Random(seed)
+    lines = ["[Identity]", "You are the admissions desk assistant.", "", "[FAQ]"]
+    for i in range(count):
+        topic = rng.choice(TOPICS)
+        lines.append(
+            f"Q: What about the {topic} policy for programme{i}? "
+            f"A: The {topic} policy for programme{i} is on the notice board."
+        )
+    return "\n".join(lines)
+
+
+def _questions(count: int, seed: int = 5):
+    rng = random.Random(seed)
+    questions = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.4:
+            questions.append(f"Hi, can you tell me about PROGRAMME{rng.randrange(4000)} please?")
+        elif kind < 0.7:
+            questions.append(f"what is the {rng.choice(TOPICS)} situation today")
+        else:
+            questions.append("I just want to talk to someone")
+    return questions
+
+
+def test_lookup_matches_linear_scan_priority() -> None:
+    pairs = [
+        QAPair(question="What are the fees?", answer="A1", keywords=["fees"]),
+        QAPair(question="Hostel fees?", answer="A2", keywords=["hostel", ""]),
+        QAPair(question="Refund", answer="A3", keywords=["Refund"]),
+        QAPair(question="", answer="A4", keywords=[]),
+    ]
+    index = QALookupIndex(pairs)
+    for question in [
+        "hostel fees please", "what are the fees?", "REFUND now", "nothing relevant", "",
+    ]:
+        assert index.find(question) is _scan_find(pairs, question)
+    # An empty question text is contained in anything, so pair 4 is the fallback.
+    assert index.find("nothing relevant") is pairs[3]
+    assert QALookupIndex([]).find("fees") is None
+
+
+def test_lookup_matches_linear_scan_on_parsed_faq_prompt() -> None:
+    blueprint = build_blueprint_from_parsed_config(SectionParser().parse_prompt(_faq_prompt(300)))
+    assert len(blueprint.qa_pairs) == 300
+    index = QALookupIndex(blueprint.qa_pairs)
+    for question in _questions(300):
+        assert index.find(question) is _scan_find(blueprint.qa_pairs, question)
+
+
+@pytest.mark.benchmark
+def test_qa_lookup_benchmark_large_faq_prompt() -> None:
+    blueprint = build_blueprint_from_parsed_config(SectionParser().parse_prompt(_faq_prompt(4000)))
+    pairs = blueprint.qa_pairs
+    questions = _questions(2000)
+
+    start = perf_counter()
+    index = QALookupIndex(pairs)
+    build_ms = (perf_counter() - start) * 1000
+
+    start = perf_counter()
+    indexed = [index.find(q) for q in questions]
+    indexed_ms = (perf_counter() - start) * 1000
+
+    start = perf_counter()
+    scanned = [_scan_find(pairs, q) for q in questions]
+    scan_ms = (perf_counter() - start) * 1000
+
+    print(
+        f"[LATENCY] flow_qa_lookup pairs={len(pairs)} questions={len(questions)} "
+        f"build_ms={build_ms:.1f} indexed_ms={indexed_ms:.1f} scan_ms={scan_ms:.1f} "
+        f"speedup={scan_ms / max(indexed_ms, 1e-6):.1f}x"
+    )
+    assert indexed == scanned
+    assert indexed_ms * 5 < scan_ms
@@ -0,0 +1,133 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+import super_services.evals.eval_generator as module
+from super_services.evals.eval_generator import EvalGenerator, QAPair
+
+mongomock = pytest.importorskip("mongomock")
+
+DOCUMENTS = [{"content": f"Store policy {n}: " + "returns are accepted within 30 days. " * 3} for n in range(2)]
+
+
+@pytest.fixture
+def kb_pairs(monkeypatch):
+    """KB pair collection backed by mongomock."""
+    collection = mongomock.MongoClient().db.kb_qa_pairs
+    model = module.KBQAPairModel
+    monkeypatch.setattr(model, "_get_collection", lambda self: collection, raising=False)
+    monkeypatch.setattr(
+        model,
+        "find",
+        lambda self, **query: [SimpleNamespace(**doc) for doc in collection.find(query)],
+        raising=False,
+    )
+    monkeypatch.setattr(
+        model,
+        "save_many_to_db",
+        lambda self, data: collection.insert_many([dict(d) for d in data]).inserted_ids,
+        raising=False,
+    )
+    monkeypatch.setattr(
+        module,
+        "_fetch_eval_info",
+        lambda gen_type, handle, multi_fetch=False: {
+            "id": 1,
+            "eval_name": "Shop Evals",
+            "eval_data": {"space_token": "eval-token"},
+        },
+    )
+    return collection
+
+
+def _generator(monkeypatch, fail_types=(), empty_types=()):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    generator = EvalGenerator("knowledgebase", "agent", "kb-token", logging.getLogger("test"))
+    calls = []
+
+    async def fetch_documents(kb_token):
+        return DOCUMENTS
+
+    async def call_llm(prompt, max_pairs=50, eval_type="general"):
+        calls.append(eval_type)
+        if eval_type in fail_types:
+            raise RuntimeError("rate limited")
+        if eval_type in empty_types:
+            return []
+        return [
+            QAPair(f"{eval_type} q{n}", "a", False, "", None, False, eval_type=eval_type)
+            for n in range(max_pairs)
+        ]
+
+    monkeypatch.setattr(generator, "_fetch_kb_documents", fetch_documents)
+    monkeypatch.setattr(generator, "_call_openai_for_qa_pairs", call_llm)
+    monkeypatch.setattr(generator, "_update_eval_status", lambda *args, **kwargs: None)
+    async def checkpoint(eval_id, progress):
+        generator.progress.append(progress)
+
+    generator.progress = []
+    monkeypatch.setattr(generator, "_checkpoint_progress", checkpoint)
+    return generator, calls
+
+
+def _legacy_pairs(collection):
+    """A KB generated before content hashing, complete for Introduction only."""
+    collection.insert_many(
+        [
+            {
+                "question": f"legacy {n}",
+                "answer": "a",
+                "eval_type": "Introduction",
+                "language": "English",
+                "status": "active",
+                "batch_id": "batch_legacy",
+            }
+            for n in range(6)
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_clean_run_retires_pairs_from_before_content_hashing(monkeypatch, kb_pairs):
+    _legacy_pairs(kb_pairs)
+
+    generator, calls = _generator(monkeypatch)
+    await generator.generate_all_evals()
+
+    assert len(calls) == 6
+    assert kb_pairs.count_documents({"content_hash": None, "status": "active"}) == 0
+    assert kb_pairs.count_documents({"status": "active"}) == 18
+
+    generator, calls = _generator(monkeypatch)
+    results = await generator.generate_all_evals()
+    assert calls == [] and results["kb_qa_count"] == 18
+
+
+@pytest.mark.asyncio
+async def test_failed_run_keeps_pairs_from_before_content_hashing(monkeypatch, kb_pairs):
+    _legacy_pairs(kb_pairs)
+
+    generator, _ = _generator(monkeypatch, fail_types=("Introduction",))
+    await generator.generate_all_evals()
+
+    assert kb_pairs.count_documents({"content_hash": None, "status": "active"}) == 6
+
+    generator, calls = _generator(monkeypatch)
+    await generator.generate_all_evals()
+    assert calls == ["Introduction"] * 2
+    assert kb_pairs.count_documents({"content_hash": None, "status": "active"}) == 0
+
+
+@pytest.mark.asyncio
+async def test_units_without_pairs_are_not_regenerated(monkeypatch, kb_pairs):
+    generator, calls = _generator(monkeypatch, empty_types=("Introduction",))
+    await generator.generate_all_evals()
+
+    assert len(calls) == 6 and generator.progress[-1]["done"] == 6
+    assert kb_pairs.count_documents({"status": "empty"}) == 2
+    assert kb_pairs.count_documents({"status": "active"}) == 12
+
+    generator, calls = _generator(monkeypatch)
+    results = await generator.generate_all_evals()
+    assert calls == [] and results["kb_qa_count"] == 12
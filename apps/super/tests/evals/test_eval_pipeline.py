@@ -0,0 +1,193 @@
+import asyncio
+from time import perf_counter
+
+import pytest
+
+from super_services.evals.eval_pipeline import EvalPipeline, EvalUnit, content_hash
+
+LLM_LATENCY = 0.01
+
+
+class _StubLLM:
+    """Generates and translates deterministic pairs, tracking calls and concurrency."""
+
+    def __init__(self, latency=LLM_LATENCY, fail_keys=()):
+        self.latency = latency
+        self.fail_keys = set(fail_keys)
+        self.generate_calls = []
+        self.translate_calls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def _call(self):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+    async def generate(self, unit):
+        self.generate_calls.append(unit.key)
+        await self._call()
+        if unit.key in self.fail_keys:
+            raise RuntimeError("rate limited")
+        return [{"question": f"{unit.prompt} q{n}", "language": "English"} for n in range(3)]
+
+    async def translate(self, pairs, language):
+        self.translate_calls.append(language)
+        await self._call()
+        return [{**pair, "language": language} for pair in pairs]
+
+
+class _Store:
+    """Saved pairs keyed like the pipeline's cache."""
+
+    def __init__(self):
+        self.pairs = {}
+
+    async def save(self, unit, language, pairs):
+        self.pairs[(unit.key, language)] = list(pairs)
+        return len(pairs)
+
+
+def _units(chunks, kb_name="kb"):
+    return [
+        EvalUnit(
+            key=content_hash("gpt-4o", kb_name, eval_type, content),
+            eval_type=eval_type,
+            prompt=f"{eval_type}:{content}",
+        )
+        for content in chunks
+        for eval_type in ("Introduction", "Q&A", "ObjectionHandling")
+    ]
+
+
+def _pipeline(llm, store, languages=("English", "Hindi"), **kwargs):
+    return EvalPipeline(
+        generate=llm.generate,
+        translate=llm.translate,
+        save=store.save,
+        languages=list(languages),
+        stored=dict(store.pairs),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_first_run_generates_and_translates_within_bounds():
+    llm, store = _StubLLM(), _Store()
+    units = _units([f"chunk {n}" for n in range(10)])
+
+    stats = await _pipeline(
+        llm, store, generation_concurrency=3, translation_concurrency=2
+    ).run(units)
+
+    assert (stats.generated, stats.translated, stats.reused) == (30, 30, 0)
+    assert stats.saved == 180 and stats.saved_by_type["Q&A"] == 60
+    assert llm.peak <= 5
+    assert {lang for _, lang in store.pairs} == {"English", "Hindi"}
+    hindi = [p for (_, lang), pairs in store.pairs.items() if lang == "Hindi" for p in pairs]
+    assert len(hindi) == 90 and all(p["language"] == "Hindi" for p in hindi)
+
+
+@pytest.mark.asyncio
+async def test_only_changed_chunks_are_regenerated():
+    store = _Store()
+    chunks = [f"chunk {n}" for n in range(10)]
+    await _pipeline(_StubLLM(), store).run(_units(chunks))
+
+    llm = _StubLLM()
+    pipeline = _pipeline(llm, store)
+    assert pipeline.pending(_units(chunks)) == []
+
+    chunks[4] = "chunk 4, edited"
+    units = _units(chunks)
+    pending = pipeline.pending(units)
+    stats = await pipeline.run(pending)
+
+    assert len(pending) == 3
+    assert len(llm.generate_calls) == 3 and len(llm.translate_calls) == 3
+    assert stats.saved == 18
+    stale = {key for key, _ in store.pairs} - {unit.key for unit in units}
+    assert len(stale) == 3
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_resumes_from_saved_units():
+    store = _Store()
+    units = _units([f"chunk {n}" for n in range(4)])
+    failing = {units[1].key, units[5].key}
+    progress = []
+
+    first = await _pipeline(
+        _StubLLM(fail_keys=failing), store, checkpoint=progress.append, checkpoint_every=4
+    ).run(units)
+    assert len(first.errors) == 2 and first.saved == 60
+    assert [p["done"] for p in progress] == [4, 8, 12, 12]
+
+    llm = _StubLLM()
+    pipeline = _pipeline(llm, store)
+    second = await pipeline.run(pipeline.pending(units))
+    assert sorted(llm.generate_calls) == sorted(failing)
+    assert second.errors == [] and len(store.pairs) == 24
+
+
+@pytest.mark.asyncio
+async def test_new_language_reuses_generated_pairs():
+    store = _Store()
+    units = _units(["chunk a", "chunk b"])
+    await _pipeline(_StubLLM(), store, languages=["English"]).run(units)
+
+    llm = _StubLLM()
+    pipeline = _pipeline(llm, store, languages=["English", "Tamil"])
+    stats = await pipeline.run(pipeline.pending(units))
+
+    assert llm.generate_calls == [] and llm.translate_calls == ["Tamil"] * 6
+    assert stats.reused == 6 and stats.saved == 18
+
+
+@pytest.mark.asyncio
+async def test_force_ignores_stored_pairs():
+    store = _Store()
+    units = _units(["chunk a"])
+    await _pipeline(_StubLLM(), store).run(units)
+
+    llm = _StubLLM()
+    await _pipeline(llm, store).run(units, force=True)
+    assert len(llm.generate_calls) == 3 and len(llm.translate_calls) == 3
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_eval_generation_pipeline_benchmark():
+    chunks = [f"chunk {n}" for n in range(40)]
+    units = _units(chunks)
+    latency = 0.02
+
+    start = perf_counter()
+    await _pipeline(
+        _StubLLM(latency), _Store(), generation_concurrency=1, translation_concurrency=1
+    ).run(units)
+    serial = perf_counter() - start
+
+    store = _Store()
+    start = perf_counter()
+    await _pipeline(_StubLLM(latency), store).run(units)
+    concurrent = perf_counter() - start
+
+    chunks[7] = "chunk 7, edited"
+    llm = _StubLLM(latency)
+    pipeline = _pipeline(llm, store)
+    start = perf_counter()
+    await pipeline.run(pipeline.pending(_units(chunks)))
+    incremental = perf_counter() - start
+
+    print(
+        f"[LATENCY] eval_generation units={len(units)} llm_ms={latency * 1000:.0f} "
+        f"serial_ms={serial * 1000:.0f} concurrent_ms={concurrent * 1000:.0f} "
+        f"incremental_ms={incremental * 1000:.0f} "
+        f"incremental_llm_calls={len(llm.generate_calls) + len(llm.translate_calls)}"
+    )
+    assert concurrent < serial / 4
+    assert len(llm.generate_calls) + len(llm.translate_calls) == 6